@@ -1,12 +1,51 @@
 """Additional API routes for new integrations."""
 
 import logging
+import math
+import time
 
 from flask_restful import Resource
 from flask import request
 
+from home_automation.core.scheduler import Priority, prioritized
+from home_automation.integrations.proxmox_bulk import BULK_ACTIONS, parse_order, parse_selector
+
 logger = logging.getLogger(__name__)
 
+# Longest a request may block waiting for a Proxmox task or a device to power on
+MAX_TASK_WAIT = 60.0
+
+# Argument names of the client's control methods, so service data may not use them
+RESERVED_SERVICE_FIELDS = ("entity_id", "entity_ids", "action", "area", "domains")
+
+
+def parse_service_parameters(data):
+    """Get the optional service data of a control request.
+
+    Raises:
+        ValueError: If ``parameters`` is not an object or uses a reserved field
+    """
+    parameters = data.get("parameters")
+    if parameters is None:
+        return {}
+    if not isinstance(parameters, dict):
+        raise ValueError("parameters must be an object")
+    reserved = [field for field in RESERVED_SERVICE_FIELDS if field in parameters]
+    if reserved:
+        raise ValueError(f"parameters may not set {', '.join(reserved)}")
+    return parameters
+
+
+def parse_string_list(value, name):
+    """Check that a request field is a list of non-empty strings.
+
+    Raises:
+        ValueError: If it is anything else, e.g. a single string
+    """
+    if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+        raise ValueError(f"{name} must be a list of strings")
+    return value
+
 
 class HomeAssistantConnection(Resource):
     """Home Assistant connection endpoint."""
@@ -29,12 +68,21 @@ class HomeAssistantStates(Resource):
         self.ha_client = ha_client
 
     def get(self):
-        """Get all entity states from Home Assistant."""
+        """Get entity states from Home Assistant, optionally filtered by domain, area or entity pattern."""
         if not self.ha_client:
             return {"success": False, "message": "Home Assistant client not configured"}, 503
         
-        states = self.ha_client.get_states()
-        return {"success": True, "states": states}
+        domains = [d for d in request.args.get("domain", "").split(",") if d]
+        entity_pattern = request.args.get("entity")
+        area = request.args.get("area")
+        if area and not (self.ha_client.registry and self.ha_client.registry.loaded):
+            return {"success": False, "message": "Area registry not available"}, 503
+        if domains or entity_pattern or area:
+            states = list(self.ha_client.iter_states(domains, entity_pattern, area))
+            return {"success": True, "states": states}
+
+        states, cache = self.ha_client.get_states_with_meta()
+        return {"success": True, "states": states, "cache": cache}
 
 
 class HomeAssistantControl(Resource):
@@ -43,6 +91,7 @@ class HomeAssistantControl(Resource):
     def __init__(self, ha_client):
         self.ha_client = ha_client
 
+    @prioritized(Priority.INTERACTIVE)
     def post(self, entity_id):
         """Control a Home Assistant entity."""
         if not self.ha_client:
@@ -50,28 +99,97 @@ class HomeAssistantControl(Resource):
         
         data = request.get_json() or {}
         action = data.get("action")
-        
+        try:
+            parameters = parse_service_parameters(data)
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+
         if action == "turn_on":
-            return self.ha_client.turn_on(entity_id, **data.get("parameters", {}))
+            return self.ha_client.turn_on(entity_id, **parameters)
         elif action == "turn_off":
-            return self.ha_client.turn_off(entity_id, **data.get("parameters", {}))
+            return self.ha_client.turn_off(entity_id, **parameters)
         elif action == "toggle":
-            return self.ha_client.toggle(entity_id, **data.get("parameters", {}))
+            return self.ha_client.toggle(entity_id, **parameters)
         else:
             return {"success": False, "message": f"Unknown action: {action}"}, 400
 
+    @prioritized(Priority.INTERACTIVE)
     def get(self, entity_id):
         """Get state of a Home Assistant entity."""
         if not self.ha_client:
             return {"success": False, "message": "Home Assistant client not configured"}, 503
         
-        state = self.ha_client.get_state(entity_id)
+        state, cache = self.ha_client.get_state_with_meta(entity_id)
         if state:
-            return {"success": True, "state": state}
+            return {"success": True, "state": state, "cache": cache}
         else:
             return {"success": False, "message": "Entity not found"}, 404
 
 
+class HomeAssistantBulkControl(Resource):
+    """Home Assistant multi-entity control endpoint."""
+
+    def __init__(self, ha_client):
+        self.ha_client = ha_client
+
+    @prioritized(Priority.INTERACTIVE)
+    def post(self):
+        """Run the same action on several entities concurrently."""
+        if not self.ha_client:
+            return {"success": False, "message": "Home Assistant client not configured"}, 503
+
+        data = request.get_json() or {}
+        action = data.get("action")
+        entity_ids = data.get("entity_ids") or []
+        area = data.get("area")
+
+        if action not in ("turn_on", "turn_off", "toggle"):
+            return {"success": False, "message": f"Unknown action: {action}"}, 400
+        try:
+            parameters = parse_service_parameters(data)
+            if area:
+                if not isinstance(area, str):
+                    raise ValueError("area must be a string")
+                domains = data.get("domains")
+                if domains is not None:
+                    domains = parse_string_list(domains, "domains")
+            else:
+                parse_string_list(entity_ids, "entity_ids")
+                if not entity_ids:
+                    raise ValueError("entity_ids must be a non-empty list")
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+
+        if area:
+            if not (self.ha_client.registry and self.ha_client.registry.loaded):
+                return {"success": False, "message": "Area registry not available"}, 503
+            results = self.ha_client.control_area(action, area, domains, **parameters)
+            if not results:
+                return {"success": False, "message": f"No matching entities in area: {area}"}, 404
+        else:
+            results = self.ha_client.control_entities(action, entity_ids, **parameters)
+        return {
+            "success": all(result.get("success") for result in results.values()),
+            "results": results
+        }
+
+
+class HomeAssistantAreas(Resource):
+    """Home Assistant areas endpoint."""
+
+    def __init__(self, ha_client):
+        self.ha_client = ha_client
+
+    def get(self):
+        """Get all areas with their entity counts."""
+        if not self.ha_client:
+            return {"success": False, "message": "Home Assistant client not configured"}, 503
+        if not (self.ha_client.registry and self.ha_client.registry.loaded):
+            return {"success": False, "message": "Area registry not available"}, 503
+
+        return {"success": True, "areas": self.ha_client.registry.get_areas()}
+
+
 class RemoteDeviceList(Resource):
     """Remote device list endpoint."""
 
@@ -90,6 +208,7 @@ class RemoteDeviceControl(Resource):
     def __init__(self, remote_manager):
         self.remote_manager = remote_manager
 
+    @prioritized(Priority.INTERACTIVE)
     def post(self, device_name):
         """Send command to remote device."""
         data = request.get_json() or {}
@@ -97,7 +216,22 @@ class RemoteDeviceControl(Resource):
         
         if not command:
             return {"success": False, "message": "Command is required"}, 400
-        
+
+        if command == "power_on":
+            commands = data.get("commands") or []
+            if not isinstance(commands, list):
+                return {"success": False, "message": "commands must be a list"}, 400
+            timeout = data.get("timeout")
+            if timeout is not None:
+                try:
+                    timeout = float(timeout)
+                except (TypeError, ValueError):
+                    return {"success": False, "message": "timeout must be a number of seconds"}, 400
+                if not math.isfinite(timeout) or timeout <= 0:
+                    return {"success": False, "message": "timeout must be a positive number of seconds"}, 400
+                timeout = min(timeout, MAX_TASK_WAIT)
+            return self.remote_manager.power_on(device_name, commands, timeout=timeout)
+
         result = self.remote_manager.send_command(device_name, command)
         return result
 
@@ -107,6 +241,65 @@ class RemoteDeviceControl(Resource):
         return result
 
 
+class RemoteMacroList(Resource):
+    """Remote macro list endpoint."""
+
+    def __init__(self, macro_runner):
+        self.macro_runner = macro_runner
+
+    def get(self):
+        """Get the shared macros, or those available on one device."""
+        macros = self.macro_runner.get_macros(request.args.get("device"))
+        return {"success": True, "macros": macros}
+
+
+class RemoteMacroExecute(Resource):
+    """Remote macro execution endpoint."""
+
+    def __init__(self, macro_runner):
+        self.macro_runner = macro_runner
+
+    @prioritized(Priority.INTERACTIVE)
+    def post(self, device_name, macro_name):
+        """Run a macro on a device, optionally waiting for it to finish."""
+        data = request.get_json(silent=True) or {}
+        try:
+            run = self.macro_runner.run(device_name, macro_name)
+        except KeyError as e:
+            return {"success": False, "message": e.args[0]}, 404
+
+        try:
+            wait = min(float(data.get("wait", request.args.get("wait", 0))), MAX_TASK_WAIT)
+        except (TypeError, ValueError):
+            wait = 0
+        if wait > 0:
+            result = self.macro_runner.wait(run.id, wait)
+            if run.done:
+                return {"success": result["status"] == "completed", "run": result}
+        return {"success": True, "run": run.to_dict()}, 202
+
+
+class RemoteMacroRun(Resource):
+    """Remote macro run endpoint."""
+
+    def __init__(self, macro_runner):
+        self.macro_runner = macro_runner
+
+    def get(self, run_id):
+        """Get the progress of a macro run."""
+        run = self.macro_runner.get(run_id)
+        if run is None:
+            return {"success": False, "message": f"Unknown run: {run_id}"}, 404
+        return {"success": True, "run": run}
+
+    def delete(self, run_id):
+        """Cancel a macro run."""
+        run = self.macro_runner.cancel(run_id)
+        if run is None:
+            return {"success": False, "message": f"Unknown run: {run_id}"}, 404
+        return {"success": True, "run": run}
+
+
 class MobileDeviceList(Resource):
     """Mobile device list endpoint."""
 
@@ -176,6 +369,24 @@ class AIProviderStatus(Resource):
         }
 
 
+def track_task(task_tracker, result, wait=None):
+    """Register the task started by a Proxmox operation and add its status to the result."""
+    upid = result.get("data")
+    if not task_tracker or not result.get("success") or not isinstance(upid, str):
+        return result
+
+    try:
+        task_tracker.track(upid)
+    except ValueError:
+        return result
+    try:
+        wait = min(float(wait or 0), MAX_TASK_WAIT)
+    except (TypeError, ValueError):
+        wait = 0
+    result["task"] = task_tracker.wait(upid, wait) if wait > 0 else task_tracker.get(upid)
+    return result
+
+
 class ProxmoxConnection(Resource):
     """Proxmox VE connection endpoint."""
 
@@ -197,10 +408,14 @@ class ProxmoxNodes(Resource):
         self.proxmox_client = proxmox_client
 
     def get(self):
-        """Get all nodes in the cluster."""
+        """Get all nodes in the cluster, with status, VMs and containers if details=true."""
         if not self.proxmox_client:
             return {"success": False, "message": "Proxmox VE client not configured"}, 503
         
+        if request.args.get("details", "false").lower() == "true":
+            inventory = self.proxmox_client.get_inventory()
+            return {"success": True, "nodes": inventory}
+
         nodes = self.proxmox_client.get_nodes()
         return {"success": True, "nodes": nodes}
 
@@ -212,20 +427,26 @@ class ProxmoxResources(Resource):
         self.proxmox_client = proxmox_client
 
     def get(self):
-        """Get all cluster resources."""
+        """Get cluster resources, optionally filtered by type, node, tag or pool."""
         if not self.proxmox_client:
             return {"success": False, "message": "Proxmox VE client not configured"}, 503
         
-        resources = self.proxmox_client.get_cluster_resources()
-        return {"success": True, "resources": resources}
+        resources, meta = self.proxmox_client.get_cluster_resources_with_meta(
+            resource_type=request.args.get("type"),
+            node=request.args.get("node"),
+            tag=request.args.get("tag"),
+            pool=request.args.get("pool")
+        )
+        return {"success": True, "resources": resources, "cache": meta}
 
 
 class ProxmoxVMControl(Resource):
     """Proxmox VE VM control endpoint."""
 
-    def __init__(self, proxmox_client, default_node):
+    def __init__(self, proxmox_client, default_node, task_tracker=None):
         self.proxmox_client = proxmox_client
         self.default_node = default_node
+        self.task_tracker = task_tracker
 
     def post(self, vmid):
         """Control a VM (start/stop/restart)."""
@@ -240,19 +461,27 @@ class ProxmoxVMControl(Resource):
             return {"success": False, "message": "Node parameter required"}, 400
         
         if action == "start":
-            return self.proxmox_client.start_vm(node, int(vmid))
+            result = self.proxmox_client.start_vm(node, int(vmid))
         elif action == "stop":
-            return self.proxmox_client.stop_vm(node, int(vmid))
+            result = self.proxmox_client.stop_vm(node, int(vmid))
         elif action == "restart":
-            return self.proxmox_client.restart_vm(node, int(vmid))
+            result = self.proxmox_client.restart_vm(node, int(vmid))
         else:
             return {"success": False, "message": f"Unknown action: {action}"}, 400
 
+        return track_task(self.task_tracker, result, data.get("wait"))
+
     def get(self, vmid):
-        """Get VM status."""
+        """Get VM status, or its cluster resource entry with ``summary=true``."""
         if not self.proxmox_client:
             return {"success": False, "message": "Proxmox VE client not configured"}, 503
-        
+
+        if request.args.get("summary", "").lower() == "true":
+            summary = self.proxmox_client.get_guest_summary(int(vmid))
+            if summary and summary.get("type") == "qemu":
+                return {"success": True, "status": summary}
+            return {"success": False, "message": "VM not found"}, 404
+
         node = request.args.get("node", self.default_node)
         if not node:
             return {"success": False, "message": "Node parameter required"}, 400
@@ -267,9 +496,10 @@ class ProxmoxVMControl(Resource):
 class ProxmoxContainerControl(Resource):
     """Proxmox VE container control endpoint."""
 
-    def __init__(self, proxmox_client, default_node):
+    def __init__(self, proxmox_client, default_node, task_tracker=None):
         self.proxmox_client = proxmox_client
         self.default_node = default_node
+        self.task_tracker = task_tracker
 
     def post(self, vmid):
         """Control a container (start/stop)."""
@@ -284,12 +514,102 @@ class ProxmoxContainerControl(Resource):
             return {"success": False, "message": "Node parameter required"}, 400
         
         if action == "start":
-            return self.proxmox_client.start_container(node, int(vmid))
+            result = self.proxmox_client.start_container(node, int(vmid))
         elif action == "stop":
-            return self.proxmox_client.stop_container(node, int(vmid))
+            result = self.proxmox_client.stop_container(node, int(vmid))
         else:
             return {"success": False, "message": f"Unknown action: {action}"}, 400
 
+        return track_task(self.task_tracker, result, data.get("wait"))
+
+
+class ProxmoxBulkOperation(Resource):
+    """Proxmox VE bulk guest operation endpoint."""
+
+    def __init__(self, bulk_runner):
+        self.bulk_runner = bulk_runner
+
+    def post(self):
+        """Start, stop or restart every guest matching a selector."""
+        data = request.get_json() or {}
+        action = data.get("action")
+        if action not in BULK_ACTIONS:
+            return {"success": False, "message": f"Unknown action: {action}"}, 400
+
+        try:
+            selector = parse_selector(data)
+            order = parse_order(data.get("order"))
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+        if not selector:
+            return {"success": False, "message": "Selector required (vmids, tags, pool, node or type)"}, 400
+
+        try:
+            job = self.bulk_runner.submit(action, selector, order)
+        except ConnectionError as e:
+            return {"success": False, "message": str(e)}, 502
+        if job is None:
+            return {"success": False, "message": "No guests matched the selector"}, 404
+        return {"success": True, "job": job.to_dict()}, 202
+
+
+class ProxmoxBulkJob(Resource):
+    """Proxmox VE bulk operation progress endpoint."""
+
+    def __init__(self, bulk_runner):
+        self.bulk_runner = bulk_runner
+
+    def get(self, job_id):
+        """Get the progress of a bulk operation."""
+        job = self.bulk_runner.get(job_id)
+        if job is None:
+            return {"success": False, "message": "Bulk job not found"}, 404
+        return {"success": True, "job": job}
+
+
+class ProxmoxMetrics(Resource):
+    """Proxmox VE stored metrics endpoint."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def get(self, target_type, target_name):
+        """Get stored samples of one node or guest metric."""
+        if target_type not in ("node", "qemu", "lxc"):
+            return {"success": False, "message": f"Unknown target type: {target_type}"}, 400
+
+        metric = request.args.get("metric", "cpu")
+        try:
+            hours = float(request.args.get("hours", 24))
+        except ValueError:
+            return {"success": False, "message": "hours must be a number"}, 400
+        if not math.isfinite(hours) or hours < 0:
+            return {"success": False, "message": "hours must be a finite, non-negative number"}, 400
+
+        target = f"{target_type}/{target_name}"
+        start = int(time.time() - hours * 3600)
+        samples = self.db_manager.get_metric_samples(target, metric, start)
+        return {"success": True, "target": target, "metric": metric, "samples": samples}
+
+
+class ProxmoxTask(Resource):
+    """Proxmox VE task status endpoint."""
+
+    def __init__(self, task_tracker):
+        self.task_tracker = task_tracker
+
+    def get(self, upid):
+        """Get the status of a tracked task, optionally waiting for it to finish."""
+        try:
+            wait = min(float(request.args.get("wait", 0)), MAX_TASK_WAIT)
+        except ValueError:
+            return {"success": False, "message": "wait must be a number of seconds"}, 400
+
+        task = self.task_tracker.wait(upid, wait) if wait > 0 else self.task_tracker.get(upid)
+        if task is None:
+            return {"success": False, "message": "Task not found"}, 404
+        return {"success": True, "task": task}
+
 
 class WebhookHandler(Resource):
     """Webhook handler for Home Assistant and external services."""
@@ -1,18 +1,25 @@
 """API routes for HOME-AI-AUTOMATION."""
 
 import logging
+import math
 
 from flask import Flask, render_template, request
 from flask_cors import CORS
 from flask_restful import Api, Resource
 
 from home_automation.core.automation_engine import AutomationEngine
+from home_automation.core.scheduler import Priority, prioritized
 from home_automation.api.integration_routes import (
     HomeAssistantConnection,
     HomeAssistantStates,
     HomeAssistantControl,
+    HomeAssistantBulkControl,
+    HomeAssistantAreas,
     RemoteDeviceList,
     RemoteDeviceControl,
+    RemoteMacroList,
+    RemoteMacroExecute,
+    RemoteMacroRun,
     MobileDeviceList,
     MobileDeviceConnection,
     MobileNotification,
@@ -22,6 +29,10 @@ from home_automation.api.integration_routes import (
     ProxmoxResources,
     ProxmoxVMControl,
     ProxmoxContainerControl,
+    ProxmoxTask,
+    ProxmoxMetrics,
+    ProxmoxBulkOperation,
+    ProxmoxBulkJob,
     WebhookHandler,
 )
 
@@ -106,6 +117,7 @@ class CommandExecutor(Resource):
     def __init__(self, automation_engine: AutomationEngine):
         self.automation_engine = automation_engine
 
+    @prioritized(Priority.INTERACTIVE)
     def post(self):
         """Execute a natural language command."""
         # Apply rate limiting for command execution
@@ -139,7 +151,11 @@ class SensorData(Resource):
         """Get sensor data for a device."""
         try:
             device_id = int(device_id)
-            data = self.automation_engine.db_manager.get_recent_sensor_data(device_id)
+
+            # Serve from the in-memory reading buffer, falling back to the database
+            data = self.automation_engine.device_manager.get_recent_sensor_data(device_id)
+            if data is None:
+                data = self.automation_engine.db_manager.get_recent_sensor_data(device_id)
 
             # Get AI analysis
             analysis = self.automation_engine.ai_intelligence.analyze_sensor_data(data)
@@ -164,8 +180,18 @@ class SensorData(Resource):
 
             if sensor_type is None or value is None:
                 return {"success": False, "message": "sensor_type and value are required"}, 400
-
-            self.automation_engine.db_manager.add_sensor_data(device_id, sensor_type, value, unit)
+            # Validate before inserting so a bad value never leaves a row behind
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return {"success": False, "message": "value must be a number"}, 400
+            if not math.isfinite(value):
+                return {"success": False, "message": "value must be a finite number"}, 400
+
+            reading_id = self.automation_engine.db_manager.add_sensor_data(device_id, sensor_type, value, unit)
+            self.automation_engine.device_manager.record_sensor_reading(
+                device_id, sensor_type, value, unit, reading_id
+            )
 
             return {"success": True, "message": "Sensor data added"}
 
@@ -226,6 +252,14 @@ def create_api_routes(app: Flask, automation_engine: AutomationEngine) -> None:
             HomeAssistantControl, "/api/homeassistant/control/<string:entity_id>",
             resource_class_kwargs={"ha_client": automation_engine.ha_client}
         )
+        api.add_resource(
+            HomeAssistantBulkControl, "/api/homeassistant/control",
+            resource_class_kwargs={"ha_client": automation_engine.ha_client}
+        )
+        api.add_resource(
+            HomeAssistantAreas, "/api/homeassistant/areas",
+            resource_class_kwargs={"ha_client": automation_engine.ha_client}
+        )
 
     # Remote control routes
     api.add_resource(
@@ -236,6 +270,18 @@ def create_api_routes(app: Flask, automation_engine: AutomationEngine) -> None:
         RemoteDeviceControl, "/api/remote/control/<string:device_name>",
         resource_class_kwargs={"remote_manager": automation_engine.remote_manager}
     )
+    api.add_resource(
+        RemoteMacroList, "/api/remote/macros",
+        resource_class_kwargs={"macro_runner": automation_engine.remote_macros}
+    )
+    api.add_resource(
+        RemoteMacroExecute, "/api/remote/macros/<string:device_name>/<string:macro_name>",
+        resource_class_kwargs={"macro_runner": automation_engine.remote_macros}
+    )
+    api.add_resource(
+        RemoteMacroRun, "/api/remote/macro-runs/<string:run_id>",
+        resource_class_kwargs={"macro_runner": automation_engine.remote_macros}
+    )
 
     # Mobile device routes
     api.add_resource(
@@ -276,16 +322,35 @@ def create_api_routes(app: Flask, automation_engine: AutomationEngine) -> None:
             ProxmoxVMControl, "/api/proxmox/vm/<int:vmid>",
             resource_class_kwargs={
                 "proxmox_client": automation_engine.proxmox_client,
-                "default_node": automation_engine.config.PROXMOX_NODE
+                "default_node": automation_engine.config.PROXMOX_NODE,
+                "task_tracker": automation_engine.proxmox_tasks
             }
         )
         api.add_resource(
             ProxmoxContainerControl, "/api/proxmox/container/<int:vmid>",
             resource_class_kwargs={
                 "proxmox_client": automation_engine.proxmox_client,
-                "default_node": automation_engine.config.PROXMOX_NODE
+                "default_node": automation_engine.config.PROXMOX_NODE,
+                "task_tracker": automation_engine.proxmox_tasks
             }
         )
+        api.add_resource(
+            ProxmoxBulkOperation, "/api/proxmox/bulk",
+            resource_class_kwargs={"bulk_runner": automation_engine.proxmox_bulk}
+        )
+        api.add_resource(
+            ProxmoxBulkJob, "/api/proxmox/bulk/<string:job_id>",
+            resource_class_kwargs={"bulk_runner": automation_engine.proxmox_bulk}
+        )
+        api.add_resource(
+            ProxmoxMetrics, "/api/proxmox/metrics/<string:target_type>/<string:target_name>",
+            resource_class_kwargs={"db_manager": automation_engine.db_manager}
+        )
+        if automation_engine.proxmox_tasks:
+            api.add_resource(
+                ProxmoxTask, "/api/proxmox/tasks/<string:upid>",
+                resource_class_kwargs={"task_tracker": automation_engine.proxmox_tasks}
+            )
 
     # Webhook handler
     api.add_resource(
@@ -10,13 +10,26 @@ from typing import Any, Optional
 
 from home_automation.ai.intelligence import AIIntelligence
 from home_automation.core.config import Config
+from home_automation.core.config_watcher import ConfigWatcher
 from home_automation.core.database import DatabaseManager
+from home_automation.core.event_loop import BackgroundEventLoop
+from home_automation.core.scheduler import OutboundScheduler, Priority
 from home_automation.devices.device_manager import DeviceManager
-from home_automation.integrations.home_assistant import HomeAssistantClient
+from home_automation.integrations.home_assistant import METADATA_EVENTS, HomeAssistantClient
+from home_automation.integrations.home_assistant_async import AsyncHomeAssistantClient
+from home_automation.integrations.ha_polling import HomeAssistantStatePoller
+from home_automation.integrations.ha_registry import REGISTRY_EVENTS, HomeAssistantRegistry
+from home_automation.integrations.ha_websocket import HomeAssistantStateMirror, HomeAssistantWebSocket
 from home_automation.integrations.ai_providers import MultiAIProvider
 from home_automation.integrations.remote_control import RemoteControlManager, RemoteDevice, DeviceType
+from home_automation.integrations.remote_macros import RemoteMacroRunner, parse_macros
+from home_automation.integrations.remote_sessions import RemoteSessionPool
 from home_automation.integrations.mobile_device import MobileDeviceManager, MobileDevice, ConnectionMethod
 from home_automation.integrations.proxmox import ProxmoxVEClient
+from home_automation.integrations.proxmox_async import AsyncProxmoxVEClient
+from home_automation.integrations.proxmox_bulk import ProxmoxBulkRunner
+from home_automation.integrations.proxmox_metrics import ProxmoxMetricsIngester
+from home_automation.integrations.proxmox_tasks import ProxmoxTaskTracker
 
 logger = logging.getLogger(__name__)
 
@@ -31,25 +44,116 @@ class AutomationEngine:
         self.device_manager = DeviceManager(config, db_manager)
         self.ai_intelligence = AIIntelligence(config)
         self.running = False
-        self.engine_thread = None
+        self.engine_thread: Optional[threading.Thread] = None
+
+        # Shared asyncio loop for WebSocket and async HTTP clients, started on first use
+        self.event_loop = BackgroundEventLoop()
 
         # Initialize Home Assistant client
         self.ha_client: Optional[HomeAssistantClient] = None
+        self.ha_async_client: Optional[AsyncHomeAssistantClient] = None
+        self.ha_websocket: Optional[HomeAssistantWebSocket] = None
+        self.ha_poller: Optional[HomeAssistantStatePoller] = None
         if config.HOME_ASSISTANT_TOKEN:
             try:
+                use_mirror = config.HOME_ASSISTANT_WEBSOCKET or config.HOME_ASSISTANT_POLL_MODE != "off"
+                state_mirror = HomeAssistantStateMirror() if use_mirror else None
+                # The registry index is loaded over the WebSocket, so it needs it too
+                registry = HomeAssistantRegistry() if config.HOME_ASSISTANT_WEBSOCKET else None
+                cache_domain_ttls = self._parse_cache_domain_ttls(config.HOME_ASSISTANT_CACHE_DOMAIN_TTLS)
+                scheduler = OutboundScheduler(
+                    max_concurrency=config.HOME_ASSISTANT_MAX_INFLIGHT,
+                    class_concurrency={
+                        Priority.AUTOMATION: config.HOME_ASSISTANT_AUTOMATION_CONCURRENCY,
+                        Priority.BACKGROUND: config.HOME_ASSISTANT_BACKGROUND_CONCURRENCY,
+                    },
+                    class_rates={
+                        Priority.AUTOMATION: config.HOME_ASSISTANT_AUTOMATION_RATE,
+                        Priority.BACKGROUND: config.HOME_ASSISTANT_BACKGROUND_RATE,
+                    }
+                )
+                self.ha_async_client = AsyncHomeAssistantClient(
+                    url=config.HOME_ASSISTANT_URL,
+                    token=config.HOME_ASSISTANT_TOKEN,
+                    verify_ssl=config.HOME_ASSISTANT_VERIFY_SSL,
+                    max_connections=config.HOME_ASSISTANT_MAX_CONNECTIONS,
+                    max_concurrency=config.HOME_ASSISTANT_MAX_CONCURRENCY,
+                    request_budget=config.HOME_ASSISTANT_REQUEST_BUDGET,
+                    max_retries=config.HOME_ASSISTANT_MAX_RETRIES
+                )
                 self.ha_client = HomeAssistantClient(
                     url=config.HOME_ASSISTANT_URL,
                     token=config.HOME_ASSISTANT_TOKEN,
-                    verify_ssl=config.HOME_ASSISTANT_VERIFY_SSL
+                    verify_ssl=config.HOME_ASSISTANT_VERIFY_SSL,
+                    state_mirror=state_mirror,
+                    async_client=self.ha_async_client,
+                    event_loop=self.event_loop,
+                    cache_ttl=config.HOME_ASSISTANT_CACHE_TTL,
+                    cache_stale_ttl=config.HOME_ASSISTANT_CACHE_STALE_TTL,
+                    cache_domain_ttls=cache_domain_ttls,
+                    service_batch_window=config.HOME_ASSISTANT_SERVICE_BATCH_WINDOW_MS / 1000,
+                    request_budget=config.HOME_ASSISTANT_REQUEST_BUDGET,
+                    max_retries=config.HOME_ASSISTANT_MAX_RETRIES,
+                    hedge_requests=config.HOME_ASSISTANT_HEDGE_REQUESTS,
+                    circuit_failure_threshold=config.HOME_ASSISTANT_CIRCUIT_FAILURES,
+                    circuit_reset_timeout=config.HOME_ASSISTANT_CIRCUIT_RESET,
+                    metadata_ttl=config.HOME_ASSISTANT_METADATA_TTL,
+                    validate_services=config.HOME_ASSISTANT_VALIDATE_SERVICES,
+                    registry=registry,
+                    scheduler=scheduler
                 )
                 logger.info("Home Assistant client initialized")
+
+                if config.HOME_ASSISTANT_WEBSOCKET:
+                    assert state_mirror is not None and registry is not None
+                    event_types = ["state_changed", *REGISTRY_EVENTS]
+                    state_mirror.add_listener(registry.handle_event)
+                    if self.ha_client.metadata_cache:
+                        event_types.extend(METADATA_EVENTS)
+                        state_mirror.add_listener(self.ha_client.handle_event)
+                    self.ha_websocket = HomeAssistantWebSocket(
+                        url=config.HOME_ASSISTANT_URL,
+                        token=config.HOME_ASSISTANT_TOKEN,
+                        mirror=state_mirror,
+                        event_loop=self.event_loop,
+                        verify_ssl=config.HOME_ASSISTANT_VERIFY_SSL,
+                        event_types=event_types
+                    )
+                    self.ha_websocket.add_connect_callback(registry.refresh)
+
+                if state_mirror and config.HOME_ASSISTANT_POLL_MODE != "off":
+                    # Keeps the mirror fed over REST when the WebSocket is down or blocked
+                    self.ha_poller = HomeAssistantStatePoller(
+                        client=self.ha_client,
+                        mirror=state_mirror,
+                        interval=config.HOME_ASSISTANT_POLL_INTERVAL,
+                        mode=config.HOME_ASSISTANT_POLL_MODE,
+                        websocket=self.ha_websocket,
+                        event_loop=self.event_loop
+                    )
             except Exception as e:
                 logger.error(f"Failed to initialize Home Assistant client: {e}")
 
         # Initialize Proxmox VE client
         self.proxmox_client: Optional[ProxmoxVEClient] = None
+        self.proxmox_async_client: Optional[AsyncProxmoxVEClient] = None
+        self.proxmox_tasks: Optional[ProxmoxTaskTracker] = None
+        self.proxmox_bulk: Optional[ProxmoxBulkRunner] = None
+        self.proxmox_metrics: Optional[ProxmoxMetricsIngester] = None
         if config.PROXMOX_HOST:
             try:
+                self.proxmox_async_client = AsyncProxmoxVEClient(
+                    host=config.PROXMOX_HOST,
+                    port=config.PROXMOX_PORT,
+                    verify_ssl=config.PROXMOX_VERIFY_SSL,
+                    username=config.PROXMOX_USERNAME if config.PROXMOX_USERNAME else None,
+                    password=config.PROXMOX_PASSWORD if config.PROXMOX_PASSWORD else None,
+                    token_id=config.PROXMOX_TOKEN_ID if config.PROXMOX_TOKEN_ID else None,
+                    token_secret=config.PROXMOX_TOKEN_SECRET if config.PROXMOX_TOKEN_SECRET else None,
+                    max_connections=config.PROXMOX_MAX_CONNECTIONS,
+                    max_concurrency=config.PROXMOX_MAX_CONCURRENCY,
+                    node_concurrency=config.PROXMOX_NODE_CONCURRENCY
+                )
                 self.proxmox_client = ProxmoxVEClient(
                     host=config.PROXMOX_HOST,
                     port=config.PROXMOX_PORT,
@@ -57,11 +161,38 @@ class AutomationEngine:
                     username=config.PROXMOX_USERNAME if config.PROXMOX_USERNAME else None,
                     password=config.PROXMOX_PASSWORD if config.PROXMOX_PASSWORD else None,
                     token_id=config.PROXMOX_TOKEN_ID if config.PROXMOX_TOKEN_ID else None,
-                    token_secret=config.PROXMOX_TOKEN_SECRET if config.PROXMOX_TOKEN_SECRET else None
+                    token_secret=config.PROXMOX_TOKEN_SECRET if config.PROXMOX_TOKEN_SECRET else None,
+                    snapshot_ttl=config.PROXMOX_SNAPSHOT_TTL,
+                    snapshot_stale_ttl=config.PROXMOX_SNAPSHOT_STALE_TTL,
+                    ticket_renew_after=config.PROXMOX_TICKET_RENEW_AFTER,
+                    async_client=self.proxmox_async_client,
+                    event_loop=self.event_loop
                 )
                 # Authenticate if using username/password
                 if config.PROXMOX_USERNAME and config.PROXMOX_PASSWORD:
                     self.proxmox_client.authenticate()
+                self.proxmox_tasks = ProxmoxTaskTracker(
+                    self.proxmox_client,
+                    poll_interval=config.PROXMOX_TASK_POLL_INTERVAL,
+                    max_poll_interval=config.PROXMOX_TASK_MAX_POLL_INTERVAL
+                )
+                if self.proxmox_client.resource_snapshot:
+                    # Guest status changes once the task is done, not when it is started
+                    self.proxmox_tasks.add_listener(lambda task: self.proxmox_client.resource_snapshot.invalidate())
+                self.proxmox_bulk = ProxmoxBulkRunner(
+                    self.proxmox_client,
+                    task_tracker=self.proxmox_tasks,
+                    max_workers=config.PROXMOX_BULK_WORKERS,
+                    node_concurrency=config.PROXMOX_BULK_NODE_CONCURRENCY
+                )
+                if config.PROXMOX_METRICS_INTERVAL > 0:
+                    self.proxmox_metrics = ProxmoxMetricsIngester(
+                        self.proxmox_client,
+                        db_manager,
+                        interval=config.PROXMOX_METRICS_INTERVAL,
+                        raw_retention=config.PROXMOX_METRICS_RAW_RETENTION,
+                        rollup_resolution=config.PROXMOX_METRICS_ROLLUP
+                    )
                 logger.info("Proxmox VE client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Proxmox VE client: {e}")
@@ -89,15 +220,54 @@ class AutomationEngine:
             logger.error(f"Failed to initialize Multi-AI provider: {e}")
 
         # Initialize Remote Control Manager
-        self.remote_manager = RemoteControlManager(home_assistant_client=self.ha_client)
+        self.remote_sessions = RemoteSessionPool(
+            self.event_loop,
+            adb_path=config.REMOTE_ADB_PATH,
+            client_name=config.REMOTE_CLIENT_NAME,
+            timeout=config.REMOTE_SESSION_TIMEOUT,
+            token_file=config.REMOTE_TOKEN_FILE
+        )
+        self.remote_manager = RemoteControlManager(
+            home_assistant_client=self.ha_client,
+            session_pool=self.remote_sessions,
+            repeat_window=config.REMOTE_REPEAT_WINDOW_MS / 1000,
+            volume_step=config.REMOTE_VOLUME_STEP,
+            power_on_timeout=config.REMOTE_POWER_ON_TIMEOUT,
+            wol_broadcast=config.REMOTE_WOL_BROADCAST
+        )
+        self.remote_macros = RemoteMacroRunner(self.remote_manager)
         self._load_tv_devices()
 
         # Initialize Mobile Device Manager
         self.mobile_manager = MobileDeviceManager()
         self._load_mobile_devices()
 
+        # Reload device configuration files in place when they change
+        self.config_watcher = ConfigWatcher(interval=config.CONFIG_WATCH_INTERVAL)
+        self.config_watcher.watch(config.DEVICES_CONFIG_PATH, self.device_manager.reload_device_config)
+        self.config_watcher.watch(config.TV_DEVICES_CONFIG, self._load_tv_devices)
+        self.config_watcher.watch(config.MOBILE_DEVICES_CONFIG, self._load_mobile_devices)
+
         logger.info("Automation engine initialized")
 
+    @staticmethod
+    def _parse_cache_domain_ttls(value: str) -> dict[str, float]:
+        """Parse ``domain=seconds`` pairs, skipping malformed entries."""
+        cache_domain_ttls = {}
+        for entry in value.split(","):
+            if not entry.strip():
+                continue
+            domain, _, ttl = entry.partition("=")
+            try:
+                seconds = float(ttl)
+            except ValueError:
+                seconds = -1
+            if not domain.strip() or not 0 <= seconds < float("inf"):
+                logger.warning(f"Ignoring invalid HOME_ASSISTANT_CACHE_DOMAIN_TTLS entry: {entry.strip()!r}")
+                continue
+            cache_domain_ttls[domain.strip()] = seconds
+        return cache_domain_ttls
+
     def start(self) -> None:
         """Start the automation engine."""
         if self.running:
@@ -111,6 +281,18 @@ class AutomationEngine:
         # Start device manager
         self.device_manager.start()
 
+        if self.ha_websocket:
+            self.ha_websocket.start()
+
+        if self.ha_poller:
+            self.ha_poller.start()
+
+        if self.config.CONFIG_WATCH_INTERVAL > 0:
+            self.config_watcher.start()
+
+        if self.proxmox_metrics:
+            self.proxmox_metrics.start()
+
         logger.info("Automation engine started")
 
     def stop(self) -> None:
@@ -120,6 +302,19 @@ class AutomationEngine:
         if self.device_manager:
             self.device_manager.stop()
 
+        self.config_watcher.stop()
+
+        self.remote_macros.stop()
+
+        if self.ha_poller:
+            self.ha_poller.stop()
+
+        if self.ha_websocket:
+            self.ha_websocket.stop()
+
+        if self.proxmox_metrics:
+            self.proxmox_metrics.stop()
+
         if self.engine_thread and self.engine_thread.is_alive():
             self.engine_thread.join(timeout=5)
 
@@ -129,6 +324,19 @@ class AutomationEngine:
         """Shutdown the automation engine."""
         self.stop()
 
+        if self.proxmox_client:
+            self.proxmox_client.close()
+
+        if self.ha_async_client and self.event_loop.running:
+            self.event_loop.run(self.ha_async_client.close(), timeout=5)
+
+        self.remote_sessions.close_all()
+
+        if self.proxmox_async_client and self.event_loop.running:
+            self.event_loop.run(self.proxmox_async_client.close(), timeout=5)
+
+        self.event_loop.stop()
+
     def _run_engine(self) -> None:
         """Main engine loop."""
         logger.info("Automation engine main loop started")
@@ -171,45 +379,74 @@ class AutomationEngine:
                 self.db_manager.update_device_status(device["id"], "online")
 
     def _load_tv_devices(self) -> None:
-        """Load TV/remote devices from configuration."""
+        """Load TV/remote devices from configuration.
+
+        Also used to hot-reload the file: only added, removed and modified
+        devices are touched.
+        """
         try:
             config_path = Path(self.config.TV_DEVICES_CONFIG)
             if config_path.exists():
                 with open(config_path) as f:
                     data = json.load(f)
-                    for device_config in data.get("tv_devices", []):
-                        device = RemoteDevice(
-                            name=device_config["name"],
-                            device_type=DeviceType(device_config["type"]),
-                            ip_address=device_config["ip_address"],
-                            port=device_config.get("port", 8080),
-                            mac_address=device_config.get("mac_address"),
-                            entity_id=device_config.get("entity_id"),
-                            description=device_config.get("description", "")
-                        )
-                        self.remote_manager.add_device(device)
-                logger.info(f"Loaded {len(data.get('tv_devices', []))} TV devices")
+                devices = [
+                    RemoteDevice(
+                        name=device_config["name"],
+                        device_type=DeviceType(device_config["type"]),
+                        ip_address=device_config["ip_address"],
+                        port=device_config.get("port"),
+                        mac_address=device_config.get("mac_address"),
+                        entity_id=device_config.get("entity_id"),
+                        description=device_config.get("description", ""),
+                        token=device_config.get("token")
+                    )
+                    for device_config in data.get("tv_devices", [])
+                ]
+                changes = self.remote_manager.sync_devices(devices)
+                for device_name in changes["removed"]:
+                    self.remote_macros.remove_device(device_name)
+                self.remote_macros.set_macros(
+                    parse_macros(data.get("macros", {})),
+                    {
+                        device_config["name"]: parse_macros(device_config["macros"])
+                        for device_config in data.get("tv_devices", [])
+                        if device_config.get("macros")
+                    }
+                )
+                logger.info(
+                    f"Loaded {len(devices)} TV devices ({len(changes['added'])} added, "
+                    f"{len(changes['removed'])} removed, {len(changes['modified'])} modified)"
+                )
         except Exception as e:
             logger.error(f"Failed to load TV devices: {e}")
 
     def _load_mobile_devices(self) -> None:
-        """Load mobile devices from configuration."""
+        """Load mobile devices from configuration.
+
+        Also used to hot-reload the file: only added, removed and modified
+        devices are touched.
+        """
         try:
-            config_path = Path("config/mobile_devices.json")
+            config_path = Path(self.config.MOBILE_DEVICES_CONFIG)
             if config_path.exists():
                 with open(config_path) as f:
                     data = json.load(f)
-                    for device_config in data.get("mobile_devices", []):
-                        device = MobileDevice(
-                            name=device_config["name"],
-                            device_id=device_config["device_id"],
-                            ip_address=device_config.get("ip_address"),
-                            port=device_config.get("port", 8080),
-                            connection_method=ConnectionMethod(device_config.get("connection_method", "wireless")),
-                            description=device_config.get("description", "")
-                        )
-                        self.mobile_manager.add_device(device)
-                logger.info(f"Loaded {len(data.get('mobile_devices', []))} mobile devices")
+                devices = [
+                    MobileDevice(
+                        name=device_config["name"],
+                        device_id=device_config["device_id"],
+                        ip_address=device_config.get("ip_address"),
+                        port=device_config.get("port", 8080),
+                        connection_method=ConnectionMethod(device_config.get("connection_method", "wireless")),
+                        description=device_config.get("description", "")
+                    )
+                    for device_config in data.get("mobile_devices", [])
+                ]
+                changes = self.mobile_manager.sync_devices(devices)
+                logger.info(
+                    f"Loaded {len(devices)} mobile devices ({len(changes['added'])} added, "
+                    f"{len(changes['removed'])} removed, {len(changes['modified'])} modified)"
+                )
         except Exception as e:
             logger.error(f"Failed to load mobile devices: {e}")
 
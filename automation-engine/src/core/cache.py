@@ -0,0 +1,120 @@
+"""Caching helpers for HOME-AI-AUTOMATION."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class StaleWhileRevalidateCache:
+    """TTL cache that serves stale entries while refreshing them in the background.
+
+    Within ``ttl`` an entry is fresh. For ``stale_ttl`` seconds after that it
+    is still served immediately while one background refresh runs. Older
+    entries are reloaded synchronously, and if that load fails the last known
+    value is served rather than nothing. A load that was already running when
+    its key was invalidated does not store its result.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 2.0,
+        stale_ttl: float = 60.0,
+        ttl_for: Callable[[Hashable], float] | None = None,
+        max_workers: int = 2
+    ):
+        """Initialize cache."""
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.ttl_for = ttl_for
+        self.entries: dict[Hashable, tuple[Any, float]] = {}
+        self._refreshing: set[Hashable] = set()
+        # Bumped on invalidation so loads started before it are discarded
+        self._generations: dict[Hashable, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-refresh")
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> tuple[Any, dict[str, Any]]:
+        """Get a value and its staleness metadata, loading it if needed.
+
+        The loader must raise on failure so errors are never cached.
+        """
+        ttl = self.ttl_for(key) if self.ttl_for else self.ttl
+        with self._lock:
+            entry = self.entries.get(key)
+            generation = self._generation(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                return value, {"source": "cache", "stale": False, "age": round(age, 3)}
+            if age < ttl + self.stale_ttl:
+                self.refresh(key, loader)
+                return value, {"source": "cache", "stale": True, "age": round(age, 3)}
+
+        try:
+            value = loader()
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Serving stale cache entry for {key}: {e}")
+            self.refresh(key, loader)
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            return value, {"source": "cache", "stale": True, "age": round(age, 3), "error": str(e)}
+
+        self.set(key, value, generation)
+        return value, {"source": "upstream", "stale": False, "age": 0.0}
+
+    def set(self, key: Hashable, value: Any, generation: tuple[int, int] | None = None) -> None:
+        """Store a freshly loaded value.
+
+        With ``generation`` the value is only stored if the key has not been
+        invalidated since that generation was read.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation(key):
+                return
+            self.entries[key] = (value, time.monotonic())
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given entries, or every entry when called without keys."""
+        with self._lock:
+            if not keys:
+                self.entries.clear()
+                self._epoch += 1
+            for key in keys:
+                self.entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _generation(self, key: Hashable) -> tuple[int, int]:
+        """Get the invalidation generation of a key, caller holds the lock."""
+        return self._epoch, self._generations.get(key, 0)
+
+    def refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        """Reload an entry on the refresh pool unless a refresh is already running.
+
+        The current value keeps being served until the reload completes.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            generation = self._generation(key)
+
+        def reload() -> None:
+            try:
+                self.set(key, loader(), generation)
+            except Exception as e:
+                logger.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(reload)
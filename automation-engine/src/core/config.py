@@ -24,6 +24,67 @@ class Config(BaseSettings):
     HOME_ASSISTANT_URL: str = Field(default="http://192.168.1.134:8123", description="Home Assistant URL")
     HOME_ASSISTANT_TOKEN: str = Field(default="", description="Home Assistant long-lived access token")
     HOME_ASSISTANT_VERIFY_SSL: bool = Field(default=False, description="Verify SSL for Home Assistant")
+    HOME_ASSISTANT_MAX_CONNECTIONS: int = Field(default=20, description="Pooled connections to Home Assistant")
+    HOME_ASSISTANT_MAX_CONCURRENCY: int = Field(
+        default=10, description="Maximum concurrent Home Assistant requests for multi-entity operations"
+    )
+    HOME_ASSISTANT_WEBSOCKET: bool = Field(
+        default=True, description="Mirror entity states over the Home Assistant WebSocket API"
+    )
+    HOME_ASSISTANT_POLL_MODE: str = Field(
+        default="auto",
+        description="Poll /api/states into the state mirror: auto (while the WebSocket is down), always or off"
+    )
+    HOME_ASSISTANT_POLL_INTERVAL: float = Field(
+        default=5.0, description="Seconds between Home Assistant state polls"
+    )
+    HOME_ASSISTANT_CACHE_TTL: float = Field(
+        default=2.0, description="Seconds REST entity states stay fresh in the cache (0 disables)"
+    )
+    HOME_ASSISTANT_CACHE_DOMAIN_TTLS: str = Field(
+        default="sensor=10,binary_sensor=2,weather=300,sun=60",
+        description="Comma-separated domain=seconds overrides of the state cache TTL"
+    )
+    HOME_ASSISTANT_CACHE_STALE_TTL: float = Field(
+        default=60.0, description="Seconds an expired state is still served while it is refreshed"
+    )
+    HOME_ASSISTANT_SERVICE_BATCH_WINDOW_MS: float = Field(
+        default=5.0, description="Milliseconds to merge concurrent entity service calls into one (0 disables)"
+    )
+    HOME_ASSISTANT_REQUEST_BUDGET: float = Field(
+        default=10.0, description="Total seconds a Home Assistant request may take including retries"
+    )
+    HOME_ASSISTANT_MAX_RETRIES: int = Field(default=2, description="Retries for idempotent Home Assistant requests")
+    HOME_ASSISTANT_HEDGE_REQUESTS: bool = Field(
+        default=False, description="Send a second GET when the first is slower than the p95 latency"
+    )
+    HOME_ASSISTANT_CIRCUIT_FAILURES: int = Field(
+        default=5, description="Consecutive Home Assistant failures before failing fast"
+    )
+    HOME_ASSISTANT_CIRCUIT_RESET: float = Field(
+        default=30.0, description="Seconds to fail fast before retrying Home Assistant"
+    )
+    HOME_ASSISTANT_METADATA_TTL: float = Field(
+        default=3600.0, description="Seconds Home Assistant services and config are memoized (0 disables)"
+    )
+    HOME_ASSISTANT_VALIDATE_SERVICES: bool = Field(
+        default=False, description="Reject calls to unknown Home Assistant services before sending them"
+    )
+    HOME_ASSISTANT_MAX_INFLIGHT: int = Field(
+        default=8, description="Maximum concurrent REST requests to Home Assistant across all priority classes"
+    )
+    HOME_ASSISTANT_AUTOMATION_CONCURRENCY: int = Field(
+        default=4, description="Maximum concurrent Home Assistant requests made by automations"
+    )
+    HOME_ASSISTANT_BACKGROUND_CONCURRENCY: int = Field(
+        default=2, description="Maximum concurrent background Home Assistant requests (state syncs, metadata)"
+    )
+    HOME_ASSISTANT_AUTOMATION_RATE: float = Field(
+        default=20.0, description="Automation requests per second to Home Assistant (0 is unlimited)"
+    )
+    HOME_ASSISTANT_BACKGROUND_RATE: float = Field(
+        default=5.0, description="Background requests per second to Home Assistant (0 is unlimited)"
+    )
 
     # Server Configuration
     FLASK_PORT: int = Field(default=5000, description="Flask server port")
@@ -41,6 +102,14 @@ class Config(BaseSettings):
 
     # Device Configuration
     DEVICES_CONFIG_PATH: str = Field(default="config/devices.json", description="Path to devices configuration")
+    DEVICE_POLL_INTERVAL: float = Field(default=30.0, description="Initial seconds between device status polls")
+    DEVICE_POLL_MIN_INTERVAL: float = Field(default=5.0, description="Fastest poll interval for changing devices")
+    DEVICE_POLL_MAX_INTERVAL: float = Field(default=300.0, description="Slowest poll interval for static devices")
+    DEVICE_POLL_JITTER: float = Field(default=0.1, description="Random spread applied to poll intervals (0-1)")
+    SENSOR_HISTORY_SIZE: int = Field(default=100, description="Readings kept in memory per sensor")
+    CONFIG_WATCH_INTERVAL: float = Field(
+        default=2.0, description="Seconds between device configuration change checks (0 disables hot reload)"
+    )
 
     # AI Configuration
     AI_MODEL: str = Field(default="gpt-3.5-turbo", description="OpenAI model to use")
@@ -53,10 +122,31 @@ class Config(BaseSettings):
     ANDROID_DEVICE_IP: str = Field(default="", description="Android device IP address")
     ANDROID_DEVICE_PORT: int = Field(default=8080, description="Android device port")
     MOBILE_CONNECTION_METHOD: str = Field(default="wireless", description="Connection method: wireless, usb, bluetooth")
+    MOBILE_DEVICES_CONFIG: str = Field(
+        default="config/mobile_devices.json", description="Path to mobile devices configuration"
+    )
 
     # Remote Control Configuration
     ENABLE_TV_REMOTE: bool = Field(default=True, description="Enable TV remote control features")
     TV_DEVICES_CONFIG: str = Field(default="config/tv_devices.json", description="Path to TV devices configuration")
+    REMOTE_REPEAT_WINDOW_MS: int = Field(
+        default=150, description="Milliseconds within which repeated volume/channel presses are merged (0 disables)"
+    )
+    REMOTE_VOLUME_STEP: float = Field(default=0.02, description="Volume change of one volume_up/volume_down press")
+    REMOTE_ADB_PATH: str = Field(default="adb", description="adb executable used to control Android devices directly")
+    REMOTE_CLIENT_NAME: str = Field(
+        default="HOME-AI-AUTOMATION", description="Name Samsung TVs show when asking to allow the remote"
+    )
+    REMOTE_SESSION_TIMEOUT: float = Field(default=5.0, description="Seconds to wait when connecting to or sending to a TV")
+    REMOTE_TOKEN_FILE: str = Field(
+        default="config/remote_tokens.json", description="File Samsung TV pairing tokens are kept in across restarts"
+    )
+    REMOTE_POWER_ON_TIMEOUT: float = Field(
+        default=30.0, description="Seconds to wait for a TV to become ready after power_on"
+    )
+    REMOTE_WOL_BROADCAST: str = Field(
+        default="255.255.255.255", description="Broadcast address Wake-on-LAN packets are sent to"
+    )
 
     # Proxmox VE Configuration
     PROXMOX_HOST: str = Field(default="", description="Proxmox VE host IP or hostname")
@@ -67,6 +157,36 @@ class Config(BaseSettings):
     PROXMOX_TOKEN_ID: str = Field(default="", description="Proxmox VE API token ID")
     PROXMOX_TOKEN_SECRET: str = Field(default="", description="Proxmox VE API token secret")
     PROXMOX_NODE: str = Field(default="", description="Default Proxmox VE node name")
+    PROXMOX_MAX_CONNECTIONS: int = Field(default=20, description="Keep-alive connection pool size of the async Proxmox VE client")
+    PROXMOX_MAX_CONCURRENCY: int = Field(default=16, description="Maximum concurrent async Proxmox VE requests")
+    PROXMOX_NODE_CONCURRENCY: int = Field(default=4, description="Maximum concurrent async Proxmox VE requests per node")
+    PROXMOX_TICKET_RENEW_AFTER: float = Field(
+        default=5400.0, description="Seconds after login the Proxmox VE ticket is renewed (tickets last 2 hours)"
+    )
+    PROXMOX_SNAPSHOT_TTL: float = Field(
+        default=10.0,
+        description="Seconds a /cluster/resources snapshot answers resource listings and guest summaries (0 disables)"
+    )
+    PROXMOX_SNAPSHOT_STALE_TTL: float = Field(
+        default=60.0, description="Seconds an expired cluster resource snapshot is served while it refreshes"
+    )
+    PROXMOX_TASK_POLL_INTERVAL: float = Field(
+        default=0.5, description="Seconds before the first status check of a started Proxmox task"
+    )
+    PROXMOX_TASK_MAX_POLL_INTERVAL: float = Field(
+        default=5.0, description="Upper bound for the backed-off Proxmox task poll interval"
+    )
+    PROXMOX_METRICS_INTERVAL: float = Field(
+        default=60.0, description="Seconds between Proxmox RRD metric ingestion runs (0 disables)"
+    )
+    PROXMOX_METRICS_RAW_RETENTION: int = Field(
+        default=86400, description="Seconds one-minute Proxmox metric samples are kept before being downsampled"
+    )
+    PROXMOX_METRICS_ROLLUP: int = Field(default=1800, description="Seconds per downsampled Proxmox metric sample")
+    PROXMOX_BULK_WORKERS: int = Field(default=16, description="Guests processed in parallel by bulk operations")
+    PROXMOX_BULK_NODE_CONCURRENCY: int = Field(
+        default=4, description="Guests processed in parallel per Proxmox node by bulk operations"
+    )
 
     # Webhook Configuration
     WEBHOOK_SECRET: str = Field(default="", description="Secret key for webhook validation")
@@ -0,0 +1,94 @@
+"""Configuration file watcher for HOME-AI-AUTOMATION."""
+
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FileSignature = tuple[int, int] | None
+
+
+class ConfigWatcher:
+    """Watch configuration files and invoke a reload callback when one changes.
+
+    Changes are detected by polling each file's modification time and size,
+    which works the same on bind-mounted Docker volumes and local disks.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        """Initialize config watcher."""
+        self.interval = interval
+        self.watches: dict[Path, list] = {}
+        self.running = False
+        self.watcher_thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def watch(self, path: str | Path, callback: Callable[[], object]) -> None:
+        """Register a file and the callback that reloads it."""
+        path = Path(path)
+        with self._lock:
+            self.watches[path] = [self._get_signature(path), callback]
+
+    @staticmethod
+    def _get_signature(path: Path) -> FileSignature:
+        """Get the change signature of a file, or None if it does not exist."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def check(self) -> list[Path]:
+        """Check all watched files once and run callbacks for changed ones."""
+        with self._lock:
+            watches = list(self.watches.items())
+
+        changed = []
+        for path, entry in watches:
+            signature = self._get_signature(path)
+            if signature == entry[0]:
+                continue
+
+            entry[0] = signature
+            if signature is None:
+                logger.warning(f"Watched configuration file {path} was removed, keeping current devices")
+                continue
+
+            logger.info(f"Configuration file {path} changed, reloading")
+            changed.append(path)
+            try:
+                entry[1]()
+            except Exception as e:
+                logger.error(f"Failed to reload {path}: {e}")
+
+        return changed
+
+    def start(self) -> None:
+        """Start watching in a background thread."""
+        if self.running:
+            return
+
+        self.running = True
+        self._stop_event.clear()
+        self.watcher_thread = threading.Thread(target=self._run_watcher, daemon=True)
+        self.watcher_thread.start()
+        logger.info(f"Config watcher started ({len(self.watches)} files)")
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self.running = False
+        self._stop_event.set()
+        if self.watcher_thread and self.watcher_thread.is_alive():
+            self.watcher_thread.join(timeout=5)
+        logger.info("Config watcher stopped")
+
+    def _run_watcher(self) -> None:
+        """Main watcher loop."""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Error in config watcher loop: {e}")
@@ -9,17 +9,25 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Engine,
     Float,
+    Index,
     Integer,
     String,
     Text,
     create_engine,
+    delete,
+    func,
+    insert,
+    select,
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
 
 logger = logging.getLogger(__name__)
-Base = declarative_base()
+
+
+class Base(DeclarativeBase):
+    """Base class of the database models."""
 
 
 class Device(Base):
@@ -55,12 +63,27 @@ class SensorData(Base):
     """Sensor data model."""
     __tablename__ = "sensor_data"
 
-    id = Column(Integer, primary_key=True)
-    device_id = Column(Integer, nullable=False)
-    sensor_type = Column(String(50), nullable=False)
-    value = Column(Float, nullable=False)
-    unit = Column(String(20))
-    timestamp = Column(DateTime, default=lambda: datetime.now(UTC))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    device_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    sensor_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    unit: Mapped[str | None] = mapped_column(String(20))
+    timestamp: Mapped[datetime | None] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+
+
+class MetricSample(Base):
+    """Time-series sample model (e.g., Proxmox RRD data)."""
+    __tablename__ = "metric_samples"
+    __table_args__ = (
+        Index("ix_metric_samples_series", "target", "metric", "resolution", "timestamp"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    target: Mapped[str] = mapped_column(String(64), nullable=False)  # e.g. node/pve, qemu/100
+    metric: Mapped[str] = mapped_column(String(32), nullable=False)
+    resolution: Mapped[int] = mapped_column(Integer, nullable=False)  # seconds per sample
+    timestamp: Mapped[int] = mapped_column(Integer, nullable=False)  # unix seconds
+    value: Mapped[float] = mapped_column(Float, nullable=False)
 
 
 class DatabaseManager:
@@ -69,8 +92,8 @@ class DatabaseManager:
     def __init__(self, database_url: str):
         """Initialize database manager."""
         self.database_url = database_url
-        self.engine = None
-        self.session_maker = None
+        self.engine: Engine | None = None
+        self.session_maker: sessionmaker[Session] | None = None
 
     def initialize(self) -> None:
         """Initialize database connection and create tables."""
@@ -81,11 +104,12 @@ class DatabaseManager:
                 Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
             # Create engine
-            self.engine = create_engine(self.database_url)
-            self.session_maker = sessionmaker(bind=self.engine)
+            engine = create_engine(self.database_url)
+            self.engine = engine
+            self.session_maker = sessionmaker(bind=engine)
 
             # Create tables
-            Base.metadata.create_all(self.engine)
+            Base.metadata.create_all(engine)
 
             logger.info("Database initialized successfully")
 
@@ -140,8 +164,8 @@ class DatabaseManager:
                 device.last_seen = datetime.now(UTC)
                 session.commit()
 
-    def add_sensor_data(self, device_id: int, sensor_type: str, value: float, unit: str = None) -> None:
-        """Add sensor data."""
+    def add_sensor_data(self, device_id: int, sensor_type: str, value: float, unit: str | None = None) -> int:
+        """Add sensor data and return its ID."""
         with self.get_session() as session:
             sensor_data = SensorData(
                 device_id=device_id,
@@ -151,6 +175,7 @@ class DatabaseManager:
             )
             session.add(sensor_data)
             session.commit()
+            return sensor_data.id
 
     def get_recent_sensor_data(self, device_id: int, limit: int = 100) -> list[dict[str, Any]]:
         """Get recent sensor data for a device."""
@@ -169,3 +194,87 @@ class DatabaseManager:
                 }
                 for d in data
             ]
+
+    def add_metric_samples(self, samples: list[dict[str, Any]]) -> int:
+        """Add time-series samples in one bulk insert.
+
+        Each sample has ``target``, ``metric``, ``resolution``, ``timestamp`` and ``value``.
+        """
+        if not samples:
+            return 0
+        with self.get_session() as session:
+            session.execute(insert(MetricSample), samples)
+            session.commit()
+        return len(samples)
+
+    def get_metric_cursors(self, resolution: int | None = None) -> dict[str, int]:
+        """Get the newest sample timestamp of every target, optionally at one resolution."""
+        query = select(MetricSample.target, func.max(MetricSample.timestamp)).group_by(MetricSample.target)
+        if resolution is not None:
+            query = query.where(MetricSample.resolution == resolution)
+        with self.get_session() as session:
+            return {target: timestamp for target, timestamp in session.execute(query).all()}
+
+    def get_metric_samples(
+        self,
+        target: str,
+        metric: str,
+        start: int,
+        end: int | None = None,
+        resolution: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Get the samples of one series between two unix timestamps, oldest first.
+
+        Without a resolution every stored resolution is returned, so
+        downsampled history and recent raw samples come back together.
+        """
+        query = select(MetricSample.timestamp, MetricSample.value, MetricSample.resolution).where(
+            MetricSample.target == target,
+            MetricSample.metric == metric,
+            MetricSample.timestamp >= start
+        )
+        if end is not None:
+            query = query.where(MetricSample.timestamp <= end)
+        if resolution is not None:
+            query = query.where(MetricSample.resolution == resolution)
+
+        with self.get_session() as session:
+            rows = session.execute(query.order_by(MetricSample.timestamp)).all()
+            return [
+                {"timestamp": timestamp, "value": value, "resolution": sample_resolution}
+                for timestamp, value, sample_resolution in rows
+            ]
+
+    def downsample_metrics(self, source_resolution: int, target_resolution: int, older_than: int) -> int:
+        """Average samples older than a timestamp into coarser buckets and drop the originals.
+
+        Only whole buckets before ``older_than`` are rolled up, so a bucket
+        is never split between two runs.
+        """
+        cutoff = older_than - older_than % target_resolution
+        bucket = (MetricSample.timestamp - MetricSample.timestamp % target_resolution).label("bucket")
+        source = (
+            MetricSample.resolution == source_resolution,
+            MetricSample.timestamp < cutoff
+        )
+        with self.get_session() as session:
+            rows = session.execute(
+                select(MetricSample.target, MetricSample.metric, bucket, func.avg(MetricSample.value))
+                .where(*source)
+                .group_by(MetricSample.target, MetricSample.metric, bucket)
+            ).all()
+            if not rows:
+                return 0
+            session.execute(insert(MetricSample), [
+                {
+                    "target": target,
+                    "metric": metric,
+                    "resolution": target_resolution,
+                    "timestamp": timestamp,
+                    "value": value,
+                }
+                for target, metric, timestamp, value in rows
+            ])
+            session.execute(delete(MetricSample).where(*source))
+            session.commit()
+            return len(rows)
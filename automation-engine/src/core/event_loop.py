@@ -0,0 +1,81 @@
+"""Background asyncio event loop for HOME-AI-AUTOMATION."""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundEventLoop:
+    """Run an asyncio event loop in a daemon thread.
+
+    The Flask app and the engine loops are synchronous; this lets them hand
+    coroutines (WebSocket listeners, async HTTP fan-out) to a single shared
+    loop and optionally block on the result.
+    """
+
+    def __init__(self, name: str = "home-automation-loop"):
+        """Initialize background event loop."""
+        self.name = name
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.loop_thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop thread is alive."""
+        return bool(self.loop_thread and self.loop_thread.is_alive())
+
+    def start(self) -> None:
+        """Start the loop thread if it is not running yet."""
+        with self._lock:
+            if self.running:
+                return
+
+            self._started.clear()
+            self.loop = asyncio.new_event_loop()
+            loop_thread = threading.Thread(target=self._run_loop, args=(self.loop,), name=self.name, daemon=True)
+            self.loop_thread = loop_thread
+            loop_thread.start()
+            self._started.wait()
+            logger.info(f"Background event loop '{self.name}' started")
+
+    def stop(self) -> None:
+        """Cancel outstanding tasks and stop the loop thread."""
+        with self._lock:
+            if not self.running:
+                return
+
+            assert self.loop is not None and self.loop_thread is not None
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join(timeout=5)
+            logger.info(f"Background event loop '{self.name}' stopped")
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule a coroutine on the loop and return a concurrent future."""
+        self.start()
+        assert self.loop is not None
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+        """Run a coroutine on the loop and block until it finishes."""
+        return self.submit(coro).result(timeout)
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Loop thread body."""
+        asyncio.set_event_loop(loop)
+        loop.call_soon(self._started.set)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
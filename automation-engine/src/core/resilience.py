@@ -0,0 +1,115 @@
+"""Failure handling helpers for HOME-AI-AUTOMATION upstream clients."""
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream service keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. Then a single trial call
+    is let through: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize circuit breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Get the current circuit state."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        """Get the circuit state, caller holds the lock."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Check whether a call may be made now."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def release_trial(self) -> None:
+        """Let another trial call through after one ended without an outcome.
+
+        For calls that were cancelled or failed locally, which say nothing
+        about the health of the upstream service.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit '{self.name}' closed")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        with self._lock:
+            self.failures += 1
+            trial_failed = self._trial_running
+            self._trial_running = False
+            if trial_failed or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                logger.warning(f"Circuit '{self.name}' opened after {self.failures} consecutive failures")
+
+    def retry_after(self) -> float:
+        """Get the seconds until the next trial call is allowed."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class LatencyTracker:
+    """Rolling window of request latencies for percentile estimates."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """Initialize latency tracker."""
+        self.min_samples = min_samples
+        self.samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of one request."""
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """Get a latency percentile, or None until enough samples are recorded."""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
@@ -0,0 +1,179 @@
+"""Priority scheduling of outbound requests for HOME-AI-AUTOMATION."""
+
+import functools
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Priority classes for outbound requests, most urgent first."""
+
+    INTERACTIVE = 0
+    AUTOMATION = 1
+    BACKGROUND = 2
+
+
+class SchedulerTimeoutError(TimeoutError):
+    """No request slot became available before the request's deadline."""
+
+
+_current_priority: ContextVar[Priority | None] = ContextVar("outbound_priority", default=None)
+
+
+def current_priority() -> Priority | None:
+    """Get the priority set for the current thread or task, if any."""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Run outbound requests made inside the block with the given priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def prioritized(priority: Priority) -> Callable:
+    """Decorate a function so the outbound requests it makes use the given priority."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with request_priority(priority):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TokenBucket:
+    """Token bucket rate limiter that blocks until a token is available."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        """Initialize token bucket."""
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: float | None = None) -> None:
+        """Take one token, sleeping until one is available.
+
+        Raises SchedulerTimeoutError without waiting if the next token
+        arrives after the monotonic ``deadline``.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                raise SchedulerTimeoutError("Rate limit leaves no time before the deadline")
+            time.sleep(wait)
+
+
+class OutboundScheduler:
+    """Admit outbound requests by priority class.
+
+    At most ``max_concurrency`` requests run at once. When a slot frees up it
+    goes to the most urgent waiting request whose class is below its own
+    concurrency limit, so interactive commands overtake queued background
+    work. Classes with a rate are additionally throttled by a token bucket
+    before they queue for a slot.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        class_concurrency: dict[Priority, int] | None = None,
+        class_rates: dict[Priority, float] | None = None
+    ):
+        """Initialize outbound scheduler."""
+        self.max_concurrency = max_concurrency
+        self.class_concurrency = {priority: max_concurrency for priority in Priority}
+        self.class_concurrency.update(class_concurrency or {})
+        self.buckets = {
+            priority: TokenBucket(rate)
+            for priority, rate in (class_rates or {}).items()
+            if rate > 0
+        }
+        self.active = {priority: 0 for priority in Priority}
+        self._waiting: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, priority: Priority, deadline: float | None = None) -> Iterator[None]:
+        """Wait for a request slot in the given class and hold it for the block.
+
+        Raises SchedulerTimeoutError if no slot is free by the monotonic
+        ``deadline``, so a queued request never starts after its budget ran out.
+        """
+        bucket = self.buckets.get(priority)
+        if bucket:
+            bucket.acquire(deadline)
+
+        self._acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def _acquire(self, priority: Priority, deadline: float | None = None) -> None:
+        """Block until this request is the next one allowed to run or the deadline passes."""
+        ticket = (int(priority), next(self._sequence))
+        with self._condition:
+            self._waiting.append(ticket)
+            while self._next_runnable() != ticket:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._waiting.remove(ticket)
+                    # The next waiter may be runnable now that this ticket is gone
+                    self._condition.notify_all()
+                    raise SchedulerTimeoutError(f"No {priority.name.lower()} slot free before the deadline")
+                self._condition.wait(remaining)
+            self._waiting.remove(ticket)
+            self.active[priority] += 1
+            # Another waiter of a different class may be runnable too
+            self._condition.notify_all()
+
+    def _release(self, priority: Priority) -> None:
+        """Free a slot and wake the waiters."""
+        with self._condition:
+            self.active[priority] -= 1
+            self._condition.notify_all()
+
+    def _next_runnable(self) -> tuple[int, int] | None:
+        """Get the most urgent waiting ticket whose class has capacity, caller holds the lock."""
+        if sum(self.active.values()) >= self.max_concurrency:
+            return None
+        for ticket in sorted(self._waiting):
+            priority = Priority(ticket[0])
+            if self.active[priority] < self.class_concurrency[priority]:
+                return ticket
+        return None
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Get the active and waiting request counts per class."""
+        with self._condition:
+            waiting = {priority: 0 for priority in Priority}
+            for ticket in self._waiting:
+                waiting[Priority(ticket[0])] += 1
+            return {
+                priority.name.lower(): {"active": self.active[priority], "waiting": waiting[priority]}
+                for priority in Priority
+            }
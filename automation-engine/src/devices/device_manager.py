@@ -1,14 +1,19 @@
 """Device manager for HOME-AI-AUTOMATION."""
 
+import heapq
+import itertools
 import json
 import logging
+import random
 import threading
-from datetime import UTC
+import time
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 from home_automation.core.config import Config
 from home_automation.core.database import DatabaseManager
+from home_automation.devices.readings import SensorReadingBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -105,7 +110,7 @@ class SmartThermostat(Device):
 class SmartSensor(Device):
     """Smart sensor device."""
 
-    def __init__(self, device_id: int, name: str, location: str, sensor_type: str):
+    def __init__(self, device_id: int, name: str, location: str, sensor_type: str, history_size: int = 100):
         """Initialize smart sensor."""
         super().__init__(device_id, name, "sensor", location)
         self.sensor_type = sensor_type
@@ -115,6 +120,8 @@ class SmartSensor(Device):
             "unit": self._get_default_unit(sensor_type),
             "last_reading": None
         }
+        self.history = SensorReadingBuffer(history_size)
+        self.history_loaded = False
 
     def _get_default_unit(self, sensor_type: str) -> str:
         """Get default unit for sensor type."""
@@ -128,13 +135,37 @@ class SmartSensor(Device):
         }
         return units.get(sensor_type, "")
 
-    def update_reading(self, value: float) -> dict[str, Any]:
+    def update_reading(self, value: float, unit: str | None = None, reading_id: int = 0) -> dict[str, Any]:
         """Update sensor reading."""
-        from datetime import datetime
+        timestamp = time.time()
+        self.history.append(value, timestamp, reading_id, (self.sensor_type, unit))
         self.properties["value"] = value
-        self.properties["last_reading"] = datetime.now(UTC).isoformat()
+        self.properties["last_reading"] = datetime.fromtimestamp(timestamp, UTC).isoformat()
         return {"success": True, "value": value, "timestamp": self.properties["last_reading"]}
 
+    def get_recent_readings(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Get recent readings from memory, newest first, shaped like the database rows."""
+        return [
+            {
+                "id": reading_id or None,
+                "sensor_type": sensor_type,
+                "value": value,
+                "unit": unit,
+                "timestamp": datetime.fromtimestamp(timestamp, UTC).isoformat()
+            }
+            for value, timestamp, reading_id, (sensor_type, unit) in self.history.latest(limit)
+        ]
+
+
+class DevicePollState:
+    """Adaptive polling state of a single device."""
+
+    def __init__(self, interval: float):
+        """Initialize poll state."""
+        self.interval = interval
+        self.snapshot: tuple[str, str] | None = None
+        self.generation = 0
+
 
 class DeviceManager:
     """Manager for all home automation devices."""
@@ -144,8 +175,16 @@ class DeviceManager:
         self.config = config
         self.db_manager = db_manager
         self.devices = {}
+        self.device_configs: dict[str, dict[str, Any]] = {}
         self.running = False
-        self.manager_thread = None
+        self.manager_thread: threading.Thread | None = None
+
+        # Adaptive polling schedule: heap of (due, seq, device key, generation)
+        self.poll_states: dict[str, DevicePollState] = {}
+        self.poll_schedule: list[tuple[float, int, str, int]] = []
+        self._poll_seq = itertools.count()
+        self._schedule_lock = threading.Lock()
+        self._wake_event = threading.Event()
 
         # Load device configuration
         self._load_device_config()
@@ -173,14 +212,70 @@ class DeviceManager:
             self._create_default_devices()
             self._save_device_config()
 
-    def _create_device_from_config(self, device_info: dict[str, Any]) -> None:
+    def reload_device_config(self) -> dict[str, list[str]]:
+        """Apply changes in the device configuration file to the running devices.
+
+        Devices are matched by name. Added devices are created, removed ones are
+        dropped, and modified ones are updated in place so their current status
+        and properties survive the reload.
+        """
+        changes: dict[str, list[str]] = {"added": [], "removed": [], "modified": []}
+        try:
+            with open(self.config.DEVICES_CONFIG_PATH) as f:
+                device_config = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to reload device configuration: {e}")
+            return changes
+
+        incoming = {
+            device_info["name"].lower(): device_info
+            for device_info in device_config.get("devices", [])
+            if device_info.get("name")
+        }
+
+        for key in list(self.devices):
+            if key not in incoming:
+                self.devices.pop(key)
+                self.device_configs.pop(key, None)
+                changes["removed"].append(key)
+
+        for key, device_info in incoming.items():
+            current = self.devices.get(key)
+            if current is None:
+                self._create_device_from_config(device_info)
+                changes["added"].append(key)
+            elif device_info != self.device_configs.get(key):
+                self._update_device_from_config(current, device_info)
+                changes["modified"].append(key)
+
+        logger.info(
+            f"Reloaded device configuration: {len(changes['added'])} added, "
+            f"{len(changes['removed'])} removed, {len(changes['modified'])} modified"
+        )
+        return changes
+
+    def _update_device_from_config(self, device: Device, device_info: dict[str, Any]) -> None:
+        """Update an existing device from changed configuration."""
+        previous = self.device_configs.get(device.name.lower(), {})
+        if (device_info.get("type") != previous.get("type")
+                or device_info.get("sensor_type") != previous.get("sensor_type")):
+            # A different device class is needed, keep the database row
+            self._create_device_from_config(device_info, device_id=device.device_id)
+            return
+
+        device.name = device_info["name"]
+        device.location = device_info.get("location", device.location)
+        self.device_configs[device.name.lower()] = device_info
+
+    def _create_device_from_config(self, device_info: dict[str, Any], device_id: int | None = None) -> None:
         """Create a device from configuration."""
-        device_type = device_info.get("type")
-        name = device_info.get("name")
-        location = device_info.get("location")
+        device_type = device_info["type"]
+        name = device_info["name"]
+        location = device_info["location"]
 
         # Add to database if not exists
-        device_id = self.db_manager.add_device(name, device_type, location, device_info)
+        if device_id is None:
+            device_id = self.db_manager.add_device(name, device_type, location, device_info)
 
         # Create device object
         if device_type == "light":
@@ -189,11 +284,15 @@ class DeviceManager:
             device = SmartThermostat(device_id, name, location)
         elif device_type == "sensor":
             sensor_type = device_info.get("sensor_type", "temperature")
-            device = SmartSensor(device_id, name, location, sensor_type)
+            device = SmartSensor(device_id, name, location, sensor_type, self.config.SENSOR_HISTORY_SIZE)
         else:
             device = Device(device_id, name, device_type, location)
 
         self.devices[name.lower()] = device
+        self.device_configs[name.lower()] = device_info
+
+        if self.running:
+            self.notify_device_changed(name)
 
     def _create_default_devices(self) -> None:
         """Create default devices."""
@@ -234,6 +333,17 @@ class DeviceManager:
     def start(self) -> None:
         """Start device manager."""
         self.running = True
+        self._wake_event.clear()
+
+        # Spread the first poll of every device across one base interval
+        with self._schedule_lock:
+            self.poll_schedule.clear()
+            now = time.monotonic()
+            for key in list(self.devices):
+                state = self.poll_states.setdefault(key, DevicePollState(self.config.DEVICE_POLL_INTERVAL))
+                delay = random.uniform(0, state.interval)  # nosec B311
+                self._push_schedule(key, state, now + delay)
+
         self.manager_thread = threading.Thread(target=self._run_manager, daemon=True)
         self.manager_thread.start()
         logger.info("Device manager started")
@@ -241,48 +351,177 @@ class DeviceManager:
     def stop(self) -> None:
         """Stop device manager."""
         self.running = False
+        self._wake_event.set()
         if self.manager_thread and self.manager_thread.is_alive():
             self.manager_thread.join(timeout=5)
         logger.info("Device manager stopped")
 
+    def _push_schedule(self, key: str, state: DevicePollState, due: float) -> None:
+        """Schedule the next poll of a device. Caller must hold the schedule lock."""
+        state.generation += 1
+        heapq.heappush(self.poll_schedule, (due, next(self._poll_seq), key, state.generation))
+
+    def notify_device_changed(self, name: str) -> None:
+        """Poll a device soon and at the fastest rate after it was changed."""
+        key = name.lower()
+        with self._schedule_lock:
+            state = self.poll_states.setdefault(key, DevicePollState(self.config.DEVICE_POLL_INTERVAL))
+            state.interval = self.config.DEVICE_POLL_MIN_INTERVAL
+            self._push_schedule(key, state, time.monotonic())
+        self._wake_event.set()
+
+    def _next_due_device(self) -> tuple[str, DevicePollState] | None:
+        """Pop the next device whose poll is due, or wait until one is."""
+        with self._schedule_lock:
+            while self.poll_schedule:
+                due, _, key, generation = self.poll_schedule[0]
+                state = self.poll_states.get(key)
+                if state is None or state.generation != generation or key not in self.devices:
+                    # Rescheduled or removed since this entry was pushed
+                    heapq.heappop(self.poll_schedule)
+                    if key not in self.devices:
+                        self.poll_states.pop(key, None)
+                    continue
+
+                delay = due - time.monotonic()
+                if delay <= 0:
+                    heapq.heappop(self.poll_schedule)
+                    return key, state
+                break
+            else:
+                delay = self.config.DEVICE_POLL_MAX_INTERVAL
+
+        self._wake_event.wait(delay)
+        self._wake_event.clear()
+        return None
+
+    def _poll_device(self, key: str, state: DevicePollState) -> None:
+        """Poll one device and adapt its interval to how often it changes."""
+        device = self.devices[key]
+        self.db_manager.update_device_status(device.device_id, device.status)
+
+        snapshot = (device.status, json.dumps(device.properties, sort_keys=True, default=str))
+        if state.snapshot is not None and snapshot != state.snapshot:
+            state.interval = max(self.config.DEVICE_POLL_MIN_INTERVAL, state.interval / 2)
+        else:
+            state.interval = min(self.config.DEVICE_POLL_MAX_INTERVAL, state.interval * 1.5)
+        state.snapshot = snapshot
+
+        jitter = self.config.DEVICE_POLL_JITTER
+        delay = state.interval * random.uniform(1 - jitter, 1 + jitter)  # nosec B311
+        with self._schedule_lock:
+            self._push_schedule(key, state, time.monotonic() + delay)
+
     def _run_manager(self) -> None:
-        """Main manager loop."""
-        import time
+        """Main manager loop.
+
+        Each device is polled on its own schedule: the interval halves when the
+        device changed since the last poll and backs off when it did not.
+        """
         while self.running:
             try:
-                # Update device statuses in database
-                for device in self.devices.values():
-                    self.db_manager.update_device_status(device.device_id, device.status)
-
-                time.sleep(30)  # Update every 30 seconds
+                next_device = self._next_due_device()
+                if next_device:
+                    self._poll_device(*next_device)
 
             except Exception as e:
                 logger.error(f"Error in device manager loop: {e}")
-                time.sleep(60)
+                self._wake_event.wait(60)
 
     def get_device(self, name: str) -> Device | None:
         """Get device by name."""
         return self.devices.get(name.lower())
 
+    def get_device_by_id(self, device_id: int) -> Device | None:
+        """Get device by database ID."""
+        for device in list(self.devices.values()):
+            if device.device_id == device_id:
+                return device
+        return None
+
+    def record_sensor_reading(
+        self,
+        device_id: int,
+        sensor_type: str,
+        value: float,
+        unit: str | None = None,
+        reading_id: int = 0
+    ) -> bool:
+        """Record a reading in the sensor's in-memory history.
+
+        Readings of the sensor's own type also update its current value.
+        Returns False if the device is not a known sensor, in which case the
+        reading only lives in the database.
+        """
+        device = self.get_device_by_id(device_id)
+        if not isinstance(device, SmartSensor):
+            return False
+        if device.sensor_type == sensor_type:
+            device.update_reading(float(value), unit, reading_id)
+        else:
+            device.history.append(float(value), time.time(), reading_id, (sensor_type, unit))
+        return True
+
+    def get_recent_sensor_data(self, device_id: int, limit: int = 100) -> list[dict[str, Any]] | None:
+        """Get recent sensor readings from memory, newest first.
+
+        The first read of a sensor merges its database history into the
+        buffer, alongside any readings recorded since startup. Returns None
+        for devices that are not sensors so callers can query the database.
+        """
+        device = self.get_device_by_id(device_id)
+        if not isinstance(device, SmartSensor):
+            return None
+
+        if not device.history_loaded:
+            self._load_sensor_history(device)
+            device.history_loaded = True
+
+        return device.get_recent_readings(limit)
+
+    def _load_sensor_history(self, sensor: SmartSensor) -> None:
+        """Merge a sensor's database history into its reading buffer."""
+        try:
+            rows = self.db_manager.get_recent_sensor_data(sensor.device_id, sensor.history.capacity)
+        except Exception as e:
+            logger.error(f"Failed to load history for sensor {sensor.name}: {e}")
+            return
+
+        readings = []
+        for row in rows:
+            if not row["timestamp"]:
+                continue
+            timestamp = datetime.fromisoformat(row["timestamp"])
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=UTC)
+            readings.append((row["value"], timestamp.timestamp(), row["id"], (row["sensor_type"], row["unit"])))
+        sensor.history.merge(readings)
+
     def turn_on_device(self, name: str) -> dict[str, Any]:
         """Turn on a device."""
         device = self.get_device(name)
         if device:
-            return device.turn_on()
+            result = device.turn_on()
+            self.notify_device_changed(name)
+            return result
         return {"success": False, "message": f"Device '{name}' not found"}
 
     def turn_off_device(self, name: str) -> dict[str, Any]:
         """Turn off a device."""
         device = self.get_device(name)
         if device:
-            return device.turn_off()
+            result = device.turn_off()
+            self.notify_device_changed(name)
+            return result
         return {"success": False, "message": f"Device '{name}' not found"}
 
     def set_temperature(self, name: str, temperature: float) -> dict[str, Any]:
         """Set temperature for a thermostat."""
         device = self.get_device(name)
         if device and isinstance(device, SmartThermostat):
-            return device.set_temperature(temperature)
+            result = device.set_temperature(temperature)
+            self.notify_device_changed(name)
+            return result
         elif device:
             return {"success": False, "message": f"Device '{name}' is not a thermostat"}
         return {"success": False, "message": f"Device '{name}' not found"}
@@ -0,0 +1,106 @@
+"""In-memory buffers for recent sensor readings."""
+
+import threading
+from array import array
+from collections.abc import Hashable, Iterable
+
+# (value, timestamp, reading ID or 0, label)
+Reading = tuple[float, float, int, Hashable]
+
+
+class SensorReadingBuffer:
+    """Fixed-capacity ring buffer holding the most recent readings of a sensor.
+
+    Values, timestamps (seconds since the epoch) and database IDs are kept
+    in preallocated arrays, so a buffer costs 24 bytes per reading of
+    capacity no matter how many readings pass through it. Each slot also
+    references a label (e.g., the sensor type and unit), which readings of
+    one sensor mostly share.
+    """
+
+    def __init__(self, capacity: int = 100):
+        """Initialize reading buffer."""
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+
+        self.capacity = capacity
+        self.values = array("d", [0.0]) * capacity
+        self.timestamps = array("d", [0.0]) * capacity
+        self.ids = array("q", [0]) * capacity
+        self.labels: list[Hashable] = [None] * capacity
+        self.count = 0
+        self.head = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of readings currently held."""
+        return self.count
+
+    def append(self, value: float, timestamp: float, reading_id: int = 0, label: Hashable = None) -> None:
+        """Add a reading, overwriting the oldest one when full."""
+        with self._lock:
+            self._append(value, timestamp, reading_id, label)
+
+    def _append(self, value: float, timestamp: float, reading_id: int, label: Hashable) -> None:
+        """Add a reading, caller holds the lock."""
+        self.values[self.head] = value
+        self.timestamps[self.head] = timestamp
+        self.ids[self.head] = reading_id
+        self.labels[self.head] = label
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def extend(self, readings: Iterable[Reading]) -> None:
+        """Add readings, oldest first."""
+        for reading in readings:
+            self.append(*reading)
+
+    def merge(self, readings: Iterable[Reading]) -> None:
+        """Merge readings (e.g., loaded from the database) with the held ones.
+
+        Readings whose ID is already held are skipped, and the result keeps
+        the newest ``capacity`` readings ordered by timestamp.
+        """
+        with self._lock:
+            held = self._latest(self.count)
+            held_ids = {reading[2] for reading in held if reading[2]}
+            merged = [reading for reading in readings if not reading[2] or reading[2] not in held_ids]
+            merged.extend(held)
+            merged.sort(key=lambda reading: reading[1])
+            self.count = 0
+            self.head = 0
+            for reading in merged[-self.capacity:]:
+                self._append(*reading)
+
+    def latest(self, limit: int | None = None) -> list[Reading]:
+        """Get up to ``limit`` readings, newest first."""
+        with self._lock:
+            return self._latest(self.count if limit is None else max(0, min(limit, self.count)))
+
+    def _latest(self, count: int) -> list[Reading]:
+        """Get the newest ``count`` readings, caller holds the lock."""
+        readings = []
+        index = self.head
+        for _ in range(count):
+            index = (index - 1) % self.capacity
+            readings.append((self.values[index], self.timestamps[index], self.ids[index], self.labels[index]))
+        return readings
+
+    def since(self, timestamp: float) -> list[Reading]:
+        """Get readings taken after ``timestamp``, newest first."""
+        with self._lock:
+            readings = []
+            index = self.head
+            for _ in range(self.count):
+                index = (index - 1) % self.capacity
+                if self.timestamps[index] <= timestamp:
+                    break
+                readings.append((self.values[index], self.timestamps[index], self.ids[index], self.labels[index]))
+            return readings
+
+    def clear(self) -> None:
+        """Drop all readings."""
+        with self._lock:
+            self.count = 0
+            self.head = 0
@@ -0,0 +1,121 @@
+"""Service call batching for the Home Assistant integration."""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+ServiceSender = Callable[[str, str, Optional[Dict[str, Any]]], Dict[str, Any]]
+
+
+def result_for_entity(result: Dict[str, Any], entity_id: str) -> Dict[str, Any]:
+    """Narrow the result of a multi-entity service call to one entity.
+
+    Home Assistant answers a service call with the states it changed, so
+    each caller gets only the states of its own entity.
+
+    Args:
+        result: Result of the combined service call
+        entity_id: Entity the caller asked for
+
+    Returns:
+        Result with ``data`` filtered to ``entity_id``
+    """
+    data = result.get("data")
+    if not isinstance(data, list):
+        return dict(result)
+    return {
+        **result,
+        "data": [state for state in data if isinstance(state, dict) and state.get("entity_id") == entity_id]
+    }
+
+
+class _PendingBatch:
+    """Entities collected for one combined service call."""
+
+    def __init__(self):
+        self.entity_ids: List[str] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.done = threading.Event()
+
+
+class ServiceCallBatcher:
+    """Merge concurrent single-entity service calls into one request.
+
+    Calls with the same domain, service and service data that arrive within
+    ``window`` seconds of each other are sent as a single call with a list
+    of entity IDs. The first caller sends the request after the window
+    closes; every caller gets the combined result narrowed to its entity.
+    """
+
+    def __init__(self, send: ServiceSender, window: float = 0.005):
+        """Initialize service call batcher.
+
+        Args:
+            send: Function performing the service call (domain, service, service_data)
+            window: Seconds to wait for more calls before sending
+        """
+        self.send = send
+        self.window = window
+        self._pending: Dict[Tuple[str, str, str], _PendingBatch] = {}
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        domain: str,
+        service: str,
+        entity_id: str,
+        service_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Call a service for one entity, batched with concurrent identical calls.
+
+        Args:
+            domain: Service domain (e.g., light, switch)
+            service: Service name (e.g., turn_on, turn_off)
+            entity_id: Entity to target
+            service_data: Additional service data, without ``entity_id``
+
+        Returns:
+            Response from service call for this entity
+        """
+        service_data = service_data or {}
+        key = (domain, service, json.dumps(service_data, sort_keys=True, default=str))
+        with self._lock:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if batch is None:
+                batch = _PendingBatch()
+                self._pending[key] = batch
+            if entity_id not in batch.entity_ids:
+                batch.entity_ids.append(entity_id)
+
+        if not leader:
+            batch.done.wait()
+            assert batch.result is not None
+            return result_for_entity(batch.result, entity_id)
+
+        try:
+            time.sleep(self.window)
+            with self._lock:
+                del self._pending[key]
+
+            entity_ids = batch.entity_ids
+            if len(entity_ids) > 1:
+                logger.debug(f"Batched {len(entity_ids)} calls to {domain}.{service}")
+            batch.result = self.send(
+                domain, service, {**service_data, "entity_id": entity_ids[0] if len(entity_ids) == 1 else entity_ids}
+            )
+        except Exception as e:
+            batch.result = {
+                "success": False,
+                "message": f"Service call failed: {str(e)}",
+                "error": str(e)
+            }
+        finally:
+            batch.done.set()
+        assert batch.result is not None
+        return result_for_entity(batch.result, entity_id)
@@ -0,0 +1,197 @@
+"""REST polling fallback for the Home Assistant state mirror."""
+
+import logging
+import threading
+from datetime import UTC, datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from home_automation.core.event_loop import BackgroundEventLoop
+from home_automation.integrations.ha_websocket import HomeAssistantStateMirror, HomeAssistantWebSocket
+
+
+logger = logging.getLogger(__name__)
+
+POLL_MODES = ("auto", "always", "off")
+
+
+def state_fingerprint(state: Dict[str, Any]) -> int:
+    """Hash the parts of a state that change whenever the entity is updated.
+
+    Args:
+        state: Entity state dictionary
+
+    Returns:
+        Hash of ``last_updated`` and the state value
+    """
+    return hash((state.get("last_updated"), state.get("state")))
+
+
+class HomeAssistantStatePoller:
+    """Keep the state mirror current by polling /api/states.
+
+    Each poll streams the full state list once, compares every entity with
+    the fingerprint kept from the previous poll and turns only the
+    differences into synthetic ``state_changed`` events on the mirror. Mirror
+    listeners therefore see the same incremental stream as with the
+    WebSocket subscription. In ``auto`` mode the poller stays idle while the
+    WebSocket is connected.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        mirror: HomeAssistantStateMirror,
+        interval: float = 5.0,
+        mode: str = "auto",
+        websocket: Optional[HomeAssistantWebSocket] = None,
+        event_loop: Optional[BackgroundEventLoop] = None
+    ):
+        """Initialize state poller.
+
+        Args:
+            client: HomeAssistantClient used to stream /api/states
+            mirror: State mirror to feed
+            interval: Seconds between polls
+            mode: ``auto`` (poll only while the WebSocket is down), ``always`` or ``off``
+            websocket: WebSocket client whose connection ``auto`` mode follows
+            event_loop: Loop the mirror listeners run on; events are applied there
+        """
+        if mode not in POLL_MODES:
+            raise ValueError(f"Unknown poll mode {mode}, expected one of {', '.join(POLL_MODES)}")
+        self.client = client
+        self.mirror = mirror
+        self.interval = interval
+        self.mode = mode
+        self.websocket = websocket
+        self.event_loop = event_loop
+        self.fingerprints: Dict[str, int] = {}
+        self.active = False
+        self.last_poll: Optional[datetime] = None
+        self.running = False
+        self.poller_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def should_poll(self) -> bool:
+        """Whether polling is needed right now."""
+        if self.mode == "off":
+            return False
+        if self.mode == "auto" and self.websocket and self.websocket.connected:
+            return False
+        return True
+
+    def poll(self) -> int:
+        """Poll once and apply the changes to the mirror.
+
+        Returns:
+            Number of synthetic events emitted
+
+        Raises:
+            requests.exceptions.RequestException: If the state list could not be fetched
+            ValueError: If the response was not a complete state list
+        """
+        if not self.active:
+            # Resuming after the WebSocket fed the mirror: diff against what it holds
+            self.fingerprints = {
+                state["entity_id"]: state_fingerprint(state) for state in self.mirror.get_states()
+            }
+            self.active = True
+
+        first_poll = not self.fingerprints
+        fired = datetime.now(UTC).isoformat()
+        seen: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+        snapshot: List[Dict[str, Any]] = []
+        for state in self.client.stream_states():
+            entity_id = state["entity_id"]
+            fingerprint = state_fingerprint(state)
+            seen[entity_id] = fingerprint
+            if first_poll:
+                snapshot.append(state)
+            elif self.fingerprints.get(entity_id) != fingerprint:
+                events.append(self._state_changed(entity_id, state, fired))
+
+        if not first_poll:
+            for entity_id in self.fingerprints.keys() - seen.keys():
+                events.append(self._state_changed(entity_id, None, fired))
+
+        if not self.should_poll():
+            # The WebSocket came back during the poll and resynced the mirror itself
+            self.active = False
+            return 0
+
+        self.fingerprints = seen
+        self.last_poll = datetime.now(UTC)
+        if first_poll:
+            self.mirror.replace_all(snapshot)
+            return 0
+
+        if self.event_loop:
+            self.event_loop.run(self._apply_async(events))
+        else:
+            self._apply(events)
+        return len(events)
+
+    def _state_changed(
+        self,
+        entity_id: str,
+        new_state: Optional[Dict[str, Any]],
+        fired: str
+    ) -> Dict[str, Any]:
+        """Build a synthetic state_changed event against the mirrored old state."""
+        return {
+            "event_type": "state_changed",
+            "data": {
+                "entity_id": entity_id,
+                "old_state": self.mirror.get_state(entity_id),
+                "new_state": new_state,
+            },
+            "origin": "POLL",
+            "time_fired": fired,
+        }
+
+    def _apply(self, events: List[Dict[str, Any]]) -> None:
+        """Apply events to the mirror and mark it in sync."""
+        for event in events:
+            self.mirror.handle_event(event)
+        self.mirror.mark_synced()
+
+    async def _apply_async(self, events: List[Dict[str, Any]]) -> None:
+        """Apply events on the event loop thread, where mirror listeners expect to run."""
+        self._apply(events)
+
+    def start(self) -> None:
+        """Start polling in a background thread."""
+        if self.running or self.mode == "off":
+            return
+
+        self.running = True
+        self._stop_event.clear()
+        self.poller_thread = threading.Thread(target=self._run_poller, name="ha-state-poller", daemon=True)
+        self.poller_thread.start()
+        logger.info(f"Home Assistant state poller started ({self.mode}, every {self.interval}s)")
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self.running = False
+        self._stop_event.set()
+        if self.poller_thread and self.poller_thread.is_alive():
+            self.poller_thread.join(timeout=5)
+        logger.info("Home Assistant state poller stopped")
+
+    def _run_poller(self) -> None:
+        """Main poller loop."""
+        # Wait one interval first so a starting WebSocket can connect
+        while not self._stop_event.wait(self.interval):
+            if self.should_poll():
+                try:
+                    changes = self.poll()
+                    if changes:
+                        logger.debug(f"State poll emitted {changes} state_changed events")
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    logger.warning(f"Home Assistant state poll failed: {e}")
+                except Exception as e:
+                    logger.error(f"Error in state poller loop: {e}")
+            else:
+                self.active = False
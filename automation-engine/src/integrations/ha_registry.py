@@ -0,0 +1,232 @@
+"""Home Assistant area, device and entity registry index for HOME-AI-AUTOMATION."""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from home_automation.integrations.ha_websocket import HomeAssistantWebSocket
+
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_EVENTS = ("area_registry_updated", "device_registry_updated", "entity_registry_updated")
+
+
+class HomeAssistantRegistry:
+    """Index of entities by domain, area and device.
+
+    Built from the Home Assistant area, device and entity registries and
+    the current entity IDs, then kept current from ``state_changed`` and
+    registry update events. Lookups return only the matching entity IDs
+    instead of scanning every state.
+    """
+
+    def __init__(self, refresh_delay: float = 1.0):
+        """Initialize registry index.
+
+        Args:
+            refresh_delay: Seconds to wait after a registry update event
+                before reloading, so bursts of updates cause one reload
+        """
+        self.refresh_delay = refresh_delay
+        self.areas: Dict[str, Dict[str, Any]] = {}
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.by_domain: Dict[str, Set[str]] = {}
+        self.by_area: Dict[str, Set[str]] = {}
+        self.by_device: Dict[str, Set[str]] = {}
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._refresh_handle: Optional[asyncio.TimerHandle] = None
+        self._websocket: Optional[HomeAssistantWebSocket] = None
+
+    def load(
+        self,
+        areas: Iterable[Dict[str, Any]],
+        devices: Iterable[Dict[str, Any]],
+        entities: Iterable[Dict[str, Any]],
+        entity_ids: Iterable[str] = ()
+    ) -> None:
+        """Rebuild the index from registry listings.
+
+        Args:
+            areas: Entries from ``config/area_registry/list``
+            devices: Entries from ``config/device_registry/list``
+            entities: Entries from ``config/entity_registry/list``
+            entity_ids: IDs of entities with a current state, including ones
+                missing from the entity registry
+        """
+        area_map = {area["area_id"]: area for area in areas}
+        device_map = {device["id"]: device for device in devices}
+        entity_map = {entry["entity_id"]: entry for entry in entities}
+
+        by_domain: Dict[str, Set[str]] = {}
+        by_area: Dict[str, Set[str]] = {}
+        by_device: Dict[str, Set[str]] = {}
+        for entity_id in set(entity_map) | set(entity_ids):
+            by_domain.setdefault(entity_id.split('.')[0], set()).add(entity_id)
+            entry = entity_map.get(entity_id, {})
+            device_id = entry.get("device_id")
+            if device_id:
+                by_device.setdefault(device_id, set()).add(entity_id)
+            area_id = entry.get("area_id") or device_map.get(device_id, {}).get("area_id")
+            if area_id:
+                by_area.setdefault(area_id, set()).add(entity_id)
+
+        with self._lock:
+            self.areas = area_map
+            self.devices = device_map
+            self.entities = entity_map
+            self.by_domain = by_domain
+            self.by_area = by_area
+            self.by_device = by_device
+            self.loaded = True
+        logger.info(
+            f"Registry index loaded: {len(area_map)} areas, {len(device_map)} devices, "
+            f"{len(by_domain)} domains"
+        )
+
+    async def refresh(self, websocket: HomeAssistantWebSocket) -> None:
+        """Reload the registries over the WebSocket API.
+
+        Args:
+            websocket: Connected WebSocket client
+        """
+        self._websocket = websocket
+        areas, devices, entities = await asyncio.gather(
+            websocket.send_command({"type": "config/area_registry/list"}),
+            websocket.send_command({"type": "config/device_registry/list"}),
+            websocket.send_command({"type": "config/entity_registry/list"}),
+        )
+        entity_ids = [state["entity_id"] for state in websocket.mirror.get_states()]
+        self.load(areas, devices, entities, entity_ids)
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Keep the index current from a Home Assistant event.
+
+        Registered as a state mirror listener, so it runs on the event loop
+        thread.
+
+        Args:
+            event: Home Assistant event dictionary
+        """
+        event_type = event.get("event_type")
+        if event_type == "state_changed":
+            data = event.get("data", {})
+            entity_id = data.get("entity_id")
+            if not entity_id:
+                return
+            with self._lock:
+                domain_entities = self.by_domain.setdefault(entity_id.split('.')[0], set())
+                if data.get("new_state") is None and entity_id not in self.entities:
+                    domain_entities.discard(entity_id)
+                else:
+                    domain_entities.add(entity_id)
+        elif event_type in REGISTRY_EVENTS and self._websocket:
+            self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        """Reload the registries after ``refresh_delay``, collapsing repeated requests."""
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._refresh_handle = loop.call_later(
+            self.refresh_delay, lambda: asyncio.ensure_future(self._refresh_safely())
+        )
+
+    async def _refresh_safely(self) -> None:
+        """Reload the registries, logging instead of raising on failure."""
+        self._refresh_handle = None
+        try:
+            await self.refresh(self._websocket)
+        except Exception as e:
+            logger.warning(f"Failed to refresh registry index: {e}")
+
+    def resolve_area(self, area: str) -> Optional[str]:
+        """Resolve an area ID or name (case-insensitive) to an area ID.
+
+        Args:
+            area: Area ID or name
+
+        Returns:
+            Area ID or None if unknown
+        """
+        if area in self.areas:
+            return area
+        wanted = area.strip().lower()
+        for area_id, entry in self.areas.items():
+            if (entry.get("name") or "").lower() == wanted:
+                return area_id
+        return None
+
+    def entities_in_domain(self, domain: str) -> List[str]:
+        """Get the entity IDs in a domain.
+
+        Args:
+            domain: Entity domain (e.g., light)
+
+        Returns:
+            Sorted entity IDs
+        """
+        with self._lock:
+            return sorted(self.by_domain.get(domain, ()))
+
+    def entities_in_area(self, area: str, domains: Optional[Iterable[str]] = None) -> List[str]:
+        """Get the entity IDs assigned to an area directly or through their device.
+
+        Args:
+            area: Area ID or name
+            domains: Optional domains to restrict to
+
+        Returns:
+            Sorted entity IDs, empty if the area is unknown
+        """
+        area_id = self.resolve_area(area)
+        domains = set(domains or ())
+        with self._lock:
+            entity_ids = self.by_area.get(area_id, set()) if area_id else set()
+            return sorted(
+                entity_id for entity_id in entity_ids
+                if not domains or entity_id.split('.')[0] in domains
+            )
+
+    def entities_for_device(self, device_id: str) -> List[str]:
+        """Get the entity IDs belonging to a device.
+
+        Args:
+            device_id: Device registry ID
+
+        Returns:
+            Sorted entity IDs
+        """
+        with self._lock:
+            return sorted(self.by_device.get(device_id, ()))
+
+    def area_of(self, entity_id: str) -> Optional[str]:
+        """Get the area ID an entity belongs to.
+
+        Args:
+            entity_id: Entity ID
+
+        Returns:
+            Area ID or None if the entity has no area
+        """
+        entry = self.entities.get(entity_id, {})
+        return entry.get("area_id") or self.devices.get(entry.get("device_id", ""), {}).get("area_id")
+
+    def get_areas(self) -> List[Dict[str, Any]]:
+        """Get all areas with their entity counts.
+
+        Returns:
+            List of areas
+        """
+        with self._lock:
+            return [
+                {
+                    "area_id": area_id,
+                    "name": area.get("name"),
+                    "entity_count": len(self.by_area.get(area_id, ())),
+                }
+                for area_id, area in sorted(self.areas.items())
+            ]
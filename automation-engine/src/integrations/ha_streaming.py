@@ -0,0 +1,147 @@
+"""Incremental parsing of Home Assistant state lists."""
+
+import codecs
+import fnmatch
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class StateFilter:
+    """Match entity states by domain and entity ID pattern."""
+
+    def __init__(self, domains: Optional[Iterable[str]] = None, entity_pattern: Optional[str] = None):
+        """Initialize state filter.
+
+        Args:
+            domains: Domains to keep (e.g., ["light", "switch"]), all if empty
+            entity_pattern: Shell-style entity ID pattern (e.g., sensor.*_temperature)
+        """
+        self.domains = set(domains or ())
+        self.entity_pattern = entity_pattern
+
+    def __bool__(self) -> bool:
+        """Whether the filter excludes anything."""
+        return bool(self.domains or self.entity_pattern)
+
+    def matches(self, state: Dict[str, Any]) -> bool:
+        """Check whether a state passes the filter.
+
+        Args:
+            state: Entity state dictionary
+
+        Returns:
+            True if the state should be kept
+        """
+        entity_id = state.get("entity_id", "")
+        if self.domains and entity_id.split('.')[0] not in self.domains:
+            return False
+        if self.entity_pattern and not fnmatch.fnmatchcase(entity_id, self.entity_pattern):
+            return False
+        return True
+
+
+class StateStreamParser:
+    """Decode a JSON array of entity states chunk by chunk.
+
+    Each complete entity object is decoded as soon as its bytes have
+    arrived and is dropped right away unless it passes the filter, so only
+    the matching states and one partial object are held in memory.
+    """
+
+    def __init__(self, state_filter: Optional[StateFilter] = None):
+        """Initialize stream parser.
+
+        Args:
+            state_filter: Optional filter applied to every decoded state
+        """
+        self.state_filter = state_filter
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Add a chunk of the response body.
+
+        Args:
+            chunk: Raw bytes as received
+
+        Returns:
+            States completed by this chunk that pass the filter
+        """
+        text = self._text.decode(chunk)
+        if self._finished or not text:
+            return []
+
+        self._buffer += text
+        states = []
+        position = 0
+        buffer = self._buffer
+        while True:
+            position = self._skip_separators(buffer, position)
+            if position >= len(buffer):
+                break
+
+            if not self._started:
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON array of states")
+                self._started = True
+                position += 1
+                continue
+
+            if buffer[position] == "]":
+                self._finished = True
+                position += 1
+                break
+
+            try:
+                state, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Object not complete yet, wait for more data
+                break
+            position = end
+            if not self.state_filter or self.state_filter.matches(state):
+                states.append(state)
+
+        self._buffer = buffer[position:]
+        return states
+
+    def close(self) -> None:
+        """Check that the whole array was received.
+
+        Raises:
+            ValueError: If the body ended in the middle of the array
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        if not self._finished:
+            raise ValueError("State list ended unexpectedly")
+
+    @staticmethod
+    def _skip_separators(buffer: str, position: int) -> int:
+        """Skip whitespace and commas between array elements."""
+        length = len(buffer)
+        while position < length and buffer[position] in " \t\r\n,":
+            position += 1
+        return position
+
+
+def iter_states(
+    chunks: Iterable[bytes],
+    domains: Optional[Iterable[str]] = None,
+    entity_pattern: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield entity states from a streamed /api/states body as they arrive.
+
+    Args:
+        chunks: Response body chunks
+        domains: Domains to keep, all if empty
+        entity_pattern: Shell-style entity ID pattern
+
+    Returns:
+        Iterator over matching entity states
+    """
+    parser = StateStreamParser(StateFilter(domains, entity_pattern))
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
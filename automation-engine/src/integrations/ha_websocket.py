@@ -0,0 +1,330 @@
+"""Home Assistant WebSocket API integration for HOME-AI-AUTOMATION."""
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from home_automation.core.event_loop import BackgroundEventLoop
+
+
+logger = logging.getLogger(__name__)
+
+
+class HomeAssistantWebSocketError(Exception):
+    """Error returned by the Home Assistant WebSocket API."""
+
+
+class HomeAssistantAuthError(HomeAssistantWebSocketError):
+    """Authentication against the WebSocket API was rejected."""
+
+
+class HomeAssistantStateMirror:
+    """In-process mirror of all Home Assistant entity states.
+
+    The mirror is fed by a WebSocket subscription: a full snapshot on every
+    (re)connect followed by ``state_changed`` events. Reads never touch the
+    network. Other Home Assistant events are passed through to listeners.
+    """
+
+    def __init__(self):
+        """Initialize state mirror."""
+        self.states: Dict[str, Dict[str, Any]] = {}
+        self.synced = False
+        self.last_synced: Optional[float] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._changed_during_sync: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback for every event the mirror receives.
+
+        Callbacks run on the event loop thread and must not block.
+
+        Args:
+            callback: Called with the Home Assistant event dictionary
+        """
+        self._listeners.append(callback)
+
+    def begin_sync(self) -> None:
+        """Start recording state changes that arrive before the next snapshot."""
+        with self._lock:
+            self._changed_during_sync = {}
+
+    def replace_all(self, states: Iterable[Dict[str, Any]]) -> None:
+        """Replace the mirror contents with a full state snapshot.
+
+        Changes received since ``begin_sync`` are applied on top of the
+        snapshot when they are newer than it.
+
+        Args:
+            states: Entity states as returned by ``get_states``
+        """
+        with self._lock:
+            snapshot = {state["entity_id"]: state for state in states}
+            for entity_id, new_state in (self._changed_during_sync or {}).items():
+                current = snapshot.get(entity_id)
+                if new_state is None:
+                    snapshot.pop(entity_id, None)
+                elif current is None or new_state.get("last_updated", "") >= current.get("last_updated", ""):
+                    snapshot[entity_id] = new_state
+            self._changed_during_sync = None
+            self.states = snapshot
+            self.synced = True
+            self.last_synced = time.monotonic()
+        logger.info(f"State mirror synced with {len(snapshot)} entities")
+
+    def mark_synced(self) -> None:
+        """Mark the mirror as current after changes were applied from another source."""
+        self.synced = True
+        self.last_synced = time.monotonic()
+
+    def mark_unsynced(self) -> None:
+        """Mark the mirror as out of date until the next snapshot."""
+        self.synced = False
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Apply a Home Assistant event and notify listeners.
+
+        Args:
+            event: Event dictionary from the WebSocket subscription
+        """
+        if event.get("event_type") == "state_changed":
+            data = event.get("data", {})
+            entity_id = data.get("entity_id")
+            new_state = data.get("new_state")
+            with self._lock:
+                if new_state is None:
+                    self.states.pop(entity_id, None)
+                else:
+                    self.states[entity_id] = new_state
+                if self._changed_during_sync is not None:
+                    self._changed_during_sync[entity_id] = new_state
+
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"State mirror listener failed: {e}")
+
+    def get_state(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Get the mirrored state of an entity.
+
+        Args:
+            entity_id: Entity ID (e.g., light.living_room)
+
+        Returns:
+            Entity state or None if the entity is unknown
+        """
+        return self.states.get(entity_id)
+
+    def get_states(self) -> List[Dict[str, Any]]:
+        """Get all mirrored entity states.
+
+        Returns:
+            List of entity states
+        """
+        with self._lock:
+            return list(self.states.values())
+
+
+class HomeAssistantWebSocket:
+    """WebSocket client that keeps a state mirror in sync with Home Assistant."""
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        mirror: HomeAssistantStateMirror,
+        event_loop: BackgroundEventLoop,
+        verify_ssl: bool = False,
+        event_types: Iterable[str] = ("state_changed",),
+        command_timeout: float = 30.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0
+    ):
+        """Initialize Home Assistant WebSocket client.
+
+        Args:
+            url: Home Assistant URL (e.g., http://192.168.1.134:8123)
+            token: Long-lived access token
+            mirror: State mirror to keep in sync
+            event_loop: Background loop the client runs on
+            verify_ssl: Whether to verify SSL certificates
+            event_types: Event types to subscribe to
+            command_timeout: Seconds to wait for a command result
+            reconnect_delay: Initial delay before reconnecting
+            max_reconnect_delay: Upper bound for the reconnect backoff
+        """
+        base_url = url.rstrip('/')
+        if base_url.startswith("https://"):
+            self.ws_url = "wss://" + base_url[len("https://"):] + "/api/websocket"
+        else:
+            self.ws_url = "ws://" + base_url.split("://", 1)[-1] + "/api/websocket"
+        self.token = token
+        self.mirror = mirror
+        self.event_loop = event_loop
+        self.verify_ssl = verify_ssl
+        self.event_types = list(event_types)
+        self.command_timeout = command_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self.consecutive_failures = 0
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task = None
+        self._message_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._connect_callbacks: List[Callable[["HomeAssistantWebSocket"], Awaitable[None]]] = []
+
+    def add_connect_callback(self, callback: Callable[["HomeAssistantWebSocket"], Awaitable[None]]) -> None:
+        """Register a coroutine function to run after every successful (re)sync.
+
+        Args:
+            callback: Called with this client; may use ``send_command``
+        """
+        self._connect_callbacks.append(callback)
+
+    def start(self) -> None:
+        """Start connecting in the background."""
+        if self._task and not self._task.done():
+            return
+        self._task = self.event_loop.submit(self._run())
+        logger.info(f"Home Assistant WebSocket client started ({self.ws_url})")
+
+    def stop(self) -> None:
+        """Disconnect and stop reconnecting."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+        self.mirror.mark_unsynced()
+        logger.info("Home Assistant WebSocket client stopped")
+
+    async def send_command(self, message: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """Send a command over the WebSocket and wait for its result.
+
+        Args:
+            message: Command message without an ``id``
+            timeout: Seconds to wait for the result
+
+        Returns:
+            The ``result`` field of the response
+        """
+        if self._ws is None or self._ws.closed:
+            raise HomeAssistantWebSocketError("WebSocket is not connected")
+
+        message_id = next(self._message_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._ws.send_json({**message, "id": message_id})
+            return await asyncio.wait_for(future, timeout or self.command_timeout)
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def _run(self) -> None:
+        """Connect, sync and listen, reconnecting with backoff until stopped."""
+        delay = self.reconnect_delay
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    await self._connect_and_listen(session)
+                except asyncio.CancelledError:
+                    raise
+                except HomeAssistantAuthError as e:
+                    logger.error(f"Home Assistant WebSocket authentication failed: {e}")
+                    delay = self.max_reconnect_delay
+                except Exception as e:
+                    logger.warning(f"Home Assistant WebSocket disconnected: {e}")
+                finally:
+                    self._disconnected()
+
+                if self.consecutive_failures == 0 and delay < self.max_reconnect_delay:
+                    # The previous session was fully synced, start backing off from scratch
+                    delay = self.reconnect_delay
+                self.consecutive_failures += 1
+                await asyncio.sleep(delay * random.uniform(0.8, 1.2))  # nosec B311
+                delay = min(self.max_reconnect_delay, delay * 2)
+
+    async def _connect_and_listen(self, session: aiohttp.ClientSession) -> None:
+        """Authenticate, subscribe, load a snapshot and process messages."""
+        async with session.ws_connect(
+            self.ws_url, ssl=self.verify_ssl, heartbeat=30, max_msg_size=0
+        ) as ws:
+            message = await ws.receive_json(timeout=self.command_timeout)
+            if message.get("type") == "auth_required":
+                await ws.send_json({"type": "auth", "access_token": self.token})
+                message = await ws.receive_json(timeout=self.command_timeout)
+            if message.get("type") != "auth_ok":
+                raise HomeAssistantAuthError(message.get("message", "authentication rejected"))
+
+            self._ws = ws
+            reader = asyncio.ensure_future(self._read_messages(ws))
+            try:
+                # Subscribe before taking the snapshot so no change is missed
+                self.mirror.begin_sync()
+                for event_type in self.event_types:
+                    await self.send_command({"type": "subscribe_events", "event_type": event_type})
+                self.mirror.replace_all(await self.send_command({"type": "get_states"}))
+                self.connected = True
+                self.consecutive_failures = 0
+                logger.info("Connected to Home Assistant WebSocket API")
+                for callback in self._connect_callbacks:
+                    try:
+                        await callback(self)
+                    except Exception as e:
+                        logger.warning(f"WebSocket connect callback failed: {e}")
+                await reader
+            finally:
+                reader.cancel()
+
+    async def _read_messages(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Dispatch incoming results and events until the socket closes.
+
+        Commands still waiting for a result fail as soon as reading stops,
+        so a caller (or the initial sync) does not wait out its timeout.
+        """
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+
+                payload = json.loads(msg.data)
+                for message in payload if isinstance(payload, list) else [payload]:
+                    message_type = message.get("type")
+                    if message_type == "event":
+                        self.mirror.handle_event(message.get("event", {}))
+                    elif message_type == "result":
+                        future = self._pending.get(message.get("id"))
+                        if future is None or future.done():
+                            continue
+                        if message.get("success"):
+                            future.set_result(message.get("result"))
+                        else:
+                            error = message.get("error", {})
+                            future.set_exception(HomeAssistantWebSocketError(error.get("message", "command failed")))
+        finally:
+            self._fail_pending()
+
+        raise ConnectionError(f"WebSocket closed ({ws.close_code})")
+
+    def _disconnected(self) -> None:
+        """Reset connection state after the socket went away."""
+        self._ws = None
+        self.connected = False
+        self.mirror.mark_unsynced()
+        self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        """Fail every command still waiting for a result."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(HomeAssistantWebSocketError("WebSocket disconnected"))
+        self._pending.clear()
@@ -1,15 +1,50 @@
 """Home Assistant integration for HOME-AI-AUTOMATION."""
 
 import logging
-from typing import Any, Dict, List, Optional
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+from home_automation.core.cache import StaleWhileRevalidateCache
+from home_automation.core.event_loop import BackgroundEventLoop
+from home_automation.core.resilience import CircuitBreaker, LatencyTracker
+from home_automation.core.scheduler import OutboundScheduler, Priority, SchedulerTimeoutError, current_priority
+from home_automation.core.single_flight import SingleFlight
+from home_automation.integrations.ha_batching import ServiceCallBatcher, result_for_entity
+from home_automation.integrations.ha_registry import HomeAssistantRegistry
+from home_automation.integrations.ha_streaming import StateFilter, iter_states
+from home_automation.integrations.ha_websocket import HomeAssistantStateMirror
+from home_automation.integrations.home_assistant_async import (
+    RETRYABLE_STATUS_CODES,
+    AsyncHomeAssistantClient,
+    ServiceCall,
+)
 
 logger = logging.getLogger(__name__)
 
+# WebSocket events after which the memoized services and config are reloaded
+METADATA_EVENTS = {
+    "service_registered": ("services",),
+    "service_removed": ("services",),
+    "component_loaded": ("services", "config"),
+    "core_config_updated": ("config",),
+}
+
+# Domains area control targets when no domains are given and services are not loaded
+AREA_CONTROL_DOMAINS = (
+    "light", "switch", "fan", "cover", "media_player", "climate",
+    "humidifier", "vacuum", "water_heater", "input_boolean", "siren",
+)
+
+
+class HomeAssistantUnavailableError(requests.exceptions.ConnectionError):
+    """Request refused because the circuit breaker is open."""
+
 
 class HomeAssistantClient:
     """Client for interacting with Home Assistant API."""
@@ -19,7 +54,23 @@ class HomeAssistantClient:
         url: str,
         token: str,
         verify_ssl: bool = False,
-        timeout: int = 10
+        timeout: int = 10,
+        state_mirror: Optional[HomeAssistantStateMirror] = None,
+        async_client: Optional[AsyncHomeAssistantClient] = None,
+        event_loop: Optional[BackgroundEventLoop] = None,
+        cache_ttl: float = 0,
+        cache_stale_ttl: float = 60,
+        cache_domain_ttls: Optional[Dict[str, float]] = None,
+        service_batch_window: float = 0,
+        request_budget: Optional[float] = None,
+        max_retries: int = 2,
+        hedge_requests: bool = False,
+        circuit_failure_threshold: int = 5,
+        circuit_reset_timeout: float = 30.0,
+        metadata_ttl: float = 0,
+        validate_services: bool = False,
+        registry: Optional[HomeAssistantRegistry] = None,
+        scheduler: Optional[OutboundScheduler] = None
     ):
         """Initialize Home Assistant client.
 
@@ -28,25 +79,76 @@ class HomeAssistantClient:
             token: Long-lived access token
             verify_ssl: Whether to verify SSL certificates
             timeout: Request timeout in seconds
+            state_mirror: Optional WebSocket-fed state mirror used for reads
+            async_client: Optional async client used for multi-entity operations
+            event_loop: Background loop the async client runs on
+            cache_ttl: Seconds REST state reads stay fresh in the cache (0 disables)
+            cache_stale_ttl: Seconds an expired state is still served while it refreshes
+            cache_domain_ttls: Per-domain overrides of ``cache_ttl`` (e.g., {"sensor": 10})
+            service_batch_window: Seconds to collect concurrent turn_on/turn_off/toggle
+                calls into one multi-entity service call (0 disables)
+            request_budget: Total seconds a call may spend including retries,
+                defaults to ``timeout``
+            max_retries: Retries for idempotent requests within the budget
+            hedge_requests: Send a second GET when the first is slower than p95
+            circuit_failure_threshold: Consecutive failures that open the circuit
+            circuit_reset_timeout: Seconds to fail fast before trying again
+            metadata_ttl: Seconds services and config are memoized (0 disables)
+            validate_services: Reject calls to services Home Assistant does not offer
+                without sending them
+            registry: Optional domain/area/device index used for filtered lookups
+            scheduler: Optional scheduler admitting requests by priority class
         """
         self.url = url.rstrip('/')
         self.token = token
         self.verify_ssl = verify_ssl
         self.timeout = timeout
+        self.request_budget = request_budget or timeout
+        self.max_retries = max_retries
+        self.hedge_requests = hedge_requests
+        self.circuit_breaker = CircuitBreaker(
+            "home_assistant",
+            failure_threshold=circuit_failure_threshold,
+            reset_timeout=circuit_reset_timeout
+        )
+        self.latency = LatencyTracker()
+        self.scheduler = scheduler
+        self._hedge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ha-hedge") if hedge_requests else None
+        self.state_mirror = state_mirror
+        self.registry = registry
+        self.async_client = async_client
+        if async_client and async_client.circuit_breaker is None:
+            # Bulk calls go through the async client; they must trip and respect the same circuit
+            async_client.circuit_breaker = self.circuit_breaker
+        self.event_loop = event_loop
+        self.cache_domain_ttls = cache_domain_ttls or {}
+        self.state_cache: Optional[StaleWhileRevalidateCache] = None
+        if cache_ttl > 0 or self.cache_domain_ttls:
+            self.state_cache = StaleWhileRevalidateCache(
+                ttl=cache_ttl,
+                stale_ttl=cache_stale_ttl,
+                ttl_for=self._get_cache_ttl
+            )
+        # Services and config rarely change; refreshed in the background on expiry or HA events
+        self.metadata_cache: Optional[StaleWhileRevalidateCache] = None
+        if metadata_ttl > 0:
+            self.metadata_cache = StaleWhileRevalidateCache(ttl=metadata_ttl, stale_ttl=metadata_ttl, max_workers=1)
+        self.validate_services = validate_services
+        self._services_index: Dict[str, Dict[str, Any]] = {}
+        self._services_index_source: Any = None
+        self.service_batcher: Optional[ServiceCallBatcher] = None
+        if service_batch_window > 0:
+            self.service_batcher = ServiceCallBatcher(self.call_service, window=service_batch_window)
+        # Concurrent identical GETs share one upstream request
+        self.single_flight = SingleFlight()
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
         
-        # Configure session with retry logic
+        # Pooled session; retries are handled per call in _request
         self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST"]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -57,14 +159,7 @@ class HomeAssistantClient:
             Dict with connection status and info
         """
         try:
-            response = self.session.get(
-                f"{self.url}/api/",
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json("/api/")
             logger.info(f"Successfully connected to Home Assistant: {data.get('message', 'OK')}")
             return {
                 "success": True,
@@ -79,24 +174,339 @@ class HomeAssistantClient:
                 "error": str(e)
             }
 
+    def _get_json(self, path: str, priority: Optional[Priority] = None) -> Any:
+        """Send a GET request and return the decoded body.
+
+        Concurrent calls for the same path wait on a single upstream request
+        and all receive its result, so callers must not mutate it.
+
+        Args:
+            path: API path (e.g., /api/states)
+            priority: Default priority class, see ``_request``
+
+        Returns:
+            Decoded response body
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        return self.single_flight.do(path, lambda: self._fetch_json(path, priority))
+
+    def _fetch_json(self, path: str, priority: Optional[Priority] = None) -> Any:
+        """Send a GET request without coalescing and return the decoded body."""
+        return self._request("GET", path, priority=priority).json()
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]] = None,
+        budget: Optional[float] = None,
+        stream: bool = False,
+        priority: Optional[Priority] = None
+    ) -> requests.Response:
+        """Send a request within a latency budget, retrying where it is safe.
+
+        GETs are retried on connection errors, timeouts and 429/5xx responses.
+        Other methods are only retried when the connection could not be
+        established, so a service call is never run twice. While the circuit
+        breaker is open requests fail immediately. With a scheduler each
+        attempt first waits for a slot in its priority class, and fails with
+        a timeout if none is free before the budget runs out.
+
+        Args:
+            method: HTTP method
+            path: API path (e.g., /api/states)
+            json: Optional JSON body
+            budget: Total seconds for all attempts, defaults to ``request_budget``
+            stream: Return as soon as the headers arrive and leave the body unread
+            priority: Priority class used unless the caller set one with
+                ``request_priority``, defaults to automation
+
+        Returns:
+            Successful response
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        deadline = time.monotonic() + (budget or self.request_budget)
+        priority = self._resolve_priority(priority)
+        attempt = 0
+        while True:
+            # Fail fast instead of queueing for a slot while the circuit is open
+            if self.circuit_breaker.state == CircuitBreaker.OPEN:
+                raise self._circuit_open_error()
+
+            # Whether the circuit breaker let this attempt through and expects its outcome
+            admitted = False
+            try:
+                with self.scheduler.slot(priority, deadline) if self.scheduler else nullcontext():
+                    timeout = min(self.timeout, deadline - time.monotonic())
+                    if timeout <= 0:
+                        raise requests.exceptions.Timeout(f"Request budget exhausted before sending {method} {path}")
+                    # Checked once the request can be sent, so a half-open trial is never
+                    # taken by a request that then times out waiting for a slot
+                    if not self.circuit_breaker.allow():
+                        raise self._circuit_open_error()
+                    admitted = True
+                    response = self._attempt(method, path, json, timeout, stream)
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                response.raise_for_status()
+                return response
+            except SchedulerTimeoutError as e:
+                # Not Home Assistant's fault, so the circuit breaker is left alone
+                raise requests.exceptions.Timeout(f"{method} {path} not sent: {e}") from e
+            except requests.exceptions.RequestException as e:
+                if not admitted:
+                    raise
+                if not isinstance(e, requests.exceptions.HTTPError):
+                    self.circuit_breaker.record_failure()
+                if method == "GET":
+                    retryable = not isinstance(e, requests.exceptions.HTTPError) or (
+                        e.response is not None and e.response.status_code in RETRYABLE_STATUS_CODES
+                    )
+                else:
+                    retryable = isinstance(e, requests.exceptions.ConnectTimeout)
+
+                delay = 0.1 * 2 ** attempt * random.uniform(0.5, 1.5)  # nosec B311
+                if not retryable or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    raise
+                attempt += 1
+                logger.debug(f"Retrying {method} {path} in {delay:.2f}s (attempt {attempt}): {e}")
+                time.sleep(delay)
+            except BaseException:
+                if admitted:
+                    self.circuit_breaker.release_trial()
+                raise
+
+    def _circuit_open_error(self) -> HomeAssistantUnavailableError:
+        """Build the error raised while the circuit breaker refuses requests."""
+        return HomeAssistantUnavailableError(
+            f"Home Assistant circuit open, retry in {self.circuit_breaker.retry_after():.0f}s"
+        )
+
+    @staticmethod
+    def _resolve_priority(priority: Optional[Priority]) -> Priority:
+        """Get the caller's ``request_priority``, else the given default, else automation."""
+        if current_priority() is not None:
+            return current_priority()
+        return Priority.AUTOMATION if priority is None else priority
+
+    def _attempt(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]],
+        timeout: float,
+        stream: bool
+    ) -> requests.Response:
+        """Send one attempt of a request, hedging GETs when enabled."""
+        if method == "GET" and self._hedge_executor and not stream:
+            return self._send_hedged(path, timeout)
+        return self._send(method, path, json, timeout, stream)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]],
+        timeout: float,
+        stream: bool = False
+    ) -> requests.Response:
+        """Send one request and record its latency."""
+        started = time.monotonic()
+        response = self.session.request(
+            method,
+            f"{self.url}{path}",
+            headers=self.headers,
+            json=json,
+            verify=self.verify_ssl,
+            timeout=timeout,
+            stream=stream
+        )
+        self.latency.record(time.monotonic() - started)
+        return response
+
+    def _send_hedged(self, path: str, timeout: float) -> requests.Response:
+        """Send a GET and, if it is slower than p95, race a second copy of it."""
+        hedge_delay = self.latency.percentile(95)
+        if hedge_delay is None or hedge_delay >= timeout:
+            return self._send("GET", path, None, timeout)
+
+        assert self._hedge_executor is not None
+        pending = {self._hedge_executor.submit(self._send, "GET", path, None, timeout)}
+        done, _ = wait(pending, timeout=hedge_delay)
+        if not done:
+            logger.debug(f"Hedging GET {path} after {hedge_delay:.3f}s")
+            pending.add(self._hedge_executor.submit(self._send, "GET", path, None, timeout - hedge_delay))
+
+        error: Exception = requests.exceptions.Timeout(f"Hedged GET {path} did not complete")
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+                    continue
+                # Release the pooled connections of the copies that lost the race
+                for other in (done | pending) - {future}:
+                    other.add_done_callback(self._close_response)
+                return response
+        raise error
+
+    @staticmethod
+    def _close_response(future: Future) -> None:
+        """Close the response of a finished hedged request."""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _fetch_state(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch an entity state over REST, returning None for unknown entities."""
+        try:
+            return self._get_json(f"/api/states/{entity_id}")
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    def _get_cache_ttl(self, key: str) -> float:
+        """Get the cache TTL for an entity ID (by domain) or the full state list."""
+        assert self.state_cache is not None
+        return self.cache_domain_ttls.get(key.split('.')[0], self.state_cache.ttl)
+
+    def get_states_with_meta(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Get all entity states along with where they came from and how old they are.
+
+        Returns:
+            Tuple of entity states and metadata with ``source`` (mirror, cache
+            or upstream), ``stale`` and ``age`` in seconds
+        """
+        if self.state_mirror and self.state_mirror.synced:
+            return self.state_mirror.get_states(), {"source": "mirror", "stale": False, "age": 0.0}
+
+        try:
+            if self.state_cache:
+                return self.state_cache.get(
+                    "states", lambda: self._get_json("/api/states", Priority.BACKGROUND)
+                )
+            states = self._get_json("/api/states", Priority.BACKGROUND)
+            return states, {"source": "upstream", "stale": False, "age": 0.0}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to get states: {e}")
+            return [], {"source": "upstream", "stale": False, "age": None, "error": str(e)}
+
+    def get_state_with_meta(self, entity_id: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Get an entity state along with where it came from and how old it is.
+
+        Args:
+            entity_id: Entity ID (e.g., light.living_room)
+
+        Returns:
+            Tuple of entity state (None if not found) and metadata as in
+            ``get_states_with_meta``
+        """
+        if self.state_mirror and self.state_mirror.synced:
+            return self.state_mirror.get_state(entity_id), {"source": "mirror", "stale": False, "age": 0.0}
+
+        try:
+            if self.state_cache:
+                return self.state_cache.get(entity_id, lambda: self._fetch_state(entity_id))
+            return self._fetch_state(entity_id), {"source": "upstream", "stale": False, "age": 0.0}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to get state for {entity_id}: {e}")
+            return None, {"source": "upstream", "stale": False, "age": None, "error": str(e)}
+
     def get_states(self) -> List[Dict[str, Any]]:
         """Get all entity states from Home Assistant.
 
+        Served from the state mirror while it is in sync, otherwise via REST
+        through the state cache when one is configured.
+
         Returns:
             List of entity states
         """
+        return self.get_states_with_meta()[0]
+
+    def iter_states(
+        self,
+        domains: Optional[Iterable[str]] = None,
+        entity_pattern: Optional[str] = None,
+        area: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over entity states, optionally filtered.
+
+        With a loaded registry, domain and area filters are resolved from
+        its index and only the matching states are read from the mirror.
+        Without an in-sync state mirror the /api/states body is streamed
+        and parsed incrementally, so states are yielded as they arrive and
+        non-matching ones are never kept.
+
+        Args:
+            domains: Domains to include (e.g., ["light", "switch"]), all if empty
+            entity_pattern: Shell-style entity ID pattern (e.g., sensor.*_temperature)
+            area: Area ID or name to include; requires a loaded registry
+
+        Returns:
+            Iterator over matching entity states
+        """
+        state_filter = StateFilter(domains, entity_pattern)
+        registry_loaded = bool(self.registry and self.registry.loaded)
+        mirror_synced = bool(self.state_mirror and self.state_mirror.synced)
+
+        candidates: Optional[List[str]] = None
+        if area is not None:
+            if not registry_loaded:
+                logger.warning(f"Cannot filter states by area {area}: registry not loaded")
+                return
+            assert self.registry is not None
+            candidates = self.registry.entities_in_area(area, domains)
+        elif domains and registry_loaded and mirror_synced:
+            assert self.registry is not None
+            candidates = [entity_id for domain in domains for entity_id in self.registry.entities_in_domain(domain)]
+
+        if mirror_synced:
+            assert self.state_mirror is not None
+            if candidates is None:
+                states: Iterable[Dict[str, Any]] = self.state_mirror.get_states()
+            else:
+                states = filter(None, (self.state_mirror.get_state(entity_id) for entity_id in candidates))
+            for state in states:
+                if state_filter.matches(state):
+                    yield state
+            return
+
+        wanted = set(candidates) if candidates is not None else None
         try:
-            response = self.session.get(
-                f"{self.url}/api/states",
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to get states: {e}")
-            return []
+            for state in self.stream_states(domains, entity_pattern):
+                if wanted is None or state.get("entity_id") in wanted:
+                    yield state
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Failed to stream states: {e}")
+
+    def stream_states(
+        self,
+        domains: Optional[Iterable[str]] = None,
+        entity_pattern: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream entity states from Home Assistant, bypassing the mirror and cache.
+
+        Args:
+            domains: Domains to include, all if empty
+            entity_pattern: Shell-style entity ID pattern
+
+        Returns:
+            Iterator over matching entity states as they are parsed
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+            ValueError: If the body is not a complete state list
+        """
+        with self._request("GET", "/api/states", stream=True, priority=Priority.BACKGROUND) as response:
+            yield from iter_states(response.iter_content(chunk_size=65536), domains, entity_pattern)
 
     def get_state(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get state of a specific entity.
@@ -107,18 +517,7 @@ class HomeAssistantClient:
         Returns:
             Entity state or None if not found
         """
-        try:
-            response = self.session.get(
-                f"{self.url}/api/states/{entity_id}",
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to get state for {entity_id}: {e}")
-            return None
+        return self.get_state_with_meta(entity_id)[0]
 
     def call_service(
         self,
@@ -136,15 +535,13 @@ class HomeAssistantClient:
         Returns:
             Response from service call
         """
+        refused = self._refuse_unknown_service(domain, service)
+        if refused:
+            return refused
+
         try:
-            response = self.session.post(
-                f"{self.url}/api/services/{domain}/{service}",
-                headers=self.headers,
-                json=service_data or {},
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            response = self._request("POST", f"/api/services/{domain}/{service}", json=service_data or {})
+            self._invalidate_cached_states(service_data)
             logger.info(f"Successfully called service {domain}.{service}")
             return {
                 "success": True,
@@ -159,6 +556,168 @@ class HomeAssistantClient:
                 "error": str(e)
             }
 
+    def _refuse_unknown_service(self, domain: str, service: str) -> Optional[Dict[str, Any]]:
+        """Get the failure result for a service Home Assistant does not offer, if validating."""
+        if self.validate_services and self.has_service(domain, service) is False:
+            logger.warning(f"Refusing to call unknown service {domain}.{service}")
+            return {
+                "success": False,
+                "message": f"Unknown service {domain}.{service}",
+                "error": "unknown_service"
+            }
+        return None
+
+    def _invalidate_cached_states(self, service_data: Optional[Dict[str, Any]]) -> None:
+        """Drop cached states a service call may have changed."""
+        if not self.state_cache:
+            return
+
+        entity_ids = (service_data or {}).get("entity_id") or []
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        self.state_cache.invalidate("states", *entity_ids)
+
+    def call_services(self, calls: Iterable[ServiceCall]) -> List[Dict[str, Any]]:
+        """Call several services, concurrently when an async client is attached.
+
+        The async client shares this client's circuit breaker and request
+        budget, and unknown services are refused before anything is sent.
+
+        Args:
+            calls: (domain, service, service_data) tuples
+
+        Returns:
+            Results in the same order as ``calls``
+        """
+        calls = list(calls)
+        if not (self.async_client and self.event_loop):
+            return [self.call_service(domain, service, data) for domain, service, data in calls]
+
+        results: List[Optional[Dict[str, Any]]] = [
+            self._refuse_unknown_service(domain, service) for domain, service, _ in calls
+        ]
+        to_send = [index for index, result in enumerate(results) if result is None]
+        if to_send:
+            sent = self._run_bulk([calls[index] for index in to_send])
+            for index, result in zip(to_send, sent):
+                results[index] = result
+                self._invalidate_cached_states(calls[index][2])
+        return [result for result in results if result is not None]
+
+    def _run_bulk(self, calls: List[ServiceCall]) -> List[Dict[str, Any]]:
+        """Send calls through the async client, holding one scheduler slot for the batch."""
+        assert self.async_client is not None and self.event_loop is not None
+        if not self.scheduler:
+            return self.event_loop.run(self.async_client.call_services(calls, timeout=self.request_budget))
+
+        deadline = time.monotonic() + self.request_budget
+        try:
+            with self.scheduler.slot(self._resolve_priority(None), deadline):
+                # Spend only what queueing left of the budget
+                return self.event_loop.run(self.async_client.call_services(
+                    calls, timeout=max(0.001, deadline - time.monotonic())
+                ))
+        except SchedulerTimeoutError as e:
+            logger.error(f"Failed to call {len(calls)} services: {e}")
+            return [
+                {
+                    "success": False,
+                    "message": f"Service call failed: {str(e)}",
+                    "error": str(e)
+                }
+                for _ in calls
+            ]
+
+    def control_entities(
+        self,
+        action: str,
+        entity_ids: Iterable[str],
+        **kwargs: Any
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run the same action (turn_on, turn_off, toggle) on several entities.
+
+        Args:
+            action: Service name to call in each entity's domain
+            entity_ids: Entity IDs to control
+            **kwargs: Additional service data for every entity
+
+        Returns:
+            Mapping of entity ID to service call result
+        """
+        entity_ids = list(entity_ids)
+        if self.service_batcher:
+            # One call per domain with an entity list, results split per entity
+            by_domain: Dict[str, List[str]] = {}
+            for entity_id in entity_ids:
+                by_domain.setdefault(entity_id.split('.')[0], []).append(entity_id)
+            calls = [
+                (domain, action, {"entity_id": ids, **kwargs})
+                for domain, ids in by_domain.items()
+            ]
+            results = dict(zip(by_domain, self.call_services(calls)))
+            return {
+                entity_id: result_for_entity(results[entity_id.split('.')[0]], entity_id)
+                for entity_id in entity_ids
+            }
+
+        calls = [
+            (entity_id.split('.')[0], action, {"entity_id": entity_id, **kwargs})
+            for entity_id in entity_ids
+        ]
+        return dict(zip(entity_ids, self.call_services(calls)))
+
+    def control_area(
+        self,
+        action: str,
+        area: str,
+        domains: Optional[Iterable[str]] = None,
+        **kwargs: Any
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run an action (turn_on, turn_off, toggle) on every entity in an area.
+
+        Entities are resolved from the registry index, so no state lookups
+        are needed before sending the calls. Without ``domains`` only
+        entities whose domain offers the action are targeted, so sensors
+        and other read-only entities are skipped.
+
+        Args:
+            action: Service name to call in each entity's domain
+            area: Area ID or name
+            domains: Optional domains to restrict to (e.g., ["light"]),
+                defaults to the domains offering ``action``
+            **kwargs: Additional service data for every entity
+
+        Returns:
+            Mapping of entity ID to service call result, empty if the area is
+            unknown or has no matching entities
+        """
+        if not (self.registry and self.registry.loaded):
+            logger.warning(f"Cannot control area {area}: registry not loaded")
+            return {}
+
+        entity_ids = self.registry.entities_in_area(area, domains)
+        if domains is None:
+            offered = {
+                domain: self._domain_offers(domain, action)
+                for domain in {entity_id.split('.')[0] for entity_id in entity_ids}
+            }
+            entity_ids = [entity_id for entity_id in entity_ids if offered[entity_id.split('.')[0]]]
+        return self.control_entities(action, entity_ids, **kwargs)
+
+    def _domain_offers(self, domain: str, service: str) -> bool:
+        """Whether a domain offers a service, judged by its name when services are not loaded."""
+        offered = self.has_service(domain, service)
+        if offered is None:
+            return domain in AREA_CONTROL_DOMAINS
+        return offered
+
+    def _call_entity_service(self, service: str, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
+        """Call a service in the entity's domain, batched when a batcher is configured."""
+        domain = entity_id.split('.')[0]
+        if self.service_batcher:
+            return self.service_batcher.call(domain, service, entity_id, kwargs)
+        return self.call_service(domain, service, {"entity_id": entity_id, **kwargs})
+
     def turn_on(self, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
         """Turn on an entity.
 
@@ -169,9 +728,7 @@ class HomeAssistantClient:
         Returns:
             Response from service call
         """
-        domain = entity_id.split('.')[0]
-        service_data = {"entity_id": entity_id, **kwargs}
-        return self.call_service(domain, "turn_on", service_data)
+        return self._call_entity_service("turn_on", entity_id, **kwargs)
 
     def turn_off(self, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
         """Turn off an entity.
@@ -183,9 +740,7 @@ class HomeAssistantClient:
         Returns:
             Response from service call
         """
-        domain = entity_id.split('.')[0]
-        service_data = {"entity_id": entity_id, **kwargs}
-        return self.call_service(domain, "turn_off", service_data)
+        return self._call_entity_service("turn_off", entity_id, **kwargs)
 
     def toggle(self, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
         """Toggle an entity.
@@ -197,9 +752,7 @@ class HomeAssistantClient:
         Returns:
             Response from service call
         """
-        domain = entity_id.split('.')[0]
-        service_data = {"entity_id": entity_id, **kwargs}
-        return self.call_service(domain, "toggle", service_data)
+        return self._call_entity_service("toggle", entity_id, **kwargs)
 
     def set_temperature(self, entity_id: str, temperature: float) -> Dict[str, Any]:
         """Set temperature for a climate entity.
@@ -220,18 +773,15 @@ class HomeAssistantClient:
     def get_services(self) -> Dict[str, Any]:
         """Get all available services.
 
+        Memoized when a metadata TTL is configured.
+
         Returns:
             Dictionary of available services
         """
         try:
-            response = self.session.get(
-                f"{self.url}/api/services",
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
+            if self.metadata_cache:
+                return self.metadata_cache.get("services", lambda: self._get_json("/api/services"))[0]
+            return self._get_json("/api/services")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get services: {e}")
             return {}
@@ -239,18 +789,68 @@ class HomeAssistantClient:
     def get_config(self) -> Dict[str, Any]:
         """Get Home Assistant configuration.
 
+        Memoized when a metadata TTL is configured.
+
         Returns:
             Configuration dictionary
         """
         try:
-            response = self.session.get(
-                f"{self.url}/api/config",
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
+            if self.metadata_cache:
+                return self.metadata_cache.get("config", lambda: self._get_json("/api/config"))[0]
+            return self._get_json("/api/config")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get config: {e}")
             return {}
+
+    def services_by_domain(self) -> Dict[str, Dict[str, Any]]:
+        """Get available services indexed by domain.
+
+        The index is rebuilt only when the services payload changes.
+
+        Returns:
+            Mapping of domain to its services and their field descriptions
+        """
+        services = self.get_services()
+        if services is not self._services_index_source:
+            index: Dict[str, Dict[str, Any]] = {}
+            if isinstance(services, list):
+                for item in services:
+                    if isinstance(item, dict) and "domain" in item:
+                        index[item["domain"]] = item.get("services", {})
+            self._services_index = index
+            self._services_index_source = services
+        return self._services_index
+
+    def has_service(self, domain: str, service: str) -> Optional[bool]:
+        """Check whether Home Assistant offers a service.
+
+        Args:
+            domain: Service domain (e.g., light, switch)
+            service: Service name (e.g., turn_on, turn_off)
+
+        Returns:
+            Whether the service exists, None if services could not be loaded
+        """
+        index = self.services_by_domain()
+        if not index:
+            return None
+        return service in index.get(domain, {})
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Refresh memoized metadata after Home Assistant reports a change.
+
+        Registered as a state mirror listener, so it runs on the event loop
+        thread and only schedules the reload.
+
+        Args:
+            event: Home Assistant event dictionary
+        """
+        if not self.metadata_cache:
+            return
+
+        loaders = {
+            "services": lambda: self._get_json("/api/services", Priority.BACKGROUND),
+            "config": lambda: self._get_json("/api/config", Priority.BACKGROUND),
+        }
+        for key in METADATA_EVENTS.get(event.get("event_type", ""), ()):
+            self.metadata_cache.refresh(key, loaders[key])
@@ -0,0 +1,392 @@
+"""Asyncio Home Assistant client for HOME-AI-AUTOMATION."""
+
+import asyncio
+import logging
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from home_automation.core.resilience import CircuitBreaker
+
+
+logger = logging.getLogger(__name__)
+
+ServiceCall = Tuple[str, str, Optional[Dict[str, Any]]]
+
+# Responses that mean Home Assistant is unhealthy rather than the request being wrong
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HomeAssistantCircuitOpenError(aiohttp.ClientError):
+    """Request refused because the circuit breaker is open."""
+
+
+class AsyncHomeAssistantClient:
+    """Asyncio client for the Home Assistant REST API.
+
+    Requests share one pooled connector and a semaphore caps how many run
+    at once, so fan-out over many entities runs concurrently without
+    flooding Home Assistant. Like the sync client, every request runs within
+    a latency budget, retries only where it is safe and respects the
+    circuit breaker, which the sync client shares with this one.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        verify_ssl: bool = False,
+        timeout: float = 10,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        request_budget: Optional[float] = None,
+        max_retries: int = 2,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        """Initialize async Home Assistant client.
+
+        Args:
+            url: Home Assistant URL (e.g., http://192.168.1.134:8123)
+            token: Long-lived access token
+            verify_ssl: Whether to verify SSL certificates
+            timeout: Default request timeout in seconds
+            max_connections: Size of the keep-alive connection pool
+            max_concurrency: Maximum number of requests in flight
+            request_budget: Total seconds a call may spend including retries,
+                defaults to ``timeout``
+            max_retries: Retries within the budget; GETs are retried on
+                connection errors, timeouts and 429/5xx responses, other
+                methods only when the connection could not be established
+            circuit_breaker: Optional breaker refusing requests while Home
+                Assistant keeps failing
+        """
+        self.url = url.rstrip('/')
+        self.token = token
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.request_budget = request_budget or timeout
+        self.max_retries = max_retries
+        self.circuit_breaker = circuit_breaker
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncHomeAssistantClient":
+        """Async context manager entry."""
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, creating it on the running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ssl=self.verify_ssl,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its connections."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Send a request within a latency budget and return the decoded JSON body.
+
+        Args:
+            method: HTTP method
+            path: API path (e.g., /api/states)
+            json: Optional JSON body
+            timeout: Total seconds for all attempts, defaults to ``request_budget``
+
+        Returns:
+            Decoded response body
+
+        Raises:
+            aiohttp.ClientError: If the request fails or the circuit is open
+            asyncio.TimeoutError: If the budget runs out
+        """
+        session = await self._get_session()
+        assert self._semaphore is not None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.request_budget)
+        attempt = 0
+        while True:
+            # Fail fast instead of queueing for the semaphore while the circuit is open
+            if self.circuit_breaker and self.circuit_breaker.state == CircuitBreaker.OPEN:
+                raise self._circuit_open_error()
+
+            async with self._semaphore:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError(f"Request budget exhausted before sending {method} {path}")
+                # Checked once the request can be sent, so a half-open trial is never
+                # taken by a request that is then cancelled or runs out of budget while queued
+                if self.circuit_breaker and not self.circuit_breaker.allow():
+                    raise self._circuit_open_error()
+                client_timeout = aiohttp.ClientTimeout(total=min(self.timeout, remaining))
+                try:
+                    async with session.request(
+                        method, f"{self.url}{path}", json=json, timeout=client_timeout
+                    ) as response:
+                        self._record_status(response.status)
+                        response.raise_for_status()
+                        return await response.json()
+                except aiohttp.ClientResponseError as e:
+                    retryable = method == "GET" and e.status in RETRYABLE_STATUS_CODES
+                    error: Exception = e
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if self.circuit_breaker:
+                        self.circuit_breaker.record_failure()
+                    retryable = method == "GET" or isinstance(e, aiohttp.ClientConnectorError)
+                    error = e
+                except BaseException:
+                    # Cancelled or failed locally; says nothing about Home Assistant
+                    if self.circuit_breaker:
+                        self.circuit_breaker.release_trial()
+                    raise
+
+            delay = 0.1 * 2 ** attempt * random.uniform(0.5, 1.5)  # nosec B311
+            if not retryable or attempt >= self.max_retries or loop.time() + delay >= deadline:
+                raise error
+            attempt += 1
+            logger.debug(f"Retrying {method} {path} in {delay:.2f}s (attempt {attempt}): {error}")
+            await asyncio.sleep(delay)
+
+    def _circuit_open_error(self) -> HomeAssistantCircuitOpenError:
+        """Build the error raised while the circuit breaker refuses requests."""
+        assert self.circuit_breaker is not None
+        return HomeAssistantCircuitOpenError(
+            f"Home Assistant circuit open, retry in {self.circuit_breaker.retry_after():.0f}s"
+        )
+
+    def _record_status(self, status: int) -> None:
+        """Record a response in the circuit breaker; only 429/5xx count as failures."""
+        if not self.circuit_breaker:
+            return
+        if status in RETRYABLE_STATUS_CODES:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """Test connection to Home Assistant.
+
+        Returns:
+            Dict with connection status and info
+        """
+        try:
+            data = await self._request("GET", "/api/")
+            return {
+                "success": True,
+                "message": "Connected to Home Assistant",
+                "data": data
+            }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to connect to Home Assistant: {e}")
+            return {
+                "success": False,
+                "message": f"Connection failed: {str(e)}",
+                "error": str(e)
+            }
+
+    async def get_states(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Get all entity states from Home Assistant.
+
+        Args:
+            timeout: Seconds the call may take including retries
+
+        Returns:
+            List of entity states
+        """
+        try:
+            return await self._request("GET", "/api/states", timeout=timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to get states: {e}")
+            return []
+
+    async def get_state(self, entity_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Get state of a specific entity.
+
+        Args:
+            entity_id: Entity ID (e.g., light.living_room)
+            timeout: Seconds the call may take including retries
+
+        Returns:
+            Entity state or None if not found
+        """
+        try:
+            return await self._request("GET", f"/api/states/{entity_id}", timeout=timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to get state for {entity_id}: {e}")
+            return None
+
+    async def get_states_for(
+        self,
+        entity_ids: Iterable[str],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get the states of several entities concurrently.
+
+        Args:
+            entity_ids: Entity IDs to look up
+            timeout: Seconds each lookup may take including retries
+
+        Returns:
+            Mapping of entity ID to state, None where not found
+        """
+        entity_ids = list(entity_ids)
+        states = await asyncio.gather(*(self.get_state(entity_id, timeout) for entity_id in entity_ids))
+        return dict(zip(entity_ids, states))
+
+    async def call_service(
+        self,
+        domain: str,
+        service: str,
+        service_data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Call a Home Assistant service.
+
+        Args:
+            domain: Service domain (e.g., light, switch)
+            service: Service name (e.g., turn_on, turn_off)
+            service_data: Optional service data
+            timeout: Seconds the call may take including retries
+
+        Returns:
+            Response from service call
+        """
+        try:
+            data = await self._request(
+                "POST", f"/api/services/{domain}/{service}", json=service_data or {}, timeout=timeout
+            )
+            logger.info(f"Successfully called service {domain}.{service}")
+            return {
+                "success": True,
+                "message": f"Service {domain}.{service} called successfully",
+                "data": data
+            }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = str(e) or type(e).__name__
+            logger.error(f"Failed to call service {domain}.{service}: {error}")
+            return {
+                "success": False,
+                "message": f"Service call failed: {error}",
+                "error": error
+            }
+
+    async def call_services(
+        self,
+        calls: Iterable[ServiceCall],
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Call several services concurrently.
+
+        Args:
+            calls: (domain, service, service_data) tuples
+            timeout: Seconds each call may take including retries
+
+        Returns:
+            Results in the same order as ``calls``
+        """
+        return list(await asyncio.gather(
+            *(self.call_service(domain, service, data, timeout) for domain, service, data in calls)
+        ))
+
+    async def turn_on(self, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
+        """Turn on an entity.
+
+        Args:
+            entity_id: Entity ID to turn on
+            **kwargs: Additional service data (brightness, color, etc.)
+
+        Returns:
+            Response from service call
+        """
+        domain = entity_id.split('.')[0]
+        return await self.call_service(domain, "turn_on", {"entity_id": entity_id, **kwargs})
+
+    async def turn_off(self, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
+        """Turn off an entity.
+
+        Args:
+            entity_id: Entity ID to turn off
+            **kwargs: Additional service data
+
+        Returns:
+            Response from service call
+        """
+        domain = entity_id.split('.')[0]
+        return await self.call_service(domain, "turn_off", {"entity_id": entity_id, **kwargs})
+
+    async def toggle(self, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
+        """Toggle an entity.
+
+        Args:
+            entity_id: Entity ID to toggle
+            **kwargs: Additional service data
+
+        Returns:
+            Response from service call
+        """
+        domain = entity_id.split('.')[0]
+        return await self.call_service(domain, "toggle", {"entity_id": entity_id, **kwargs})
+
+    async def set_temperature(self, entity_id: str, temperature: float) -> Dict[str, Any]:
+        """Set temperature for a climate entity.
+
+        Args:
+            entity_id: Climate entity ID
+            temperature: Target temperature
+
+        Returns:
+            Response from service call
+        """
+        return await self.call_service(
+            "climate", "set_temperature", {"entity_id": entity_id, "temperature": temperature}
+        )
+
+    async def get_services(self) -> Dict[str, Any]:
+        """Get all available services.
+
+        Returns:
+            Dictionary of available services
+        """
+        try:
+            return await self._request("GET", "/api/services")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to get services: {e}")
+            return {}
+
+    async def get_config(self) -> Dict[str, Any]:
+        """Get Home Assistant configuration.
+
+        Returns:
+            Configuration dictionary
+        """
+        try:
+            return await self._request("GET", "/api/config")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to get config: {e}")
+            return {}
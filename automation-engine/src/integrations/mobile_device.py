@@ -4,7 +4,7 @@ import logging
 import socket
 import subprocess
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 
@@ -61,6 +61,24 @@ class MobileDevice:
             **self.additional_params
         }
 
+    def update_from(self, other: "MobileDevice") -> None:
+        """Update this device in place from another definition of it.
+
+        The connection flag is kept unless the connection settings changed.
+
+        Args:
+            other: Device carrying the new settings
+        """
+        if (other.ip_address, other.port, other.connection_method) != (
+            self.ip_address, self.port, self.connection_method
+        ):
+            self.connected = False
+        self.name = other.name
+        self.ip_address = other.ip_address
+        self.port = other.port
+        self.connection_method = other.connection_method
+        self.additional_params = other.additional_params
+
 
 class MobileDeviceManager:
     """Manager for mobile device connections."""
@@ -93,6 +111,38 @@ class MobileDeviceManager:
             return True
         return False
 
+    def sync_devices(self, devices: List[MobileDevice]) -> Dict[str, List[str]]:
+        """Reconcile managed devices with a freshly loaded device list.
+
+        Devices are matched by device ID. New devices are added, missing ones
+        are removed and changed ones are updated in place.
+
+        Args:
+            devices: Complete list of devices that should be managed
+
+        Returns:
+            IDs of added, removed and modified devices
+        """
+        incoming = {device.device_id: device for device in devices}
+        changes: Dict[str, List[str]] = {"added": [], "removed": [], "modified": []}
+
+        for device_id in list(self.devices):
+            if device_id not in incoming:
+                self.remove_device(device_id)
+                changes["removed"].append(device_id)
+
+        for device_id, device in incoming.items():
+            current = self.devices.get(device_id)
+            if current is None:
+                self.add_device(device)
+                changes["added"].append(device_id)
+            elif current.to_dict() != {**device.to_dict(), "connected": current.connected}:
+                current.update_from(device)
+                changes["modified"].append(device_id)
+                logger.info(f"Updated mobile device: {device_id}")
+
+        return changes
+
     def get_device(self, device_id: str) -> Optional[MobileDevice]:
         """Get a device by ID.
 
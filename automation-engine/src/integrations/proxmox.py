@@ -1,15 +1,26 @@
 """Proxmox VE integration for HOME-AI-AUTOMATION."""
 
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from home_automation.core.event_loop import BackgroundEventLoop
+from home_automation.core.single_flight import SingleFlight
+from home_automation.integrations.proxmox_async import AsyncProxmoxVEClient
+from home_automation.integrations.proxmox_snapshot import ClusterResourceIndex, ClusterResourceSnapshot
+
 
 logger = logging.getLogger(__name__)
 
+# Proxmox VE tickets are valid for two hours
+TICKET_LIFETIME = 7200
+
 
 class ProxmoxVEClient:
     """Client for interacting with Proxmox VE API."""
@@ -23,7 +34,12 @@ class ProxmoxVEClient:
         username: Optional[str] = None,
         password: Optional[str] = None,
         token_id: Optional[str] = None,
-        token_secret: Optional[str] = None
+        token_secret: Optional[str] = None,
+        snapshot_ttl: float = 0,
+        snapshot_stale_ttl: float = 60.0,
+        ticket_renew_after: float = 5400.0,
+        async_client: Optional[AsyncProxmoxVEClient] = None,
+        event_loop: Optional[BackgroundEventLoop] = None
     ):
         """Initialize Proxmox VE client.
 
@@ -36,6 +52,13 @@ class ProxmoxVEClient:
             password: Password for authentication
             token_id: API token ID for token authentication (e.g., root@pam!mytoken)
             token_secret: API token secret
+            snapshot_ttl: Seconds a /cluster/resources snapshot answers resource
+                listings and guest summaries before it is refreshed in the
+                background (0 disables)
+            snapshot_stale_ttl: Seconds an expired snapshot is still served while it refreshes
+            ticket_renew_after: Seconds after login the ticket is renewed in the background
+            async_client: Optional asyncio client used to fan out multi-node refreshes
+            event_loop: Background loop the async client runs on
         """
         self.base_url = f"https://{host}:{port}/api2/json"
         self.verify_ssl = verify_ssl
@@ -46,6 +69,23 @@ class ProxmoxVEClient:
         self.token_secret = token_secret
         self.ticket = None
         self.csrf_token = None
+        self.ticket_issued_at: Optional[float] = None
+        self.ticket_renew_after = min(ticket_renew_after, TICKET_LIFETIME - 60)
+        self._auth_lock = threading.Lock()
+        self._renew_timer: Optional[threading.Timer] = None
+        self.async_client = async_client
+        self.event_loop = event_loop
+
+        # Concurrent identical GETs share one upstream request
+        self.single_flight = SingleFlight()
+        # Guest lookups are answered from one indexed /cluster/resources listing
+        self.resource_snapshot: Optional[ClusterResourceSnapshot] = None
+        if snapshot_ttl > 0:
+            self.resource_snapshot = ClusterResourceSnapshot(
+                lambda: self._get("/cluster/resources"),
+                ttl=snapshot_ttl,
+                stale_ttl=snapshot_stale_ttl
+            )
         
         # Configure session with retry logic
         self.session = requests.Session()
@@ -77,6 +117,112 @@ class ProxmoxVEClient:
             
         return headers
 
+    def _get(self, path: str) -> Any:
+        """Send a GET request and return the ``data`` field of the response.
+
+        Concurrent calls for the same path wait on a single upstream request
+        and all receive its result, so callers must not mutate it.
+
+        Args:
+            path: API path below /api2/json (e.g., /nodes)
+
+        Returns:
+            Response data
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        return self.single_flight.do(path, lambda: self._fetch(path))
+
+    def _fetch(self, path: str) -> Any:
+        """Send a GET request without coalescing and return the response data."""
+        return self._request("GET", path).json()["data"]
+
+    def _request(self, method: str, path: str) -> requests.Response:
+        """Send an authenticated request.
+
+        With ticket authentication an expired ticket is renewed before
+        sending, and a 401 response triggers one re-authentication and
+        replay of the request.
+
+        Args:
+            method: HTTP method
+            path: API path below /api2/json (e.g., /nodes)
+
+        Returns:
+            Successful response
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        uses_ticket = bool(self.username and self.password and not (self.token_id and self.token_secret))
+        reauthenticated = False
+        if uses_ticket and self._ticket_expired():
+            self._reauthenticate(self.ticket)
+            reauthenticated = True
+
+        ticket = self.ticket
+        response = self._send(method, path)
+        if response.status_code == 401 and uses_ticket and not reauthenticated:
+            logger.info(f"Proxmox VE rejected the ticket for {method} {path}, re-authenticating")
+            if self._reauthenticate(ticket):
+                response = self._send(method, path)
+        response.raise_for_status()
+        return response
+
+    def _send(self, method: str, path: str) -> requests.Response:
+        """Send one request with the current credentials."""
+        return self.session.request(
+            method,
+            f"{self.base_url}{path}",
+            headers=self._get_headers(),
+            verify=self.verify_ssl,
+            timeout=self.timeout
+        )
+
+    def _ticket_expired(self) -> bool:
+        """Whether the ticket is missing or past its lifetime."""
+        return self.ticket_issued_at is None or time.monotonic() - self.ticket_issued_at >= TICKET_LIFETIME - 60
+
+    def _reauthenticate(self, stale_ticket: Optional[str]) -> bool:
+        """Log in again unless another thread already replaced ``stale_ticket``.
+
+        Returns:
+            Whether a usable ticket is available
+        """
+        with self._auth_lock:
+            if self.ticket != stale_ticket and not self._ticket_expired():
+                return True
+            return self.authenticate()["success"]
+
+    def _schedule_renewal(self, delay: float) -> None:
+        """Renew the ticket in the background after ``delay`` seconds."""
+        if self._renew_timer:
+            self._renew_timer.cancel()
+        self._renew_timer = threading.Timer(delay, self._renew_ticket)
+        self._renew_timer.daemon = True
+        self._renew_timer.start()
+
+    def _renew_ticket(self) -> None:
+        """Timer body: renew the ticket, retrying shortly while it is still valid."""
+        with self._auth_lock:
+            result = self.authenticate()
+            if not result["success"] and not self._ticket_expired():
+                self._schedule_renewal(60)
+
+    def close(self) -> None:
+        """Stop background ticket renewal."""
+        # Waits for a renewal in progress so it cannot schedule the next one afterwards
+        with self._auth_lock:
+            if self._renew_timer:
+                self._renew_timer.cancel()
+                self._renew_timer = None
+
+    def _invalidate_snapshot(self) -> None:
+        """Drop the cluster resource snapshot after a guest changed state."""
+        if self.resource_snapshot:
+            self.resource_snapshot.invalidate()
+
     def authenticate(self) -> Dict[str, Any]:
         """Authenticate with Proxmox VE using username/password.
 
@@ -104,6 +250,8 @@ class ProxmoxVEClient:
             
             self.ticket = data["ticket"]
             self.csrf_token = data["CSRFPreventionToken"]
+            self.ticket_issued_at = time.monotonic()
+            self._schedule_renewal(self.ticket_renew_after)
             
             logger.info(f"Successfully authenticated with Proxmox VE as {self.username}")
             return {
@@ -125,14 +273,7 @@ class ProxmoxVEClient:
             Connection test result
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/version",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()["data"]
+            data = self._get("/version")
             
             logger.info(f"Successfully connected to Proxmox VE version {data.get('version', 'unknown')}")
             return {
@@ -156,14 +297,7 @@ class ProxmoxVEClient:
             List of node information
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/nodes",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()["data"]
+            return self._get("/nodes")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get nodes: {e}")
             return []
@@ -171,6 +305,11 @@ class ProxmoxVEClient:
     def get_vms(self, node: str) -> List[Dict[str, Any]]:
         """Get list of VMs on a node.
 
+        Always fetched from the node, since the per-node listing has fields
+        (cpus, pid, qmpstatus) the resource snapshot lacks. Use
+        ``get_cluster_resources(resource_type="qemu", node=node)`` for the
+        snapshot-backed listing.
+
         Args:
             node: Node name
 
@@ -178,14 +317,7 @@ class ProxmoxVEClient:
             List of VM information
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/nodes/{node}/qemu",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()["data"]
+            return self._get(f"/nodes/{node}/qemu")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get VMs for node {node}: {e}")
             return []
@@ -193,6 +325,8 @@ class ProxmoxVEClient:
     def get_containers(self, node: str) -> List[Dict[str, Any]]:
         """Get list of containers on a node.
 
+        Always fetched from the node, like ``get_vms``.
+
         Args:
             node: Node name
 
@@ -200,14 +334,7 @@ class ProxmoxVEClient:
             List of container information
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/nodes/{node}/lxc",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()["data"]
+            return self._get(f"/nodes/{node}/lxc")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get containers for node {node}: {e}")
             return []
@@ -223,18 +350,35 @@ class ProxmoxVEClient:
             VM status information
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/nodes/{node}/qemu/{vmid}/status/current",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()["data"]
+            return self._get(f"/nodes/{node}/qemu/{vmid}/status/current")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get VM status for {vmid} on {node}: {e}")
             return None
 
+    def get_guest_summary(self, vmid: int) -> Optional[Dict[str, Any]]:
+        """Get the cluster resource entry of a VM or container.
+
+        Answered from the resource snapshot when one is configured. The entry
+        has the same keys as ``get_cluster_resources`` (node, type, status,
+        cpu, mem, ...) but lacks details only ``status/current`` reports,
+        such as qmpstatus, ha and pid.
+
+        Args:
+            vmid: VM or container ID
+
+        Returns:
+            Resource entry or None if no such guest exists
+        """
+        try:
+            if self.resource_snapshot:
+                index, _ = self.resource_snapshot.get_index()
+            else:
+                index = ClusterResourceIndex(self._get("/cluster/resources"))
+            return index.get_guest(vmid)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to get summary of guest {vmid}: {e}")
+            return None
+
     def start_vm(self, node: str, vmid: int) -> Dict[str, Any]:
         """Start a VM.
 
@@ -246,13 +390,8 @@ class ProxmoxVEClient:
             Operation result
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/nodes/{node}/qemu/{vmid}/status/start",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            response = self._request("POST", f"/nodes/{node}/qemu/{vmid}/status/start")
+            self._invalidate_snapshot()
             logger.info(f"Started VM {vmid} on node {node}")
             return {
                 "success": True,
@@ -278,13 +417,8 @@ class ProxmoxVEClient:
             Operation result
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/nodes/{node}/qemu/{vmid}/status/stop",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            response = self._request("POST", f"/nodes/{node}/qemu/{vmid}/status/stop")
+            self._invalidate_snapshot()
             logger.info(f"Stopped VM {vmid} on node {node}")
             return {
                 "success": True,
@@ -310,13 +444,8 @@ class ProxmoxVEClient:
             Operation result
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/nodes/{node}/qemu/{vmid}/status/reboot",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            response = self._request("POST", f"/nodes/{node}/qemu/{vmid}/status/reboot")
+            self._invalidate_snapshot()
             logger.info(f"Restarted VM {vmid} on node {node}")
             return {
                 "success": True,
@@ -342,13 +471,8 @@ class ProxmoxVEClient:
             Operation result
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/nodes/{node}/lxc/{vmid}/status/start",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            response = self._request("POST", f"/nodes/{node}/lxc/{vmid}/status/start")
+            self._invalidate_snapshot()
             logger.info(f"Started container {vmid} on node {node}")
             return {
                 "success": True,
@@ -374,13 +498,8 @@ class ProxmoxVEClient:
             Operation result
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/nodes/{node}/lxc/{vmid}/status/stop",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            response = self._request("POST", f"/nodes/{node}/lxc/{vmid}/status/stop")
+            self._invalidate_snapshot()
             logger.info(f"Stopped container {vmid} on node {node}")
             return {
                 "success": True,
@@ -405,33 +524,147 @@ class ProxmoxVEClient:
             Node status information
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/nodes/{node}/status",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()["data"]
+            return self._get(f"/nodes/{node}/status")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get node status for {node}: {e}")
             return None
 
-    def get_cluster_resources(self) -> List[Dict[str, Any]]:
-        """Get all cluster resources (nodes, VMs, containers).
+    def get_node_statuses(self, nodes: Optional[List[str]] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get the status of several nodes, concurrently when an async client is attached.
+
+        Args:
+            nodes: Node names, all cluster nodes if omitted
+
+        Returns:
+            Mapping of node name to status, None where it could not be fetched
+        """
+        if self.async_client and self.event_loop:
+            return self.event_loop.run(self.async_client.get_node_statuses(nodes))
+        if nodes is None:
+            nodes = [node["node"] for node in self.get_nodes()]
+        return {node: self.get_node_status(node) for node in nodes}
+
+    def get_inventory(self, nodes: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get status, VMs and containers of several nodes, concurrently when an async client is attached.
+
+        Args:
+            nodes: Node names, all cluster nodes if omitted
+
+        Returns:
+            Mapping of node name to a dictionary with ``status``, ``vms`` and ``containers``
+        """
+        if self.async_client and self.event_loop:
+            return self.event_loop.run(self.async_client.get_inventory(nodes))
+        if nodes is None:
+            nodes = [node["node"] for node in self.get_nodes()]
+        return {
+            node: {
+                "status": self.get_node_status(node),
+                "vms": self.get_vms(node),
+                "containers": self.get_containers(node),
+            }
+            for node in nodes
+        }
+
+    def get_task_status(self, node: str, upid: str) -> Dict[str, Any]:
+        """Get the status of a task.
+
+        Args:
+            node: Node the task runs on
+            upid: Task UPID
 
         Returns:
-            List of all cluster resources
+            Task status; ``status`` is "stopped" and ``exitstatus`` set once it finished
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        return self._get(f"/nodes/{node}/tasks/{quote(upid, safe='')}/status")
+
+    def get_active_tasks(self, node: str) -> List[Dict[str, Any]]:
+        """Get the tasks currently running on a node.
+
+        Args:
+            node: Node name
+
+        Returns:
+            List of running tasks
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        return self._get(f"/nodes/{node}/tasks?source=active")
+
+    def get_rrd_data(
+        self,
+        node: str,
+        timeframe: str = "hour",
+        guest_type: Optional[str] = None,
+        vmid: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get averaged RRD statistics of a node or guest.
+
+        Args:
+            node: Node name
+            timeframe: hour (1 minute steps), day (30 minutes), week, month or year
+            guest_type: qemu or lxc for guest statistics, None for the node itself
+            vmid: Guest ID when ``guest_type`` is given
+
+        Returns:
+            Data points with a ``time`` field, oldest first
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        path = f"/nodes/{node}/{guest_type}/{vmid}" if guest_type else f"/nodes/{node}"
+        return self._get(f"{path}/rrddata?timeframe={timeframe}&cf=AVERAGE")
+
+    def get_cluster_resources(
+        self,
+        resource_type: Optional[str] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        pool: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get cluster resources (nodes, VMs, containers), optionally filtered.
+
+        Args:
+            resource_type: Resource type (qemu, lxc, node, storage, ...)
+            node: Node name
+            tag: Guest tag
+            pool: Resource pool
+
+        Returns:
+            List of matching cluster resources
+        """
+        return self.get_cluster_resources_with_meta(resource_type, node, tag, pool)[0]
+
+    def get_cluster_resources_with_meta(
+        self,
+        resource_type: Optional[str] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        pool: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Get filtered cluster resources along with how old the listing is.
+
+        Args:
+            resource_type: Resource type (qemu, lxc, node, storage, ...)
+            node: Node name
+            tag: Guest tag
+            pool: Resource pool
+
+        Returns:
+            Tuple of matching resources and metadata with ``source`` (cache or
+            upstream), ``stale`` and ``age`` in seconds
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/cluster/resources",
-                headers=self._get_headers(),
-                verify=self.verify_ssl,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()["data"]
+            if self.resource_snapshot:
+                index, meta = self.resource_snapshot.get_index()
+            else:
+                index = ClusterResourceIndex(self._get("/cluster/resources"))
+                meta = {"source": "upstream", "stale": False, "age": 0.0}
+            return index.select(resource_type, node, tag, pool), meta
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get cluster resources: {e}")
-            return []
+            return [], {"source": "upstream", "stale": False, "age": None, "error": str(e)}
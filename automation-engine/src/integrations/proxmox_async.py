@@ -0,0 +1,537 @@
+"""Asyncio Proxmox VE client for HOME-AI-AUTOMATION."""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import aiohttp
+
+from home_automation.integrations.proxmox_snapshot import ClusterResourceIndex
+
+
+logger = logging.getLogger(__name__)
+
+# Errors a failed request surfaces as
+REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class AsyncProxmoxVEClient:
+    """Asyncio client for the Proxmox VE API.
+
+    Requests share one pooled keep-alive connector, so fanning out over the
+    nodes of a cluster reuses TLS connections instead of handshaking for
+    every call. A global semaphore caps the requests in flight and a
+    per-node semaphore keeps one busy node from taking all of them.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 8006,
+        verify_ssl: bool = False,
+        timeout: float = 10,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        token_id: Optional[str] = None,
+        token_secret: Optional[str] = None,
+        max_connections: int = 20,
+        max_concurrency: int = 16,
+        node_concurrency: int = 4
+    ):
+        """Initialize async Proxmox VE client.
+
+        Args:
+            host: Proxmox VE host (IP or hostname)
+            port: Proxmox VE port (default: 8006)
+            verify_ssl: Whether to verify SSL certificates
+            timeout: Default request timeout in seconds
+            username: Username for password authentication (e.g., root@pam)
+            password: Password for authentication
+            token_id: API token ID for token authentication (e.g., root@pam!mytoken)
+            token_secret: API token secret
+            max_connections: Size of the keep-alive connection pool
+            max_concurrency: Maximum number of requests in flight
+            node_concurrency: Maximum number of requests in flight for one node
+        """
+        self.base_url = f"https://{host}:{port}/api2/json"
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.username = username
+        self.password = password
+        self.token_id = token_id
+        self.token_secret = token_secret
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.node_concurrency = node_concurrency
+        self.ticket: Optional[str] = None
+        self.csrf_token: Optional[str] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._node_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._auth_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncProxmoxVEClient":
+        """Async context manager entry."""
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+    @property
+    def uses_ticket(self) -> bool:
+        """Whether requests authenticate with a login ticket instead of an API token."""
+        return bool(self.username and self.password and not (self.token_id and self.token_secret))
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, creating it on the running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ssl=self.verify_ssl,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._node_semaphores = {}
+            self._auth_lock = asyncio.Lock()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its connections."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_headers(self, method: str) -> Dict[str, str]:
+        """Get request headers with authentication."""
+        if self.token_id and self.token_secret:
+            return {"Authorization": f"PVEAPIToken={self.token_id}={self.token_secret}"}
+        headers = {}
+        if self.ticket:
+            headers["Cookie"] = f"PVEAuthCookie={self.ticket}"
+            if method != "GET" and self.csrf_token:
+                headers["CSRFPreventionToken"] = self.csrf_token
+        return headers
+
+    def _node_semaphore(self, path: str) -> Optional[asyncio.Semaphore]:
+        """Get the concurrency limiter of the node a path addresses, if any."""
+        parts = path.split("/", 3)
+        if len(parts) < 3 or parts[1] != "nodes" or not parts[2]:
+            return None
+        node = parts[2].split("?", 1)[0]
+        semaphore = self._node_semaphores.get(node)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.node_concurrency)
+            self._node_semaphores[node] = semaphore
+        return semaphore
+
+    async def _request(self, method: str, path: str, timeout: Optional[float] = None) -> Any:
+        """Send an authenticated request and return the ``data`` field of the response.
+
+        With ticket authentication the client logs in before the first
+        request, and a 401 response triggers one re-authentication and
+        replay of the request.
+
+        Args:
+            method: HTTP method
+            path: API path below /api2/json (e.g., /nodes)
+            timeout: Per-call timeout, defaults to the client timeout
+
+        Returns:
+            Response data
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+            asyncio.TimeoutError: If the request times out
+        """
+        await self._get_session()
+        if self.uses_ticket and not self.ticket:
+            await self._reauthenticate(None)
+
+        ticket = self.ticket
+        status, data = await self._send(method, path, timeout, allow_unauthorized=self.uses_ticket)
+        if status == 401:
+            logger.info(f"Proxmox VE rejected the ticket for {method} {path}, re-authenticating")
+            await self._reauthenticate(ticket)
+            status, data = await self._send(method, path, timeout)
+        return data
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        timeout: Optional[float],
+        allow_unauthorized: bool = False
+    ) -> Tuple[int, Any]:
+        """Send one request with the current credentials, limited per node.
+
+        Returns:
+            Tuple of status code and response data; with ``allow_unauthorized``
+            a 401 is returned instead of raised
+        """
+        session = await self._get_session()
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+        node_semaphore = self._node_semaphore(path)
+        # Wait for the node's slot first so requests queued on one busy node
+        # do not hold global slots other nodes could use
+        if node_semaphore:
+            await node_semaphore.acquire()
+        assert self._semaphore is not None
+        try:
+            async with self._semaphore:
+                async with session.request(
+                    method, f"{self.base_url}{path}", headers=self._get_headers(method), timeout=client_timeout
+                ) as response:
+                    if response.status == 401 and allow_unauthorized:
+                        return response.status, None
+                    response.raise_for_status()
+                    return response.status, (await response.json())["data"]
+        finally:
+            if node_semaphore:
+                node_semaphore.release()
+
+    async def _reauthenticate(self, stale_ticket: Optional[str]) -> bool:
+        """Log in again unless another request already replaced ``stale_ticket``.
+
+        Returns:
+            Whether a usable ticket is available
+        """
+        await self._get_session()
+        assert self._auth_lock is not None
+        async with self._auth_lock:
+            if self.ticket and self.ticket != stale_ticket:
+                return True
+            return (await self.authenticate())["success"]
+
+    async def authenticate(self) -> Dict[str, Any]:
+        """Authenticate with Proxmox VE using username/password.
+
+        Returns:
+            Authentication result
+        """
+        if not self.username or not self.password:
+            return {
+                "success": False,
+                "message": "Username and password required for authentication"
+            }
+
+        session = await self._get_session()
+        try:
+            async with session.post(
+                f"{self.base_url}/access/ticket",
+                data={"username": self.username, "password": self.password},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                response.raise_for_status()
+                data = (await response.json())["data"]
+
+            self.ticket = data["ticket"]
+            self.csrf_token = data["CSRFPreventionToken"]
+            logger.info(f"Successfully authenticated with Proxmox VE as {self.username}")
+            return {
+                "success": True,
+                "message": "Authentication successful"
+            }
+        except REQUEST_ERRORS as e:
+            error = str(e) or type(e).__name__
+            logger.error(f"Failed to authenticate with Proxmox VE: {error}")
+            return {
+                "success": False,
+                "message": f"Authentication failed: {error}",
+                "error": error
+            }
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """Test connection to Proxmox VE.
+
+        Returns:
+            Connection test result
+        """
+        try:
+            data = await self._request("GET", "/version")
+            return {
+                "success": True,
+                "message": "Connected to Proxmox VE",
+                "version": data.get("version"),
+                "release": data.get("release")
+            }
+        except REQUEST_ERRORS as e:
+            error = str(e) or type(e).__name__
+            logger.error(f"Failed to connect to Proxmox VE: {error}")
+            return {
+                "success": False,
+                "message": f"Connection failed: {error}",
+                "error": error
+            }
+
+    async def get_nodes(self) -> List[Dict[str, Any]]:
+        """Get list of nodes in the cluster.
+
+        Returns:
+            List of node information
+        """
+        try:
+            return await self._request("GET", "/nodes")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get nodes: {e}")
+            return []
+
+    async def get_vms(self, node: str) -> List[Dict[str, Any]]:
+        """Get list of VMs on a node.
+
+        Args:
+            node: Node name
+
+        Returns:
+            List of VM information
+        """
+        try:
+            return await self._request("GET", f"/nodes/{node}/qemu")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get VMs for node {node}: {e}")
+            return []
+
+    async def get_containers(self, node: str) -> List[Dict[str, Any]]:
+        """Get list of containers on a node.
+
+        Args:
+            node: Node name
+
+        Returns:
+            List of container information
+        """
+        try:
+            return await self._request("GET", f"/nodes/{node}/lxc")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get containers for node {node}: {e}")
+            return []
+
+    async def get_vm_status(self, node: str, vmid: int) -> Optional[Dict[str, Any]]:
+        """Get status of a specific VM.
+
+        Args:
+            node: Node name
+            vmid: VM ID
+
+        Returns:
+            VM status information
+        """
+        try:
+            return await self._request("GET", f"/nodes/{node}/qemu/{vmid}/status/current")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get VM status for {vmid} on {node}: {e}")
+            return None
+
+    async def _control(self, node: str, guest_type: str, vmid: int, action: str) -> Dict[str, Any]:
+        """Start, stop or reboot a VM or container."""
+        label = "VM" if guest_type == "qemu" else "container"
+        verb = "restart" if action == "reboot" else action
+        past = {"start": "Started", "stop": "Stopped", "reboot": "Restarted"}[action]
+        try:
+            data = await self._request("POST", f"/nodes/{node}/{guest_type}/{vmid}/status/{action}")
+            logger.info(f"{past} {label} {vmid} on node {node}")
+            return {
+                "success": True,
+                "message": f"{label[0].upper()}{label[1:]} {vmid} {verb} initiated",
+                "data": data
+            }
+        except REQUEST_ERRORS as e:
+            error = str(e) or type(e).__name__
+            logger.error(f"Failed to {verb} {label} {vmid}: {error}")
+            return {
+                "success": False,
+                "message": f"Failed to {verb} {label}: {error}",
+                "error": error
+            }
+
+    async def start_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Start a VM.
+
+        Args:
+            node: Node name
+            vmid: VM ID
+
+        Returns:
+            Operation result
+        """
+        return await self._control(node, "qemu", vmid, "start")
+
+    async def stop_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Stop a VM.
+
+        Args:
+            node: Node name
+            vmid: VM ID
+
+        Returns:
+            Operation result
+        """
+        return await self._control(node, "qemu", vmid, "stop")
+
+    async def restart_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Restart a VM.
+
+        Args:
+            node: Node name
+            vmid: VM ID
+
+        Returns:
+            Operation result
+        """
+        return await self._control(node, "qemu", vmid, "reboot")
+
+    async def start_container(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Start a container.
+
+        Args:
+            node: Node name
+            vmid: Container ID
+
+        Returns:
+            Operation result
+        """
+        return await self._control(node, "lxc", vmid, "start")
+
+    async def stop_container(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Stop a container.
+
+        Args:
+            node: Node name
+            vmid: Container ID
+
+        Returns:
+            Operation result
+        """
+        return await self._control(node, "lxc", vmid, "stop")
+
+    async def get_node_status(self, node: str) -> Optional[Dict[str, Any]]:
+        """Get status of a node.
+
+        Args:
+            node: Node name
+
+        Returns:
+            Node status information
+        """
+        try:
+            return await self._request("GET", f"/nodes/{node}/status")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get node status for {node}: {e}")
+            return None
+
+    async def get_task_status(self, node: str, upid: str) -> Dict[str, Any]:
+        """Get the status of a task.
+
+        Args:
+            node: Node the task runs on
+            upid: Task UPID
+
+        Returns:
+            Task status; ``status`` is "stopped" and ``exitstatus`` set once it finished
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+        """
+        return await self._request("GET", f"/nodes/{node}/tasks/{quote(upid, safe='')}/status")
+
+    async def get_active_tasks(self, node: str) -> List[Dict[str, Any]]:
+        """Get the tasks currently running on a node.
+
+        Args:
+            node: Node name
+
+        Returns:
+            List of running tasks
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+        """
+        return await self._request("GET", f"/nodes/{node}/tasks?source=active")
+
+    async def get_rrd_data(
+        self,
+        node: str,
+        timeframe: str = "hour",
+        guest_type: Optional[str] = None,
+        vmid: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get averaged RRD statistics of a node or guest.
+
+        Args:
+            node: Node name
+            timeframe: hour (1 minute steps), day (30 minutes), week, month or year
+            guest_type: qemu or lxc for guest statistics, None for the node itself
+            vmid: Guest ID when ``guest_type`` is given
+
+        Returns:
+            Data points with a ``time`` field, oldest first
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+        """
+        path = f"/nodes/{node}/{guest_type}/{vmid}" if guest_type else f"/nodes/{node}"
+        return await self._request("GET", f"{path}/rrddata?timeframe={timeframe}&cf=AVERAGE")
+
+    async def get_cluster_resources(
+        self,
+        resource_type: Optional[str] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        pool: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get cluster resources (nodes, VMs, containers), optionally filtered.
+
+        Args:
+            resource_type: Resource type (qemu, lxc, node, storage, ...)
+            node: Node name
+            tag: Guest tag
+            pool: Resource pool
+
+        Returns:
+            List of matching cluster resources
+        """
+        try:
+            resources = await self._request("GET", "/cluster/resources")
+            return ClusterResourceIndex(resources).select(resource_type, node, tag, pool)
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get cluster resources: {e}")
+            return []
+
+    async def get_node_statuses(self, nodes: Optional[Iterable[str]] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get the status of several nodes concurrently.
+
+        Args:
+            nodes: Node names, all cluster nodes if omitted
+
+        Returns:
+            Mapping of node name to status, None where it could not be fetched
+        """
+        if nodes is None:
+            nodes = [node["node"] for node in await self.get_nodes()]
+        nodes = list(nodes)
+        statuses = await asyncio.gather(*(self.get_node_status(node) for node in nodes))
+        return dict(zip(nodes, statuses))
+
+    async def get_inventory(self, nodes: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get status, VMs and containers of several nodes concurrently.
+
+        Args:
+            nodes: Node names, all cluster nodes if omitted
+
+        Returns:
+            Mapping of node name to a dictionary with ``status``, ``vms`` and ``containers``
+        """
+        if nodes is None:
+            nodes = [node["node"] for node in await self.get_nodes()]
+        nodes = list(nodes)
+        results = await asyncio.gather(*(
+            asyncio.gather(self.get_node_status(node), self.get_vms(node), self.get_containers(node))
+            for node in nodes
+        ))
+        return {
+            node: {"status": status, "vms": vms, "containers": containers}
+            for node, (status, vms, containers) in zip(nodes, results)
+        }
@@ -0,0 +1,370 @@
+"""Bulk Proxmox VE guest operations for HOME-AI-AUTOMATION."""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional
+
+from home_automation.integrations.proxmox_snapshot import GUEST_TYPES, parse_tags
+from home_automation.integrations.proxmox_tasks import ProxmoxTaskTracker
+
+
+logger = logging.getLogger(__name__)
+
+BULK_ACTIONS = ("start", "stop", "restart")
+
+# Guests already in this state are skipped for the action
+SKIP_STATUS = {"start": "running", "stop": "stopped"}
+
+SELECTOR_KEYS = ("vmids", "tags", "pool", "node", "type")
+
+
+def _as_list(value: Any) -> List[Any]:
+    """Wrap a single selector value in a list, leaving lists and tuples as they are."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def _parse_vmid(value: Any) -> int:
+    """Convert a vmid given as number or numeric string, rejecting anything else."""
+    if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Invalid vmid: {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid vmid: {value!r}") from None
+
+
+def parse_selector(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and normalize a guest selector from a request.
+
+    A single vmid or tag may be given instead of a list, and a tag string
+    may hold several tags in Proxmox notation (e.g., "prod;web").
+
+    Args:
+        data: Request data holding any of ``SELECTOR_KEYS``
+
+    Returns:
+        Selector with ``vmids`` as integers and ``tags`` as strings; empty
+        criteria are left out
+
+    Raises:
+        ValueError: If a vmid is not an integer or a criterion has the wrong type
+    """
+    selector: Dict[str, Any] = {}
+    vmids = [_parse_vmid(vmid) for vmid in _as_list(data.get("vmids"))]
+    if vmids:
+        selector["vmids"] = vmids
+    tags = []
+    for tag in _as_list(data.get("tags")):
+        if not isinstance(tag, str):
+            raise ValueError(f"Invalid tag: {tag!r}")
+        tags.extend(parse_tags(tag))
+    if tags:
+        selector["tags"] = tags
+    for key in ("pool", "node", "type"):
+        value = data.get(key)
+        if value is None or value == "":
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f"Invalid {key}: {value!r}")
+        selector[key] = value
+    if selector.get("type") not in (None, *GUEST_TYPES):
+        raise ValueError(f"Invalid type: {selector['type']}, expected one of {', '.join(GUEST_TYPES)}")
+    return selector
+
+
+def parse_order(order: Any) -> List[List[int]]:
+    """Validate the stages of a bulk operation.
+
+    Args:
+        order: List of stages, each a list of vmids (or None for no stages)
+
+    Returns:
+        Stages as lists of integer vmids
+
+    Raises:
+        ValueError: If order is not a list of lists of vmids
+    """
+    if order is None:
+        return []
+    if not isinstance(order, list) or not all(isinstance(stage, list) for stage in order):
+        raise ValueError("order must be a list of lists of vmids")
+    return [[_parse_vmid(vmid) for vmid in stage] for stage in order]
+
+
+def select_guests(resources: Iterable[Dict[str, Any]], selector: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pick the VMs and containers matching a selector.
+
+    Every given criterion must match; a guest matches ``tags`` if it has
+    any of them.
+
+    Args:
+        resources: Entries from /cluster/resources
+        selector: Any of ``vmids``, ``tags``, ``pool``, ``node`` and ``type`` (qemu or lxc)
+
+    Returns:
+        Matching guests ordered by vmid
+    """
+    vmids = {_parse_vmid(vmid) for vmid in _as_list(selector.get("vmids"))}
+    tags = {tag for value in _as_list(selector.get("tags")) for tag in parse_tags(value)}
+    pool = selector.get("pool")
+    node = selector.get("node")
+    guest_type = selector.get("type")
+
+    guests = []
+    for resource in resources:
+        if resource.get("type") not in GUEST_TYPES or resource.get("template"):
+            continue
+        if vmids and int(resource.get("vmid", -1)) not in vmids:
+            continue
+        if tags and not tags.intersection(parse_tags(resource.get("tags"))):
+            continue
+        if pool and resource.get("pool") != pool:
+            continue
+        if node and resource.get("node") != node:
+            continue
+        if guest_type and resource.get("type") != guest_type:
+            continue
+        guests.append(resource)
+    return sorted(guests, key=lambda guest: int(guest["vmid"]))
+
+
+class BulkJob:
+    """Progress of one bulk operation."""
+
+    def __init__(self, action: str, stages: List[List[Dict[str, Any]]]):
+        """Initialize bulk job.
+
+        Args:
+            action: Action applied to every guest
+            stages: Guests grouped into stages that run one after another
+        """
+        self.id = uuid.uuid4().hex
+        self.action = action
+        self.stages = stages
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.results: Dict[int, Dict[str, Any]] = {
+            int(guest["vmid"]): {
+                "vmid": int(guest["vmid"]),
+                "name": guest.get("name"),
+                "node": guest.get("node"),
+                "type": guest.get("type"),
+                "stage": index,
+                "status": "pending",
+            }
+            for index, stage in enumerate(stages)
+            for guest in stage
+        }
+        self._lock = threading.Lock()
+
+    def update(self, vmid: int, **fields: Any) -> None:
+        """Update the result of one guest."""
+        with self._lock:
+            self.results[int(vmid)].update(fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the job with aggregated progress as a JSON-serializable dictionary."""
+        with self._lock:
+            results = [dict(result) for result in self.results.values()]
+        counts = {status: 0 for status in ("pending", "running", "succeeded", "failed", "skipped")}
+        for result in results:
+            counts[result["status"]] += 1
+        return {
+            "job_id": self.id,
+            "action": self.action,
+            "total": len(results),
+            **counts,
+            "done": self.finished_at is not None,
+            "elapsed": round((self.finished_at or time.time()) - self.created_at, 3),
+            "results": sorted(results, key=lambda result: (result["stage"], result["vmid"])),
+        }
+
+
+class ProxmoxBulkRunner:
+    """Run one action on many guests in parallel.
+
+    Guests run on a shared worker pool with at most ``node_concurrency``
+    operations per node at a time; a slot is held until the guest's task
+    finishes so a node is not flooded with simultaneous boots. Stages run
+    in order, each one starting after the previous one has finished.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        task_tracker: Optional[ProxmoxTaskTracker] = None,
+        max_workers: int = 16,
+        node_concurrency: int = 4,
+        task_timeout: float = 300.0,
+        retention: float = 3600.0
+    ):
+        """Initialize bulk runner.
+
+        Args:
+            client: ProxmoxVEClient used to list and control guests
+            task_tracker: Tracker used to wait for each guest's task to finish;
+                without it an operation counts as done once Proxmox accepts it
+            max_workers: Guests processed in parallel across all nodes
+            node_concurrency: Guests processed in parallel on one node
+            task_timeout: Seconds to wait for one guest's task
+            retention: Seconds finished jobs stay available
+        """
+        self.client = client
+        self.task_tracker = task_tracker
+        self.node_concurrency = node_concurrency
+        self.task_timeout = task_timeout
+        self.retention = retention
+        self.jobs: Dict[str, BulkJob] = {}
+        self._node_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proxmox-bulk")
+
+    def submit(
+        self,
+        action: str,
+        selector: Dict[str, Any],
+        order: Optional[List[List[int]]] = None
+    ) -> Optional[BulkJob]:
+        """Start a bulk operation in the background.
+
+        Args:
+            action: One of ``BULK_ACTIONS``
+            selector: Guest selector, see ``select_guests``
+            order: Optional stages of vmids run one after another; selected
+                guests not listed run in a final stage
+
+        Returns:
+            The started job, or None if no guest matched
+
+        Raises:
+            ValueError: If the action is unknown
+            ConnectionError: If the guests could not be listed
+        """
+        if action not in BULK_ACTIONS:
+            raise ValueError(f"Unknown action {action}, expected one of {', '.join(BULK_ACTIONS)}")
+
+        # Skipping guests by status needs a current listing, not a cached one
+        if self.client.resource_snapshot:
+            self.client.resource_snapshot.invalidate()
+        resources, meta = self.client.get_cluster_resources_with_meta()
+        if meta.get("error"):
+            raise ConnectionError(f"Failed to list guests: {meta['error']}")
+        guests = select_guests(resources, selector)
+        if not guests:
+            return None
+
+        job = BulkJob(action, self._build_stages(guests, order or []))
+        with self._lock:
+            self._prune()
+            self.jobs[job.id] = job
+        threading.Thread(target=self._run_job, args=(job,), name=f"proxmox-bulk-{job.id[:8]}", daemon=True).start()
+        logger.info(f"Bulk {action} of {len(guests)} guests started (job {job.id})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the progress of a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job dictionary or None if unknown
+        """
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    @staticmethod
+    def _build_stages(guests: List[Dict[str, Any]], order: List[List[int]]) -> List[List[Dict[str, Any]]]:
+        """Group the selected guests into the requested stages."""
+        remaining = {int(guest["vmid"]): guest for guest in guests}
+        stages = []
+        for stage_vmids in order:
+            stage = [remaining.pop(int(vmid)) for vmid in stage_vmids if int(vmid) in remaining]
+            if stage:
+                stages.append(stage)
+        if remaining:
+            stages.append(list(remaining.values()))
+        return stages
+
+    def _run_job(self, job: BulkJob) -> None:
+        """Run the stages of a job one after another."""
+        for stage in job.stages:
+            wait([self._executor.submit(self._run_guest, job, guest) for guest in self._interleave_nodes(stage)])
+        job.finished_at = time.time()
+        summary = job.to_dict()
+        logger.info(
+            f"Bulk {job.action} job {job.id} finished in {summary['elapsed']}s: "
+            f"{summary['succeeded']} succeeded, {summary['failed']} failed, {summary['skipped']} skipped"
+        )
+
+    @staticmethod
+    def _interleave_nodes(guests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order guests round-robin by node so no node's queue blocks the shared pool."""
+        by_node: Dict[str, List[Dict[str, Any]]] = {}
+        for guest in guests:
+            by_node.setdefault(guest.get("node", ""), []).append(guest)
+        position = {id(guest): index for node_guests in by_node.values() for index, guest in enumerate(node_guests)}
+        return sorted(guests, key=lambda guest: position[id(guest)])
+
+    def _node_slot(self, node: str) -> threading.BoundedSemaphore:
+        """Get the concurrency limiter of a node."""
+        with self._lock:
+            slot = self._node_slots.get(node)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.node_concurrency)
+                self._node_slots[node] = slot
+            return slot
+
+    def _run_guest(self, job: BulkJob, guest: Dict[str, Any]) -> None:
+        """Apply the job's action to one guest and wait for its task."""
+        vmid = int(guest["vmid"])
+        if guest.get("status") == SKIP_STATUS.get(job.action):
+            job.update(vmid, status="skipped", message=f"Already {guest['status']}")
+            return
+
+        with self._node_slot(guest["node"]):
+            job.update(vmid, status="running")
+            try:
+                result = self._apply(job.action, guest)
+                if not result.get("success"):
+                    job.update(vmid, status="failed", message=result.get("message"))
+                    return
+
+                upid = result.get("data")
+                job.update(vmid, upid=upid)
+                if self.task_tracker and isinstance(upid, str):
+                    task = self.task_tracker.track(upid).result(self.task_timeout)
+                    if not task["success"]:
+                        job.update(vmid, status="failed", message=task["exitstatus"])
+                        return
+                job.update(vmid, status="succeeded", message=result.get("message"))
+            except TimeoutError:
+                job.update(vmid, status="failed", message=f"Task did not finish within {self.task_timeout}s")
+            except Exception as e:
+                logger.error(f"Bulk {job.action} of guest {vmid} failed: {e}")
+                job.update(vmid, status="failed", message=str(e))
+
+    def _apply(self, action: str, guest: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the client method for an action on a VM or container."""
+        node, vmid = guest["node"], int(guest["vmid"])
+        if guest["type"] == "qemu":
+            operations = {"start": self.client.start_vm, "stop": self.client.stop_vm, "restart": self.client.restart_vm}
+        else:
+            operations = {"start": self.client.start_container, "stop": self.client.stop_container}
+        operation = operations.get(action)
+        if operation is None:
+            return {"success": False, "message": f"Action {action} is not supported for containers"}
+        return operation(node, vmid)
+
+    def _prune(self) -> None:
+        """Forget jobs that finished longer than ``retention`` ago, caller holds the lock."""
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self.jobs[job_id]
@@ -0,0 +1,165 @@
+"""Proxmox VE RRD metrics ingestion for HOME-AI-AUTOMATION."""
+
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from home_automation.integrations.proxmox_snapshot import GUEST_TYPES
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between points of the rrddata timeframes used
+TIMEFRAME_RESOLUTIONS = {"hour": 60, "day": 1800}
+RAW_RESOLUTION = TIMEFRAME_RESOLUTIONS["hour"]
+
+# RRD fields stored per target type
+NODE_METRICS = ("cpu", "iowait", "loadavg", "memused", "memtotal", "netin", "netout", "rootused")
+GUEST_METRICS = ("cpu", "mem", "maxmem", "netin", "netout", "diskread", "diskwrite")
+
+
+def target_id(resource: Dict[str, Any]) -> str:
+    """Get the metric target ID of a cluster resource (e.g., node/pve, qemu/100)."""
+    if resource.get("type") == "node":
+        return f"node/{resource['node']}"
+    return f"{resource['type']}/{resource['vmid']}"
+
+
+class ProxmoxMetricsIngester:
+    """Copy node and guest RRD statistics into the local database.
+
+    Every interval all nodes and guests are fetched concurrently. Each
+    target keeps a cursor (the newest stored timestamp, recovered from the
+    database on start) and only points after it are stored, using the
+    one-minute "hour" timeframe when the cursor is recent and the
+    30-minute "day" timeframe to backfill longer gaps. Raw samples older than
+    ``raw_retention`` are averaged into ``rollup_resolution`` buckets.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        db_manager: Any,
+        interval: float = 60.0,
+        max_workers: int = 8,
+        raw_retention: int = 86400,
+        rollup_resolution: int = 1800
+    ):
+        """Initialize metrics ingester.
+
+        Args:
+            client: ProxmoxVEClient used to list targets and read RRD data
+            db_manager: DatabaseManager the samples are stored in
+            interval: Seconds between ingestion runs
+            max_workers: Targets fetched in parallel
+            raw_retention: Seconds one-minute samples are kept before being rolled up
+            rollup_resolution: Seconds per downsampled sample
+        """
+        self.client = client
+        self.db_manager = db_manager
+        self.interval = interval
+        self.raw_retention = raw_retention
+        self.rollup_resolution = rollup_resolution
+        self.cursors: Optional[Dict[str, int]] = None
+        self.running = False
+        self.ingester_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proxmox-rrd")
+
+    def ingest(self) -> int:
+        """Fetch and store new points of every node and guest once.
+
+        Returns:
+            Number of samples stored
+        """
+        if self.cursors is None:
+            self.cursors = self.db_manager.get_metric_cursors()
+
+        targets = [
+            resource for resource in self.client.get_cluster_resources()
+            if resource.get("type") == "node" or (resource.get("type") in GUEST_TYPES and not resource.get("template"))
+        ]
+        samples: List[Dict[str, Any]] = []
+        cursors: Dict[str, int] = {}
+        for target, points in self._executor.map(self._fetch_target, targets):
+            samples.extend(points)
+            if points:
+                cursors[target] = max(point["timestamp"] for point in points)
+
+        stored = self.db_manager.add_metric_samples(samples)
+        # Only advance once the samples are stored, so a failed write is fetched again
+        self.cursors.update(cursors)
+        rolled_up = self.db_manager.downsample_metrics(
+            RAW_RESOLUTION, self.rollup_resolution, int(time.time()) - self.raw_retention
+        )
+        logger.debug(f"Stored {stored} Proxmox metric samples from {len(targets)} targets, rolled up {rolled_up}")
+        return stored
+
+    def _fetch_target(self, resource: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+        """Fetch the points of one target newer than its cursor."""
+        target = target_id(resource)
+        cursor = (self.cursors or {}).get(target, 0)
+        is_node = resource.get("type") == "node"
+        # The hour timeframe covers about 70 minutes; longer gaps are backfilled coarsely
+        timeframe = "hour" if time.time() - cursor < 3600 else "day"
+        try:
+            if is_node:
+                points = self.client.get_rrd_data(resource["node"], timeframe)
+            else:
+                points = self.client.get_rrd_data(resource["node"], timeframe, resource["type"], resource["vmid"])
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Failed to get RRD data for {target}: {e}")
+            return target, []
+
+        metrics = NODE_METRICS if is_node else GUEST_METRICS
+        samples = []
+        for point in points or []:
+            timestamp = int(point.get("time", 0))
+            if timestamp <= cursor:
+                continue
+            for metric in metrics:
+                value = point.get(metric)
+                # Points still being filled in have missing or NaN fields
+                if isinstance(value, (int, float)) and not math.isnan(value):
+                    samples.append({
+                        "target": target,
+                        "metric": metric,
+                        "resolution": TIMEFRAME_RESOLUTIONS[timeframe],
+                        "timestamp": timestamp,
+                        "value": float(value),
+                    })
+        return target, samples
+
+    def start(self) -> None:
+        """Start ingesting in a background thread."""
+        if self.running:
+            return
+
+        self.running = True
+        self._stop_event.clear()
+        self.ingester_thread = threading.Thread(target=self._run_ingester, name="proxmox-metrics", daemon=True)
+        self.ingester_thread.start()
+        logger.info(f"Proxmox metrics ingester started (every {self.interval}s)")
+
+    def stop(self) -> None:
+        """Stop ingesting."""
+        self.running = False
+        self._stop_event.set()
+        if self.ingester_thread and self.ingester_thread.is_alive():
+            self.ingester_thread.join(timeout=5)
+        logger.info("Proxmox metrics ingester stopped")
+
+    def _run_ingester(self) -> None:
+        """Main ingester loop."""
+        while True:
+            try:
+                self.ingest()
+            except Exception as e:
+                logger.error(f"Error in Proxmox metrics ingester loop: {e}")
+            if self._stop_event.wait(self.interval):
+                break
@@ -0,0 +1,154 @@
+"""Indexed snapshot of Proxmox VE cluster resources for HOME-AI-AUTOMATION."""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from home_automation.core.cache import StaleWhileRevalidateCache
+
+GUEST_TYPES = ("qemu", "lxc")
+
+
+def parse_tags(tags: Optional[str]) -> List[str]:
+    """Split a Proxmox tag string (e.g., "prod;web") into tags.
+
+    Args:
+        tags: Tags separated by semicolons, commas or spaces
+
+    Returns:
+        List of tags
+    """
+    return [tag for tag in re.split(r"[;,\s]+", tags or "") if tag]
+
+
+class ClusterResourceIndex:
+    """Lookups over one /cluster/resources listing by vmid, node, type, tag and pool."""
+
+    def __init__(self, resources: Iterable[Dict[str, Any]]):
+        """Build the index.
+
+        Args:
+            resources: Entries from /cluster/resources
+        """
+        self.resources: List[Dict[str, Any]] = []
+        self.by_vmid: Dict[int, Dict[str, Any]] = {}
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.by_node: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_type: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_tag: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_pool: Dict[str, List[Dict[str, Any]]] = {}
+
+        for resource in resources:
+            self.resources.append(resource)
+            resource_type = resource.get("type", "")
+            self.by_type.setdefault(resource_type, []).append(resource)
+            if resource_type == "node":
+                self.nodes[resource["node"]] = resource
+                continue
+            if resource.get("node"):
+                self.by_node.setdefault(resource["node"], []).append(resource)
+            if resource_type in GUEST_TYPES and "vmid" in resource:
+                self.by_vmid[int(resource["vmid"])] = resource
+            for tag in parse_tags(resource.get("tags")):
+                self.by_tag.setdefault(tag, []).append(resource)
+            if resource.get("pool"):
+                self.by_pool.setdefault(resource["pool"], []).append(resource)
+
+    def get_guest(self, vmid: int) -> Optional[Dict[str, Any]]:
+        """Get a VM or container by ID.
+
+        Args:
+            vmid: VM or container ID
+
+        Returns:
+            Resource entry or None if unknown
+        """
+        return self.by_vmid.get(int(vmid))
+
+    def select(
+        self,
+        resource_type: Optional[str] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        pool: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the resources matching every given filter.
+
+        The smallest matching index bucket is scanned, so the cost depends
+        on the number of candidates rather than the cluster size.
+
+        Args:
+            resource_type: Resource type (qemu, lxc, node, storage, ...)
+            node: Node name
+            tag: Guest tag
+            pool: Resource pool
+
+        Returns:
+            Matching resource entries
+        """
+        buckets = []
+        if resource_type is not None:
+            buckets.append(self.by_type.get(resource_type, []))
+        if node is not None:
+            node_resources = self.by_node.get(node, [])
+            if resource_type in (None, "node") and node in self.nodes:
+                node_resources = [self.nodes[node], *node_resources]
+            buckets.append(node_resources)
+        if tag is not None:
+            buckets.append(self.by_tag.get(tag, []))
+        if pool is not None:
+            buckets.append(self.by_pool.get(pool, []))
+        if not buckets:
+            return list(self.resources)
+
+        candidates = min(buckets, key=len)
+        return [
+            resource for resource in candidates
+            if (resource_type is None or resource.get("type") == resource_type)
+            and (node is None or resource.get("node") == node)
+            and (tag is None or tag in parse_tags(resource.get("tags")))
+            and (pool is None or resource.get("pool") == pool)
+        ]
+
+
+class ClusterResourceSnapshot:
+    """Cached /cluster/resources listing with its lookup index.
+
+    The listing is refreshed in the background once it is older than
+    ``ttl`` while the previous snapshot keeps answering queries, so per-VM
+    and per-node lookups cost no API call. The index is rebuilt only when
+    a new listing arrives.
+    """
+
+    KEY = "cluster_resources"
+
+    def __init__(self, loader: Callable[[], List[Dict[str, Any]]], ttl: float = 10.0, stale_ttl: float = 60.0):
+        """Initialize snapshot.
+
+        Args:
+            loader: Fetches /cluster/resources, raising on failure
+            ttl: Seconds a snapshot is fresh
+            stale_ttl: Seconds an expired snapshot is still served while it refreshes
+        """
+        self.loader = loader
+        self.cache = StaleWhileRevalidateCache(ttl=ttl, stale_ttl=stale_ttl, max_workers=1)
+        self._indexed: Optional[Tuple[Any, ClusterResourceIndex]] = None
+
+    def get_index(self) -> Tuple[ClusterResourceIndex, Dict[str, Any]]:
+        """Get the index of the current snapshot, loading it if needed.
+
+        Returns:
+            Tuple of index and cache metadata (source, stale, age)
+
+        Raises:
+            requests.exceptions.RequestException: If no snapshot could be loaded
+        """
+        resources, meta = self.cache.get(self.KEY, self.loader)
+        indexed = self._indexed
+        if indexed is None or indexed[0] is not resources:
+            indexed = (resources, ClusterResourceIndex(resources))
+            self._indexed = indexed
+        return indexed[1], meta
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next lookup reloads it, e.g. after a guest changed state."""
+        self.cache.invalidate(self.KEY)
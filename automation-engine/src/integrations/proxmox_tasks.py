@@ -0,0 +1,297 @@
+"""Proxmox VE task tracking for HOME-AI-AUTOMATION."""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_upid(upid: str) -> Dict[str, Any]:
+    """Split a Proxmox task ID into its fields.
+
+    UPIDs look like ``UPID:pve:0000A1B2:0012C3D4:65F0A1B2:qmstart:100:root@pam:``.
+
+    Args:
+        upid: Task UPID
+
+    Returns:
+        Dictionary with node, pid, starttime, type, id and user
+
+    Raises:
+        ValueError: If the string is not a UPID
+    """
+    parts = upid.split(":")
+    if len(parts) < 8 or parts[0] != "UPID":
+        raise ValueError(f"Invalid UPID: {upid}")
+    return {
+        "node": parts[1],
+        "pid": int(parts[2], 16),
+        "starttime": int(parts[4], 16),
+        "type": parts[5],
+        "id": parts[6],
+        "user": parts[7],
+    }
+
+
+class TrackedTask:
+    """A Proxmox task being waited on."""
+
+    def __init__(self, upid: str):
+        """Initialize tracked task.
+
+        Args:
+            upid: Task UPID
+        """
+        info = parse_upid(upid)
+        self.upid = upid
+        self.node = info["node"]
+        self.type = info["type"]
+        self.id = info["id"]
+        self.user = info["user"]
+        self.starttime = info["starttime"]
+        self.status = "running"
+        self.exitstatus: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self.future: Future = Future()
+        self.callbacks: List[Callable[[Dict[str, Any]], None]] = []
+
+    @property
+    def done(self) -> bool:
+        """Whether the task has finished."""
+        return self.finished_at is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the task as a JSON-serializable dictionary."""
+        return {
+            "upid": self.upid,
+            "node": self.node,
+            "type": self.type,
+            "id": self.id,
+            "user": self.user,
+            "starttime": self.starttime,
+            "status": self.status,
+            "exitstatus": self.exitstatus,
+            "success": self.exitstatus == "OK" if self.done else None,
+        }
+
+
+class ProxmoxTaskTracker:
+    """Wait for Proxmox tasks to finish without polling each one.
+
+    Registered tasks are checked per node: while several tasks run on a
+    node one ``/nodes/{node}/tasks?source=active`` call covers all of them,
+    and only tasks that dropped off that list have their final status
+    fetched. The poll interval backs off while nothing finishes and resets
+    when a task is added. Completion is reported through futures, callbacks
+    and ``get``.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 5.0,
+        retention: float = 600.0
+    ):
+        """Initialize task tracker.
+
+        Args:
+            client: ProxmoxVEClient used to query tasks
+            poll_interval: Seconds before the first check of a node's tasks
+            max_poll_interval: Upper bound for the backed-off interval
+            retention: Seconds finished tasks stay available to ``get``
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.retention = retention
+        self.tasks: Dict[str, TrackedTask] = {}
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._node_delay: Dict[str, float] = {}
+        self._node_next_poll: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self.poller_thread: Optional[threading.Thread] = None
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback for every task that finishes.
+
+        Args:
+            callback: Called with the task dictionary on the poller thread
+        """
+        self.listeners.append(callback)
+
+    def track(self, upid: str, callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Future:
+        """Start tracking a task.
+
+        Args:
+            upid: Task UPID returned by a Proxmox operation
+            callback: Optional callable run with the task dictionary when it finishes
+
+        Returns:
+            Future resolved with the task dictionary when it finishes
+
+        Raises:
+            ValueError: If the string is not a UPID
+        """
+        with self._condition:
+            task = self.tasks.get(upid)
+            if task is None:
+                task = TrackedTask(upid)
+                self.tasks[upid] = task
+            if not task.done:
+                if callback:
+                    task.callbacks.append(callback)
+                self._node_delay[task.node] = self.poll_interval
+                self._node_next_poll[task.node] = min(
+                    self._node_next_poll.get(task.node, float("inf")),
+                    time.monotonic() + self.poll_interval
+                )
+                self._ensure_poller()
+                self._condition.notify()
+                return task.future
+
+        if callback:
+            self._run_callback(callback, task)
+        return task.future
+
+    def get(self, upid: str) -> Optional[Dict[str, Any]]:
+        """Get the status of a tracked task.
+
+        Args:
+            upid: Task UPID
+
+        Returns:
+            Task dictionary or None if the task is not tracked
+        """
+        task = self.tasks.get(upid)
+        return task.to_dict() if task else None
+
+    def wait(self, upid: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until a tracked task finishes or the timeout passes.
+
+        Args:
+            upid: Task UPID
+            timeout: Seconds to wait at most
+
+        Returns:
+            Task dictionary (still running if the timeout passed) or None if not tracked
+        """
+        task = self.tasks.get(upid)
+        if task is None:
+            return None
+        try:
+            task.future.result(timeout)
+        except TimeoutError:
+            pass
+        return task.to_dict()
+
+    def _ensure_poller(self) -> None:
+        """Start the poller thread if it is not running, caller holds the lock."""
+        if self.poller_thread and self.poller_thread.is_alive():
+            return
+        self.poller_thread = threading.Thread(target=self._run_poller, name="proxmox-tasks", daemon=True)
+        self.poller_thread.start()
+
+    def _run_poller(self) -> None:
+        """Poll nodes with running tasks until none are left."""
+        while True:
+            with self._condition:
+                self._prune()
+                if not self._node_next_poll:
+                    self.poller_thread = None
+                    return
+                now = time.monotonic()
+                due = [node for node, at in self._node_next_poll.items() if at <= now]
+                if not due:
+                    self._condition.wait(min(self._node_next_poll.values()) - now)
+                    continue
+
+            for node in due:
+                try:
+                    self.poll_node(node)
+                except Exception as e:
+                    logger.error(f"Error polling Proxmox tasks on {node}: {e}")
+                    with self._condition:
+                        self._node_next_poll[node] = time.monotonic() + self.max_poll_interval
+
+    def poll_node(self, node: str) -> int:
+        """Check the running tasks of one node once.
+
+        Args:
+            node: Node name
+
+        Returns:
+            Number of tasks that finished
+        """
+        with self._condition:
+            pending = [task for task in self.tasks.values() if task.node == node and not task.done]
+        if not pending:
+            with self._condition:
+                self._node_next_poll.pop(node, None)
+            return 0
+
+        finished = 0
+        try:
+            if len(pending) == 1:
+                candidates = pending
+            else:
+                active = {task.get("upid") for task in self.client.get_active_tasks(node)}
+                candidates = [task for task in pending if task.upid not in active]
+            for task in candidates:
+                status = self.client.get_task_status(node, task.upid)
+                if status.get("status") == "stopped":
+                    self._finish(task, status)
+                    finished += 1
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Failed to check Proxmox tasks on {node}: {e}")
+
+        with self._condition:
+            # Tasks tracked while this poll ran are still pending too
+            if not any(task.node == node and not task.done for task in self.tasks.values()):
+                self._node_next_poll.pop(node, None)
+                self._node_delay.pop(node, None)
+            else:
+                delay = self._node_delay.get(node, self.poll_interval)
+                if not finished:
+                    delay = min(self.max_poll_interval, delay * 1.5)
+                self._node_delay[node] = delay
+                self._node_next_poll[node] = time.monotonic() + delay
+        return finished
+
+    def _finish(self, task: TrackedTask, status: Dict[str, Any]) -> None:
+        """Record a finished task and notify its waiters."""
+        with self._condition:
+            task.status = "stopped"
+            task.exitstatus = status.get("exitstatus")
+            task.finished_at = time.monotonic()
+            callbacks = [*task.callbacks, *self.listeners]
+            task.callbacks = []
+
+        result = task.to_dict()
+        if task.exitstatus == "OK":
+            logger.info(f"Proxmox task {task.type} {task.id} on {task.node} finished")
+        else:
+            logger.warning(f"Proxmox task {task.type} {task.id} on {task.node} failed: {task.exitstatus}")
+        task.future.set_result(result)
+        for callback in callbacks:
+            self._run_callback(callback, task)
+
+    @staticmethod
+    def _run_callback(callback: Callable[[Dict[str, Any]], None], task: TrackedTask) -> None:
+        """Run a completion callback, logging instead of raising on failure."""
+        try:
+            callback(task.to_dict())
+        except Exception as e:
+            logger.error(f"Proxmox task callback failed: {e}")
+
+    def _prune(self) -> None:
+        """Forget tasks that finished longer than ``retention`` ago, caller holds the lock."""
+        cutoff = time.monotonic() - self.retention
+        for upid in [upid for upid, task in self.tasks.items() if task.done and (task.finished_at or 0) < cutoff]:
+            del self.tasks[upid]
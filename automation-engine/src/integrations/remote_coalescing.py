@@ -0,0 +1,182 @@
+"""Key-repeat coalescing for remote control commands."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Command values that are merged when repeated, as (group, direction)
+REPEATABLE_COMMANDS = {
+    "volume_up": ("volume", 1),
+    "volume_down": ("volume", -1),
+    "channel_up": ("channel", 1),
+    "channel_down": ("channel", -1),
+}
+
+# Command value sending the net steps of a group in each direction
+GROUP_COMMANDS = {group: command for command, group in REPEATABLE_COMMANDS.items()}
+
+RepeatSender = Callable[[str, str, int], Dict[str, Any]]
+
+
+class _Burst:
+    """Repeated presses collected for one combined command."""
+
+    def __init__(self, group: str, ticket: int):
+        self.group = group
+        self.ticket = ticket
+        self.steps = 0
+        self.presses = 0
+        self.started = time.monotonic()
+        self.last_press = self.started
+        self.closed = False
+        self.flush_now = threading.Event()
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class _DeviceLane:
+    """Send order of one device's commands."""
+
+    def __init__(self):
+        self.next_ticket = 0
+        self.serving = 0
+        self.tail: Optional[_Burst] = None
+        # Group and time of the latest repeatable press, None after any other command
+        self.last_press: Optional[Tuple[str, float]] = None
+        self.turn = threading.Condition()
+
+
+class KeyRepeatCoalescer:
+    """Collapse bursts of volume and channel presses into one command.
+
+    The first press of a group (volume or channel) is sent right away.
+    Presses following it within ``window`` seconds of each other on a
+    device are merged: ups and downs cancel out and the net number of
+    steps is sent once. Every command of a device, merged or not, takes a
+    ticket on arrival and is sent in ticket order, so a burst is never
+    reordered with the commands around it. Any other command closes the
+    open burst instead of waiting out its window.
+    """
+
+    def __init__(self, send_repeated: RepeatSender, window: float = 0.15, max_delay: float = 0.5):
+        """Initialize key-repeat coalescer.
+
+        Args:
+            send_repeated: Function sending (device name, command value, count)
+            window: Seconds without a new press that end a burst
+            max_delay: Seconds after the first press a burst is sent at the latest
+        """
+        self.send_repeated = send_repeated
+        self.window = window
+        self.max_delay = max_delay
+        self._lanes: Dict[str, _DeviceLane] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        device_name: str,
+        command: str,
+        send: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Send a command in order, merging it into a burst if it repeats.
+
+        Args:
+            device_name: Target device
+            command: Value of the command pressed (e.g., volume_up)
+            send: Sends the command on its own when it is not merged with others
+
+        Returns:
+            Result of the command, or of the burst it was merged into
+        """
+        repeat = REPEATABLE_COMMANDS.get(command)
+        with self._lock:
+            lane = self._lanes.setdefault(device_name, _DeviceLane())
+            now = time.monotonic()
+            tail = lane.tail
+            if repeat and tail and not tail.closed and tail.group == repeat[0]:
+                tail.steps += repeat[1]
+                tail.presses += 1
+                tail.last_press = now
+                burst, leader = tail, False
+            else:
+                if tail and not tail.closed:
+                    # Close the open burst so it goes out now, ahead of this command
+                    tail.closed = True
+                    tail.flush_now.set()
+                ticket = lane.next_ticket
+                lane.next_ticket += 1
+                # Only a press following another of its group opens a burst; the first goes out at once
+                last = lane.last_press
+                if repeat and last and last[0] == repeat[0] and now - last[1] < self.window:
+                    burst = _Burst(repeat[0], ticket)
+                    burst.steps = repeat[1]
+                    burst.presses = 1
+                    lane.tail = burst
+                    leader = True
+                else:
+                    lane.tail = None
+                    burst = None
+            lane.last_press = (repeat[0], now) if repeat else None
+
+        if burst is None:
+            return self._in_turn(lane, ticket, send)
+        if not leader:
+            burst.done.wait()
+            assert burst.result is not None
+            return burst.result
+
+        self._collect(burst)
+        try:
+            result = self._in_turn(lane, burst.ticket, lambda: self._send_burst(device_name, burst, send))
+            burst.result = result
+        finally:
+            burst.done.set()
+        return result
+
+    def _collect(self, burst: _Burst) -> None:
+        """Wait until the burst goes quiet, hits ``max_delay`` or is closed by another command."""
+        while True:
+            now = time.monotonic()
+            remaining = min(burst.last_press + self.window, burst.started + self.max_delay) - now
+            if remaining <= 0 or burst.flush_now.wait(remaining):
+                break
+        with self._lock:
+            burst.closed = True
+
+    def _send_burst(self, device_name: str, burst: _Burst, send: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Send the net steps of a burst, or its only press on its own."""
+        if burst.presses == 1:
+            return send()
+        if burst.steps == 0:
+            return {
+                "success": True,
+                "message": f"{burst.presses} {burst.group} presses cancelled out",
+                "coalesced": burst.presses
+            }
+
+        command = GROUP_COMMANDS[(burst.group, 1 if burst.steps > 0 else -1)]
+        logger.debug(f"Coalesced {burst.presses} {burst.group} presses on {device_name} into {burst.steps:+d}")
+        try:
+            result = self.send_repeated(device_name, command, abs(burst.steps))
+        except Exception as e:
+            result = {
+                "success": False,
+                "message": str(e)
+            }
+        return {**result, "coalesced": burst.presses}
+
+    @staticmethod
+    def _in_turn(lane: _DeviceLane, ticket: int, send: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run ``send`` once every earlier ticket of the lane has been sent."""
+        with lane.turn:
+            lane.turn.wait_for(lambda: lane.serving == ticket)
+        try:
+            return send()
+        finally:
+            with lane.turn:
+                lane.serving += 1
+                lane.turn.notify_all()
@@ -1,11 +1,16 @@
 """Remote control module for TV and media devices."""
 
 import logging
+import threading
+import time
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
 
+from home_automation.integrations.remote_coalescing import KeyRepeatCoalescer
+from home_automation.integrations.remote_power import PowerOnState, ReadinessProber, send_magic_packet
+
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +47,17 @@ class RemoteCommand(str, Enum):
     PRIME_VIDEO = "prime_video"
 
 
+# Commands Home Assistant handles with media_player services instead of remote.send_command
+MEDIA_PLAYER_COMMANDS = {
+    RemoteCommand.POWER,
+    RemoteCommand.POWER_ON,
+    RemoteCommand.POWER_OFF,
+    RemoteCommand.VOLUME_UP,
+    RemoteCommand.VOLUME_DOWN,
+    RemoteCommand.VOLUME_MUTE,
+}
+
+
 class DeviceType(str, Enum):
     """Types of remote controllable devices."""
     SAMSUNG_TV = "samsung_tv"
@@ -57,6 +73,11 @@ class DeviceType(str, Enum):
     GENERIC = "generic"
 
 
+# Ports used when a device definition gives none
+DEFAULT_PORT = 8080
+DEFAULT_PORTS = {DeviceType.SAMSUNG_TV: 8002}
+
+
 class RemoteDevice:
     """Represents a remote controllable device."""
 
@@ -65,7 +86,7 @@ class RemoteDevice:
         name: str,
         device_type: DeviceType,
         ip_address: str,
-        port: int = 8080,
+        port: Optional[int] = None,
         mac_address: Optional[str] = None,
         entity_id: Optional[str] = None,
         **kwargs: Any
@@ -76,15 +97,17 @@ class RemoteDevice:
             name: Device name
             device_type: Type of device
             ip_address: IP address of device
-            port: Port for communication
+            port: Port for communication; defaults to 8002 (TLS) for Samsung
+                TVs and 8080 otherwise
             mac_address: MAC address for WOL
             entity_id: Home Assistant entity ID
-            **kwargs: Additional device-specific parameters
+            **kwargs: Additional device-specific parameters, e.g. the Samsung
+                pairing ``token``
         """
         self.name = name
         self.device_type = device_type
         self.ip_address = ip_address
-        self.port = port
+        self.port = port if port is not None else DEFAULT_PORTS.get(device_type, DEFAULT_PORT)
         self.mac_address = mac_address
         self.entity_id = entity_id
         self.additional_params = kwargs
@@ -98,21 +121,69 @@ class RemoteDevice:
             "port": self.port,
             "mac_address": self.mac_address,
             "entity_id": self.entity_id,
-            **self.additional_params
+            # The pairing token grants control of the TV, so it is not exposed
+            **{key: value for key, value in self.additional_params.items() if key != "token"}
         }
 
+    def connection_key(self) -> Tuple[Any, ...]:
+        """Settings an open control connection to the device depends on."""
+        return (self.device_type, self.ip_address, self.port, self.additional_params.get("token"))
+
+    def config_key(self) -> Tuple[Any, ...]:
+        """Every configured setting, including the ones ``to_dict`` leaves out."""
+        return (*self.connection_key(), self.mac_address, self.entity_id, dict(self.additional_params))
+
+    def update_from(self, other: "RemoteDevice") -> None:
+        """Update this device in place from another definition of it.
+
+        Args:
+            other: Device carrying the new settings
+        """
+        self.device_type = other.device_type
+        self.ip_address = other.ip_address
+        self.port = other.port
+        self.mac_address = other.mac_address
+        self.entity_id = other.entity_id
+        self.additional_params = other.additional_params
+
 
 class RemoteControlManager:
     """Manager for remote control operations."""
 
-    def __init__(self, home_assistant_client: Optional[Any] = None):
+    def __init__(
+        self,
+        home_assistant_client: Optional[Any] = None,
+        session_pool: Optional[Any] = None,
+        repeat_window: float = 0,
+        volume_step: float = 0.02,
+        power_on_timeout: float = 30.0,
+        wol_broadcast: str = "255.255.255.255"
+    ):
         """Initialize remote control manager.
 
         Args:
             home_assistant_client: Optional Home Assistant client for integration
+            session_pool: Optional RemoteSessionPool keeping persistent
+                connections to devices controlled directly
+            repeat_window: Seconds within which repeated volume and channel
+                presses are merged into one command (0 disables)
+            volume_step: Volume change of one press, used to turn merged
+                presses into an absolute volume_set
+            power_on_timeout: Seconds to wait for a device to become ready after power_on
+            wol_broadcast: Broadcast address Wake-on-LAN packets are sent to
         """
         self.devices: Dict[str, RemoteDevice] = {}
         self.ha_client = home_assistant_client
+        self.session_pool = session_pool
+        self.volume_step = volume_step
+        self.coalescer: Optional[KeyRepeatCoalescer] = None
+        if repeat_window > 0:
+            self.coalescer = KeyRepeatCoalescer(self.send_repeated, window=repeat_window)
+        self.power_on_timeout = power_on_timeout
+        self.wol_broadcast = wol_broadcast
+        self.prober = ReadinessProber(home_assistant_client)
+        self._powering_on: Dict[str, PowerOnState] = {}
+        self._power_lock = threading.Lock()
 
     def add_device(self, device: RemoteDevice) -> None:
         """Add a device to the manager.
@@ -134,10 +205,51 @@ class RemoteControlManager:
         """
         if device_name in self.devices:
             del self.devices[device_name]
+            if self.session_pool:
+                self.session_pool.close(device_name)
             logger.info(f"Removed remote device: {device_name}")
             return True
         return False
 
+    def sync_devices(self, devices: List[RemoteDevice]) -> Dict[str, List[str]]:
+        """Reconcile managed devices with a freshly loaded device list.
+
+        Devices are matched by name. New devices are added, missing ones are
+        removed and changed ones are updated in place, so unchanged devices
+        are left untouched. A device whose address, port or pairing token
+        changed has its open session closed.
+
+        Args:
+            devices: Complete list of devices that should be managed
+
+        Returns:
+            Names of added, removed and modified devices
+        """
+        incoming = {device.name: device for device in devices}
+        changes: Dict[str, List[str]] = {"added": [], "removed": [], "modified": []}
+
+        for device_name in list(self.devices):
+            if device_name not in incoming:
+                self.remove_device(device_name)
+                changes["removed"].append(device_name)
+
+        for device_name, device in incoming.items():
+            current = self.devices.get(device_name)
+            if current is None:
+                self.add_device(device)
+                changes["added"].append(device_name)
+            elif current.config_key() != device.config_key():
+                reconnect = current.connection_key() != device.connection_key()
+                token_changed = current.additional_params.get("token") != device.additional_params.get("token")
+                current.update_from(device)
+                if reconnect and self.session_pool:
+                    # The next command opens a session with the new address or token
+                    self.session_pool.close(device_name, forget_token=token_changed)
+                changes["modified"].append(device_name)
+                logger.info(f"Updated remote device: {device_name}")
+
+        return changes
+
     def get_device(self, device_name: str) -> Optional[RemoteDevice]:
         """Get a device by name.
 
@@ -160,19 +272,21 @@ class RemoteControlManager:
     def send_command(
         self,
         device_name: str,
-        command: RemoteCommand,
+        command: Union[str, RemoteCommand],
         **kwargs: Any
     ) -> Dict[str, Any]:
         """Send a command to a device.
 
         Args:
             device_name: Name of target device
-            command: Remote command to send
-            **kwargs: Additional command parameters
+            command: Remote command to send, or its value (e.g., "power")
+            **kwargs: Additional command parameters; ``coalesce=False``
+                sends the command on its own even if it repeats
 
         Returns:
             Result of command execution
         """
+        coalesce = kwargs.pop("coalesce", True)
         device = self.get_device(device_name)
         if not device:
             return {
@@ -180,12 +294,240 @@ class RemoteControlManager:
                 "message": f"Device '{device_name}' not found"
             }
 
+        try:
+            command = RemoteCommand(command)
+        except ValueError:
+            return {
+                "success": False,
+                "message": f"Unknown command '{command}'"
+            }
+
+        if command == RemoteCommand.POWER_ON:
+            return self.power_on(device_name)
+
+        # Commands sent while the device powers on wait until it is ready
+        powering_on = self._powering_on.get(device_name)
+        if powering_on and not powering_on.wait():
+            return {
+                "success": False,
+                "message": f"Device '{device_name}' did not become ready"
+            }
+
+        if self.coalescer and coalesce:
+            return self.coalescer.submit(device_name, command.value, lambda: self._dispatch(device, command, **kwargs))
+        return self._dispatch(device, command, **kwargs)
+
+    def power_on(
+        self,
+        device_name: str,
+        commands: Optional[List[str]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Power on a device, wait until it is ready and then send commands.
+
+        A Wake-on-LAN packet is broadcast when the device has a MAC address,
+        and Home Assistant or the device's own protocol is asked to turn it
+        on. The control port and the Home Assistant state are then probed
+        concurrently; commands are sent the moment either reports the device
+        ready. Other commands sent to the device meanwhile wait as well.
+
+        Args:
+            device_name: Name of target device
+            commands: Commands to send once the device is ready
+            timeout: Seconds to wait for the device, defaults to ``power_on_timeout``
+
+        Returns:
+            Result with ``ready_via``, ``waited`` and the ``results`` of the commands
+        """
+        device = self.get_device(device_name)
+        if not device:
+            return {
+                "success": False,
+                "message": f"Device '{device_name}' not found"
+            }
+        timeout = self.power_on_timeout if timeout is None else timeout
+
+        with self._power_lock:
+            existing = self._powering_on.get(device_name)
+            owner = existing is None
+            if existing is None:
+                state = PowerOnState(time.monotonic() + timeout)
+                self._powering_on[device_name] = state
+            else:
+                state = existing
+
+        if owner:
+            try:
+                result = self._wake(device)
+                if result is not None:
+                    return result
+                ready_via, waited = self.prober.wait_ready(
+                    device.ip_address,
+                    device.port,
+                    entity_id=device.entity_id,
+                    timeout=timeout,
+                    wake=self._wol_sender(device)
+                )
+                state.ready = ready_via is not None
+            finally:
+                with self._power_lock:
+                    self._powering_on.pop(device_name, None)
+                state.done.set()
+            if not state.ready:
+                logger.warning(f"{device_name} did not become ready within {timeout}s")
+                return {
+                    "success": False,
+                    "message": f"Device '{device_name}' did not become ready within {timeout}s",
+                    "waited": waited
+                }
+            logger.info(f"{device_name} ready after {waited}s ({ready_via})")
+        else:
+            # Another request is already powering the device on
+            ready_via, waited = "shared", 0.0
+            if not state.wait():
+                return {
+                    "success": False,
+                    "message": f"Device '{device_name}' did not become ready"
+                }
+
+        results = []
+        for command in commands or []:
+            result = self.send_command(device_name, command)
+            results.append({"command": command, **result})
+            if not result.get("success"):
+                break
+        return {
+            "success": all(result.get("success") for result in results),
+            "message": f"Device '{device_name}' is ready",
+            "ready_via": ready_via,
+            "waited": waited,
+            "results": results
+        }
+
+    def _wake(self, device: RemoteDevice) -> Optional[Dict[str, Any]]:
+        """Send the wake-up signals of a device.
+
+        Returns:
+            Failure result if the device cannot be woken, None otherwise
+        """
+        wol_sender = self._wol_sender(device)
+        if wol_sender:
+            try:
+                wol_sender()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to send Wake-on-LAN packet to {device.name}: {e}")
+
+        if (device.entity_id and self.ha_client) or not wol_sender:
+            result = self._dispatch(device, RemoteCommand.POWER_ON)
+            if not result.get("success") and not wol_sender:
+                return result
+        return None
+
+    def _wol_sender(self, device: RemoteDevice) -> Optional[Any]:
+        """Get a function broadcasting the device's magic packet, None without a MAC address."""
+        if not device.mac_address:
+            return None
+        return lambda: send_magic_packet(device.mac_address, self.wol_broadcast)
+
+    def _dispatch(self, device: RemoteDevice, command: RemoteCommand, **kwargs: Any) -> Dict[str, Any]:
+        """Send a command through Home Assistant or directly."""
         # If device has Home Assistant entity, use that
         if device.entity_id and self.ha_client:
             return self._send_via_home_assistant(device, command, **kwargs)
         else:
             return self._send_direct_command(device, command, **kwargs)
 
+    def send_repeated(self, device_name: str, command: str, count: int) -> Dict[str, Any]:
+        """Send a volume or channel step several times as one command where possible.
+
+        A single step is sent like any other command. Through Home
+        Assistant, several volume steps become one absolute
+        ``media_player.volume_set`` when the current level is known (else
+        relative steps sent one after another), and channel steps one
+        ``remote.send_command`` with ``num_repeats``. Directly controlled
+        devices get the key ``count`` times back to back over their session.
+
+        Args:
+            device_name: Name of target device
+            command: Value of a volume_up/down or channel_up/down command
+            count: Number of steps
+
+        Returns:
+            Result of the last call made
+        """
+        device = self.get_device(device_name)
+        if not device:
+            return {
+                "success": False,
+                "message": f"Device '{device_name}' not found"
+            }
+        command = RemoteCommand(command)
+        if count == 1:
+            return self._dispatch(device, command)
+
+        if device.entity_id and self.ha_client:
+            if command in (RemoteCommand.VOLUME_UP, RemoteCommand.VOLUME_DOWN):
+                state = self.ha_client.get_state(device.entity_id) or {}
+                level = state.get("attributes", {}).get("volume_level")
+                if isinstance(level, (int, float)):
+                    step = self.volume_step if command == RemoteCommand.VOLUME_UP else -self.volume_step
+                    volume = round(min(1.0, max(0.0, level + step * count)), 3)
+                    return self.ha_client.call_service(
+                        "media_player",
+                        "volume_set",
+                        {"entity_id": device.entity_id, "volume_level": volume}
+                    )
+            else:
+                return self.ha_client.call_service(
+                    "remote",
+                    "send_command",
+                    {"entity_id": device.entity_id, "command": command.value, "num_repeats": count}
+                )
+
+        # Relative volume steps and direct keys go out one at a time, in order
+        result: Dict[str, Any] = {"success": True}
+        for _ in range(count):
+            result = self._dispatch(device, command)
+            if not result.get("success"):
+                break
+        return result
+
+    def send_key_sequence(
+        self,
+        device_name: str,
+        commands: List[RemoteCommand],
+        delay: float
+    ) -> Optional[Dict[str, Any]]:
+        """Send several keys in one Home Assistant remote.send_command call.
+
+        Home Assistant presses the keys itself, ``delay`` seconds apart, so
+        the whole sequence costs one round trip.
+
+        Args:
+            device_name: Name of target device
+            commands: Keys to press in order
+            delay: Seconds between key presses
+
+        Returns:
+            Result of the call, or None if the device is not controlled
+            through Home Assistant or a command is not a remote key
+        """
+        device = self.get_device(device_name)
+        if not device or not device.entity_id or not self.ha_client:
+            return None
+        if any(command in MEDIA_PLAYER_COMMANDS for command in commands):
+            return None
+
+        return self.ha_client.call_service(
+            "remote",
+            "send_command",
+            {
+                "entity_id": device.entity_id,
+                "command": [command.value for command in commands],
+                "delay_secs": delay
+            }
+        )
+
     def _send_via_home_assistant(
         self,
         device: RemoteDevice,
@@ -255,7 +597,8 @@ class RemoteControlManager:
             Result of command
         """
         try:
-            # Device-specific implementations would go here
+            if self.session_pool and self.session_pool.supports(device):
+                return self.session_pool.send(device, command)
             if device.device_type == DeviceType.SAMSUNG_TV:
                 return self._send_samsung_command(device, command)
             elif device.device_type == DeviceType.ANDROID_TV:
@@ -0,0 +1,455 @@
+"""Remote control macros for TV and media devices."""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from home_automation.integrations.remote_control import RemoteCommand, RemoteControlManager
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between key presses unless a macro or step sets its own
+DEFAULT_KEY_DELAY = 0.4
+
+
+class MacroStep:
+    """One key press (optionally repeated) or pause of a macro."""
+
+    def __init__(self, command: Optional[RemoteCommand] = None, repeat: int = 1, wait: float = 0.0):
+        """Initialize macro step.
+
+        Args:
+            command: Key to press, None for a pure pause
+            repeat: Number of presses
+            wait: Extra seconds to wait after the step
+        """
+        self.command = command
+        self.repeat = repeat
+        self.wait = wait
+
+    @classmethod
+    def parse(cls, config: Any) -> "MacroStep":
+        """Build a step from its configuration.
+
+        Steps are a command name (``"down"``), a dictionary with ``command``
+        and optional ``repeat`` and ``wait``, or ``{"wait": seconds}``.
+
+        Raises:
+            ValueError: If the step is malformed or the command unknown
+        """
+        if isinstance(config, str):
+            return cls(RemoteCommand(config))
+        if not isinstance(config, dict):
+            raise ValueError(f"Invalid macro step: {config!r}")
+        command = config.get("command")
+        return cls(
+            RemoteCommand(command) if command else None,
+            repeat=max(1, int(config.get("repeat", 1))),
+            wait=float(config.get("wait", 0.0))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert step to dictionary."""
+        return {
+            "command": self.command.value if self.command else None,
+            "repeat": self.repeat,
+            "wait": self.wait,
+        }
+
+
+class RemoteMacro:
+    """Named key sequence, e.g. navigating to an app."""
+
+    def __init__(self, name: str, steps: List[MacroStep], delay: float = DEFAULT_KEY_DELAY, description: str = ""):
+        """Initialize macro.
+
+        Args:
+            name: Macro name
+            steps: Steps run in order
+            delay: Seconds between key presses
+            description: Human readable description
+        """
+        self.name = name
+        self.steps = steps
+        self.delay = delay
+        self.description = description
+
+    @classmethod
+    def parse(cls, name: str, config: Any) -> "RemoteMacro":
+        """Build a macro from its configuration, a step list or a dictionary with ``steps``.
+
+        Raises:
+            ValueError: If the macro or one of its steps is malformed
+        """
+        if isinstance(config, list):
+            config = {"steps": config}
+        steps = [MacroStep.parse(step) for step in config.get("steps", [])]
+        if not steps:
+            raise ValueError(f"Macro '{name}' has no steps")
+        return cls(
+            name,
+            steps,
+            delay=float(config.get("delay", DEFAULT_KEY_DELAY)),
+            description=config.get("description", "")
+        )
+
+    def plan(self) -> List[Dict[str, Any]]:
+        """Group the steps into timed batches.
+
+        Consecutive key presses with no extra wait between them form one
+        batch, which can be sent to Home Assistant as a single call.
+
+        Returns:
+            Batches with ``commands`` and ``gap`` (seconds after the batch's
+            last key before the next batch starts)
+        """
+        batches: List[Dict[str, Any]] = []
+        current: List[RemoteCommand] = []
+        for step in self.steps:
+            if step.command:
+                current.extend([step.command] * step.repeat)
+            if step.wait or not step.command:
+                if current:
+                    batches.append({"commands": current, "gap": self.delay + step.wait})
+                    current = []
+                elif batches:
+                    batches[-1]["gap"] += step.wait
+                else:
+                    batches.append({"commands": [], "gap": step.wait})
+        if current:
+            batches.append({"commands": current, "gap": 0.0})
+        return batches
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert macro to dictionary."""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "delay": self.delay,
+            "steps": [step.to_dict() for step in self.steps],
+        }
+
+
+def parse_macros(config: Dict[str, Any]) -> Dict[str, RemoteMacro]:
+    """Build macros from a name to definition mapping, skipping invalid ones.
+
+    Args:
+        config: ``macros`` section of the TV devices configuration
+
+    Returns:
+        Macros by name
+    """
+    macros = {}
+    for name, definition in (config or {}).items():
+        try:
+            macros[name] = RemoteMacro.parse(name, definition)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.error(f"Invalid remote macro '{name}': {e}")
+    return macros
+
+
+class MacroRun:
+    """Progress of one macro execution."""
+
+    def __init__(self, device_name: str, macro: RemoteMacro):
+        """Initialize macro run.
+
+        Args:
+            device_name: Target device
+            macro: Macro being run
+        """
+        self.id = uuid.uuid4().hex
+        self.device_name = device_name
+        self.macro = macro
+        self.status = "queued"
+        self.keys_total = sum(len(batch["commands"]) for batch in macro.plan())
+        self.keys_sent = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """Whether the run has finished, failed or been cancelled."""
+        return self.done_event.is_set()
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        """Record the outcome and wake up waiters."""
+        self.status = status
+        self.error = error
+        self.finished_at = time.time()
+        self.done_event.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert run to dictionary."""
+        end = self.finished_at or time.time()
+        return {
+            "run_id": self.id,
+            "device": self.device_name,
+            "macro": self.macro.name,
+            "status": self.status,
+            "keys_total": self.keys_total,
+            "keys_sent": self.keys_sent,
+            "error": self.error,
+            "elapsed": round(end - self.started_at, 3) if self.started_at else None,
+        }
+
+
+class RemoteMacroRunner:
+    """Run macros server-side with precise key timing.
+
+    Each device gets a worker thread that runs its macros one after
+    another, so two macros never interleave keys on the same TV while
+    different TVs run in parallel. Key presses are scheduled against
+    absolute deadlines, so slow sends do not accumulate drift, and a run
+    can be cancelled between any two keys. For devices controlled through
+    Home Assistant each batch of keys is one remote.send_command call.
+    """
+
+    def __init__(self, remote_manager: RemoteControlManager, retention: float = 600.0):
+        """Initialize macro runner.
+
+        Args:
+            remote_manager: Manager used to send commands
+            retention: Seconds finished runs stay available
+        """
+        self.remote_manager = remote_manager
+        self.retention = retention
+        self.macros: Dict[str, RemoteMacro] = {}
+        self.device_macros: Dict[str, Dict[str, RemoteMacro]] = {}
+        self.runs: Dict[str, MacroRun] = {}
+        self._queues: Dict[str, queue.Queue] = {}
+        self._workers: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def set_macros(
+        self,
+        macros: Dict[str, RemoteMacro],
+        device_macros: Optional[Dict[str, Dict[str, RemoteMacro]]] = None
+    ) -> None:
+        """Replace the known macros.
+
+        Args:
+            macros: Macros available on every device, by name
+            device_macros: Per-device macros by device name, overriding shared ones
+        """
+        self.macros = macros
+        self.device_macros = device_macros or {}
+
+    def get_macro(self, device_name: str, macro_name: str) -> Optional[RemoteMacro]:
+        """Get the macro a device runs under a name."""
+        return self.device_macros.get(device_name, {}).get(macro_name) or self.macros.get(macro_name)
+
+    def get_macros(self, device_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the macros available on a device, or the shared ones.
+
+        Args:
+            device_name: Optional device name
+
+        Returns:
+            List of macro dictionaries
+        """
+        macros = dict(self.macros)
+        if device_name:
+            macros.update(self.device_macros.get(device_name, {}))
+        return [macro.to_dict() for macro in macros.values()]
+
+    def run(self, device_name: str, macro_name: str) -> MacroRun:
+        """Queue a macro on a device.
+
+        Args:
+            device_name: Target device
+            macro_name: Macro to run
+
+        Returns:
+            The queued run
+
+        Raises:
+            KeyError: If the device or macro is unknown
+        """
+        if not self.remote_manager.get_device(device_name):
+            raise KeyError(f"Device '{device_name}' not found")
+        macro = self.get_macro(device_name, macro_name)
+        if macro is None:
+            raise KeyError(f"Macro '{macro_name}' not found")
+
+        run = MacroRun(device_name, macro)
+        with self._lock:
+            self._prune()
+            self.runs[run.id] = run
+            self._queue(device_name).put(run)
+        logger.info(f"Queued macro {macro_name} on {device_name} (run {run.id})")
+        return run
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get the progress of a run.
+
+        Args:
+            run_id: Run ID
+
+        Returns:
+            Run dictionary or None if unknown
+        """
+        run = self.runs.get(run_id)
+        return run.to_dict() if run else None
+
+    def wait(self, run_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until a run finishes or the timeout passes.
+
+        Args:
+            run_id: Run ID
+            timeout: Seconds to wait at most
+
+        Returns:
+            Run dictionary or None if unknown
+        """
+        run = self.runs.get(run_id)
+        if run is None:
+            return None
+        run.done_event.wait(timeout)
+        return run.to_dict()
+
+    def cancel(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running macro; keys already sent are not undone.
+
+        Args:
+            run_id: Run ID
+
+        Returns:
+            Run dictionary or None if unknown
+        """
+        run = self.runs.get(run_id)
+        if run is None:
+            return None
+        run.cancel_event.set()
+        if run.status == "queued":
+            run.finish("cancelled")
+        return run.to_dict()
+
+    def cancel_device(self, device_name: str) -> int:
+        """Cancel every queued and running macro of a device.
+
+        Returns:
+            Number of runs cancelled
+        """
+        runs = [run for run in list(self.runs.values()) if run.device_name == device_name and not run.done]
+        for run in runs:
+            self.cancel(run.id)
+        return len(runs)
+
+    def remove_device(self, device_name: str) -> int:
+        """Cancel the macros of a device that was removed and stop its worker.
+
+        Returns:
+            Number of runs cancelled
+        """
+        cancelled = self.cancel_device(device_name)
+        with self._lock:
+            device_queue = self._queues.pop(device_name, None)
+            self._workers.pop(device_name, None)
+        if device_queue is not None:
+            device_queue.put(None)
+        return cancelled
+
+    def stop(self) -> None:
+        """Cancel all runs and stop the device workers."""
+        for run in list(self.runs.values()):
+            if not run.done:
+                self.cancel(run.id)
+        with self._lock:
+            for device_queue in self._queues.values():
+                device_queue.put(None)
+            workers = list(self._workers.values())
+            self._queues.clear()
+            self._workers.clear()
+        for worker in workers:
+            worker.join(timeout=5)
+
+    def _queue(self, device_name: str) -> queue.Queue:
+        """Get the run queue of a device, starting its worker, caller holds the lock."""
+        device_queue = self._queues.get(device_name)
+        if device_queue is None:
+            device_queue = queue.Queue()
+            self._queues[device_name] = device_queue
+            worker = threading.Thread(
+                target=self._run_worker, args=(device_queue,), name=f"remote-macro-{device_name}", daemon=True
+            )
+            self._workers[device_name] = worker
+            worker.start()
+        return device_queue
+
+    def _run_worker(self, device_queue: queue.Queue) -> None:
+        """Run the queued macros of one device in order."""
+        while True:
+            run = device_queue.get()
+            if run is None:
+                return
+            if run.done:
+                continue
+            try:
+                self._execute(run)
+            except Exception as e:
+                logger.error(f"Macro {run.macro.name} on {run.device_name} failed: {e}")
+                run.finish("failed", str(e))
+
+    def _execute(self, run: MacroRun) -> None:
+        """Send the keys of a run at their scheduled times."""
+        run.status = "running"
+        run.started_at = time.time()
+        macro = run.macro
+        deadline = time.monotonic()
+        for batch in macro.plan():
+            if self._sleep_until(run, deadline):
+                run.finish("cancelled")
+                return
+
+            commands = batch["commands"]
+            result = self.remote_manager.send_key_sequence(run.device_name, commands, macro.delay) if commands else None
+            if result is not None:
+                if not result.get("success"):
+                    run.finish("failed", result.get("message"))
+                    return
+                run.keys_sent += len(commands)
+                # Home Assistant paces the keys itself
+                deadline += (len(commands) - 1) * macro.delay
+            else:
+                for index, command in enumerate(commands):
+                    if index and self._sleep_until(run, deadline):
+                        run.finish("cancelled")
+                        return
+                    result = self.remote_manager.send_command(run.device_name, command, coalesce=False)
+                    if not result.get("success"):
+                        run.finish("failed", result.get("message"))
+                        return
+                    run.keys_sent += 1
+                    if index < len(commands) - 1:
+                        deadline += macro.delay
+            deadline += batch["gap"]
+
+        run.finish("completed")
+        logger.info(f"Macro {macro.name} on {run.device_name} completed in {run.to_dict()['elapsed']}s")
+
+    @staticmethod
+    def _sleep_until(run: MacroRun, deadline: float) -> bool:
+        """Wait for a monotonic deadline.
+
+        Returns:
+            Whether the run was cancelled meanwhile
+        """
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            return run.cancel_event.wait(remaining)
+        return run.cancel_event.is_set()
+
+    def _prune(self) -> None:
+        """Forget runs that finished longer than ``retention`` ago, caller holds the lock."""
+        cutoff = time.time() - self.retention
+        for run_id in [run_id for run_id, run in self.runs.items() if run.done and (run.finished_at or 0) < cutoff]:
+            del self.runs[run_id]
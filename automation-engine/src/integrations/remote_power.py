@@ -0,0 +1,184 @@
+"""Wake-on-LAN and readiness probing for TV and media devices."""
+
+import logging
+import re
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Home Assistant states of a media player that is not ready for commands
+OFF_STATES = {"off", "standby", "unavailable", "unknown"}
+
+
+def magic_packet(mac_address: str) -> bytes:
+    """Build a Wake-on-LAN magic packet.
+
+    Args:
+        mac_address: MAC address with or without separators (e.g., AA:BB:CC:DD:EE:FF)
+
+    Returns:
+        Six 0xFF bytes followed by the MAC address repeated 16 times
+
+    Raises:
+        ValueError: If the MAC address is malformed
+    """
+    digits = re.sub(r"[^0-9A-Fa-f]", "", mac_address)
+    if len(digits) != 12:
+        raise ValueError(f"Invalid MAC address: {mac_address}")
+    return b"\xff" * 6 + bytes.fromhex(digits) * 16
+
+
+def send_magic_packet(mac_address: str, broadcast: str = "255.255.255.255", port: int = 9) -> None:
+    """Broadcast a Wake-on-LAN magic packet.
+
+    Args:
+        mac_address: MAC address of the device to wake
+        broadcast: Broadcast address of the device's network
+        port: UDP port (7 or 9)
+
+    Raises:
+        ValueError: If the MAC address is malformed
+        OSError: If the packet could not be sent
+    """
+    packet = magic_packet(mac_address)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.sendto(packet, (broadcast, port))
+
+
+class ReadinessProber:
+    """Wait for a device to come up by probing it several ways at once.
+
+    The device's control port and its Home Assistant state are polled in
+    parallel; the first probe that sees the device ready ends the wait and
+    stops the others. While waiting, the magic packet is re-sent
+    periodically in case the device missed it.
+    """
+
+    def __init__(
+        self,
+        ha_client: Optional[Any] = None,
+        probe_interval: float = 0.25,
+        resend_interval: float = 2.0
+    ):
+        """Initialize readiness prober.
+
+        Args:
+            ha_client: Optional Home Assistant client used for the state probe
+            probe_interval: Seconds between attempts of one probe
+            resend_interval: Seconds between magic packets while waiting
+        """
+        self.ha_client = ha_client
+        self.probe_interval = probe_interval
+        self.resend_interval = resend_interval
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="remote-probe")
+
+    def wait_ready(
+        self,
+        ip_address: str,
+        port: int,
+        entity_id: Optional[str] = None,
+        timeout: float = 30.0,
+        wake: Optional[Callable[[], None]] = None
+    ) -> Tuple[Optional[str], float]:
+        """Block until the device answers or the deadline passes.
+
+        Args:
+            ip_address: Device IP address
+            port: Control port that accepts connections once the device is up
+            entity_id: Optional Home Assistant media player entity
+            timeout: Seconds to wait at most
+            wake: Called every ``resend_interval`` seconds while waiting
+
+        Returns:
+            Tuple of the probe that saw the device ready (``port`` or
+            ``home_assistant``, None on timeout) and the seconds waited
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        stop = threading.Event()
+        probes: List[Tuple[str, Callable[[], bool]]] = [("port", lambda: self._port_open(ip_address, port, deadline))]
+        if entity_id and self.ha_client:
+            probes.append(("home_assistant", lambda: self._state_on(entity_id)))
+
+        futures = {self._executor.submit(self._poll, check, stop, deadline): name for name, check in probes}
+        ready = None
+        pending = set(futures)
+        next_wake = started + self.resend_interval
+        while pending and ready is None:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            done, pending = wait(pending, timeout=min(deadline, next_wake) - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result():
+                    ready = futures[future]
+                    break
+            if ready is None and wake and time.monotonic() >= next_wake:
+                self._run_wake(wake)
+                next_wake += self.resend_interval
+        stop.set()
+        return ready, round(time.monotonic() - started, 3)
+
+    def _poll(self, check: Callable[[], bool], stop: threading.Event, deadline: float) -> bool:
+        """Run one probe until it succeeds, is stopped or the deadline passes."""
+        while not stop.is_set() and time.monotonic() < deadline:
+            try:
+                if check():
+                    return True
+            except Exception as e:
+                logger.debug(f"Readiness probe failed: {e}")
+            stop.wait(min(self.probe_interval, max(0.0, deadline - time.monotonic())))
+        return False
+
+    @staticmethod
+    def _port_open(ip_address: str, port: int, deadline: float) -> bool:
+        """Whether the device accepts a TCP connection on its control port."""
+        timeout = max(0.05, min(1.0, deadline - time.monotonic()))
+        try:
+            with socket.create_connection((ip_address, port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+
+    def _state_on(self, entity_id: str) -> bool:
+        """Whether Home Assistant reports the media player as on."""
+        assert self.ha_client is not None
+        state = self.ha_client.get_state(entity_id)
+        return bool(state) and state.get("state") not in OFF_STATES
+
+    @staticmethod
+    def _run_wake(wake: Callable[[], None]) -> None:
+        """Re-send the wake-up, logging instead of raising on failure."""
+        try:
+            wake()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to re-send Wake-on-LAN packet: {e}")
+
+
+class PowerOnState:
+    """A power-on in progress that commands to the device wait for."""
+
+    def __init__(self, deadline: float):
+        """Initialize power-on state.
+
+        Args:
+            deadline: Monotonic time by which the device should be ready
+        """
+        self.deadline = deadline
+        self.ready = False
+        self.done = threading.Event()
+
+    def wait(self) -> bool:
+        """Wait for the power-on to finish.
+
+        Returns:
+            Whether the device became ready
+        """
+        self.done.wait(max(0.0, self.deadline - time.monotonic()) + 1)
+        return self.ready
@@ -0,0 +1,513 @@
+"""Persistent control connections for TV and media devices."""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+import aiohttp
+
+from home_automation.core.event_loop import BackgroundEventLoop
+from home_automation.integrations.remote_control import DeviceType, RemoteCommand, RemoteDevice
+
+
+logger = logging.getLogger(__name__)
+
+# Device types controlled over ADB when they have no Home Assistant entity
+ADB_DEVICE_TYPES = {DeviceType.ANDROID_TV, DeviceType.ANDROID_BOX, DeviceType.GOOGLE_TV, DeviceType.FIRE_TV}
+
+SAMSUNG_KEYS = {
+    RemoteCommand.POWER: "KEY_POWER",
+    RemoteCommand.POWER_OFF: "KEY_POWER",
+    RemoteCommand.VOLUME_UP: "KEY_VOLUP",
+    RemoteCommand.VOLUME_DOWN: "KEY_VOLDOWN",
+    RemoteCommand.VOLUME_MUTE: "KEY_MUTE",
+    RemoteCommand.CHANNEL_UP: "KEY_CHUP",
+    RemoteCommand.CHANNEL_DOWN: "KEY_CHDOWN",
+    RemoteCommand.INPUT_HDMI1: "KEY_HDMI1",
+    RemoteCommand.INPUT_HDMI2: "KEY_HDMI2",
+    RemoteCommand.INPUT_HDMI3: "KEY_HDMI3",
+    RemoteCommand.INPUT_USB: "KEY_SOURCE",
+    RemoteCommand.HOME: "KEY_HOME",
+    RemoteCommand.BACK: "KEY_RETURN",
+    RemoteCommand.UP: "KEY_UP",
+    RemoteCommand.DOWN: "KEY_DOWN",
+    RemoteCommand.LEFT: "KEY_LEFT",
+    RemoteCommand.RIGHT: "KEY_RIGHT",
+    RemoteCommand.SELECT: "KEY_ENTER",
+    RemoteCommand.PLAY: "KEY_PLAY",
+    RemoteCommand.PAUSE: "KEY_PAUSE",
+    RemoteCommand.STOP: "KEY_STOP",
+    RemoteCommand.REWIND: "KEY_REWIND",
+    RemoteCommand.FAST_FORWARD: "KEY_FF",
+    RemoteCommand.MENU: "KEY_MENU",
+}
+
+SAMSUNG_APPS = {
+    RemoteCommand.NETFLIX: "3201907018807",
+    RemoteCommand.YOUTUBE: "111299001912",
+    RemoteCommand.PRIME_VIDEO: "3201910019365",
+}
+
+ANDROID_KEYCODES = {
+    RemoteCommand.POWER: "KEYCODE_POWER",
+    RemoteCommand.POWER_ON: "KEYCODE_WAKEUP",
+    RemoteCommand.POWER_OFF: "KEYCODE_SLEEP",
+    RemoteCommand.VOLUME_UP: "KEYCODE_VOLUME_UP",
+    RemoteCommand.VOLUME_DOWN: "KEYCODE_VOLUME_DOWN",
+    RemoteCommand.VOLUME_MUTE: "KEYCODE_VOLUME_MUTE",
+    RemoteCommand.CHANNEL_UP: "KEYCODE_CHANNEL_UP",
+    RemoteCommand.CHANNEL_DOWN: "KEYCODE_CHANNEL_DOWN",
+    RemoteCommand.INPUT_HDMI1: "KEYCODE_TV_INPUT_HDMI_1",
+    RemoteCommand.INPUT_HDMI2: "KEYCODE_TV_INPUT_HDMI_2",
+    RemoteCommand.INPUT_HDMI3: "KEYCODE_TV_INPUT_HDMI_3",
+    RemoteCommand.INPUT_USB: "KEYCODE_TV_INPUT",
+    RemoteCommand.HOME: "KEYCODE_HOME",
+    RemoteCommand.BACK: "KEYCODE_BACK",
+    RemoteCommand.UP: "KEYCODE_DPAD_UP",
+    RemoteCommand.DOWN: "KEYCODE_DPAD_DOWN",
+    RemoteCommand.LEFT: "KEYCODE_DPAD_LEFT",
+    RemoteCommand.RIGHT: "KEYCODE_DPAD_RIGHT",
+    RemoteCommand.SELECT: "KEYCODE_DPAD_CENTER",
+    RemoteCommand.PLAY: "KEYCODE_MEDIA_PLAY",
+    RemoteCommand.PAUSE: "KEYCODE_MEDIA_PAUSE",
+    RemoteCommand.STOP: "KEYCODE_MEDIA_STOP",
+    RemoteCommand.REWIND: "KEYCODE_MEDIA_REWIND",
+    RemoteCommand.FAST_FORWARD: "KEYCODE_MEDIA_FAST_FORWARD",
+    RemoteCommand.MENU: "KEYCODE_MENU",
+}
+
+ANDROID_APPS = {
+    RemoteCommand.NETFLIX: "com.netflix.ninja",
+    RemoteCommand.YOUTUBE: "com.google.android.youtube.tv",
+    RemoteCommand.PRIME_VIDEO: "com.amazon.amazonvideo.livingroom",
+}
+
+
+class SamsungTVSession:
+    """Samsung Smart TV remote over one persistent WebSocket.
+
+    The connection and its pairing handshake happen once; afterwards every
+    key is a single WebSocket frame. The socket lives on the shared event
+    loop and is reopened on the next command after the TV drops it.
+    """
+
+    def __init__(
+        self,
+        device: RemoteDevice,
+        event_loop: BackgroundEventLoop,
+        client_name: str = "HOME-AI-AUTOMATION",
+        token: Optional[str] = None,
+        timeout: float = 5.0
+    ):
+        """Initialize Samsung TV session.
+
+        Args:
+            device: Samsung TV device
+            event_loop: Loop the WebSocket runs on
+            client_name: Name the TV shows when asking to allow the remote
+            token: Pairing token from an earlier connection (port 8002)
+            timeout: Seconds to wait for connecting and sending
+        """
+        self.device = device
+        self.event_loop = event_loop
+        self.client_name = client_name
+        self.token = token
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def connected(self) -> bool:
+        """Whether the WebSocket is open."""
+        return self._ws is not None and not self._ws.closed
+
+    @property
+    def url(self) -> str:
+        """WebSocket URL of the TV's remote control channel."""
+        name = base64.b64encode(self.client_name.encode()).decode()
+        scheme = "wss" if self.device.port == 8002 else "ws"
+        url = f"{scheme}://{self.device.ip_address}:{self.device.port}/api/v2/channels/samsung.remote.control?name={name}"
+        if self.token:
+            url += f"&token={self.token}"
+        return url
+
+    def send(self, command: RemoteCommand) -> Dict[str, Any]:
+        """Send a command, connecting first if needed.
+
+        Args:
+            command: Command to send
+
+        Returns:
+            Result of command
+        """
+        if command in SAMSUNG_APPS:
+            payload = {
+                "method": "ms.channel.emit",
+                "params": {
+                    "event": "ed.apps.launch",
+                    "to": "host",
+                    "data": {"appId": SAMSUNG_APPS[command], "action_type": "DEEP_LINK"},
+                },
+            }
+        elif command in SAMSUNG_KEYS:
+            payload = {
+                "method": "ms.remote.control",
+                "params": {
+                    "Cmd": "Click",
+                    "DataOfCmd": SAMSUNG_KEYS[command],
+                    "Option": "false",
+                    "TypeOfRemote": "SendRemoteKey",
+                },
+            }
+        else:
+            return {
+                "success": False,
+                "message": f"Command {command.value} is not supported by Samsung TVs"
+            }
+
+        try:
+            self.event_loop.run(self._send(payload), timeout=self.timeout * 2 + 1)
+        except (aiohttp.ClientError, asyncio.TimeoutError, TimeoutError, ConnectionError) as e:
+            error = str(e) or type(e).__name__
+            logger.error(f"Failed to send {command.value} to {self.device.name}: {error}")
+            return {
+                "success": False,
+                "message": f"Failed to send {command.value}: {error}",
+                "error": error
+            }
+        return {
+            "success": True,
+            "message": f"Command {command.value} sent to {self.device.name}"
+        }
+
+    def close(self) -> None:
+        """Close the WebSocket."""
+        if self.event_loop.running:
+            self.event_loop.run(self._close(), timeout=self.timeout)
+
+    async def _send(self, payload: Dict[str, Any]) -> None:
+        """Send one frame, reconnecting once if the socket turns out to be dead."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            for attempt in range(2):
+                if not self.connected:
+                    await self._connect()
+                assert self._ws is not None
+                try:
+                    await asyncio.wait_for(self._ws.send_str(json.dumps(payload)), self.timeout)
+                    return
+                except (aiohttp.ClientError, ConnectionError) as e:
+                    if attempt:
+                        raise
+                    logger.info(f"Connection to {self.device.name} lost ({e}), reconnecting")
+                    await self._close()
+
+    async def _connect(self) -> None:
+        """Open the WebSocket and wait for the TV to accept the client."""
+        await self._close()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        ws = await asyncio.wait_for(self._session.ws_connect(self.url, ssl=False, heartbeat=30), self.timeout)
+        try:
+            # The TV answers once the user allowed the remote (first connection only)
+            message = await asyncio.wait_for(ws.receive_json(), self.timeout)
+        except Exception:
+            await ws.close()
+            raise
+        event = message.get("event")
+        if event != "ms.channel.connect":
+            await ws.close()
+            raise ConnectionError(f"{self.device.name} refused the connection: {event}")
+
+        token = (message.get("data") or {}).get("token")
+        if token:
+            self.token = token
+        self._ws = ws
+        self._reader = asyncio.create_task(self._read(ws))
+        logger.info(f"Connected to Samsung TV {self.device.name}")
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Drain incoming frames so the socket notices when the TV closes it."""
+        async for message in ws:
+            if message.type == aiohttp.WSMsgType.ERROR:
+                break
+        logger.debug(f"Samsung TV {self.device.name} closed the connection")
+
+    async def _close(self) -> None:
+        """Close the socket and the HTTP session."""
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class AndroidADBSession:
+    """Android device remote over one persistent ``adb shell``.
+
+    ``adb connect`` and the shell are set up once; each key is a single
+    ``input keyevent`` line written to the running shell. A shell that
+    exited is restarted on the next command.
+    """
+
+    def __init__(self, device: RemoteDevice, adb_path: str = "adb", timeout: float = 5.0):
+        """Initialize ADB session.
+
+        Args:
+            device: Android device
+            adb_path: Path of the adb executable
+            timeout: Seconds to wait for ``adb connect``
+        """
+        self.device = device
+        self.adb_path = adb_path
+        self.timeout = timeout
+        self.serial = f"{device.ip_address}:{device.port}"
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the shell is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def send(self, command: RemoteCommand) -> Dict[str, Any]:
+        """Send a command, starting the shell first if needed.
+
+        Args:
+            command: Command to send
+
+        Returns:
+            Result of command
+        """
+        if command in ANDROID_APPS:
+            line = f"monkey -p {ANDROID_APPS[command]} -c android.intent.category.LEANBACK_LAUNCHER 1 >/dev/null 2>&1"
+        elif command in ANDROID_KEYCODES:
+            line = f"input keyevent {ANDROID_KEYCODES[command]}"
+        else:
+            return {
+                "success": False,
+                "message": f"Command {command.value} is not supported by Android devices"
+            }
+
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if not self.connected:
+                        self._connect()
+                    assert self._process is not None and self._process.stdin is not None
+                    self._process.stdin.write(f"{line}\n".encode())
+                    self._process.stdin.flush()
+                    break
+                except (OSError, subprocess.SubprocessError) as e:
+                    self._terminate()
+                    if attempt:
+                        logger.error(f"Failed to send {command.value} to {self.device.name}: {e}")
+                        return {
+                            "success": False,
+                            "message": f"Failed to send {command.value}: {e}",
+                            "error": str(e)
+                        }
+        return {
+            "success": True,
+            "message": f"Command {command.value} sent to {self.device.name}"
+        }
+
+    def close(self) -> None:
+        """Exit the shell."""
+        with self._lock:
+            self._terminate()
+
+    def _connect(self) -> None:
+        """Connect adb to the device and start the shell, caller holds the lock."""
+        if shutil.which(self.adb_path) is None:
+            raise FileNotFoundError(f"adb executable not found: {self.adb_path}")
+        subprocess.run(
+            [self.adb_path, "connect", self.serial],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=self.timeout,
+            check=True
+        )
+        self._process = subprocess.Popen(
+            [self.adb_path, "-s", self.serial, "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        logger.info(f"Opened adb shell to {self.device.name} ({self.serial})")
+
+    def _terminate(self) -> None:
+        """Stop the shell process, caller holds the lock."""
+        if self._process is None:
+            return
+        try:
+            if self._process.poll() is None:
+                if self._process.stdin:
+                    self._process.stdin.close()
+                self._process.terminate()
+                self._process.wait(timeout=2)
+        except (OSError, subprocess.SubprocessError):
+            self._process.kill()
+        self._process = None
+
+
+class RemoteSessionPool:
+    """One persistent control session per device, created on first use.
+
+    Sessions are keyed by device name and replaced when the device's
+    address changes. Commands to one device are serialized by its session
+    while different devices are controlled in parallel.
+    """
+
+    def __init__(
+        self,
+        event_loop: BackgroundEventLoop,
+        adb_path: str = "adb",
+        client_name: str = "HOME-AI-AUTOMATION",
+        timeout: float = 5.0,
+        token_file: Optional[str] = None
+    ):
+        """Initialize session pool.
+
+        Args:
+            event_loop: Loop the Samsung WebSockets run on
+            adb_path: Path of the adb executable for Android devices
+            client_name: Name Samsung TVs show when asking to allow the remote
+            timeout: Seconds to wait for connecting and sending
+            token_file: JSON file Samsung pairing tokens are kept in across
+                restarts; without it they only survive reconnects
+        """
+        self.event_loop = event_loop
+        self.adb_path = adb_path
+        self.client_name = client_name
+        self.timeout = timeout
+        self.token_file = token_file
+        self.sessions: Dict[str, Tuple[Tuple[Any, ...], Any]] = {}
+        # Samsung pairing tokens survive reconnects so the TV does not ask again
+        self.tokens: Dict[str, str] = self._load_tokens()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supports(device: RemoteDevice) -> bool:
+        """Whether the pool can control a device directly."""
+        return device.device_type == DeviceType.SAMSUNG_TV or device.device_type in ADB_DEVICE_TYPES
+
+    def get_session(self, device: RemoteDevice) -> Any:
+        """Get the session of a device, creating it if needed.
+
+        Args:
+            device: Target device
+
+        Returns:
+            SamsungTVSession or AndroidADBSession
+
+        Raises:
+            ValueError: If the device type has no direct control protocol
+        """
+        key = (device.device_type, device.ip_address, device.port)
+        stale = None
+        with self._lock:
+            entry = self.sessions.get(device.name)
+            if entry and entry[0] == key:
+                return entry[1]
+            if entry:
+                stale = entry[1]
+
+            session: Union[SamsungTVSession, AndroidADBSession]
+            if device.device_type == DeviceType.SAMSUNG_TV:
+                # A token paired at runtime wins over the configured one
+                token = self.tokens.get(device.name) or device.additional_params.get("token")
+                session = SamsungTVSession(device, self.event_loop, self.client_name, token, self.timeout)
+            elif device.device_type in ADB_DEVICE_TYPES:
+                session = AndroidADBSession(device, self.adb_path, self.timeout)
+            else:
+                raise ValueError(f"Direct control not implemented for {device.device_type.value}")
+            self.sessions[device.name] = (key, session)
+
+        if stale:
+            self._close_session(device.name, stale)
+        return session
+
+    def send(self, device: RemoteDevice, command: RemoteCommand) -> Dict[str, Any]:
+        """Send a command over the device's persistent session.
+
+        Args:
+            device: Target device
+            command: Command to send
+
+        Returns:
+            Result of command
+        """
+        session = self.get_session(device)
+        result = session.send(command)
+        if isinstance(session, SamsungTVSession) and session.token and self.tokens.get(device.name) != session.token:
+            self.tokens[device.name] = session.token
+            self._save_tokens()
+        return result
+
+    def _load_tokens(self) -> Dict[str, str]:
+        """Read the pairing tokens saved by an earlier run."""
+        if not self.token_file or not os.path.exists(self.token_file):
+            return {}
+        try:
+            with open(self.token_file) as f:
+                return {str(name): str(token) for name, token in json.load(f).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Failed to load Samsung pairing tokens from {self.token_file}: {e}")
+            return {}
+
+    def _save_tokens(self) -> None:
+        """Write the pairing tokens so the TVs do not ask again after a restart."""
+        if not self.token_file:
+            return
+        temp_path = f"{self.token_file}.tmp"
+        try:
+            # Written to a private file and swapped in, so a crash never leaves half a file
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.tokens, f, indent=2)
+            os.replace(temp_path, self.token_file)
+        except OSError as e:
+            logger.error(f"Failed to save Samsung pairing tokens to {self.token_file}: {e}")
+
+    def close(self, device_name: str, forget_token: bool = False) -> None:
+        """Close the session of a device, e.g. after it was removed or reconfigured.
+
+        Args:
+            device_name: Name of device
+            forget_token: Also drop the pairing token the TV issued, so the
+                next session uses the configured one
+        """
+        with self._lock:
+            entry = self.sessions.pop(device_name, None)
+            forgotten = forget_token and self.tokens.pop(device_name, None) is not None
+        if forgotten:
+            self._save_tokens()
+        if entry:
+            self._close_session(device_name, entry[1])
+
+    def close_all(self) -> None:
+        """Close every session."""
+        for device_name in list(self.sessions):
+            self.close(device_name)
+
+    @staticmethod
+    def _close_session(device_name: str, session: Any) -> None:
+        """Close a session, logging instead of raising on failure."""
+        try:
+            session.close()
+        except Exception as e:
+            logger.warning(f"Failed to close control session of {device_name}: {e}")
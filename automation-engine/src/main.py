@@ -82,6 +82,9 @@ def create_app() -> Flask:
     # Store references in app context
     app.automation_engine = automation_engine
     app.db_manager = db_manager
+
+    # Background work (device polling, Home Assistant mirror, watchers) runs until shutdown()
+    automation_engine.start()
     app.config_obj = config
 
     logger.info("HOME-AI-AUTOMATION application initialized successfully")
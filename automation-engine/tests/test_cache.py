@@ -0,0 +1,138 @@
+"""Tests for the stale-while-revalidate state cache."""
+
+import threading
+
+import pytest
+
+from conftest import wait_until
+from home_automation.core.cache import StaleWhileRevalidateCache
+from home_automation.integrations.home_assistant import HomeAssistantClient
+
+
+class Loader:
+    """Loader returning successive values, optionally blocking or failing."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+        self.gate = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(2)
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+def age_entry(cache, key, seconds):
+    value, fetched_at = cache.entries[key]
+    cache.entries[key] = (value, fetched_at - seconds)
+
+
+def test_fresh_entries_are_served_without_loading():
+    cache = StaleWhileRevalidateCache(ttl=10)
+    loader = Loader("a", "b")
+
+    assert cache.get("key", loader) == ("a", {"source": "upstream", "stale": False, "age": 0.0})
+    value, meta = cache.get("key", loader)
+
+    assert value == "a"
+    assert meta["source"] == "cache" and not meta["stale"]
+    assert loader.calls == 1
+
+
+def test_stale_entries_are_served_while_one_refresh_runs():
+    cache = StaleWhileRevalidateCache(ttl=1, stale_ttl=60)
+    loader = Loader("a", "b")
+    cache.get("key", loader)
+    age_entry(cache, "key", 5)
+    loader.gate = threading.Event()
+
+    first = cache.get("key", loader)
+    second = cache.get("key", loader)
+
+    assert first[0] == second[0] == "a"
+    assert first[1]["stale"] and second[1]["stale"]
+    loader.gate.set()
+    assert wait_until(lambda: cache.entries["key"][0] == "b")
+    assert loader.calls == 2
+
+
+def test_expired_entry_is_served_when_reload_fails():
+    cache = StaleWhileRevalidateCache(ttl=1, stale_ttl=1)
+    loader = Loader("a", ConnectionError("down"), ConnectionError("down"))
+    cache.get("key", loader)
+    age_entry(cache, "key", 5)
+
+    value, meta = cache.get("key", loader)
+
+    assert value == "a"
+    assert meta["stale"] and meta["error"] == "down"
+
+
+def test_errors_are_not_cached():
+    cache = StaleWhileRevalidateCache(ttl=10)
+    loader = Loader(ConnectionError("down"), "a")
+
+    with pytest.raises(ConnectionError):
+        cache.get("key", loader)
+
+    assert cache.get("key", loader)[0] == "a"
+
+
+def test_refresh_started_before_invalidation_is_discarded():
+    cache = StaleWhileRevalidateCache(ttl=1, stale_ttl=60)
+    loader = Loader("old")
+    loader.gate = threading.Event()
+
+    cache.refresh("key", loader)
+    cache.invalidate("key")
+    loader.gate.set()
+
+    assert wait_until(lambda: not cache._refreshing)
+    assert "key" not in cache.entries
+
+
+def test_full_invalidation_discards_running_refreshes():
+    cache = StaleWhileRevalidateCache(ttl=1, stale_ttl=60)
+    loader = Loader("old")
+    loader.gate = threading.Event()
+
+    cache.refresh("key", loader)
+    cache.invalidate()
+    loader.gate.set()
+
+    assert wait_until(lambda: not cache._refreshing)
+    assert cache.entries == {}
+
+
+def test_ttl_for_overrides_the_default_per_key():
+    cache = StaleWhileRevalidateCache(ttl=100, stale_ttl=0, ttl_for=lambda key: 1 if key == "short" else 100)
+    for key in ("short", "long"):
+        cache.get(key, Loader(key))
+        age_entry(cache, key, 5)
+
+    assert cache.get("short", Loader("reloaded"))[1]["source"] == "upstream"
+    assert cache.get("long", Loader("reloaded"))[1]["source"] == "cache"
+
+
+def test_client_domain_ttls_and_service_invalidation(ha_standin):
+    standin, url = ha_standin
+    client = HomeAssistantClient(
+        url, "test-token", cache_ttl=60, cache_stale_ttl=0, cache_domain_ttls={"sensor": 0}
+    )
+
+    assert client.get_state("light.kitchen")["state"] == "off"
+    standin.states["light.kitchen"]["state"] = "unknown"
+    assert client.get_state("light.kitchen")["state"] == "off"
+
+    client.turn_on("light.kitchen")
+    assert client.get_state("light.kitchen")["state"] == "on"
+    assert client.get_state_with_meta("light.kitchen")[1]["source"] == "cache"
+
+    client.get_state("sensor.outside")
+    standin.states["sensor.outside"]["state"] = "13.0"
+    assert client.get_state_with_meta("sensor.outside")[1]["source"] == "upstream"
@@ -0,0 +1,116 @@
+"""Tests for hot-reloading device configuration files."""
+
+import json
+import os
+
+from home_automation.core.config import Config
+from home_automation.core.config_watcher import ConfigWatcher
+from home_automation.core.database import DatabaseManager
+from home_automation.devices.device_manager import DeviceManager
+from home_automation.integrations.remote_control import DeviceType, RemoteControlManager, RemoteDevice
+
+
+class FakeSessionPool:
+    """Records which device sessions were closed."""
+
+    def __init__(self):
+        self.closed = []
+
+    def close(self, device_name, forget_token=False):
+        self.closed.append((device_name, forget_token))
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+    # Make sure the watcher sees a new mtime even on coarse filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watcher_runs_callback_only_when_file_changes(tmp_path):
+    path = tmp_path / "devices.json"
+    write_json(path, {"devices": []})
+    calls = []
+    watcher = ConfigWatcher()
+    watcher.watch(path, lambda: calls.append(path.read_text()))
+
+    assert watcher.check() == []
+    write_json(path, {"devices": [{"name": "Lamp"}]})
+    assert watcher.check() == [path]
+    assert watcher.check() == []
+    assert len(calls) == 1
+
+
+def test_watcher_keeps_going_when_file_is_removed(tmp_path):
+    path = tmp_path / "devices.json"
+    write_json(path, {})
+    calls = []
+    watcher = ConfigWatcher()
+    watcher.watch(path, lambda: calls.append(1))
+
+    path.unlink()
+    assert watcher.check() == []
+    write_json(path, {})
+    assert watcher.check() == [path]
+    assert calls == [1]
+
+
+def test_device_manager_reload_applies_only_the_difference(tmp_path):
+    config_path = tmp_path / "devices.json"
+    write_json(config_path, {"devices": [
+        {"name": "Hall Light", "type": "light", "location": "Hall"},
+        {"name": "Porch Light", "type": "light", "location": "Porch"},
+    ]})
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    db_manager.initialize()
+    manager = DeviceManager(Config(DEVICES_CONFIG_PATH=str(config_path)), db_manager)
+    hall = manager.devices["hall light"]
+    hall.status = "online"
+
+    write_json(config_path, {"devices": [
+        {"name": "Hall Light", "type": "light", "location": "Entrance"},
+        {"name": "Garage Sensor", "type": "sensor", "location": "Garage"},
+    ]})
+    changes = manager.reload_device_config()
+
+    assert changes == {"added": ["garage sensor"], "removed": ["porch light"], "modified": ["hall light"]}
+    # Modified devices are updated in place and keep their runtime state
+    assert manager.devices["hall light"] is hall
+    assert hall.location == "Entrance"
+    assert hall.status == "online"
+
+
+def test_remote_sync_detects_token_change_and_closes_session():
+    pool = FakeSessionPool()
+    manager = RemoteControlManager(session_pool=pool)
+    manager.sync_devices([RemoteDevice("TV", DeviceType.SAMSUNG_TV, "10.0.0.2", token="old")])
+
+    changes = manager.sync_devices([RemoteDevice("TV", DeviceType.SAMSUNG_TV, "10.0.0.2", token="new")])
+
+    assert changes["modified"] == ["TV"]
+    assert manager.get_device("TV").additional_params["token"] == "new"
+    assert pool.closed == [("TV", True)]
+
+
+def test_remote_sync_reconnects_on_address_change_but_not_on_description():
+    pool = FakeSessionPool()
+    manager = RemoteControlManager(session_pool=pool)
+    manager.sync_devices([RemoteDevice("TV", DeviceType.SAMSUNG_TV, "10.0.0.2", description="old")])
+
+    manager.sync_devices([RemoteDevice("TV", DeviceType.SAMSUNG_TV, "10.0.0.2", description="new")])
+    assert pool.closed == []
+
+    manager.sync_devices([RemoteDevice("TV", DeviceType.SAMSUNG_TV, "10.0.0.3", description="new")])
+    assert pool.closed == [("TV", False)]
+    assert manager.get_device("TV").ip_address == "10.0.0.3"
+
+
+def test_remote_sync_leaves_unchanged_devices_alone():
+    manager = RemoteControlManager()
+    manager.sync_devices([RemoteDevice("TV", DeviceType.GOOGLE_TV, "10.0.0.4")])
+    device = manager.get_device("TV")
+
+    changes = manager.sync_devices([RemoteDevice("TV", DeviceType.GOOGLE_TV, "10.0.0.4")])
+
+    assert changes == {"added": [], "removed": [], "modified": []}
+    assert manager.get_device("TV") is device
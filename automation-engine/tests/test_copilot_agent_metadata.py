@@ -0,0 +1,100 @@
+"""Tests for the Copilot agent MCP server's memoized Home Assistant metadata."""
+
+import pytest
+import requests
+
+from conftest import REPO, load_script, wait_until
+
+copilot_agent = load_script(REPO / "mcp-servers" / "copilot-agent-mcp.py")
+
+
+@pytest.fixture
+def agent(ha_standin, background_loop):
+    """A started agent pointed at the stand-in, with its event subscriptions running."""
+    _, url = ha_standin
+    agent = copilot_agent.CopilotAgentMCP(copilot_agent.HAConfig(url=url, token="test-token"))
+    agent.metadata_ttl = 60
+    agent.event_reconnect_delay = 0.05
+    background_loop.run(agent.start())
+    # The state snapshot is requested after every subscription
+    assert wait_until(lambda: agent._states_synced)
+    yield agent
+    background_loop.run(agent.stop())
+
+
+def components(agent, background_loop):
+    return background_loop.run(agent.get_config())["components"]
+
+
+def add_climate(standin):
+    standin.states["climate.hall"] = {"entity_id": "climate.hall", "state": "heat", "attributes": {}}
+
+
+def age(agent, path, seconds):
+    fetched_at, data = agent._metadata[path]
+    agent._metadata[path] = (fetched_at - seconds, data)
+
+
+def test_config_is_memoized(agent, ha_standin, background_loop):
+    standin, _ = ha_standin
+    assert "climate" not in components(agent, background_loop)
+    requests_before = standin.request_count
+    add_climate(standin)
+
+    assert "climate" not in components(agent, background_loop)
+    assert standin.request_count == requests_before
+
+
+def test_stale_config_is_served_while_it_reloads(agent, ha_standin, background_loop):
+    standin, _ = ha_standin
+    components(agent, background_loop)
+    add_climate(standin)
+    age(agent, "/api/config", 61)
+
+    assert "climate" not in components(agent, background_loop)
+    assert wait_until(lambda: "climate" in agent._metadata["/api/config"][1]["components"])
+
+
+def test_expired_config_is_served_when_home_assistant_is_down(agent, background_loop):
+    components(agent, background_loop)
+    agent.config.url = "http://127.0.0.1:9"
+    age(agent, "/api/config", 600)
+
+    assert "light" in components(agent, background_loop)
+
+
+def test_metadata_events_reload_the_affected_payload(agent, ha_standin, background_loop):
+    standin, url = ha_standin
+    components(agent, background_loop)
+    background_loop.run(agent.get_services())
+    add_climate(standin)
+
+    requests.post(f"{url}/api/events/core_config_updated", headers={"Authorization": "Bearer test-token"}, timeout=5)
+
+    assert wait_until(lambda: "climate" in components(agent, background_loop))
+    domains = [s["domain"] for s in background_loop.run(agent.get_services())]
+    assert "climate" not in domains
+
+
+def test_load_started_before_a_change_is_not_memoized(agent, ha_standin, background_loop):
+    standin, _ = ha_standin
+    standin.latency_ms = 200
+    requests_before = standin.request_count
+    load = background_loop.submit(agent._get_metadata("/api/config"))
+    assert wait_until(lambda: standin.request_count > requests_before)
+
+    async def change():
+        agent.refresh_metadata("/api/config")
+
+    background_loop.run(change())
+
+    assert load.result(timeout=5)["components"]
+    assert "/api/config" not in agent._metadata
+
+
+def test_query_commands_report_home_assistant_errors(agent, background_loop):
+    agent.config.token = "wrong-token"
+
+    for command in ("get config", "list services"):
+        result = background_loop.run(agent.execute_command(command))
+        assert result == {"success": False, "error": "Home Assistant returned 401: Unauthorized"}
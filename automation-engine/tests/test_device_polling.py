@@ -0,0 +1,101 @@
+"""Tests for adaptive device polling and sensor data validation."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from flask_restful import Api
+
+from home_automation.api.routes import SensorData
+from home_automation.core.config import Config
+from home_automation.core.database import DatabaseManager
+from home_automation.devices.device_manager import DeviceManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    config_path = tmp_path / "devices.json"
+    config_path.write_text(json.dumps({"devices": [
+        {"name": "Desk Lamp", "type": "light", "location": "Office"},
+        {"name": "Office Temp", "type": "sensor", "sensor_type": "temperature", "location": "Office"},
+    ]}))
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    db_manager.initialize()
+    config = Config(
+        DEVICES_CONFIG_PATH=str(config_path),
+        DEVICE_POLL_INTERVAL=30.0,
+        DEVICE_POLL_MIN_INTERVAL=5.0,
+        DEVICE_POLL_MAX_INTERVAL=300.0,
+        DEVICE_POLL_JITTER=0.0,
+    )
+    return DeviceManager(config, db_manager)
+
+
+def test_interval_backs_off_while_device_is_unchanged(manager):
+    manager.notify_device_changed("Desk Lamp")
+    key, state = manager._next_due_device()
+    assert key == "desk lamp"
+    assert state.interval == 5.0
+
+    manager._poll_device(key, state)
+    manager._poll_device(key, state)
+    assert state.interval == pytest.approx(11.25)
+
+    for _ in range(20):
+        manager._poll_device(key, state)
+    assert state.interval == 300.0
+
+
+def test_interval_halves_when_device_changes(manager):
+    manager.notify_device_changed("Desk Lamp")
+    key, state = manager._next_due_device()
+    manager._poll_device(key, state)
+    state.interval = 80.0
+
+    manager.devices[key].turn_on()
+    manager._poll_device(key, state)
+
+    assert state.interval == 40.0
+
+
+def test_notify_replaces_the_pending_schedule_entry(manager):
+    manager.notify_device_changed("Desk Lamp")
+    manager.notify_device_changed("Desk Lamp")
+
+    assert manager._next_due_device()[0] == "desk lamp"
+    # The older entry was superseded and is skipped instead of polling twice
+    assert manager._next_due_device() is None
+
+
+def test_removed_device_is_dropped_from_schedule(manager):
+    manager.notify_device_changed("Desk Lamp")
+    del manager.devices["desk lamp"]
+
+    assert manager._next_due_device() is None
+    assert "desk lamp" not in manager.poll_states
+
+
+def post_reading(manager, body):
+    app = Flask(__name__)
+    engine = SimpleNamespace(db_manager=manager.db_manager, device_manager=manager)
+    Api(app).add_resource(SensorData, "/api/sensors/<device_id>", resource_class_args=(engine,))
+    device_id = manager.get_device("Office Temp").device_id
+    response = app.test_client().post(f"/api/sensors/{device_id}", json=body)
+    return response, device_id
+
+
+@pytest.mark.parametrize("value", ["warm", [21], {"v": 1}, "nan"])
+def test_invalid_sensor_value_is_rejected_before_insert(manager, value):
+    response, device_id = post_reading(manager, {"sensor_type": "temperature", "value": value})
+
+    assert response.status_code == 400
+    assert manager.db_manager.get_recent_sensor_data(device_id) == []
+
+
+def test_numeric_string_sensor_value_is_stored(manager):
+    response, device_id = post_reading(manager, {"sensor_type": "temperature", "value": "21.5", "unit": "°C"})
+
+    assert response.status_code == 200
+    assert manager.db_manager.get_recent_sensor_data(device_id)[0]["value"] == 21.5
+    assert manager.get_device("Office Temp").properties["value"] == 21.5
@@ -0,0 +1,121 @@
+"""Tests for the asyncio Home Assistant client and the multi-entity control endpoints."""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from flask import Flask
+from flask_restful import Api
+
+from home_automation.api.integration_routes import HomeAssistantBulkControl, HomeAssistantControl
+from home_automation.integrations.home_assistant_async import AsyncHomeAssistantClient
+
+
+def test_fan_out_against_standin(ha_standin, background_loop):
+    standin, url = ha_standin
+
+    async def run():
+        async with AsyncHomeAssistantClient(url, "test-token") as client:
+            states = await client.get_states()
+            found = await client.get_states_for(["light.kitchen", "light.missing"])
+            results = await client.call_services([
+                ("light", "turn_on", {"entity_id": "light.kitchen"}),
+                ("switch", "turn_on", {"entity_id": "switch.fan"}),
+            ])
+            return states, found, results
+
+    states, found, results = background_loop.run(run(), timeout=10)
+
+    assert len(states) == len(standin.states)
+    assert found["light.kitchen"]["state"] == "off"
+    assert found["light.missing"] is None
+    assert [result["success"] for result in results] == [True, True]
+    assert standin.states["switch.fan"]["state"] == "on"
+
+
+def test_concurrency_is_capped(serve_app, background_loop):
+    in_flight = {"now": 0, "max": 0}
+
+    async def slow_state(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.02)
+        in_flight["now"] -= 1
+        return web.json_response({"entity_id": request.match_info["entity_id"], "state": "on"})
+
+    app = web.Application()
+    app.router.add_get("/api/states/{entity_id}", slow_state)
+    url = serve_app(app)
+
+    async def run():
+        async with AsyncHomeAssistantClient(url, "token", max_concurrency=3) as client:
+            return await client.get_states_for(f"light.l{index}" for index in range(12))
+
+    states = background_loop.run(run(), timeout=10)
+
+    assert len(states) == 12
+    assert in_flight["max"] == 3
+
+
+class RecordingClient:
+    """Stands in for HomeAssistantClient and records control calls."""
+
+    registry = None
+
+    def __init__(self):
+        self.calls = []
+
+    def turn_on(self, entity_id, **parameters):
+        self.calls.append(("turn_on", entity_id, parameters))
+        return {"success": True}
+
+    def control_entities(self, action, entity_ids, **parameters):
+        self.calls.append((action, entity_ids, parameters))
+        return {entity_id: {"success": True} for entity_id in entity_ids}
+
+
+@pytest.fixture
+def control_api():
+    client = RecordingClient()
+    app = Flask(__name__)
+    api = Api(app)
+    api.add_resource(HomeAssistantBulkControl, "/control", resource_class_args=(client,))
+    api.add_resource(HomeAssistantControl, "/control/<entity_id>", resource_class_args=(client,))
+    return app.test_client(), client
+
+
+@pytest.mark.parametrize("body", [
+    {"action": "turn_on", "entity_ids": "light.kitchen"},
+    {"action": "turn_on", "entity_ids": ["light.kitchen", 5]},
+    {"action": "turn_on", "entity_ids": []},
+    {"action": "turn_on", "entity_ids": ["light.kitchen"], "parameters": ["brightness"]},
+    {"action": "turn_on", "entity_ids": ["light.kitchen"], "parameters": {"entity_id": "light.hall"}},
+    {"action": "turn_on", "area": "kitchen", "domains": "light"},
+    {"action": "turn_on", "area": ["kitchen"]},
+])
+def test_bulk_control_rejects_malformed_input(control_api, body):
+    http, client = control_api
+
+    response = http.post("/control", json=body)
+
+    assert response.status_code == 400
+    assert client.calls == []
+
+
+def test_bulk_control_passes_parameters(control_api):
+    http, client = control_api
+
+    response = http.post("/control", json={
+        "action": "turn_on", "entity_ids": ["light.kitchen"], "parameters": {"brightness": 10}
+    })
+
+    assert response.status_code == 200
+    assert client.calls == [("turn_on", ["light.kitchen"], {"brightness": 10})]
+
+
+def test_single_control_rejects_non_object_parameters(control_api):
+    http, client = control_api
+
+    assert http.post("/control/light.kitchen", json={"action": "turn_on", "parameters": "x"}).status_code == 400
+    assert http.post("/control/light.kitchen", json={"action": "turn_on"}).status_code == 200
+    assert client.calls == [("turn_on", "light.kitchen", {})]
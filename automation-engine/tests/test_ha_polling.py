@@ -0,0 +1,99 @@
+"""Tests for the REST polling fallback of the state mirror."""
+
+import pytest
+
+from home_automation.integrations.ha_polling import HomeAssistantStatePoller
+from home_automation.integrations.ha_websocket import HomeAssistantStateMirror
+from home_automation.integrations.home_assistant import HomeAssistantClient
+
+
+class FakeWebSocket:
+    connected = False
+
+
+@pytest.fixture
+def poller(ha_standin):
+    standin, url = ha_standin
+    mirror = HomeAssistantStateMirror()
+    events = []
+    mirror.add_listener(events.append)
+    poller = HomeAssistantStatePoller(HomeAssistantClient(url, "test-token"), mirror, websocket=FakeWebSocket())
+    return standin, poller, events
+
+
+def update(standin, entity_id, value, updated):
+    standin.states[entity_id] = {**standin.states[entity_id], "state": value, "last_updated": updated}
+
+
+def test_first_poll_loads_the_snapshot_without_events(poller):
+    _, poller, events = poller
+
+    assert poller.poll() == 0
+
+    assert poller.mirror.synced
+    assert poller.mirror.get_state("light.hall")["state"] == "on"
+    assert events == []
+
+
+def test_later_polls_emit_only_the_differences(poller):
+    standin, poller, events = poller
+    poller.poll()
+    update(standin, "light.kitchen", "on", "2026-01-02T00:00:00+00:00")
+    # Same state, newer update: still a change
+    update(standin, "sensor.outside", "12.5", "2026-01-02T00:00:00+00:00")
+    del standin.states["switch.fan"]
+
+    assert poller.poll() == 3
+
+    by_entity = {e["data"]["entity_id"]: e for e in events}
+    assert set(by_entity) == {"light.kitchen", "sensor.outside", "switch.fan"}
+    assert by_entity["light.kitchen"]["data"]["old_state"]["state"] == "off"
+    assert by_entity["light.kitchen"]["data"]["new_state"]["state"] == "on"
+    assert by_entity["switch.fan"]["data"]["new_state"] is None
+    assert all(e["origin"] == "POLL" for e in events)
+    assert poller.mirror.get_state("switch.fan") is None
+    assert poller.poll() == 0
+
+
+def test_auto_mode_idles_while_the_websocket_is_connected(poller):
+    _, poller, _ = poller
+    assert poller.should_poll()
+
+    poller.websocket.connected = True
+    assert not poller.should_poll()
+
+    poller.mode = "always"
+    assert poller.should_poll()
+
+
+def test_resuming_diffs_against_the_mirror(poller):
+    standin, poller, events = poller
+    poller.mirror.replace_all(list(standin.states.values()))
+    update(standin, "light.hall", "off", "2026-01-02T00:00:00+00:00")
+
+    assert poller.poll() == 1
+    assert events[0]["data"]["entity_id"] == "light.hall"
+
+
+def test_websocket_reconnecting_mid_poll_discards_the_result(poller, monkeypatch):
+    standin, poller, events = poller
+    poller.poll()
+    update(standin, "light.kitchen", "on", "2026-01-02T00:00:00+00:00")
+    stream = poller.client.stream_states
+
+    def stream_then_reconnect():
+        yield from stream()
+        poller.websocket.connected = True
+
+    monkeypatch.setattr(poller.client, "stream_states", stream_then_reconnect)
+
+    assert poller.poll() == 0
+    assert events == []
+    assert not poller.active
+
+
+def test_unknown_mode_is_rejected(poller):
+    _, poller, _ = poller
+
+    with pytest.raises(ValueError):
+        HomeAssistantStatePoller(poller.client, poller.mirror, mode="sometimes")
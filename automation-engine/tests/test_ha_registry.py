@@ -0,0 +1,121 @@
+"""Tests for the domain, area and device indexes of Home Assistant entities."""
+
+import requests
+
+from conftest import REPO, load_script, wait_until
+from home_automation.integrations.ha_registry import HomeAssistantRegistry
+
+copilot_agent = load_script(REPO / "mcp-servers" / "copilot-agent-mcp.py")
+ha_mcp_client = load_script(REPO / "mcp-servers" / "ha_mcp_client.py")
+
+AREAS = [{"area_id": "kitchen", "name": "Kitchen"}, {"area_id": "hall", "name": "Front Hall"}]
+DEVICES = [{"id": "dev-fan", "area_id": "kitchen"}]
+ENTITIES = [
+    {"entity_id": "light.kitchen", "device_id": None, "area_id": "kitchen"},
+    {"entity_id": "switch.fan", "device_id": "dev-fan", "area_id": None},
+    {"entity_id": "sensor.fan_power", "device_id": "dev-fan", "area_id": "hall"},
+    {"entity_id": "light.hall", "device_id": None, "area_id": "hall"},
+]
+
+
+def loaded_registry():
+    registry = HomeAssistantRegistry()
+    registry.load(AREAS, DEVICES, ENTITIES, ["light.kitchen", "light.hall", "light.unregistered"])
+    return registry
+
+
+def changed(entity_id, new_state):
+    return {"event_type": "state_changed", "data": {"entity_id": entity_id, "new_state": new_state}}
+
+
+def test_index_by_domain_area_and_device():
+    registry = loaded_registry()
+
+    assert registry.entities_in_domain("light") == ["light.hall", "light.kitchen", "light.unregistered"]
+    assert registry.entities_in_area("kitchen") == ["light.kitchen", "switch.fan"]
+    assert registry.entities_in_area("hall", domains=["light"]) == ["light.hall"]
+    assert registry.entities_for_device("dev-fan") == ["sensor.fan_power", "switch.fan"]
+    assert registry.area_of("switch.fan") == "kitchen"
+
+
+def test_entity_area_overrides_its_device_area():
+    registry = loaded_registry()
+
+    assert registry.area_of("sensor.fan_power") == "hall"
+    assert "sensor.fan_power" not in registry.entities_in_area("kitchen")
+
+
+def test_areas_resolve_by_id_or_name():
+    registry = loaded_registry()
+
+    assert registry.resolve_area("hall") == "hall"
+    assert registry.resolve_area(" front hall ") == "hall"
+    assert registry.resolve_area("garage") is None
+    assert registry.entities_in_area("garage") == []
+    assert registry.get_areas() == [
+        {"area_id": "hall", "name": "Front Hall", "entity_count": 2},
+        {"area_id": "kitchen", "name": "Kitchen", "entity_count": 2},
+    ]
+
+
+def test_state_changes_keep_the_domain_index_current():
+    registry = loaded_registry()
+
+    registry.handle_event(changed("cover.garage", {"state": "open"}))
+    registry.handle_event(changed("light.unregistered", None))
+    registry.handle_event(changed("light.kitchen", None))
+
+    assert registry.entities_in_domain("cover") == ["cover.garage"]
+    # Registered entities stay indexed while they have no state
+    assert registry.entities_in_domain("light") == ["light.hall", "light.kitchen"]
+
+
+def test_copilot_agent_serves_domains_from_its_mirror(ha_standin, background_loop):
+    standin, url = ha_standin
+    agent = copilot_agent.CopilotAgentMCP(copilot_agent.HAConfig(url=url, token="test-token"))
+    background_loop.run(agent.start())
+    try:
+        assert wait_until(lambda: agent._states_synced)
+        requests_before = standin.request_count
+
+        lights = background_loop.run(agent.get_states("light"))
+        assert [s["entity_id"] for s in lights] == ["light.hall", "light.kitchen"]
+        assert standin.request_count == requests_before
+
+        requests.post(
+            f"{url}/api/states/light.porch", json={"state": "on"},
+            headers={"Authorization": "Bearer test-token"}, timeout=5
+        )
+        assert wait_until(lambda: len(background_loop.run(agent.get_states("light"))) == 3)
+        assert len(background_loop.run(agent.get_states())) == 5
+    finally:
+        background_loop.run(agent.stop())
+
+
+def test_copilot_agent_falls_back_to_rest_without_a_mirror(ha_standin, background_loop):
+    _, url = ha_standin
+    agent = copilot_agent.CopilotAgentMCP(copilot_agent.HAConfig(url=url, token="test-token"))
+
+    async def query():
+        agent.session = copilot_agent.aiohttp.ClientSession()
+        try:
+            return await agent.get_states("switch")
+        finally:
+            await agent.session.close()
+
+    assert [s["entity_id"] for s in background_loop.run(query())] == ["switch.fan"]
+
+
+def test_mcp_client_indexes_cached_states_by_domain(ha_standin, background_loop):
+    _, url = ha_standin
+    client = ha_mcp_client.HomeAssistantMCPClient(ha_mcp_client.MCPConfig(base_url=f"{url}/api", token="test-token"))
+
+    async def connect_and_read():
+        async with client:
+            return client.get_cached_states("light"), client.get_cached_states()
+
+    lights, everything = background_loop.run(connect_and_read())
+
+    assert [s["entity_id"] for s in lights] == ["light.hall", "light.kitchen"]
+    assert len(everything) == 4
+    assert sorted(client.domain_index) == ["light", "sensor", "switch"]
@@ -0,0 +1,126 @@
+"""Tests for the local Home Assistant stand-in server used by the client tests."""
+
+import json
+import time
+
+import aiohttp
+import pytest
+import requests
+
+from conftest import SCRIPTS, STANDIN_STATES, load_script
+
+standin_server = load_script(SCRIPTS / "ha_standin_server.py")
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+def test_load_states_replicates_with_unique_ids(tmp_path):
+    path = tmp_path / "states.json"
+    path.write_text(json.dumps({"states": STANDIN_STATES}))
+
+    states = standin_server.load_states(path, multiply=3)
+
+    assert len(states) == 12
+    assert len({s["entity_id"] for s in states}) == 12
+    assert states[4]["entity_id"] == "light.kitchen_1"
+    assert STANDIN_STATES[0]["entity_id"] == "light.kitchen"
+
+
+def test_rest_requires_the_token(ha_standin):
+    _, url = ha_standin
+
+    assert requests.get(f"{url}/api/states", timeout=5).status_code == 401
+    assert requests.get(f"{url}/api/states", headers={"Authorization": "Bearer nope"}, timeout=5).status_code == 401
+    assert len(requests.get(f"{url}/api/states", headers=AUTH, timeout=5).json()) == 4
+
+
+def test_service_calls_change_states(ha_standin):
+    standin, url = ha_standin
+
+    changed = requests.post(
+        f"{url}/api/services/light/toggle", json={"entity_id": ["light.kitchen", "light.hall"]},
+        headers=AUTH, timeout=5
+    ).json()
+
+    assert {s["entity_id"]: s["state"] for s in changed} == {"light.kitchen": "on", "light.hall": "off"}
+    assert standin.states["light.kitchen"]["state"] == "on"
+    assert requests.get(f"{url}/api/states/light.missing", headers=AUTH, timeout=5).status_code == 404
+
+
+def test_services_and_config_follow_the_state_domains(ha_standin):
+    _, url = ha_standin
+
+    services = requests.get(f"{url}/api/services", headers=AUTH, timeout=5).json()
+    config = requests.get(f"{url}/api/config", headers=AUTH, timeout=5).json()
+
+    assert [s["domain"] for s in services] == ["light", "sensor", "switch", "homeassistant"]
+    assert config["components"] == ["light", "sensor", "switch"]
+
+
+def test_error_and_latency_injection(ha_standin):
+    standin, url = ha_standin
+    standin.error_rate = 1
+    assert requests.get(f"{url}/api/states", headers=AUTH, timeout=5).status_code in (500, 502, 503)
+
+    standin.error_rate = 0
+    standin.latency_ms = 100
+    started = time.monotonic()
+    requests.get(f"{url}/api/", headers=AUTH, timeout=5)
+    assert time.monotonic() - started >= 0.1
+
+
+def test_websocket_rejects_a_wrong_token(ha_standin, background_loop):
+    _, url = ha_standin
+
+    async def authenticate():
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"{url}/api/websocket") as ws:
+                await ws.receive_json()
+                await ws.send_json({"type": "auth", "access_token": "nope"})
+                return await ws.receive_json()
+
+    assert background_loop.run(authenticate(), timeout=5)["type"] == "auth_invalid"
+
+
+def test_websocket_commands_and_subscriptions(ha_standin, background_loop):
+    standin, url = ha_standin
+
+    async def session_script():
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"{url}/api/websocket") as ws:
+                await ws.receive_json()
+                await ws.send_json({"type": "auth", "access_token": "test-token"})
+                assert (await ws.receive_json())["type"] == "auth_ok"
+
+                await ws.send_json([
+                    {"id": 1, "type": "subscribe_events", "event_type": "state_changed"},
+                    {"id": 2, "type": "get_states"},
+                    {"id": 3, "type": "bogus"},
+                ])
+                replies = [await ws.receive_json() for _ in range(3)]
+
+                await ws.send_json({
+                    "id": 4, "type": "call_service", "domain": "switch", "service": "turn_on",
+                    "target": {"entity_id": "switch.fan"}
+                })
+                messages = [await ws.receive_json() for _ in range(2)]
+                return replies, messages
+
+    replies, messages = background_loop.run(session_script(), timeout=5)
+
+    assert replies[0]["success"]
+    assert len(replies[1]["result"]) == 4
+    assert replies[2]["error"]["code"] == "unknown_command"
+    event = next(m for m in messages if m["type"] == "event")
+    assert event["id"] == 1
+    assert event["event"]["data"]["new_state"]["state"] == "on"
+    assert standin.states["switch.fan"]["state"] == "on"
+
+
+@pytest.mark.parametrize("path", ["/api/", "/api/config"])
+def test_requests_are_counted(ha_standin, path):
+    standin, url = ha_standin
+    before = standin.request_count
+
+    requests.get(f"{url}{path}", headers=AUTH, timeout=5)
+
+    assert standin.request_count == before + 1
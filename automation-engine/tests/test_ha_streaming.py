@@ -0,0 +1,68 @@
+"""Tests for incremental parsing of streamed Home Assistant state lists."""
+
+import json
+
+import pytest
+
+from conftest import STANDIN_STATES
+from home_automation.integrations.ha_streaming import StateFilter, StateStreamParser, iter_states
+from home_automation.integrations.home_assistant import HomeAssistantClient
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+BODY = json.dumps(STANDIN_STATES, indent=1).encode()
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(BODY)])
+def test_chunk_boundaries_do_not_change_the_result(size):
+    assert list(iter_states(chunked(BODY, size))) == STANDIN_STATES
+
+
+def test_multibyte_characters_split_across_chunks():
+    states = [{"entity_id": "sensor.outside", "state": "12.5", "attributes": {"unit": "°C"}}]
+    body = json.dumps(states, ensure_ascii=False).encode()
+    split = body.index("°".encode()) + 1
+
+    assert list(iter_states([body[:split], body[split:]])) == states
+
+
+def test_states_are_yielded_as_soon_as_they_are_complete():
+    parser = StateStreamParser()
+    first = json.dumps(STANDIN_STATES[0]).encode()
+
+    assert parser.feed(b"[" + first[:-1]) == []
+    assert parser.feed(first[-1:] + b",") == [STANDIN_STATES[0]]
+    assert parser.feed(b"]") == []
+    parser.close()
+
+
+def test_filter_by_domain_and_pattern():
+    lights = list(iter_states(chunked(BODY, 16), domains=["light"]))
+    hall = list(iter_states(chunked(BODY, 16), entity_pattern="*.h*"))
+
+    assert [s["entity_id"] for s in lights] == ["light.kitchen", "light.hall"]
+    assert [s["entity_id"] for s in hall] == ["light.hall"]
+    assert not StateFilter()
+    assert StateFilter(domains=["light"])
+
+
+def test_truncated_body_is_an_error():
+    with pytest.raises(ValueError):
+        list(iter_states([BODY[:-10]]))
+
+
+def test_body_that_is_not_a_list_is_an_error():
+    with pytest.raises(ValueError):
+        list(iter_states([b'{"message": "API running."}']))
+
+
+def test_client_streams_filtered_states_without_a_mirror(ha_standin):
+    standin, url = ha_standin
+    client = HomeAssistantClient(url, "test-token")
+
+    states = list(client.iter_states(domains=["switch", "sensor"]))
+
+    assert [s["entity_id"] for s in states] == ["switch.fan", "sensor.outside"]
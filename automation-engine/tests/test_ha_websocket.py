@@ -0,0 +1,130 @@
+"""Tests for the Home Assistant WebSocket state mirror."""
+
+import asyncio
+import time
+
+import requests
+from aiohttp import web
+
+from conftest import wait_until
+from home_automation.core.event_loop import BackgroundEventLoop
+from home_automation.integrations.ha_websocket import HomeAssistantStateMirror, HomeAssistantWebSocket
+
+
+def state(entity_id, value, updated):
+    return {"entity_id": entity_id, "state": value, "last_updated": updated}
+
+
+def changed(entity_id, new_state):
+    return {"event_type": "state_changed", "data": {"entity_id": entity_id, "new_state": new_state}}
+
+
+def test_snapshot_keeps_newer_changes_received_during_sync():
+    mirror = HomeAssistantStateMirror()
+    mirror.begin_sync()
+    mirror.handle_event(changed("light.a", state("light.a", "on", "2026-01-02")))
+    mirror.handle_event(changed("light.b", state("light.b", "on", "2026-01-01")))
+    mirror.handle_event(changed("light.c", None))
+
+    mirror.replace_all([
+        state("light.a", "off", "2026-01-01"),
+        state("light.b", "off", "2026-01-03"),
+        state("light.c", "off", "2026-01-01"),
+    ])
+
+    assert mirror.synced
+    assert mirror.get_state("light.a")["state"] == "on"
+    assert mirror.get_state("light.b")["state"] == "off"
+    assert mirror.get_state("light.c") is None
+
+
+def test_failing_listener_does_not_stop_others():
+    mirror = HomeAssistantStateMirror()
+    seen = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    mirror.add_listener(broken)
+    mirror.add_listener(seen.append)
+    mirror.handle_event({"event_type": "area_registry_updated"})
+
+    assert seen == [{"event_type": "area_registry_updated"}]
+
+
+def test_client_mirrors_states_and_changes(ha_standin, background_loop):
+    standin, url = ha_standin
+    mirror = HomeAssistantStateMirror()
+    client = HomeAssistantWebSocket(url, "test-token", mirror, background_loop, reconnect_delay=0.05)
+    client.start()
+    try:
+        assert wait_until(lambda: mirror.synced)
+        assert {s["entity_id"] for s in mirror.get_states()} == set(standin.states)
+
+        requests.post(
+            f"{url}/api/states/light.kitchen",
+            json={"state": "on"},
+            headers={"Authorization": "Bearer test-token"},
+            timeout=5,
+        ).raise_for_status()
+        assert wait_until(lambda: mirror.get_state("light.kitchen")["state"] == "on")
+    finally:
+        client.stop()
+    assert not mirror.synced
+
+
+def test_rejected_token_never_syncs(ha_standin, background_loop):
+    _, url = ha_standin
+    mirror = HomeAssistantStateMirror()
+    client = HomeAssistantWebSocket(url, "wrong", mirror, background_loop, reconnect_delay=0.05)
+    client.start()
+    try:
+        assert wait_until(lambda: client.consecutive_failures >= 1)
+        assert not client.connected
+        assert not mirror.synced
+    finally:
+        client.stop()
+
+
+def test_pending_commands_fail_as_soon_as_socket_closes(serve_app, background_loop):
+    async def close_on_get_states(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json({"type": "auth_required"})
+        await ws.receive_json()
+        await ws.send_json({"type": "auth_ok"})
+        async for message in ws:
+            command = message.json()
+            if command["type"] == "get_states":
+                await ws.close()
+                break
+            await ws.send_json({"type": "result", "id": command["id"], "success": True, "result": None})
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/api/websocket", close_on_get_states)
+    url = serve_app(app)
+    client = HomeAssistantWebSocket(
+        url, "token", HomeAssistantStateMirror(), background_loop, command_timeout=10, reconnect_delay=30
+    )
+    started = time.monotonic()
+    client.start()
+    try:
+        # Without failing the pending get_states this would take command_timeout
+        assert wait_until(lambda: client.consecutive_failures >= 1, timeout=5)
+        assert time.monotonic() - started < 2
+    finally:
+        client.stop()
+
+
+def test_background_loop_runs_coroutines_and_restarts():
+    async def answer():
+        await asyncio.sleep(0)
+        return 42
+
+    loop = BackgroundEventLoop("restart-test")
+    assert loop.run(answer(), timeout=5) == 42
+    loop.stop()
+    assert not loop.running
+    assert loop.run(answer(), timeout=5) == 42
+    loop.stop()
@@ -0,0 +1,184 @@
+"""Tests for the asyncio Proxmox VE client."""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from home_automation.integrations.proxmox import ProxmoxVEClient
+from home_automation.integrations.proxmox_async import AsyncProxmoxVEClient
+
+NODES = ("pve1", "pve2", "pve3")
+
+
+class FakeProxmoxCluster:
+    """Proxmox API with slow per-node endpoints that records concurrency and connections."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.logins = 0
+        self.valid_ticket = None
+        self.active = {}
+        self.peak = {}
+        self.client_ports = set()
+        self.csrf_by_method = {}
+
+    async def login(self, request):
+        self.logins += 1
+        self.valid_ticket = f"PVE:root@pam:{self.logins}"
+        return web.json_response({"data": {"ticket": self.valid_ticket, "CSRFPreventionToken": "csrf"}})
+
+    @web.middleware
+    async def track(self, request, handler):
+        self.client_ports.add(request.transport.get_extra_info("peername")[1])
+        if request.path.endswith("/access/ticket"):
+            return await handler(request)
+        ticket = request.cookies.get("PVEAuthCookie")
+        if request.headers.get("Authorization") != "PVEAPIToken=t=s" and (ticket is None or ticket != self.valid_ticket):
+            raise web.HTTPUnauthorized()
+        self.csrf_by_method[request.method] = request.headers.get("CSRFPreventionToken")
+        node = request.match_info.get("node")
+        if node is None:
+            return await handler(request)
+        self.active[node] = self.active.get(node, 0) + 1
+        self.peak[node] = max(self.peak.get(node, 0), self.active[node])
+        try:
+            await asyncio.sleep(self.delay)
+            return await handler(request)
+        finally:
+            self.active[node] -= 1
+
+    async def nodes(self, request):
+        return web.json_response({"data": [{"node": node} for node in NODES]})
+
+    async def node_status(self, request):
+        if request.match_info["node"] == "pve3":
+            raise web.HTTPInternalServerError()
+        return web.json_response({"data": {"uptime": 1}})
+
+    async def guests(self, request):
+        node, kind = request.match_info["node"], request.match_info["kind"]
+        return web.json_response({"data": [{"vmid": 100, "name": f"{kind}-{node}"}]})
+
+    async def control(self, request):
+        return web.json_response({"data": f"UPID:{request.match_info['node']}:start"})
+
+    def make_app(self):
+        app = web.Application(middlewares=[self.track])
+        app.router.add_post("/api2/json/access/ticket", self.login)
+        app.router.add_get("/api2/json/nodes", self.nodes)
+        app.router.add_get("/api2/json/nodes/{node}/status", self.node_status)
+        app.router.add_get("/api2/json/nodes/{node}/{kind:qemu|lxc}", self.guests)
+        app.router.add_post("/api2/json/nodes/{node}/qemu/{vmid}/status/start", self.control)
+        return app
+
+
+@pytest.fixture
+def cluster(serve_app, background_loop):
+    server = FakeProxmoxCluster()
+    url = serve_app(server.make_app())
+    clients = []
+
+    def make_client(**kwargs):
+        kwargs.setdefault("username", "root@pam")
+        kwargs.setdefault("password", "secret")
+        client = AsyncProxmoxVEClient("pve.invalid", **kwargs)
+        client.base_url = f"{url}/api2/json"
+        clients.append(client)
+        return client
+
+    yield server, make_client
+
+    for client in clients:
+        background_loop.run(client.close())
+
+
+def test_inventory_fans_out_across_nodes(cluster, background_loop):
+    server, make_client = cluster
+    client = make_client()
+
+    started = time.monotonic()
+    inventory = background_loop.run(client.get_inventory(), timeout=5)
+    elapsed = time.monotonic() - started
+
+    assert sorted(inventory) == list(NODES)
+    assert inventory["pve1"]["vms"] == [{"vmid": 100, "name": "qemu-pve1"}]
+    assert inventory["pve2"]["containers"] == [{"vmid": 100, "name": "lxc-pve2"}]
+    assert inventory["pve3"]["status"] is None
+    # Nine slow requests in about the time of one
+    assert elapsed < server.delay * 4
+    assert server.logins == 1
+
+
+def test_node_concurrency_limits_requests_per_node(cluster, background_loop):
+    server, make_client = cluster
+    client = make_client(node_concurrency=1)
+
+    background_loop.run(client.get_inventory(["pve1", "pve2"]), timeout=5)
+
+    assert server.peak == {"pve1": 1, "pve2": 1}
+
+
+def test_sequential_requests_reuse_one_connection(cluster, background_loop):
+    server, make_client = cluster
+    server.delay = 0
+    client = make_client(token_id="t", token_secret="s")
+
+    async def repeated():
+        for _ in range(5):
+            await client.get_nodes()
+
+    background_loop.run(repeated(), timeout=5)
+
+    assert len(server.client_ports) == 1
+
+
+def test_rejected_ticket_is_renewed_once_for_concurrent_requests(cluster, background_loop):
+    server, make_client = cluster
+    server.delay = 0
+    client = make_client()
+    background_loop.run(client.get_nodes())
+    server.valid_ticket = None
+
+    async def concurrent():
+        return await asyncio.gather(*(client.get_vms("pve1") for _ in range(5)))
+
+    results = background_loop.run(concurrent(), timeout=5)
+
+    assert all(result == [{"vmid": 100, "name": "qemu-pve1"}] for result in results)
+    assert server.logins == 2
+
+
+def test_csrf_token_is_only_sent_with_writes(cluster, background_loop):
+    server, make_client = cluster
+    server.delay = 0
+    client = make_client()
+
+    background_loop.run(client.get_nodes())
+    result = background_loop.run(client.start_vm("pve1", 100))
+
+    assert result == {"success": True, "message": "VM 100 start initiated", "data": "UPID:pve1:start"}
+    assert server.csrf_by_method == {"GET": None, "POST": "csrf"}
+
+
+def test_failures_are_reported_like_the_sync_client(cluster, background_loop):
+    server, make_client = cluster
+    server.delay = 0
+    client = make_client()
+
+    assert background_loop.run(client.get_node_status("pve3")) is None
+    stopped = background_loop.run(client.stop_container("pve1", 200))
+    assert stopped["success"] is False
+    assert stopped["message"].startswith("Failed to stop container")
+
+
+def test_sync_client_delegates_fan_out_to_the_async_client(cluster, background_loop):
+    server, make_client = cluster
+    async_client = make_client()
+    client = ProxmoxVEClient("pve.invalid", async_client=async_client, event_loop=background_loop)
+
+    statuses = client.get_node_statuses(["pve1", "pve2"])
+
+    assert statuses == {"pve1": {"uptime": 1}, "pve2": {"uptime": 1}}
+    assert server.logins == 1
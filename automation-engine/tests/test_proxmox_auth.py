@@ -0,0 +1,138 @@
+"""Tests for Proxmox VE ticket renewal and re-authentication."""
+
+import threading
+
+import pytest
+import requests
+from aiohttp import web
+
+from conftest import wait_until
+from home_automation.integrations.proxmox import TICKET_LIFETIME, ProxmoxVEClient
+
+
+class FakeProxmoxAuth:
+    """Proxmox API that issues tickets and rejects any but the latest one."""
+
+    def __init__(self):
+        self.logins = 0
+        self.rejected = 0
+        self.valid_ticket = None
+
+    def revoke(self):
+        self.valid_ticket = None
+
+    async def login(self, request):
+        form = await request.post()
+        if form.get("password") != "secret":
+            raise web.HTTPUnauthorized()
+        self.logins += 1
+        self.valid_ticket = f"PVE:root@pam:{self.logins}"
+        return web.json_response({"data": {"ticket": self.valid_ticket, "CSRFPreventionToken": "csrf"}})
+
+    async def nodes(self, request):
+        authorization = request.headers.get("Authorization", "")
+        ticket = request.cookies.get("PVEAuthCookie")
+        if (ticket is None or ticket != self.valid_ticket) and authorization != "PVEAPIToken=t=s":
+            self.rejected += 1
+            raise web.HTTPUnauthorized()
+        return web.json_response({"data": [{"node": "pve1"}]})
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_post("/api2/json/access/ticket", self.login)
+        app.router.add_get("/api2/json/nodes", self.nodes)
+        return app
+
+
+@pytest.fixture
+def pve(serve_app):
+    server = FakeProxmoxAuth()
+    url = serve_app(server.make_app())
+    clients = []
+
+    def make_client(**kwargs):
+        client = ProxmoxVEClient("pve.invalid", **kwargs)
+        client.base_url = f"{url}/api2/json"
+        clients.append(client)
+        return client
+
+    yield server, make_client
+
+    for client in clients:
+        client.close()
+
+
+def test_revoked_ticket_is_renewed_once_and_the_request_replayed(pve):
+    server, make_client = pve
+    client = make_client(username="root@pam", password="secret")
+    assert client.authenticate()["success"]
+    server.revoke()
+
+    assert client._request("GET", "/nodes").json()["data"] == [{"node": "pve1"}]
+    assert (server.logins, server.rejected) == (2, 1)
+
+
+def test_concurrent_rejections_share_one_login(pve):
+    server, make_client = pve
+    client = make_client(username="root@pam", password="secret")
+    client.authenticate()
+    server.revoke()
+    barrier = threading.Barrier(6)
+    statuses = []
+
+    def request():
+        barrier.wait()
+        statuses.append(client._request("GET", "/nodes").status_code)
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert statuses == [200] * 6
+    assert server.logins == 2
+
+
+def test_expired_ticket_is_renewed_before_sending(pve):
+    server, make_client = pve
+    client = make_client(username="root@pam", password="secret")
+    client.authenticate()
+    client.ticket_issued_at -= TICKET_LIFETIME
+
+    client._request("GET", "/nodes")
+
+    assert (server.logins, server.rejected) == (2, 0)
+
+
+def test_ticket_is_renewed_in_the_background(pve):
+    server, make_client = pve
+    client = make_client(username="root@pam", password="secret", ticket_renew_after=0.05)
+    client.authenticate()
+
+    assert wait_until(lambda: server.logins >= 3 and client.ticket == server.valid_ticket)
+
+    client.close()
+    logins = server.logins
+    assert not wait_until(lambda: server.logins > logins, timeout=0.2)
+
+
+def test_failed_login_is_not_retried_in_a_loop(pve):
+    server, make_client = pve
+    client = make_client(username="root@pam", password="wrong")
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client._request("GET", "/nodes")
+    assert server.logins == 0
+    assert server.rejected == 1
+
+
+def test_token_auth_does_not_log_in(pve):
+    server, make_client = pve
+    client = make_client(token_id="t", token_secret="s")
+
+    assert client._request("GET", "/nodes").status_code == 200
+    client.token_secret = "revoked"
+    with pytest.raises(requests.exceptions.HTTPError):
+        client._request("GET", "/nodes")
+    assert server.logins == 0
@@ -0,0 +1,151 @@
+"""Tests for bulk Proxmox VE guest operations."""
+
+import threading
+import time
+
+import pytest
+
+from conftest import wait_until
+from home_automation.integrations.proxmox_bulk import ProxmoxBulkRunner, parse_order, parse_selector, select_guests
+
+RESOURCES = [
+    {"type": "qemu", "vmid": 101, "node": "pve1", "name": "db", "status": "stopped", "tags": "prod;db", "pool": "core"},
+    {"type": "qemu", "vmid": 102, "node": "pve1", "name": "web", "status": "stopped", "tags": "prod;web"},
+    {"type": "lxc", "vmid": 103, "node": "pve2", "name": "dns", "status": "running", "tags": "prod"},
+    {"type": "lxc", "vmid": 104, "node": "pve2", "name": "lab", "status": "stopped", "tags": "lab"},
+    {"type": "qemu", "vmid": 900, "node": "pve1", "name": "tpl", "template": 1, "tags": "prod"},
+    {"type": "storage", "id": "storage/pve1/local", "node": "pve1"},
+]
+
+
+class FakeProxmoxClient:
+    """Proxmox client that records guest operations and their concurrency per node."""
+
+    resource_snapshot = None
+
+    def __init__(self, resources=RESOURCES, delay=0.0, failing=()):
+        self.resources = resources
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = []
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def get_cluster_resources_with_meta(self):
+        return self.resources, {}
+
+    def _operate(self, action, node, vmid):
+        with self.lock:
+            self.calls.append((action, vmid))
+            self.active[node] = self.active.get(node, 0) + 1
+            self.peak[node] = max(self.peak.get(node, 0), self.active[node])
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[node] -= 1
+        if vmid in self.failing:
+            return {"success": False, "message": f"{action} failed"}
+        return {"success": True, "message": f"{action} {vmid}", "data": None}
+
+    def start_vm(self, node, vmid):
+        return self._operate("start_vm", node, vmid)
+
+    def stop_vm(self, node, vmid):
+        return self._operate("stop_vm", node, vmid)
+
+    def restart_vm(self, node, vmid):
+        return self._operate("restart_vm", node, vmid)
+
+    def start_container(self, node, vmid):
+        return self._operate("start_container", node, vmid)
+
+    def stop_container(self, node, vmid):
+        return self._operate("stop_container", node, vmid)
+
+
+def run_job(runner, action, selector, order=None):
+    job = runner.submit(action, selector, order)
+    assert wait_until(lambda: runner.get(job.id)["done"])
+    return runner.get(job.id)
+
+
+def test_parse_selector_normalizes_values():
+    selector = parse_selector({"vmids": "101", "tags": ["prod;web", "lab"], "pool": "", "node": "pve1"})
+
+    assert selector == {"vmids": [101], "tags": ["prod", "web", "lab"], "node": "pve1"}
+    assert parse_selector({}) == {}
+
+
+@pytest.mark.parametrize("data", [{"vmids": ["abc"]}, {"vmids": [True]}, {"tags": [5]}, {"node": 1}, {"type": "vm"}])
+def test_parse_selector_rejects_bad_values(data):
+    with pytest.raises(ValueError):
+        parse_selector(data)
+
+
+def test_parse_order():
+    assert parse_order(None) == []
+    assert parse_order([["101"], [102, 103]]) == [[101], [102, 103]]
+    with pytest.raises(ValueError):
+        parse_order([101, 102])
+
+
+def test_select_guests_matches_every_criterion_and_skips_templates():
+    assert [g["vmid"] for g in select_guests(RESOURCES, {"tags": ["prod"]})] == [101, 102, 103]
+    assert [g["vmid"] for g in select_guests(RESOURCES, {"tags": ["web", "lab"]})] == [102, 104]
+    assert [g["vmid"] for g in select_guests(RESOURCES, {"tags": ["prod"], "type": "lxc"})] == [103]
+    assert [g["vmid"] for g in select_guests(RESOURCES, {"pool": "core"})] == [101]
+    assert [g["vmid"] for g in select_guests(RESOURCES, {"node": "pve2", "vmids": [104, 101]})] == [104]
+
+
+def test_bulk_start_skips_running_guests_and_aggregates_progress():
+    client = FakeProxmoxClient(failing={104})
+    runner = ProxmoxBulkRunner(client)
+
+    job = run_job(runner, "start", {})
+
+    assert (job["total"], job["succeeded"], job["failed"], job["skipped"]) == (4, 2, 1, 1)
+    by_vmid = {result["vmid"]: result for result in job["results"]}
+    assert by_vmid[103]["message"] == "Already running"
+    assert by_vmid[104]["message"] == "start_container failed"
+    assert sorted(client.calls) == [("start_container", 104), ("start_vm", 101), ("start_vm", 102)]
+
+
+def test_node_concurrency_caps_parallel_operations():
+    resources = [{"type": "qemu", "vmid": vmid, "node": f"pve{vmid % 2}", "status": "stopped"} for vmid in range(100, 112)]
+    client = FakeProxmoxClient(resources, delay=0.05)
+    runner = ProxmoxBulkRunner(client, node_concurrency=2)
+
+    started = time.monotonic()
+    job = run_job(runner, "start", {})
+
+    assert job["succeeded"] == 12
+    assert client.peak == {"pve0": 2, "pve1": 2}
+    # 6 guests per node, 2 at a time: 3 rounds instead of 12 serial calls
+    assert time.monotonic() - started < 0.05 * 12
+
+
+def test_stages_run_in_order():
+    client = FakeProxmoxClient(delay=0.02)
+    runner = ProxmoxBulkRunner(client)
+
+    job = run_job(runner, "start", {"vmids": [101, 102, 104]}, order=[[104], [101]])
+
+    assert [vmid for _, vmid in client.calls] == [104, 101, 102]
+    assert {result["vmid"]: result["stage"] for result in job["results"]} == {104: 0, 101: 1, 102: 2}
+
+
+def test_restart_is_not_supported_for_containers():
+    runner = ProxmoxBulkRunner(FakeProxmoxClient())
+
+    job = run_job(runner, "restart", {"vmids": [102, 103]})
+
+    assert job["succeeded"] == 1
+    assert job["failed"] == 1
+
+
+def test_submit_rejects_unknown_actions_and_empty_selections():
+    runner = ProxmoxBulkRunner(FakeProxmoxClient())
+
+    with pytest.raises(ValueError):
+        runner.submit("destroy", {})
+    assert runner.submit("start", {"tags": ["missing"]}) is None
@@ -0,0 +1,149 @@
+"""Tests for incremental Proxmox RRD ingestion and the metric sample store."""
+
+import time
+
+import pytest
+import requests
+
+from home_automation.core.database import DatabaseManager
+from home_automation.integrations.proxmox_metrics import ProxmoxMetricsIngester
+
+RESOURCES = [
+    {"type": "node", "node": "pve1"},
+    {"type": "qemu", "vmid": 100, "node": "pve1"},
+    {"type": "lxc", "vmid": 200, "node": "pve1", "template": 1},
+    {"type": "storage", "node": "pve1"},
+]
+
+
+class FakeRRDClient:
+    """Proxmox client serving RRD points per target and recording the timeframes asked for."""
+
+    def __init__(self):
+        self.points = {"node/pve1": [], "qemu/100": []}
+        self.requests = []
+        self.failing = set()
+
+    def get_cluster_resources(self):
+        return RESOURCES
+
+    def get_rrd_data(self, node, timeframe, guest_type=None, vmid=None):
+        target = f"{guest_type}/{vmid}" if guest_type else f"node/{node}"
+        self.requests.append((target, timeframe))
+        if target in self.failing:
+            raise requests.exceptions.ConnectionError("unreachable")
+        return self.points[target]
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'metrics.db'}")
+    manager.initialize()
+    return manager
+
+
+def sample(target, timestamp, value, metric="cpu", resolution=60):
+    return {"target": target, "metric": metric, "resolution": resolution, "timestamp": timestamp, "value": value}
+
+
+def test_only_points_after_the_cursor_are_stored(db_manager):
+    client = FakeRRDClient()
+    now = int(time.time())
+    client.points["qemu/100"] = [{"time": now - 120, "cpu": 0.1, "mem": 512}, {"time": now - 60, "cpu": 0.2}]
+    ingester = ProxmoxMetricsIngester(client, db_manager)
+
+    assert ingester.ingest() == 3
+    assert ingester.ingest() == 0
+
+    client.points["qemu/100"].append({"time": now, "cpu": 0.3, "mem": float("nan")})
+    assert ingester.ingest() == 1
+    assert ingester.cursors["qemu/100"] == now
+    samples = db_manager.get_metric_samples("qemu/100", "cpu", now - 3600)
+    assert [s["value"] for s in samples] == [0.1, 0.2, 0.3]
+
+
+def test_templates_and_other_resources_are_not_fetched(db_manager):
+    client = FakeRRDClient()
+
+    ProxmoxMetricsIngester(client, db_manager).ingest()
+
+    assert sorted(target for target, _ in client.requests) == ["node/pve1", "qemu/100"]
+
+
+def test_long_gaps_are_backfilled_from_the_day_timeframe(db_manager):
+    client = FakeRRDClient()
+    now = int(time.time())
+    client.points["node/pve1"] = [{"time": now - 7200, "cpu": 0.5}]
+    db_manager.add_metric_samples([sample("qemu/100", now - 60, 0.1)])
+    ingester = ProxmoxMetricsIngester(client, db_manager)
+
+    ingester.ingest()
+
+    assert dict(client.requests) == {"node/pve1": "day", "qemu/100": "hour"}
+    assert db_manager.get_metric_samples("node/pve1", "cpu", 0)[0]["resolution"] == 1800
+
+
+def test_cursors_survive_a_restart(db_manager):
+    client = FakeRRDClient()
+    now = int(time.time())
+    client.points["qemu/100"] = [{"time": now - 60, "cpu": 0.1}]
+    ProxmoxMetricsIngester(client, db_manager).ingest()
+
+    restarted = ProxmoxMetricsIngester(client, db_manager)
+
+    assert restarted.ingest() == 0
+    assert restarted.cursors == {"qemu/100": now - 60}
+
+
+def test_failed_targets_and_writes_do_not_advance_cursors(db_manager, monkeypatch):
+    client = FakeRRDClient()
+    now = int(time.time())
+    client.points["node/pve1"] = [{"time": now - 60, "cpu": 0.5}]
+    client.points["qemu/100"] = [{"time": now - 60, "cpu": 0.1}]
+    client.failing.add("node/pve1")
+    ingester = ProxmoxMetricsIngester(client, db_manager)
+
+    assert ingester.ingest() == 1
+    assert "node/pve1" not in ingester.cursors
+
+    client.failing.clear()
+
+    def failing_write(samples):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(db_manager, "add_metric_samples", failing_write)
+    with pytest.raises(RuntimeError):
+        ingester.ingest()
+    assert "node/pve1" not in ingester.cursors
+
+
+def test_cursors_per_resolution(db_manager):
+    db_manager.add_metric_samples([
+        sample("node/pve1", 100, 1.0), sample("node/pve1", 1800, 1.0, resolution=1800), sample("qemu/100", 50, 1.0)
+    ])
+
+    assert db_manager.get_metric_cursors() == {"node/pve1": 1800, "qemu/100": 50}
+    assert db_manager.get_metric_cursors(resolution=60) == {"node/pve1": 100, "qemu/100": 50}
+
+
+def test_samples_are_filtered_by_window_and_resolution(db_manager):
+    db_manager.add_metric_samples([sample("node/pve1", timestamp, float(timestamp)) for timestamp in (60, 120, 180)])
+    db_manager.add_metric_samples([sample("node/pve1", 0, 1.0, resolution=1800), sample("node/pve1", 120, 9.0, "mem")])
+
+    assert [s["timestamp"] for s in db_manager.get_metric_samples("node/pve1", "cpu", 60, end=120)] == [60, 120]
+    assert [s["resolution"] for s in db_manager.get_metric_samples("node/pve1", "cpu", 0)] == [1800, 60, 60, 60]
+    assert len(db_manager.get_metric_samples("node/pve1", "cpu", 0, resolution=1800)) == 1
+
+
+def test_downsampling_averages_whole_buckets_only(db_manager):
+    db_manager.add_metric_samples(
+        [sample("node/pve1", timestamp, float(index)) for index, timestamp in enumerate(range(0, 5400, 600))]
+    )
+
+    # 4000 falls inside the third bucket, so only the first two are rolled up
+    assert db_manager.downsample_metrics(60, 1800, older_than=4000) == 2
+
+    samples = db_manager.get_metric_samples("node/pve1", "cpu", 0)
+    assert [(s["timestamp"], s["value"], s["resolution"]) for s in samples[:2]] == [(0, 1.0, 1800), (1800, 4.0, 1800)]
+    assert [s["resolution"] for s in samples[2:]] == [60, 60, 60]
+    assert db_manager.downsample_metrics(60, 1800, older_than=4000) == 0
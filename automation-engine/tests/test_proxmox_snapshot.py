@@ -0,0 +1,75 @@
+"""Tests for the indexed Proxmox VE cluster resource snapshot."""
+
+from home_automation.integrations.proxmox import ProxmoxVEClient
+from home_automation.integrations.proxmox_snapshot import ClusterResourceIndex, ClusterResourceSnapshot, parse_tags
+
+RESOURCES = [
+    {"id": "node/pve1", "type": "node", "node": "pve1", "status": "online"},
+    {"id": "node/pve2", "type": "node", "node": "pve2", "status": "online"},
+    {"id": "qemu/100", "type": "qemu", "vmid": 100, "node": "pve1", "tags": "prod;web", "pool": "apps"},
+    {"id": "qemu/101", "type": "qemu", "vmid": 101, "node": "pve2", "tags": "dev"},
+    {"id": "lxc/200", "type": "lxc", "vmid": 200, "node": "pve1", "tags": "prod", "pool": "apps"},
+    {"id": "storage/pve1/local", "type": "storage", "node": "pve1", "storage": "local"},
+]
+
+
+def ids(resources):
+    return [resource["id"] for resource in resources]
+
+
+def test_parse_tags_accepts_any_separator():
+    assert parse_tags("prod;web, db  edge") == ["prod", "web", "db", "edge"]
+    assert parse_tags(None) == []
+
+
+def test_select_combines_filters():
+    index = ClusterResourceIndex(RESOURCES)
+
+    assert ids(index.select(resource_type="qemu")) == ["qemu/100", "qemu/101"]
+    assert ids(index.select(resource_type="qemu", node="pve1")) == ["qemu/100"]
+    assert ids(index.select(tag="prod", pool="apps")) == ["qemu/100", "lxc/200"]
+    assert ids(index.select(node="pve1")) == ["node/pve1", "qemu/100", "lxc/200", "storage/pve1/local"]
+    assert ids(index.select(resource_type="lxc", tag="web")) == []
+    assert len(index.select()) == len(RESOURCES)
+
+
+def test_guests_are_found_by_vmid():
+    index = ClusterResourceIndex(RESOURCES)
+
+    assert index.get_guest(200)["type"] == "lxc"
+    assert index.get_guest("101")["node"] == "pve2"
+    assert index.get_guest(999) is None
+
+
+def test_index_is_rebuilt_only_for_a_new_listing():
+    listings = [RESOURCES, RESOURCES[:2]]
+    snapshot = ClusterResourceSnapshot(lambda: listings.pop(0), ttl=60)
+
+    first, meta = snapshot.get_index()
+    again, _ = snapshot.get_index()
+    assert again is first
+    assert meta["source"] == "upstream"
+
+    snapshot.invalidate()
+    reloaded, _ = snapshot.get_index()
+    assert reloaded is not first
+    assert reloaded.get_guest(100) is None
+
+
+def test_node_guest_lists_keep_the_per_node_schema(monkeypatch):
+    client = ProxmoxVEClient("pve.invalid", token_id="root@pam!t", token_secret="s", snapshot_ttl=60)
+    fetched = []
+    node_vms = [{"vmid": 100, "name": "web", "status": "running", "cpus": 2, "pid": 4242, "qmpstatus": "running"}]
+
+    def fetch(path):
+        fetched.append(path)
+        return RESOURCES if path == "/cluster/resources" else node_vms
+
+    monkeypatch.setattr(client, "_fetch", fetch)
+
+    assert client.get_vms("pve1") == node_vms
+    assert client.get_containers("pve1") == node_vms
+    assert client.get_guest_summary(100)["tags"] == "prod;web"
+    resources, _ = client.get_cluster_resources_with_meta(resource_type="qemu", node="pve1")
+    assert ids(resources) == ["qemu/100"]
+    assert fetched == ["/nodes/pve1/qemu", "/nodes/pve1/lxc", "/cluster/resources"]
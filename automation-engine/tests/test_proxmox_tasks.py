@@ -0,0 +1,154 @@
+"""Tests for tracking Proxmox VE tasks by UPID."""
+
+import threading
+
+import pytest
+import requests
+
+from home_automation.integrations.proxmox_tasks import ProxmoxTaskTracker, parse_upid
+
+
+def upid(node, vmid, kind="qmstart"):
+    return f"UPID:{node}:0000A1B2:0012C3D4:65F0A1B2:{kind}:{vmid}:root@pam:"
+
+
+class FakeTaskClient:
+    """Proxmox client whose tasks finish when the test says so."""
+
+    def __init__(self):
+        self.running = set()
+        self.exitstatus = {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def start(self, task_upid):
+        self.running.add(task_upid)
+        return task_upid
+
+    def finish(self, task_upid, exitstatus="OK"):
+        self.exitstatus[task_upid] = exitstatus
+        self.running.discard(task_upid)
+
+    def get_active_tasks(self, node):
+        with self.lock:
+            self.calls.append(("active", node))
+        return [{"upid": task_upid} for task_upid in self.running if f":{node}:" in task_upid]
+
+    def get_task_status(self, node, task_upid):
+        with self.lock:
+            self.calls.append(("status", task_upid))
+        if task_upid in self.running:
+            return {"status": "running"}
+        return {"status": "stopped", "exitstatus": self.exitstatus[task_upid]}
+
+
+@pytest.fixture
+def tracker():
+    client = FakeTaskClient()
+    return client, ProxmoxTaskTracker(client, poll_interval=0.01, max_poll_interval=0.05)
+
+
+def test_parse_upid():
+    info = parse_upid(upid("pve1", 100))
+
+    assert info == {
+        "node": "pve1", "pid": 0xA1B2, "starttime": 0x65F0A1B2, "type": "qmstart", "id": "100", "user": "root@pam"
+    }
+    with pytest.raises(ValueError):
+        parse_upid("not-a-upid")
+
+
+def test_single_task_resolves_future_callback_and_listener(tracker):
+    client, tracker = tracker
+    seen = []
+    tracker.add_listener(lambda task: seen.append(("listener", task["id"])))
+    task_upid = client.start(upid("pve1", 100))
+
+    future = tracker.track(task_upid, callback=lambda task: seen.append(("callback", task["success"])))
+    assert tracker.get(task_upid)["status"] == "running"
+    client.finish(task_upid)
+
+    result = future.result(timeout=2)
+    assert result["success"] is True
+    assert seen == [("callback", True), ("listener", "100")]
+    assert tracker.get(task_upid)["exitstatus"] == "OK"
+
+
+def test_many_tasks_on_a_node_share_one_active_listing(tracker):
+    client, tracker = tracker
+    running = [client.start(upid("pve1", vmid)) for vmid in (100, 101, 102)]
+    for task_upid in running:
+        tracker.track(task_upid)
+
+    assert tracker.poll_node("pve1") == 0
+    assert client.calls == [("active", "pve1")]
+
+    client.finish(running[1], "command failed")
+    client.calls.clear()
+    assert tracker.poll_node("pve1") == 1
+    assert client.calls == [("active", "pve1"), ("status", running[1])]
+    assert tracker.get(running[1])["success"] is False
+
+
+def test_interval_backs_off_while_nothing_finishes(tracker):
+    client, tracker = tracker
+    tracker.track(client.start(upid("pve1", 100)))
+    tracker.track(client.start(upid("pve1", 101)))
+
+    delays = []
+    for _ in range(6):
+        tracker.poll_node("pve1")
+        delays.append(tracker._node_delay["pve1"])
+
+    assert delays == sorted(delays)
+    assert delays[-1] == tracker.max_poll_interval
+
+
+def test_request_errors_keep_the_task_pending(tracker):
+    client, tracker = tracker
+    task_upid = client.start(upid("pve1", 100))
+    tracker.track(task_upid)
+
+    def failing(node, task_upid):
+        raise requests.exceptions.ConnectionError("down")
+
+    client.get_task_status = failing
+    assert tracker.poll_node("pve1") == 0
+    assert tracker.get(task_upid)["status"] == "running"
+
+
+def test_tracking_a_finished_task_runs_the_callback_at_once(tracker):
+    client, tracker = tracker
+    task_upid = client.start(upid("pve1", 100))
+    client.finish(task_upid)
+    tracker.track(task_upid).result(timeout=2)
+
+    seen = []
+    tracker.track(task_upid, callback=seen.append)
+
+    assert seen[0]["success"] is True
+
+
+def test_wait_returns_the_running_task_on_timeout(tracker):
+    client, tracker = tracker
+    task_upid = client.start(upid("pve1", 100))
+    tracker.track(task_upid)
+
+    assert tracker.wait(task_upid, timeout=0.05)["status"] == "running"
+    assert tracker.wait(upid("pve1", 999)) is None
+    client.finish(task_upid)
+    assert tracker.wait(task_upid, timeout=2)["status"] == "stopped"
+
+
+def test_finished_tasks_are_pruned_after_retention(tracker):
+    client, tracker = tracker
+    tracker.retention = 0
+    task_upid = client.start(upid("pve1", 100))
+    future = tracker.track(task_upid)
+    client.finish(task_upid)
+    future.result(timeout=2)
+
+    with tracker._condition:
+        tracker._prune()
+
+    assert tracker.get(task_upid) is None
@@ -0,0 +1,177 @@
+"""Tests for key-repeat coalescing of volume and channel presses."""
+
+import threading
+import time
+
+import pytest
+
+from home_automation.integrations.remote_coalescing import KeyRepeatCoalescer
+from home_automation.integrations.remote_control import DeviceType, RemoteControlManager, RemoteDevice
+
+WINDOW = 0.1
+
+
+class Recorder:
+    """Collects what the coalescer sends, natively or merged."""
+
+    def __init__(self):
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_repeated(self, device_name, command, count):
+        with self.lock:
+            self.sent.append((command, count))
+        return {"success": True}
+
+    def native(self, command):
+        def send():
+            with self.lock:
+                self.sent.append((command, 1))
+            return {"success": True, "native": True}
+        return send
+
+
+@pytest.fixture
+def coalescer():
+    recorder = Recorder()
+    return recorder, KeyRepeatCoalescer(recorder.send_repeated, window=WINDOW, max_delay=0.5)
+
+
+def press(coalescer, recorder, command, results=None):
+    """Submit a press from its own thread, as concurrent HTTP requests would."""
+    def run():
+        result = coalescer.submit("tv", command, recorder.native(command))
+        if results is not None:
+            results.append(result)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.01)
+    return thread
+
+
+def test_first_press_is_sent_at_once(coalescer):
+    recorder, coalescer = coalescer
+
+    started = time.monotonic()
+    result = coalescer.submit("tv", "volume_up", recorder.native("volume_up"))
+
+    assert time.monotonic() - started < WINDOW / 2
+    assert result == {"success": True, "native": True}
+    assert recorder.sent == [("volume_up", 1)]
+
+
+def test_following_presses_are_merged(coalescer):
+    recorder, coalescer = coalescer
+    results = []
+
+    threads = [press(coalescer, recorder, "volume_up", results) for _ in range(5)]
+    for thread in threads:
+        thread.join(2)
+
+    assert recorder.sent == [("volume_up", 1), ("volume_up", 4)]
+    assert sorted(result.get("coalesced", 1) for result in results) == [1, 4, 4, 4, 4]
+
+
+def test_a_lone_second_press_is_sent_natively(coalescer):
+    recorder, coalescer = coalescer
+
+    coalescer.submit("tv", "channel_up", recorder.native("channel_up"))
+    result = coalescer.submit("tv", "channel_up", recorder.native("channel_up"))
+
+    assert result == {"success": True, "native": True}
+    assert recorder.sent == [("channel_up", 1), ("channel_up", 1)]
+
+
+def test_ups_and_downs_cancel_out(coalescer):
+    recorder, coalescer = coalescer
+    results = []
+
+    threads = [press(coalescer, recorder, command, results) for command in ("volume_up", "volume_up", "volume_down")]
+    for thread in threads:
+        thread.join(2)
+
+    assert recorder.sent == [("volume_up", 1)]
+    assert "cancelled out" in results[-1]["message"]
+
+
+def test_other_commands_flush_the_burst_and_keep_order(coalescer):
+    recorder, coalescer = coalescer
+
+    threads = [press(coalescer, recorder, command) for command in ("volume_up", "volume_up", "volume_up", "home")]
+    for thread in threads:
+        thread.join(2)
+    # After another command the next press is a first press again
+    coalescer.submit("tv", "volume_down", recorder.native("volume_down"))
+
+    assert recorder.sent == [("volume_up", 1), ("volume_up", 2), ("home", 1), ("volume_down", 1)]
+
+
+def test_devices_are_coalesced_separately(coalescer):
+    recorder, coalescer = coalescer
+
+    coalescer.submit("tv", "volume_up", recorder.native("volume_up"))
+    coalescer.submit("radio", "volume_up", recorder.native("volume_up"))
+
+    assert recorder.sent == [("volume_up", 1), ("volume_up", 1)]
+
+
+class FakeHomeAssistant:
+    """Home Assistant client recording service calls, with an optional volume level."""
+
+    def __init__(self, volume_level=None):
+        self.volume_level = volume_level
+        self.calls = []
+
+    def get_state(self, entity_id):
+        attributes = {} if self.volume_level is None else {"volume_level": self.volume_level}
+        return {"entity_id": entity_id, "state": "on", "attributes": attributes}
+
+    def call_service(self, domain, service, data):
+        self.calls.append((domain, service, data))
+        return {"success": True, "message": f"{domain}.{service} called"}
+
+
+def manager_with(ha_client):
+    manager = RemoteControlManager(ha_client, volume_step=0.05)
+    manager.add_device(RemoteDevice("tv", DeviceType.ANDROID_TV, "127.0.0.1", entity_id="media_player.tv"))
+    return manager
+
+
+def test_known_volume_level_becomes_one_volume_set():
+    ha_client = FakeHomeAssistant(volume_level=0.5)
+
+    assert manager_with(ha_client).send_repeated("tv", "volume_down", 3)["success"]
+
+    assert ha_client.calls == [("media_player", "volume_set", {"entity_id": "media_player.tv", "volume_level": 0.35})]
+
+
+def test_unknown_volume_level_steps_one_after_another():
+    ha_client = FakeHomeAssistant()
+
+    manager_with(ha_client).send_repeated("tv", "volume_up", 3)
+
+    assert ha_client.calls == [("media_player", "volume_up", {"entity_id": "media_player.tv"})] * 3
+
+
+def test_single_step_is_sent_natively():
+    ha_client = FakeHomeAssistant(volume_level=0.5)
+    manager = manager_with(ha_client)
+
+    manager.send_repeated("tv", "volume_up", 1)
+    manager.send_repeated("tv", "channel_up", 1)
+
+    assert ha_client.calls == [
+        ("media_player", "volume_up", {"entity_id": "media_player.tv"}),
+        ("remote", "send_command", {"entity_id": "media_player.tv", "command": "channel_up"}),
+    ]
+
+
+def test_channel_steps_use_num_repeats():
+    ha_client = FakeHomeAssistant()
+
+    manager_with(ha_client).send_repeated("tv", "channel_down", 4)
+
+    assert ha_client.calls == [
+        ("remote", "send_command", {"entity_id": "media_player.tv", "command": "channel_down", "num_repeats": 4})
+    ]
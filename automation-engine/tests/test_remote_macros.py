@@ -0,0 +1,162 @@
+"""Tests for planning and running remote control macros."""
+
+import threading
+import time
+
+import pytest
+
+from conftest import wait_until
+from home_automation.integrations.remote_control import RemoteCommand
+from home_automation.integrations.remote_macros import MacroStep, RemoteMacro, RemoteMacroRunner, parse_macros
+
+
+class FakeRemoteManager:
+    """Remote manager recording when each key or key sequence was sent."""
+
+    def __init__(self, sequences=False, failing=()):
+        self.sequences = sequences
+        self.failing = set(failing)
+        self.sent = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def get_device(self, device_name):
+        return device_name if device_name.startswith("tv") else None
+
+    def send_key_sequence(self, device_name, commands, delay):
+        if not self.sequences:
+            return None
+        self.sent.append((time.monotonic(), device_name, list(commands)))
+        return {"success": True}
+
+    def send_command(self, device_name, command, coalesce=True):
+        self.gate.wait(5)
+        self.sent.append((time.monotonic(), device_name, command))
+        if command in self.failing:
+            return {"success": False, "message": f"{command.value} failed"}
+        return {"success": True}
+
+
+def macro(steps, delay=0.05):
+    return RemoteMacro.parse("test", {"steps": steps, "delay": delay})
+
+
+@pytest.fixture
+def runner():
+    runners = []
+
+    def make(manager, **macros):
+        runner = RemoteMacroRunner(manager)
+        runner.set_macros(macros)
+        runners.append(runner)
+        return runner
+
+    yield make
+
+    for runner in runners:
+        runner.stop()
+
+
+def test_steps_parse_from_names_and_dictionaries():
+    step = MacroStep.parse({"command": "down", "repeat": 0, "wait": "0.5"})
+
+    assert step.to_dict() == {"command": "down", "repeat": 1, "wait": 0.5}
+    assert MacroStep.parse("home").command == RemoteCommand.HOME
+    with pytest.raises(ValueError):
+        MacroStep.parse("launch_rockets")
+    with pytest.raises(ValueError):
+        MacroStep.parse(5)
+
+
+def test_invalid_macros_are_skipped():
+    macros = parse_macros({"netflix": ["home", "netflix"], "empty": [], "broken": [{"command": "nope"}]})
+
+    assert list(macros) == ["netflix"]
+
+
+def test_plan_batches_keys_between_waits():
+    plan = macro(["home", {"command": "down", "repeat": 2, "wait": 1.0}, {"wait": 0.5}, "select"]).plan()
+
+    assert plan == [
+        {"commands": [RemoteCommand.HOME, RemoteCommand.DOWN, RemoteCommand.DOWN], "gap": 0.05 + 1.0 + 0.5},
+        {"commands": [RemoteCommand.SELECT], "gap": 0.0},
+    ]
+    assert macro([{"wait": 0.2}, "home"]).plan() == [
+        {"commands": [], "gap": 0.2}, {"commands": [RemoteCommand.HOME], "gap": 0.0}
+    ]
+
+
+def test_keys_are_sent_at_fixed_intervals(runner):
+    manager = FakeRemoteManager()
+    macros = runner(manager, nav=macro(["home", {"command": "down", "repeat": 2, "wait": 0.1}, "select"]))
+
+    result = macros.wait(macros.run("tv1", "nav").id, timeout=5)
+
+    assert result["status"] == "completed"
+    assert result["keys_sent"] == result["keys_total"] == 4
+    times = [sent_at - manager.sent[0][0] for sent_at, _, _ in manager.sent]
+    for actual, expected in zip(times, [0, 0.05, 0.1, 0.25]):
+        assert actual == pytest.approx(expected, abs=0.03)
+
+
+def test_home_assistant_devices_get_one_call_per_batch(runner):
+    manager = FakeRemoteManager(sequences=True)
+    macros = runner(manager, nav=macro(["home", "down", {"wait": 0.05}, "select"]))
+
+    macros.wait(macros.run("tv1", "nav").id, timeout=5)
+
+    assert [commands for _, _, commands in manager.sent] == [
+        [RemoteCommand.HOME, RemoteCommand.DOWN], [RemoteCommand.SELECT]
+    ]
+
+
+def test_failed_key_stops_the_run(runner):
+    manager = FakeRemoteManager(failing={RemoteCommand.DOWN})
+    macros = runner(manager, nav=macro(["home", "down", "select"]))
+
+    result = macros.wait(macros.run("tv1", "nav").id, timeout=5)
+
+    assert result["status"] == "failed"
+    assert result["error"] == "down failed"
+    assert result["keys_sent"] == 1
+
+
+def test_runs_on_one_device_queue_and_can_be_cancelled(runner):
+    manager = FakeRemoteManager()
+    manager.gate.clear()
+    macros = runner(manager, slow=macro(["home"] * 20, delay=0.01))
+    first = macros.run("tv1", "slow")
+    second = macros.run("tv1", "slow")
+
+    assert wait_until(lambda: macros.get(first.id)["status"] == "running")
+    assert macros.get(second.id)["status"] == "queued"
+    assert macros.cancel_device("tv1") == 2
+    manager.gate.set()
+
+    assert macros.wait(first.id, timeout=5)["status"] == "cancelled"
+    assert macros.get(second.id)["status"] == "cancelled"
+    assert len(manager.sent) == 1
+
+
+def test_devices_run_in_parallel(runner):
+    manager = FakeRemoteManager()
+    macros = runner(manager, nav=macro(["home", "down", "down", "select"], delay=0.1))
+
+    started = time.monotonic()
+    runs = [macros.run(device, "nav") for device in ("tv1", "tv2", "tv3")]
+    for run in runs:
+        assert macros.wait(run.id, timeout=5)["status"] == "completed"
+
+    assert time.monotonic() - started < 0.6
+
+
+def test_device_macros_override_shared_ones(runner):
+    macros = runner(FakeRemoteManager(), nav=macro(["home"]))
+    macros.set_macros(macros.macros, {"tv2": {"nav": macro(["menu"])}})
+
+    assert macros.get_macro("tv1", "nav").steps[0].command == RemoteCommand.HOME
+    assert macros.get_macro("tv2", "nav").steps[0].command == RemoteCommand.MENU
+    with pytest.raises(KeyError):
+        macros.run("tv1", "missing")
+    with pytest.raises(KeyError):
+        macros.run("fridge", "nav")
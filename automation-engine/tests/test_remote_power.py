@@ -0,0 +1,177 @@
+"""Tests for Wake-on-LAN and readiness probing of remote devices."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from home_automation.integrations.remote_control import DeviceType, RemoteControlManager, RemoteDevice
+from home_automation.integrations.remote_power import ReadinessProber, magic_packet, send_magic_packet
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def listen_later(port, delay):
+    """Start accepting connections on a port after a delay, like a TV finishing its boot."""
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+    def run():
+        time.sleep(delay)
+        server.bind(("127.0.0.1", port))
+        server.listen()
+
+    threading.Thread(target=run, daemon=True).start()
+    return server
+
+
+class FakeHomeAssistant:
+    """Home Assistant client whose media player turns on some time after turn_on."""
+
+    def __init__(self, boot_time=None):
+        self.boot_time = boot_time
+        self.turned_on_at = None
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_state(self, entity_id):
+        booted = self.turned_on_at is not None and time.monotonic() - self.turned_on_at >= self.boot_time
+        return {"entity_id": entity_id, "state": "on" if booted else "off", "attributes": {}}
+
+    def turn_on(self, entity_id):
+        self.turned_on_at = time.monotonic()
+        return self.call_service("media_player", "turn_on", {"entity_id": entity_id})
+
+    def call_service(self, domain, service, data):
+        with self.lock:
+            self.calls.append((time.monotonic(), service, data.get("command")))
+        return {"success": True}
+
+
+def test_magic_packet_layout():
+    packet = magic_packet("aa-bb-cc-dd-ee-ff")
+
+    assert packet[:6] == b"\xff" * 6
+    assert packet[6:] == bytes.fromhex("aabbccddeeff") * 16
+    with pytest.raises(ValueError):
+        magic_packet("AA:BB:CC")
+
+
+def test_magic_packet_is_sent_over_udp():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver:
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(2)
+
+        send_magic_packet(MAC, broadcast="127.0.0.1", port=receiver.getsockname()[1])
+
+        assert receiver.recv(1024) == magic_packet(MAC)
+
+
+def test_ready_as_soon_as_the_port_opens():
+    port = free_port()
+    server = listen_later(port, 0.2)
+    try:
+        ready_via, waited = ReadinessProber(probe_interval=0.02).wait_ready("127.0.0.1", port, timeout=3)
+    finally:
+        server.close()
+
+    assert ready_via == "port"
+    assert 0.2 <= waited < 0.5
+
+
+def test_home_assistant_state_and_port_are_probed_concurrently():
+    ha_client = FakeHomeAssistant(boot_time=0.1)
+    ha_client.turn_on("media_player.tv")
+    prober = ReadinessProber(ha_client, probe_interval=0.02)
+
+    ready_via, waited = prober.wait_ready("127.0.0.1", free_port(), entity_id="media_player.tv", timeout=3)
+
+    assert ready_via == "home_assistant"
+    assert waited < 0.5
+
+
+def test_deadline_ends_the_wait_and_wake_is_resent():
+    wakes = []
+    prober = ReadinessProber(probe_interval=0.02, resend_interval=0.05)
+
+    ready_via, waited = prober.wait_ready("127.0.0.1", free_port(), timeout=0.3, wake=lambda: wakes.append(1))
+
+    assert ready_via is None
+    assert waited == pytest.approx(0.3, abs=0.1)
+    assert 3 <= len(wakes) <= 6
+
+
+@pytest.fixture
+def manager():
+    ha_client = FakeHomeAssistant(boot_time=0.2)
+    manager = RemoteControlManager(ha_client, wol_broadcast="127.0.0.1")
+    manager.prober.probe_interval = 0.02
+    manager.add_device(RemoteDevice(
+        "tv", DeviceType.ANDROID_TV, "127.0.0.1", port=free_port(), mac_address=MAC, entity_id="media_player.tv"
+    ))
+    return ha_client, manager
+
+
+def test_power_on_then_commands_in_one_request(manager):
+    ha_client, manager = manager
+
+    result = manager.power_on("tv", ["home", "netflix"], timeout=3)
+
+    assert result["success"]
+    assert result["ready_via"] == "home_assistant"
+    assert result["results"] == [
+        {"command": "home", "success": True}, {"command": "netflix", "success": True}
+    ]
+    assert [(service, command) for _, service, command in ha_client.calls] == [
+        ("turn_on", None), ("send_command", "home"), ("send_command", "netflix")
+    ]
+
+
+def test_commands_sent_while_powering_on_wait_until_ready(manager):
+    ha_client, manager = manager
+    results = {}
+    powering = threading.Thread(target=lambda: results.update(power=manager.power_on("tv", timeout=3)))
+    powering.start()
+    time.sleep(0.05)
+
+    select = manager.send_command("tv", "select")
+    powering.join(3)
+
+    assert select["success"]
+    turned_on, selected = ha_client.calls[0][0], ha_client.calls[-1][0]
+    assert selected - turned_on >= 0.2
+    assert results["power"]["success"]
+
+
+def test_concurrent_power_on_joins_the_one_in_progress(manager):
+    ha_client, manager = manager
+    results = {}
+    powering = threading.Thread(target=lambda: results.update(power=manager.power_on("tv", timeout=3)))
+    powering.start()
+    time.sleep(0.05)
+
+    joined = manager.power_on("tv", ["home"], timeout=3)
+    powering.join(3)
+
+    assert joined["success"]
+    assert joined["ready_via"] == "shared"
+    assert [service for _, service, _ in ha_client.calls] == ["turn_on", "send_command"]
+
+
+def test_power_on_reports_a_device_that_stays_off(manager):
+    ha_client, manager = manager
+    ha_client.boot_time = 60
+
+    result = manager.power_on("tv", ["home"], timeout=0.2)
+
+    assert not result["success"]
+    assert "did not become ready" in result["message"]
+    assert [service for _, service, _ in ha_client.calls] == ["turn_on"]
+    assert manager.power_on("missing")["success"] is False
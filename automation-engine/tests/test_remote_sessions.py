@@ -0,0 +1,198 @@
+"""Tests for persistent TV control sessions against local stand-ins."""
+
+import json
+import os
+import stat
+
+import pytest
+from aiohttp import WSMsgType, web
+
+from conftest import wait_until
+from home_automation.integrations.remote_control import DeviceType, RemoteCommand, RemoteDevice
+from home_automation.integrations.remote_sessions import RemoteSessionPool
+
+
+class SamsungStandIn:
+    """Samsung remote control WebSocket that pairs clients and records their frames."""
+
+    def __init__(self):
+        self.connections = 0
+        self.frames = []
+        self.tokens_seen = []
+        self.refuse = False
+        self.sockets = []
+
+    async def remote(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self.tokens_seen.append(request.query.get("token"))
+        if self.refuse:
+            await ws.send_json({"event": "ms.channel.unauthorized"})
+            await ws.close()
+            return ws
+        await ws.send_json({"event": "ms.channel.connect", "data": {"token": "paired-token"}})
+        self.sockets.append(ws)
+        async for message in ws:
+            if message.type == WSMsgType.TEXT:
+                self.frames.append(json.loads(message.data))
+        return ws
+
+    async def drop_all(self):
+        for ws in self.sockets:
+            await ws.close()
+        self.sockets.clear()
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get("/api/v2/channels/samsung.remote.control", self.remote)
+        return app
+
+
+@pytest.fixture
+def samsung(serve_app):
+    standin = SamsungStandIn()
+    port = int(serve_app(standin.make_app()).rsplit(":", 1)[1])
+    return standin, RemoteDevice("Living Room", DeviceType.SAMSUNG_TV, "127.0.0.1", port=port)
+
+
+@pytest.fixture
+def pool(background_loop, tmp_path):
+    pools = []
+
+    def make(**kwargs):
+        kwargs.setdefault("token_file", str(tmp_path / "tokens.json"))
+        pool = RemoteSessionPool(background_loop, timeout=2, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+
+    for pool in pools:
+        pool.close_all()
+
+
+def test_samsung_keys_share_one_connection(samsung, pool):
+    standin, device = samsung
+    sessions = pool()
+
+    for command in (RemoteCommand.HOME, RemoteCommand.DOWN, RemoteCommand.NETFLIX):
+        assert sessions.send(device, command)["success"]
+
+    assert wait_until(lambda: len(standin.frames) == 3)
+    assert standin.connections == 1
+    assert [frame["params"].get("DataOfCmd") for frame in standin.frames[:2]] == ["KEY_HOME", "KEY_DOWN"]
+    assert standin.frames[2]["params"]["data"]["appId"] == "3201907018807"
+
+
+def test_samsung_reconnects_after_the_tv_drops_the_socket(samsung, pool, background_loop):
+    standin, device = samsung
+    sessions = pool()
+    sessions.send(device, RemoteCommand.HOME)
+    session = sessions.get_session(device)
+
+    background_loop.run(standin.drop_all())
+    assert wait_until(lambda: not session.connected)
+
+    assert sessions.send(device, RemoteCommand.BACK)["success"]
+    assert standin.connections == 2
+    # The reconnect presents the token the TV issued on the first pairing
+    assert standin.tokens_seen == [None, "paired-token"]
+
+
+def test_samsung_refusal_and_unsupported_commands_fail(samsung, pool):
+    standin, device = samsung
+    standin.refuse = True
+    sessions = pool()
+
+    refused = sessions.send(device, RemoteCommand.HOME)
+    unsupported = sessions.send(device, RemoteCommand.POWER_ON)
+
+    assert not refused["success"]
+    assert "refused" in refused["message"]
+    assert not unsupported["success"]
+    assert standin.connections == 1
+
+
+def test_pairing_tokens_are_saved_privately_and_reused(samsung, pool, tmp_path):
+    standin, device = samsung
+    pool().send(device, RemoteCommand.HOME)
+
+    token_file = tmp_path / "tokens.json"
+    assert json.loads(token_file.read_text()) == {"Living Room": "paired-token"}
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+
+    restarted = pool()
+    restarted.send(device, RemoteCommand.HOME)
+    assert standin.tokens_seen[-1] == "paired-token"
+
+    restarted.close("Living Room", forget_token=True)
+    assert json.loads(token_file.read_text()) == {}
+
+
+def test_unreadable_token_file_is_ignored(pool, tmp_path):
+    (tmp_path / "tokens.json").write_text("[not json")
+
+    assert pool().tokens == {}
+
+
+def test_sessions_are_replaced_when_the_address_changes(samsung, pool):
+    _, device = samsung
+    sessions = pool()
+    first = sessions.get_session(device)
+
+    assert sessions.get_session(device) is first
+    moved = RemoteDevice(device.name, device.device_type, "127.0.0.2", port=device.port)
+    assert sessions.get_session(moved) is not first
+    with pytest.raises(ValueError):
+        sessions.get_session(RemoteDevice("Roku", DeviceType.ROKU, "127.0.0.1"))
+
+
+@pytest.fixture
+def fake_adb(tmp_path):
+    """Executable standing in for adb that logs connects and the shell's input."""
+    log = tmp_path / "adb.log"
+    script = tmp_path / "adb"
+    script.write_text(
+        "#!/bin/sh\n"
+        f'if [ "$1" = connect ]; then echo "connect $2" >> {log}; exit 0; fi\n'
+        f'while read line; do echo "$line" >> {log}; done\n'
+    )
+    script.chmod(0o755)
+    return str(script), log
+
+
+def test_adb_keys_go_through_one_shell(fake_adb, pool):
+    adb_path, log = fake_adb
+    device = RemoteDevice("Shield", DeviceType.ANDROID_TV, "127.0.0.1", port=5555)
+    sessions = pool(adb_path=adb_path)
+
+    assert sessions.send(device, RemoteCommand.HOME)["success"]
+    assert sessions.send(device, RemoteCommand.SELECT)["success"]
+
+    expected = ["connect 127.0.0.1:5555", "input keyevent KEYCODE_HOME", "input keyevent KEYCODE_DPAD_CENTER"]
+    assert wait_until(lambda: log.read_text().splitlines() == expected)
+
+
+def test_adb_shell_is_restarted_after_it_exits(fake_adb, pool):
+    adb_path, log = fake_adb
+    device = RemoteDevice("Shield", DeviceType.ANDROID_TV, "127.0.0.1", port=5555)
+    sessions = pool(adb_path=adb_path)
+    sessions.send(device, RemoteCommand.HOME)
+    session = sessions.get_session(device)
+
+    session._process.stdin.close()
+    session._process.wait(2)
+    assert sessions.send(device, RemoteCommand.BACK)["success"]
+
+    assert wait_until(lambda: log.read_text().splitlines()[-1] == "input keyevent KEYCODE_BACK")
+    assert log.read_text().splitlines().count("connect 127.0.0.1:5555") == 2
+
+
+def test_missing_adb_fails_cleanly(pool, tmp_path):
+    device = RemoteDevice("Shield", DeviceType.ANDROID_TV, "127.0.0.1", port=5555)
+
+    result = pool(adb_path=str(tmp_path / "no-adb")).send(device, RemoteCommand.HOME)
+
+    assert not result["success"]
+    assert "adb executable not found" in result["message"]
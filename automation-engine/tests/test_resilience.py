@@ -0,0 +1,160 @@
+"""Tests for the circuit breaker, latency tracking and request retries."""
+
+import asyncio
+import time
+
+import pytest
+import requests
+from aiohttp import web
+
+from home_automation.core.resilience import CircuitBreaker, LatencyTracker
+from home_automation.integrations.home_assistant import HomeAssistantClient, HomeAssistantUnavailableError
+
+
+def expire(breaker):
+    """Move an open circuit past its reset timeout."""
+    breaker.opened_at -= breaker.reset_timeout
+
+
+class ScriptedServer:
+    """Server answering each request with the next scripted (status, delay) pair."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.requests = []
+
+    async def handle(self, request):
+        self.requests.append((request.method, request.path))
+        status, delay = self.script.pop(0) if self.script else (200, 0)
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({"status": status}, status=status)
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+
+@pytest.fixture
+def scripted(serve_app):
+    def start(*script, **client_options):
+        server = ScriptedServer(*script)
+        client = HomeAssistantClient(serve_app(server.make_app()), "test-token", **client_options)
+        return server, client
+    return start
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert 29 < breaker.retry_after() <= 30
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    expire(breaker)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_latency_percentile_needs_enough_samples():
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for ms in range(9):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(95) is None
+
+    for ms in range(9, 100):
+        tracker.record(ms / 1000)
+
+    assert tracker.percentile(50) == 0.05
+    assert tracker.percentile(95) == 0.095
+
+
+def test_get_is_retried_on_server_errors(scripted):
+    server, client = scripted((503, 0), (502, 0), max_retries=2)
+
+    assert client._request("GET", "/api/states").json() == {"status": 200}
+    assert len(server.requests) == 3
+    assert client.circuit_breaker.failures == 0
+
+
+def test_service_calls_are_not_retried(scripted):
+    server, client = scripted((500, 0), max_retries=2)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client._request("POST", "/api/services/light/turn_on", json={})
+
+    assert len(server.requests) == 1
+
+
+def test_client_errors_are_not_retried(scripted):
+    server, client = scripted((404, 0), max_retries=2)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client._request("GET", "/api/states/light.missing")
+
+    assert len(server.requests) == 1
+    assert client.circuit_breaker.failures == 0
+
+
+def test_budget_bounds_all_attempts(scripted):
+    server, client = scripted((200, 1), (200, 1), timeout=5, max_retries=5)
+
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        client._request("GET", "/api/states", budget=0.3)
+
+    assert time.monotonic() - started < 0.9
+
+
+def test_open_circuit_fails_fast(scripted):
+    server, client = scripted(circuit_failure_threshold=1)
+    client.circuit_breaker.record_failure()
+
+    with pytest.raises(HomeAssistantUnavailableError):
+        client._request("GET", "/api/states")
+
+    assert server.requests == []
+
+
+def test_slow_get_is_hedged(scripted):
+    server, client = scripted((200, 2), (200, 0), hedge_requests=True, timeout=5)
+    for _ in range(client.latency.min_samples):
+        client.latency.record(0.01)
+
+    started = time.monotonic()
+    response = client._request("GET", "/api/states")
+
+    assert response.status_code == 200
+    assert time.monotonic() - started < 1
+    assert len(server.requests) == 2
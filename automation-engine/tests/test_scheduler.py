@@ -0,0 +1,176 @@
+"""Tests for priority scheduling of outbound requests."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+from aiohttp import web
+
+from conftest import wait_until
+from home_automation.core.resilience import CircuitBreaker
+from home_automation.core.scheduler import (
+    OutboundScheduler, Priority, SchedulerTimeoutError, TokenBucket, current_priority, prioritized, request_priority
+)
+from home_automation.integrations.home_assistant import HomeAssistantClient
+from home_automation.integrations.home_assistant_async import AsyncHomeAssistantClient
+
+
+def hold_slot(scheduler, priority=Priority.BACKGROUND):
+    """Occupy a slot from another thread until the returned event is set."""
+    release = threading.Event()
+    held = threading.Event()
+
+    def run():
+        with scheduler.slot(priority):
+            held.set()
+            release.wait(5)
+
+    threading.Thread(target=run, daemon=True).start()
+    assert held.wait(2)
+    return release
+
+
+def half_open_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return breaker
+
+
+def test_freed_slot_goes_to_the_most_urgent_waiter():
+    scheduler = OutboundScheduler(max_concurrency=1)
+    release = hold_slot(scheduler)
+    order = []
+
+    def request(priority):
+        with scheduler.slot(priority):
+            order.append(priority)
+
+    threads = []
+    for priority in (Priority.BACKGROUND, Priority.AUTOMATION, Priority.INTERACTIVE):
+        threads.append(threading.Thread(target=request, args=(priority,)))
+        threads[-1].start()
+        assert wait_until(lambda: len(scheduler._waiting) == len(threads))
+
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert order == [Priority.INTERACTIVE, Priority.AUTOMATION, Priority.BACKGROUND]
+
+
+def test_class_limit_lets_other_classes_overtake():
+    scheduler = OutboundScheduler(max_concurrency=4, class_concurrency={Priority.BACKGROUND: 1})
+    release = hold_slot(scheduler)
+
+    with pytest.raises(SchedulerTimeoutError):
+        with scheduler.slot(Priority.BACKGROUND, deadline=time.monotonic() + 0.05):
+            pass
+    with scheduler.slot(Priority.AUTOMATION, deadline=time.monotonic() + 0.05):
+        assert scheduler.stats()["automation"] == {"active": 1, "waiting": 0}
+
+    release.set()
+    assert wait_until(lambda: scheduler.stats()["background"]["active"] == 0)
+    assert scheduler._waiting == []
+
+
+def test_token_bucket_throttles_and_respects_deadlines():
+    bucket = TokenBucket(rate=20, burst=1)
+    bucket.acquire()
+
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.04
+
+    with pytest.raises(SchedulerTimeoutError):
+        bucket.acquire(deadline=time.monotonic() + 0.01)
+
+
+def test_priority_context_applies_to_nested_calls():
+    @prioritized(Priority.BACKGROUND)
+    def background_job():
+        return current_priority()
+
+    assert current_priority() is None
+    with request_priority(Priority.INTERACTIVE):
+        assert current_priority() == Priority.INTERACTIVE
+        assert background_job() == Priority.BACKGROUND
+        assert current_priority() == Priority.INTERACTIVE
+    assert current_priority() is None
+
+
+def test_half_open_trial_survives_a_scheduler_timeout(ha_standin):
+    _, url = ha_standin
+    scheduler = OutboundScheduler(max_concurrency=1)
+    client = HomeAssistantClient(url, "test-token", scheduler=scheduler, max_retries=0)
+    client.circuit_breaker = half_open_breaker()
+    release = hold_slot(scheduler)
+
+    with pytest.raises(requests.exceptions.Timeout):
+        client._request("GET", "/api/", budget=0.1)
+    release.set()
+
+    assert client.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    assert client._request("GET", "/api/").status_code == 200
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_circuit_fails_without_queueing(ha_standin):
+    _, url = ha_standin
+    scheduler = OutboundScheduler(max_concurrency=1)
+    client = HomeAssistantClient(url, "test-token", scheduler=scheduler, circuit_failure_threshold=1)
+    client.circuit_breaker.record_failure()
+    release = hold_slot(scheduler)
+    try:
+        started = time.monotonic()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client._request("GET", "/api/", budget=2)
+        assert time.monotonic() - started < 0.5
+    finally:
+        release.set()
+
+
+def test_async_half_open_trial_survives_cancellation_while_queued(ha_standin, background_loop):
+    _, url = ha_standin
+    breaker = half_open_breaker()
+    client = AsyncHomeAssistantClient(url, "test-token", max_concurrency=1, circuit_breaker=breaker)
+
+    async def queued_then_cancelled():
+        await client._get_session()
+        await client._semaphore.acquire()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client._request("GET", "/api/"), 0.1)
+        finally:
+            client._semaphore.release()
+        return await client._request("GET", "/api/")
+
+    try:
+        assert background_loop.run(queued_then_cancelled(), timeout=5) == {"message": "API running."}
+        assert breaker.state == CircuitBreaker.CLOSED
+    finally:
+        background_loop.run(client.close())
+
+
+def test_async_trial_cancelled_in_flight_is_released(serve_app, background_loop):
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/api/", slow)
+    breaker = half_open_breaker()
+    client = AsyncHomeAssistantClient(serve_app(app), "test-token", circuit_breaker=breaker)
+
+    async def cancelled_trial():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client._request("GET", "/api/"), 0.1)
+
+    try:
+        background_loop.run(cancelled_trial(), timeout=5)
+        assert breaker.allow()
+    finally:
+        background_loop.run(client.close())
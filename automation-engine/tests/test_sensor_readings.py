@@ -0,0 +1,69 @@
+"""Tests for in-memory sensor reading buffers."""
+
+import json
+
+import pytest
+
+from home_automation.core.config import Config
+from home_automation.core.database import DatabaseManager
+from home_automation.devices.device_manager import DeviceManager
+from home_automation.devices.readings import SensorReadingBuffer
+
+
+def test_buffer_overwrites_oldest_when_full():
+    buffer = SensorReadingBuffer(3)
+    for index in range(5):
+        buffer.append(float(index), 100.0 + index, index + 1, "temp")
+
+    assert len(buffer) == 3
+    assert [reading[0] for reading in buffer.latest()] == [4.0, 3.0, 2.0]
+    assert [reading[0] for reading in buffer.latest(2)] == [4.0, 3.0]
+    assert buffer.latest(0) == []
+
+
+def test_buffer_since_stops_at_older_readings():
+    buffer = SensorReadingBuffer(10)
+    buffer.extend((float(index), float(index), 0, None) for index in range(5))
+
+    assert [reading[1] for reading in buffer.since(2.0)] == [4.0, 3.0]
+
+
+def test_buffer_merge_deduplicates_by_id_and_orders_by_time():
+    buffer = SensorReadingBuffer(4)
+    buffer.append(20.0, 300.0, 3, "temp")
+    buffer.append(21.0, 400.0, 4, "temp")
+
+    buffer.merge([(18.0, 100.0, 1, "temp"), (19.0, 200.0, 2, "temp"), (20.0, 300.0, 3, "temp")])
+
+    assert [reading[2] for reading in buffer.latest()] == [4, 3, 2, 1]
+    buffer.merge([(17.0, 50.0, 9, "temp")])
+    # The oldest reading falls out once capacity is exceeded
+    assert [reading[2] for reading in buffer.latest()] == [4, 3, 2, 1]
+
+
+def test_buffer_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        SensorReadingBuffer(0)
+
+
+def test_first_read_merges_database_history(tmp_path):
+    config_path = tmp_path / "devices.json"
+    config_path.write_text(json.dumps({"devices": [
+        {"name": "Attic", "type": "sensor", "sensor_type": "temperature", "location": "Attic"},
+    ]}))
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    db_manager.initialize()
+    manager = DeviceManager(Config(DEVICES_CONFIG_PATH=str(config_path)), db_manager)
+    device_id = manager.get_device("Attic").device_id
+
+    stored_id = db_manager.add_sensor_data(device_id, "humidity", 55.0, "%")
+    recorded_id = db_manager.add_sensor_data(device_id, "temperature", 21.5, "°C")
+    manager.record_sensor_reading(device_id, "temperature", 21.5, "°C", recorded_id)
+
+    readings = manager.get_recent_sensor_data(device_id)
+
+    # The reading recorded since startup is not duplicated by the database copy
+    assert [reading["id"] for reading in readings] == [recorded_id, stored_id]
+    assert readings[1]["sensor_type"] == "humidity"
+    assert readings[1]["unit"] == "%"
+    assert manager.get_device("Attic").properties["value"] == 21.5
@@ -0,0 +1,120 @@
+"""Tests for service call batching and the Home Assistant client lifecycle."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from home_automation.core.automation_engine import AutomationEngine
+from home_automation.core.config import Config
+from home_automation.core.database import DatabaseManager
+from home_automation.integrations.ha_batching import ServiceCallBatcher
+
+
+class RecordingSender:
+    """Service sender answering with one changed state per entity."""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+        self.lock = threading.Lock()
+
+    def __call__(self, domain, service, service_data):
+        with self.lock:
+            self.calls.append((domain, service, service_data))
+        if self.error:
+            raise self.error
+        entity_ids = service_data["entity_id"]
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        return {
+            "success": True,
+            "message": f"Called {domain}.{service}",
+            "data": [{"entity_id": entity_id, "state": "on"} for entity_id in entity_ids],
+        }
+
+
+def call_concurrently(batcher, calls):
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(batcher.call, *call) for call in calls]
+        return [future.result() for future in futures]
+
+
+def test_concurrent_calls_are_merged_and_results_narrowed():
+    sender = RecordingSender()
+    batcher = ServiceCallBatcher(sender, window=0.2)
+
+    results = call_concurrently(batcher, [("light", "turn_on", f"light.{name}") for name in ("a", "b", "c")])
+
+    assert len(sender.calls) == 1
+    assert sorted(sender.calls[0][2]["entity_id"]) == ["light.a", "light.b", "light.c"]
+    for name, result in zip(("a", "b", "c"), results):
+        assert result["data"] == [{"entity_id": f"light.{name}", "state": "on"}]
+
+
+def test_calls_with_different_service_data_are_not_merged():
+    sender = RecordingSender()
+    batcher = ServiceCallBatcher(sender, window=0.2)
+
+    call_concurrently(batcher, [
+        ("light", "turn_on", "light.a", {"brightness": 10}),
+        ("light", "turn_on", "light.b", {"brightness": 200}),
+        ("light", "turn_off", "light.c", None),
+    ])
+
+    assert sorted((c[1], c[2]["entity_id"]) for c in sender.calls) == [
+        ("turn_off", "light.c"), ("turn_on", "light.a"), ("turn_on", "light.b")
+    ]
+
+
+def test_single_call_sends_a_plain_entity_id():
+    sender = RecordingSender()
+    batcher = ServiceCallBatcher(sender, window=0)
+
+    result = batcher.call("switch", "toggle", "switch.fan", {"x": 1})
+
+    assert sender.calls == [("switch", "toggle", {"x": 1, "entity_id": "switch.fan"})]
+    assert result["success"]
+
+
+def test_send_failure_is_reported_to_every_caller():
+    batcher = ServiceCallBatcher(RecordingSender(error=ConnectionError("down")), window=0.2)
+
+    results = call_concurrently(batcher, [("light", "turn_on", "light.a"), ("light", "turn_on", "light.b")])
+
+    assert [r["success"] for r in results] == [False, False]
+    assert all(r["error"] == "down" for r in results)
+    assert batcher._pending == {}
+
+
+def test_malformed_domain_ttls_are_skipped():
+    ttls = AutomationEngine._parse_cache_domain_ttls("sensor=10, bad,light=x,=3,weather=nan,sun=-1,,climate = 0")
+
+    assert ttls == {"sensor": 10.0, "climate": 0.0}
+
+
+def test_websocket_and_poller_follow_engine_start_and_stop(tmp_path):
+    config = Config(
+        HOME_ASSISTANT_TOKEN="test-token",
+        HOME_ASSISTANT_URL="http://127.0.0.1:9",
+        HOME_ASSISTANT_CACHE_DOMAIN_TTLS="sensor=10,light=x",
+        DEVICES_CONFIG_PATH=str(tmp_path / "devices.json"),
+        TV_DEVICES_CONFIG=str(tmp_path / "tv_devices.json"),
+        MOBILE_DEVICES_CONFIG=str(tmp_path / "mobile_devices.json"),
+        DATABASE_URL=f"sqlite:///{tmp_path / 'engine.db'}",
+    )
+    db_manager = DatabaseManager(config.DATABASE_URL)
+    db_manager.initialize()
+    engine = AutomationEngine(config, db_manager)
+    # The rule loop sleeps between passes; it is not under test here
+    engine._run_engine = lambda: None
+    try:
+        assert engine.ha_client is not None
+        assert engine.ha_client.cache_domain_ttls == {"sensor": 10.0}
+        assert engine.ha_websocket._task is None and not engine.ha_poller.running
+
+        engine.start()
+        assert engine.ha_websocket._task is not None and engine.ha_poller.running
+
+        engine.stop()
+        assert engine.ha_websocket._task is None and not engine.ha_poller.running
+    finally:
+        engine.shutdown()
@@ -0,0 +1,77 @@
+"""Tests for single-flight request coalescing."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import wait_until
+from home_automation.core.single_flight import SingleFlight
+
+
+def run_concurrently(group, key, fn, release, callers=5):
+    """Start one leader, add followers while it is in flight, then let it finish."""
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(group.do, key, fn)]
+        assert wait_until(lambda: key in group._calls)
+        futures += [executor.submit(group.do, key, fn) for _ in range(callers - 1)]
+        time.sleep(0.1)
+        release.set()
+    return futures
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return {"state": "on"}
+
+    futures = run_concurrently(group, "light.kitchen", fetch, release)
+
+    assert [f.result() for f in futures] == [{"state": "on"}] * 5
+    assert len(calls) == 1
+
+
+def test_followers_receive_the_leaders_exception():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(2)
+        raise ConnectionError("down")
+
+    futures = run_concurrently(group, "states", fetch, release, callers=3)
+
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result()
+
+
+def test_key_is_released_after_the_call():
+    group = SingleFlight()
+    results = iter(["first", "second"])
+
+    assert group.do("states", lambda: next(results)) == "first"
+    assert group.do("states", lambda: next(results)) == "second"
+    assert group._calls == {}
+
+    with pytest.raises(ValueError):
+        group.do("states", lambda: int("x"))
+    assert group._calls == {}
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    group = SingleFlight()
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        slow = executor.submit(group.do, "a", lambda: release.wait(2))
+        assert wait_until(lambda: "a" in group._calls)
+        assert group.do("b", lambda: "b") == "b"
+        release.set()
+        assert slow.result() is True
@@ -8,9 +8,10 @@ import asyncio
 import json
 import logging
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
 import aiohttp
@@ -29,6 +30,15 @@ env_file = Path(__file__).parent.parent / "config" / ".env"
 load_dotenv(env_file, override=True)
 
 
+# Home Assistant events after which memoized metadata is reloaded
+METADATA_EVENTS = {
+    "service_registered": ("/api/services",),
+    "service_removed": ("/api/services",),
+    "component_loaded": ("/api/services", "/api/config"),
+    "core_config_updated": ("/api/config",),
+}
+
+
 @dataclass
 class HAConfig:
     """Home Assistant configuration"""
@@ -50,14 +60,35 @@ class CopilotAgentMCP:
         self.config = config or HAConfig()
         self.session: Optional[aiohttp.ClientSession] = None
         self.command_history: List[Dict] = []
+        # Config and service lists rarely change, keep them for a while
+        self.metadata_ttl = float(os.getenv("HA_METADATA_TTL", "300"))
+        self.event_reconnect_delay = 10.0
+        self._metadata: Dict[str, Tuple[float, Any]] = {}
+        # Bumped when a payload changes so loads started before that are discarded
+        self._metadata_generations: Dict[str, int] = {}
+        self._metadata_refreshes: Dict[str, Tuple[int, asyncio.Task]] = {}
+        # States mirrored over the WebSocket, indexed by domain for filtered lookups
+        self._states: Dict[str, Dict] = {}
+        self._domain_index: Dict[str, Set[str]] = {}
+        self._states_synced = False
+        self._event_task: Optional[asyncio.Task] = None
         
     async def start(self):
         """Start the MCP server"""
         self.session = aiohttp.ClientSession()
+        self._event_task = asyncio.create_task(self._watch_events())
         logger.info(f"Copilot Agent MCP started - HA: {self.config.url}")
         
     async def stop(self):
         """Stop the MCP server"""
+        tasks = [task for _, task in self._metadata_refreshes.values()]
+        if self._event_task:
+            tasks.append(self._event_task)
+            self._event_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._metadata_refreshes.clear()
         if self.session:
             await self.session.close()
         logger.info("Copilot Agent MCP stopped")
@@ -67,7 +98,15 @@ class CopilotAgentMCP:
     # =========================================================================
     
     async def get_states(self, domain: str = None) -> List[Dict]:
-        """Get all entity states or filter by domain"""
+        """Get all entity states or filter by domain
+        
+        Served from the WebSocket mirror while it is in sync, where a domain
+        is looked up in the index instead of scanning every state.
+        """
+        if self._states_synced:
+            if domain:
+                return [self._states[entity_id] for entity_id in sorted(self._domain_index.get(domain, ()))]
+            return list(self._states.values())
         async with self.session.get(
             f"{self.config.url}/api/states",
             headers=self.config.headers
@@ -105,21 +144,134 @@ class CopilotAgentMCP:
         ) as resp:
             return await resp.json()
     
-    async def get_config(self) -> Dict:
-        """Get Home Assistant configuration"""
+    async def _get_metadata(self, path: str) -> Any:
+        """Get a rarely-changing payload, memoized for metadata_ttl seconds
+
+        For another metadata_ttl seconds the memoized copy is still returned
+        while it is reloaded in the background. It is also returned when
+        Home Assistant cannot be reached.
+        """
+        cached = self._metadata.get(path)
+        if cached:
+            age = time.monotonic() - cached[0]
+            if age < self.metadata_ttl:
+                return cached[1]
+            if age < 2 * self.metadata_ttl:
+                self.refresh_metadata(path, invalidate=False)
+                return cached[1]
+        try:
+            return await self._load_metadata(path)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if not cached:
+                raise
+            logger.warning(f"Serving cached {path}: {e}")
+            return cached[1]
+    
+    async def _load_metadata(self, path: str) -> Any:
+        """Fetch a metadata payload and memoize it unless it changed meanwhile"""
+        generation = self._metadata_generations.get(path, 0)
         async with self.session.get(
-            f"{self.config.url}/api/config",
+            f"{self.config.url}{path}",
             headers=self.config.headers
         ) as resp:
-            return await resp.json()
+            resp.raise_for_status()
+            data = await resp.json()
+        if self.metadata_ttl > 0 and generation == self._metadata_generations.get(path, 0):
+            self._metadata[path] = (time.monotonic(), data)
+        return data
+    
+    def refresh_metadata(self, *paths: str, invalidate: bool = True):
+        """Reload memoized metadata in the background, serving the old copy meanwhile
+        
+        With ``invalidate`` loads that were already running are discarded,
+        since they may have read the payload from before a change.
+        """
+        for path in paths:
+            if invalidate:
+                self._metadata_generations[path] = self._metadata_generations.get(path, 0) + 1
+            if path not in self._metadata:
+                continue
+            generation = self._metadata_generations.get(path, 0)
+            running = self._metadata_refreshes.get(path)
+            if running and running[0] == generation and not running[1].done():
+                continue
+            self._metadata_refreshes[path] = (generation, asyncio.create_task(self._refresh_in_background(path)))
+    
+    async def _refresh_in_background(self, path: str):
+        """Reload one metadata payload, keeping the old copy on failure"""
+        try:
+            await self._load_metadata(path)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Background refresh of {path} failed: {e}")
+    
+    async def _watch_events(self):
+        """Mirror entity states and reload memoized metadata from Home Assistant events"""
+        ws_url = self.config.url.replace("http", "ws", 1) + "/api/websocket"
+        while True:
+            try:
+                async with self.session.ws_connect(ws_url, heartbeat=30) as ws:
+                    await ws.receive_json()
+                    await ws.send_json({"type": "auth", "access_token": self.config.token})
+                    auth = await ws.receive_json()
+                    if auth.get("type") != "auth_ok":
+                        logger.warning("Home Assistant refused the event subscription")
+                        return
+                    event_types = ["state_changed", *METADATA_EVENTS]
+                    for message_id, event_type in enumerate(event_types, start=1):
+                        await ws.send_json({"id": message_id, "type": "subscribe_events", "event_type": event_type})
+                    # Subscribed first, so no change is lost between the snapshot and the events
+                    snapshot_id = len(event_types) + 1
+                    await ws.send_json({"id": snapshot_id, "type": "get_states"})
+                    # Changes made while disconnected were missed
+                    self.refresh_metadata(*list(self._metadata))
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        message = msg.json()
+                        if message.get("type") == "event":
+                            self._handle_event(message.get("event", {}))
+                        elif message.get("id") == snapshot_id and message.get("success"):
+                            self._load_states(message.get("result") or [])
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"Home Assistant event subscription lost: {e}")
+            finally:
+                self._states_synced = False
+            await asyncio.sleep(self.event_reconnect_delay)
+    
+    def _load_states(self, states: List[Dict]):
+        """Replace the mirrored states and rebuild the domain index"""
+        self._states = {state["entity_id"]: state for state in states}
+        self._domain_index = {}
+        for entity_id in self._states:
+            self._domain_index.setdefault(entity_id.split(".")[0], set()).add(entity_id)
+        self._states_synced = True
+    
+    def _handle_event(self, event: Dict):
+        """Apply a state change to the mirror or reload metadata it affects"""
+        event_type = event.get("event_type", "")
+        if event_type != "state_changed":
+            self.refresh_metadata(*METADATA_EVENTS.get(event_type, ()))
+            return
+        data = event.get("data", {})
+        entity_id = data.get("entity_id")
+        if not entity_id:
+            return
+        new_state = data.get("new_state")
+        domain_entities = self._domain_index.setdefault(entity_id.split(".")[0], set())
+        if new_state is None:
+            self._states.pop(entity_id, None)
+            domain_entities.discard(entity_id)
+        else:
+            self._states[entity_id] = new_state
+            domain_entities.add(entity_id)
+    
+    async def get_config(self) -> Dict:
+        """Get Home Assistant configuration"""
+        return await self._get_metadata("/api/config")
     
     async def get_services(self) -> List[Dict]:
         """Get available services"""
-        async with self.session.get(
-            f"{self.config.url}/api/services",
-            headers=self.config.headers
-        ) as resp:
-            return await resp.json()
+        return await self._get_metadata("/api/services")
     
     # =========================================================================
     # Copilot Agent Commands
@@ -292,10 +444,16 @@ class CopilotAgentMCP:
                 "entities": [{"entity_id": s["entity_id"], "state": s["state"]} for s in states[:50]]
             }
         elif "config" in command:
-            config = await self.get_config()
+            try:
+                config = await self.get_config()
+            except aiohttp.ClientResponseError as e:
+                return {"success": False, "error": f"Home Assistant returned {e.status}: {e.message}"}
             return {"success": True, "config": config}
         elif "services" in command:
-            services = await self.get_services()
+            try:
+                services = await self.get_services()
+            except aiohttp.ClientResponseError as e:
+                return {"success": False, "error": f"Home Assistant returned {e.status}: {e.message}"}
             return {"success": True, "services": [s["domain"] for s in services]}
         
         return {"success": False, "error": "Unknown query type"}
@@ -397,6 +555,12 @@ class CopilotAgentServer:
                 "ha_connected": True,
                 "timestamp": datetime.now().isoformat()
             })
+        except aiohttp.ClientResponseError as e:
+            return web.json_response({
+                "status": "unhealthy",
+                "error": f"Home Assistant returned {e.status}: {e.message}",
+                "ha_connected": True
+            }, status=503)
         except Exception as e:
             return web.json_response({
                 "status": "unhealthy",
@@ -5,12 +5,14 @@ Manages bidirectional real-time synchronization between repository and live serv
 """
 
 import asyncio
+import codecs
+import fnmatch
 import json
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, AsyncIterator, Iterable, Set
 from enum import Enum
 
 import aiohttp
@@ -70,6 +72,52 @@ class EntityState:
         return asdict(self)
 
 
+class StateStreamDecoder:
+    """Incrementally decode the /api/states array, keeping only matching entities"""
+    
+    def __init__(self, domains: Iterable[str] = None, entity_pattern: str = None):
+        self.domains = set(domains or ())
+        self.entity_pattern = entity_pattern
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self.finished = False
+    
+    def _matches(self, state: Dict[str, Any]) -> bool:
+        entity_id = state.get("entity_id", "")
+        if self.domains and entity_id.split(".")[0] not in self.domains:
+            return False
+        return not self.entity_pattern or fnmatch.fnmatchcase(entity_id, self.entity_pattern)
+    
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Decode the entities completed by this chunk"""
+        self._buffer += self._text.decode(chunk)
+        buffer, position, states = self._buffer, 0, []
+        while not self.finished:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if not self._started:
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON array of states")
+                self._started = True
+                position += 1
+            elif buffer[position] == "]":
+                self.finished = True
+                position += 1
+            else:
+                try:
+                    state, position = self._decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    break  # Entity not complete yet
+                if self._matches(state):
+                    states.append(state)
+        self._buffer = buffer[position:]
+        return states
+
+
 class HomeAssistantMCPClient:
     """Home Assistant MCP Live Server Client"""
     
@@ -87,6 +135,8 @@ class HomeAssistantMCPClient:
         self.connected = False
         self.event_callbacks: List[Callable] = []
         self.state_cache: Dict[str, EntityState] = {}
+        # Entity IDs in state_cache by domain
+        self.domain_index: Dict[str, Set[str]] = {}
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -159,21 +209,65 @@ class HomeAssistantMCPClient:
             logger.error(f"Error retrieving states: {e}")
             return {}
     
+    async def iter_states(self, domains: Iterable[str] = None,
+                          entity_pattern: str = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream entity states from the server as they are received
+        
+        Args:
+            domains: Domains to include, all if empty
+            entity_pattern: Shell-style entity ID pattern (e.g. sensor.*_temperature)
+        
+        Yields:
+            Matching entity states
+        """
+        if not self.connected:
+            raise RuntimeError("Not connected to Home Assistant")
+        
+        decoder = StateStreamDecoder(domains, entity_pattern)
+        async with self.session.get(
+            f"{self.config.base_url}/states",
+            headers=self._get_headers()
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(65536):
+                for state in decoder.feed(chunk):
+                    yield state
+        if not decoder.finished:
+            raise ValueError("State list ended unexpectedly")
+    
     async def _cache_all_states(self):
         """Cache all entity states locally"""
-        states = await self.get_all_states()
-        for state_data in states:
-            entity_id = state_data.get("entity_id")
-            state = EntityState(
-                entity_id=entity_id,
-                state=state_data.get("state"),
-                attributes=state_data.get("attributes", {}),
-                last_changed=state_data.get("last_changed"),
-                last_updated=state_data.get("last_updated")
-            )
-            self.state_cache[entity_id] = state
+        try:
+            async for state_data in self.iter_states():
+                entity_id = state_data.get("entity_id")
+                state = EntityState(
+                    entity_id=entity_id,
+                    state=state_data.get("state"),
+                    attributes=state_data.get("attributes", {}),
+                    last_changed=state_data.get("last_changed"),
+                    last_updated=state_data.get("last_updated")
+                )
+                self.state_cache[entity_id] = state
+                self.domain_index.setdefault(entity_id.split(".")[0], set()).add(entity_id)
+        except Exception as e:
+            logger.error(f"Error retrieving states: {e}")
         logger.info(f"💾 Cached {len(self.state_cache)} entity states")
     
+    def get_cached_states(self, domain: str = None) -> List[Dict[str, Any]]:
+        """
+        Get entity states cached at connect time
+        
+        Args:
+            domain: Only return this domain, looked up in the domain index
+        
+        Returns:
+            Entity state dictionaries
+        """
+        if domain is None:
+            return [state.to_dict() for state in self.state_cache.values()]
+        return [self.state_cache[entity_id].to_dict() for entity_id in sorted(self.domain_index.get(domain, ()))]
+    
     async def get_config(self) -> Dict[str, Any]:
         """Retrieve Home Assistant configuration"""
         if not self.connected:
@@ -237,8 +331,7 @@ class HomeAssistantMCPClient:
         """Retrieve all automation configurations"""
         try:
             # Automations are typically entities with domain 'automation'
-            states = await self.get_all_states()
-            automations = [s for s in states if s.get("entity_id", "").startswith("automation.")]
+            automations = [s async for s in self.iter_states(domains=["automation"])]
             logger.info(f"🤖 Retrieved {len(automations)} automations")
             return automations
         except Exception as e:
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Home Assistant client throughput benchmark
+Measures requests per second, latency percentiles and memory for each of our
+Home Assistant clients against the local stand-in server (or any HA URL).
+
+Usage:
+    python scripts/benchmark_ha_clients.py --requests 500 --concurrency 20 --latency-ms 5
+    python scripts/benchmark_ha_clients.py --url http://127.0.0.1:8124 --clients engine-sync,mcp-client
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+repo_root = Path(__file__).parent.parent
+ENGINE_SRC = repo_root / "automation-engine" / "src"
+MCP_SERVERS = repo_root / "mcp-servers"
+
+OPERATIONS = ("get_states", "get_state", "turn_on")
+
+
+def load_engine_package():
+    """Import automation-engine/src as the home_automation package, as the Docker image does"""
+    if "home_automation" in sys.modules:
+        return
+    spec = importlib.util.spec_from_file_location(
+        "home_automation", ENGINE_SRC / "__init__.py", submodule_search_locations=[str(ENGINE_SRC)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["home_automation"] = module
+    spec.loader.exec_module(module)
+
+
+def load_module_from_path(name: str, path: Path):
+    """Import a module from a file whose name is not a valid identifier"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class BenchmarkResult:
+    """Measurements for one client and operation"""
+
+    def __init__(self, client: str, operation: str, latencies: List[float], errors: int,
+                 wall: float, peak_memory: Optional[int]):
+        self.client = client
+        self.operation = operation
+        self.requests = len(latencies) + errors
+        self.errors = errors
+        self.rps = self.requests / wall if wall else 0.0
+        self.p50_ms = percentile(latencies, 50) * 1000
+        self.p99_ms = percentile(latencies, 99) * 1000
+        self.peak_memory_kb = peak_memory // 1024 if peak_memory is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "client": self.client,
+            "operation": self.operation,
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.rps, 1),
+            "p50_ms": round(self.p50_ms, 2),
+            "p99_ms": round(self.p99_ms, 2),
+            "peak_memory_kb": self.peak_memory_kb,
+        }
+
+
+# =============================================================================
+# Runners
+# =============================================================================
+
+def succeeded(result: Any) -> bool:
+    """Whether a client call succeeded; most clients return a fallback value instead of raising"""
+    if result is None:
+        return False
+    if isinstance(result, dict) and result.get("success") is False:
+        return False
+    return True
+
+
+def run_threaded(call: Callable[[int], Any], requests: int, concurrency: int):
+    """Run a blocking call from a thread pool, returning latencies and error count"""
+    latencies: List[float] = []
+    errors = 0
+
+    def timed(index: int):
+        started = time.perf_counter()
+        try:
+            ok = succeeded(call(index))
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for ok, elapsed in executor.map(timed, range(requests)):
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+    return latencies, errors
+
+
+async def run_async(call: Callable[[int], Awaitable[Any]], requests: int, concurrency: int):
+    """Run a coroutine with bounded concurrency, returning latencies and error count"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def timed(index: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = succeeded(await call(index))
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(timed(i) for i in range(requests)))
+    return latencies, errors
+
+
+def measure(client: str, operation: str, run: Callable[[], Any], track_memory: bool) -> BenchmarkResult:
+    """Time one scenario, optionally tracking peak Python allocations"""
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    latencies, errors = run()
+    wall = time.perf_counter() - started
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return BenchmarkResult(client, operation, latencies, errors, wall, peak)
+
+
+# =============================================================================
+# Clients
+# =============================================================================
+
+def bench_engine_sync(url, token, entity_ids, args) -> List[BenchmarkResult]:
+    load_engine_package()
+    from home_automation.integrations.home_assistant import HomeAssistantClient
+
+    client = HomeAssistantClient(url, token)
+    calls = {
+        "get_states": lambda i: client.get_states(),
+        "get_state": lambda i: client.get_state(entity_ids[i % len(entity_ids)]),
+        "turn_on": lambda i: client.turn_on(entity_ids[i % len(entity_ids)]),
+    }
+    return [
+        measure("engine-sync", op, lambda: run_threaded(calls[op], args.requests, args.concurrency), args.memory)
+        for op in args.operations
+    ]
+
+
+def bench_engine_async(url, token, entity_ids, args) -> List[BenchmarkResult]:
+    load_engine_package()
+    from home_automation.integrations.home_assistant_async import AsyncHomeAssistantClient
+
+    async def run(op):
+        async with AsyncHomeAssistantClient(url, token, max_concurrency=args.concurrency,
+                                            max_connections=args.concurrency) as client:
+            calls = {
+                "get_states": lambda i: client.get_states(),
+                "get_state": lambda i: client.get_state(entity_ids[i % len(entity_ids)]),
+                "turn_on": lambda i: client.turn_on(entity_ids[i % len(entity_ids)]),
+            }
+            return await run_async(calls[op], args.requests, args.concurrency)
+
+    return [measure("engine-async", op, lambda: asyncio.run(run(op)), args.memory) for op in args.operations]
+
+
+def bench_mcp_client(url, token, entity_ids, args) -> List[BenchmarkResult]:
+    sys.path.insert(0, str(MCP_SERVERS))
+    from ha_mcp_client import HomeAssistantMCPClient, MCPConfig
+
+    protocol, _, rest = url.partition("://")
+    host, _, port = rest.rstrip("/").partition(":")
+    config = MCPConfig(host=host, port=int(port or 8123), token=token, protocol=protocol)
+
+    async def run(op):
+        client = HomeAssistantMCPClient(config)
+        # Connect without seeding the local state cache so only the operation is measured
+        client.session = aiohttp.ClientSession()
+        client.connected = True
+        try:
+            calls = {
+                "get_states": lambda i: client.get_all_states(),
+                "turn_on": lambda i: client.call_service(
+                    entity_ids[i % len(entity_ids)].split(".")[0], "turn_on", entity_ids[i % len(entity_ids)]
+                ),
+            }
+            return await run_async(calls[op], args.requests, args.concurrency)
+        finally:
+            await client.disconnect()
+
+    # HomeAssistantMCPClient has no single-entity read
+    return [
+        measure("mcp-client", op, lambda: asyncio.run(run(op)), args.memory)
+        for op in args.operations if op != "get_state"
+    ]
+
+
+def bench_copilot_agent(url, token, entity_ids, args) -> List[BenchmarkResult]:
+    os.environ.setdefault("HOME_ASSISTANT_URL", url)
+    module = load_module_from_path("copilot_agent_mcp", MCP_SERVERS / "copilot-agent-mcp.py")
+    config = module.HAConfig(url=url, token=token)
+
+    async def run(op):
+        agent = module.CopilotAgentMCP(config)
+        await agent.start()
+        try:
+            calls = {
+                "get_states": lambda i: agent.get_states(),
+                "get_state": lambda i: agent.get_state(entity_ids[i % len(entity_ids)]),
+                "turn_on": lambda i: agent.call_service(
+                    entity_ids[i % len(entity_ids)].split(".")[0], "turn_on",
+                    {"entity_id": entity_ids[i % len(entity_ids)]}
+                ),
+            }
+            return await run_async(calls[op], args.requests, args.concurrency)
+        finally:
+            await agent.stop()
+
+    return [measure("copilot-agent", op, lambda: asyncio.run(run(op)), args.memory) for op in args.operations]
+
+
+CLIENTS = {
+    "engine-sync": bench_engine_sync,
+    "engine-async": bench_engine_async,
+    "mcp-client": bench_mcp_client,
+    "copilot-agent": bench_copilot_agent,
+}
+
+
+# =============================================================================
+# Stand-in server
+# =============================================================================
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_standin(args) -> subprocess.Popen:
+    """Start the stand-in server in a separate process so it does not share our GIL"""
+    command = [
+        sys.executable, str(Path(__file__).parent / "ha_standin_server.py"),
+        "--port", str(args.port), "--token", args.token,
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate), "--multiply", str(args.multiply),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", args.port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Stand-in server did not start")
+
+
+def print_table(results: List[BenchmarkResult]):
+    header = f"{'client':<15}{'operation':<12}{'requests':>9}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        memory = str(r.peak_memory_kb) if r.peak_memory_kb is not None else "-"
+        print(f"{r.client:<15}{r.operation:<12}{r.requests:>9}{r.errors:>8}{r.rps:>10.1f}"
+              f"{r.p50_ms:>10.2f}{r.p99_ms:>10.2f}{memory:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Home Assistant clients")
+    parser.add_argument("--url", help="Benchmark an existing server instead of starting the stand-in")
+    parser.add_argument("--token", default="benchmark", help="Access token")
+    parser.add_argument("--clients", default=",".join(CLIENTS), help="Comma-separated clients to run")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="Comma-separated operations to run")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight")
+    parser.add_argument("--memory", action="store_true", help="Track peak Python allocations (slows clients)")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    parser.add_argument("--port", type=int, default=0, help="Stand-in server port (random if 0)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Stand-in latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Stand-in random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0, help="Stand-in fraction of failing requests")
+    parser.add_argument("--multiply", type=int, default=1, help="Replicate the stand-in states N times")
+    args = parser.parse_args()
+    args.operations = [op for op in args.operations.split(",") if op in OPERATIONS]
+
+    process = None
+    url = args.url
+    if not url:
+        args.port = args.port or free_port()
+        process = start_standin(args)
+        url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        with open(repo_root / "backups" / "states.json") as f:
+            entity_ids = [s["entity_id"] for s in json.load(f) if s["entity_id"].split(".")[0] in ("light", "switch")]
+        entity_ids = entity_ids or ["light.benchmark"]
+
+        results: List[BenchmarkResult] = []
+        for name in args.clients.split(","):
+            if name not in CLIENTS:
+                print(f"Unknown client: {name}", file=sys.stderr)
+                continue
+            results.extend(CLIENTS[name](url, args.token, entity_ids, args))
+
+        print(f"\nTarget: {url}  requests={args.requests}  concurrency={args.concurrency}\n")
+        print_table(results)
+        if args.json:
+            args.json.write_text(json.dumps([r.to_dict() for r in results], indent=2))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
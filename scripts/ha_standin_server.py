@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Local Home Assistant stand-in server
+Serves the REST and WebSocket API surface our clients use, seeded from a
+state export, with configurable latency and error injection.
+
+Usage:
+    python scripts/ha_standin_server.py --port 8124 --latency-ms 20 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web, WSMsgType
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("ha-standin")
+
+repo_root = Path(__file__).parent.parent
+DEFAULT_STATES = repo_root / "backups" / "states.json"
+
+# Services offered for every domain present in the state export
+ENTITY_SERVICES = ("turn_on", "turn_off", "toggle")
+STATE_AFTER_SERVICE = {"turn_on": "on", "turn_off": "off"}
+
+
+def load_states(path: Path, multiply: int = 1) -> List[Dict[str, Any]]:
+    """Load a state export, optionally replicated to simulate larger installs"""
+    with open(path) as f:
+        data = json.load(f)
+    states = data["states"] if isinstance(data, dict) else data
+    if multiply <= 1:
+        return states
+
+    replicated = []
+    for copy_index in range(multiply):
+        for state in states:
+            state = copy.deepcopy(state)
+            if copy_index:
+                state["entity_id"] = f"{state['entity_id']}_{copy_index}"
+            replicated.append(state)
+    return replicated
+
+
+class HomeAssistantStandIn:
+    """In-memory Home Assistant REST and WebSocket API"""
+
+    def __init__(self, states: List[Dict[str, Any]], token: str = "",
+                 latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0):
+        self.states: Dict[str, Dict[str, Any]] = {s["entity_id"]: s for s in states}
+        self.token = token
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.subscribers: List[tuple] = []
+        self.request_count = 0
+
+    # =========================================================================
+    # Fault injection and auth
+    # =========================================================================
+
+    async def _delay(self):
+        """Simulate server-side latency"""
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)  # nosec B311
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        """Apply auth, latency and error injection to REST requests"""
+        self.request_count += 1
+        if request.path == "/api/websocket":
+            return await handler(request)
+
+        if self.token and request.headers.get("Authorization") != f"Bearer {self.token}":
+            return web.json_response({"message": "Unauthorized"}, status=401)
+        await self._delay()
+        if self.error_rate and random.random() < self.error_rate:  # nosec B311
+            return web.json_response({"message": "Injected error"}, status=random.choice([500, 502, 503]))  # nosec B311
+        return await handler(request)
+
+    # =========================================================================
+    # State helpers
+    # =========================================================================
+
+    def _set_state(self, entity_id: str, state: str, attributes: Optional[Dict] = None) -> Dict[str, Any]:
+        """Update an entity and notify WebSocket subscribers"""
+        now = datetime.now(timezone.utc).isoformat()
+        old_state = self.states.get(entity_id)
+        new_state = {
+            "entity_id": entity_id,
+            "state": state,
+            "attributes": attributes if attributes is not None else (old_state or {}).get("attributes", {}),
+            "last_changed": now if not old_state or old_state["state"] != state else old_state["last_changed"],
+            "last_updated": now,
+        }
+        self.states[entity_id] = new_state
+        self._broadcast("state_changed", {"entity_id": entity_id, "old_state": old_state, "new_state": new_state})
+        return new_state
+
+    def _broadcast(self, event_type: str, data: Dict[str, Any]):
+        """Send an event to every WebSocket subscribed to it"""
+        event = {
+            "event_type": event_type,
+            "data": data,
+            "origin": "LOCAL",
+            "time_fired": datetime.now(timezone.utc).isoformat(),
+        }
+        for ws, subscriptions in list(self.subscribers):
+            for subscription_id, subscribed_type in subscriptions.items():
+                if subscribed_type in (None, event_type) and not ws.closed:
+                    asyncio.ensure_future(ws.send_json({"id": subscription_id, "type": "event", "event": event}))
+
+    def _services(self) -> List[Dict[str, Any]]:
+        """Build the service list from the domains in the state export"""
+        domains = sorted({entity_id.split(".")[0] for entity_id in self.states})
+        return [
+            {"domain": domain, "services": {service: {"fields": {}} for service in ENTITY_SERVICES}}
+            for domain in domains + ["homeassistant"]
+        ]
+
+    def _config(self) -> Dict[str, Any]:
+        return {
+            "version": "stand-in",
+            "location_name": "Stand-in",
+            "time_zone": "UTC",
+            "unit_system": {"temperature": "°C"},
+            "components": sorted({entity_id.split(".")[0] for entity_id in self.states}),
+            "state": "RUNNING",
+        }
+
+    def _call_service(self, domain: str, service: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply an entity service and return the changed states"""
+        entity_ids = data.get("entity_id") or []
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+
+        changed = []
+        for entity_id in entity_ids:
+            current = self.states.get(entity_id)
+            if current is None:
+                continue
+            if service == "toggle":
+                new_value = "off" if current["state"] == "on" else "on"
+            else:
+                new_value = STATE_AFTER_SERVICE.get(service, current["state"])
+            changed.append(self._set_state(entity_id, new_value))
+        self._broadcast("call_service", {"domain": domain, "service": service, "service_data": data})
+        return changed
+
+    # =========================================================================
+    # REST API
+    # =========================================================================
+
+    async def handle_root(self, request: web.Request) -> web.Response:
+        return web.json_response({"message": "API running."})
+
+    async def handle_states(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self.states.values()))
+
+    async def handle_state(self, request: web.Request) -> web.Response:
+        state = self.states.get(request.match_info["entity_id"])
+        if state is None:
+            return web.json_response({"message": "Entity not found."}, status=404)
+        return web.json_response(state)
+
+    async def handle_set_state(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        entity_id = request.match_info["entity_id"]
+        created = entity_id not in self.states
+        state = self._set_state(entity_id, str(body.get("state")), body.get("attributes"))
+        return web.json_response(state, status=201 if created else 200)
+
+    async def handle_services(self, request: web.Request) -> web.Response:
+        return web.json_response(self._services())
+
+    async def handle_call_service(self, request: web.Request) -> web.Response:
+        data = await request.json() if request.can_read_body else {}
+        changed = self._call_service(request.match_info["domain"], request.match_info["service"], data or {})
+        return web.json_response(changed)
+
+    async def handle_config(self, request: web.Request) -> web.Response:
+        return web.json_response(self._config())
+
+    async def handle_fire_event(self, request: web.Request) -> web.Response:
+        event_type = request.match_info["event_type"]
+        data = await request.json() if request.can_read_body else {}
+        self._broadcast(event_type, data or {})
+        return web.json_response({"message": f"Event {event_type} fired."})
+
+    # =========================================================================
+    # WebSocket API
+    # =========================================================================
+
+    async def handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        await ws.send_json({"type": "auth_required", "ha_version": "stand-in"})
+
+        auth = await ws.receive_json()
+        if self.token and auth.get("access_token") != self.token:
+            await ws.send_json({"type": "auth_invalid", "message": "Invalid access token"})
+            await ws.close()
+            return ws
+        await ws.send_json({"type": "auth_ok", "ha_version": "stand-in"})
+
+        subscriptions: Dict[int, Optional[str]] = {}
+        entry = (ws, subscriptions)
+        self.subscribers.append(entry)
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    break
+                payload = json.loads(msg.data)
+                for message in payload if isinstance(payload, list) else [payload]:
+                    await self._handle_command(ws, subscriptions, message)
+        finally:
+            self.subscribers.remove(entry)
+        return ws
+
+    async def _handle_command(self, ws: web.WebSocketResponse, subscriptions: Dict[int, Optional[str]],
+                              message: Dict[str, Any]):
+        """Answer one WebSocket command"""
+        message_id = message.get("id")
+        command = message.get("type")
+        await self._delay()
+
+        def result(value: Any = None):
+            return ws.send_json({"id": message_id, "type": "result", "success": True, "result": value})
+
+        if command == "ping":
+            await ws.send_json({"id": message_id, "type": "pong"})
+        elif command == "subscribe_events":
+            subscriptions[message_id] = message.get("event_type")
+            await result()
+        elif command == "unsubscribe_events":
+            subscriptions.pop(message.get("subscription"), None)
+            await result()
+        elif command == "get_states":
+            await result(list(self.states.values()))
+        elif command == "get_services":
+            await result({s["domain"]: s["services"] for s in self._services()})
+        elif command == "get_config":
+            await result(self._config())
+        elif command == "call_service":
+            self._call_service(message.get("domain"), message.get("service"),
+                               {**message.get("service_data", {}), **message.get("target", {})})
+            await result({"context": {"id": str(message_id)}})
+        elif command in ("config/area_registry/list", "config/device_registry/list"):
+            await result([])
+        elif command == "config/entity_registry/list":
+            await result([{"entity_id": entity_id, "device_id": None, "area_id": None} for entity_id in self.states])
+        else:
+            await ws.send_json({
+                "id": message_id, "type": "result", "success": False,
+                "error": {"code": "unknown_command", "message": f"Unknown command {command}"}
+            })
+
+    # =========================================================================
+    # Server
+    # =========================================================================
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get("/api/", self.handle_root)
+        app.router.add_get("/api/states", self.handle_states)
+        app.router.add_get("/api/states/{entity_id}", self.handle_state)
+        app.router.add_post("/api/states/{entity_id}", self.handle_set_state)
+        app.router.add_get("/api/services", self.handle_services)
+        app.router.add_post("/api/services/{domain}/{service}", self.handle_call_service)
+        app.router.add_get("/api/config", self.handle_config)
+        app.router.add_post("/api/events/{event_type}", self.handle_fire_event)
+        app.router.add_get("/api/websocket", self.handle_websocket)
+        return app
+
+    async def churn(self, changes_per_second: float):
+        """Randomly change sensor-like states to generate event traffic"""
+        entity_ids = [e for e in self.states if e.split(".")[0] in ("sensor", "binary_sensor", "light", "switch")]
+        if not entity_ids:
+            return
+        while True:
+            await asyncio.sleep(1 / changes_per_second)
+            entity_id = random.choice(entity_ids)  # nosec B311
+            self._set_state(entity_id, str(random.randint(0, 100)))  # nosec B311
+
+
+async def serve(args):
+    states = load_states(args.states, args.multiply)
+    standin = HomeAssistantStandIn(
+        states, token=args.token, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, error_rate=args.error_rate
+    )
+    runner = web.AppRunner(standin.make_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    logger.info(f"Stand-in Home Assistant with {len(states)} entities on http://{args.host}:{args.port}")
+
+    if args.churn:
+        asyncio.ensure_future(standin.churn(args.churn))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Home Assistant stand-in server")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8124, help="Port to listen on")
+    parser.add_argument("--states", type=Path, default=DEFAULT_STATES, help="State export to serve")
+    parser.add_argument("--multiply", type=int, default=1, help="Replicate the states N times")
+    parser.add_argument("--token", default="", help="Require this access token (any token if empty)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency per request")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of REST requests failing with 5xx")
+    parser.add_argument("--churn", type=float, default=0, help="Random state changes per second")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
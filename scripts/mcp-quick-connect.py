@@ -24,13 +24,12 @@ async def main():
         print("✅ Connected to Home Assistant via MCP")
         print(f"📍 Server: {config.host}:{config.port}\n")
         
-        # Get all states
-        states = await client.get_all_states()
+        # States were cached and indexed by domain when connecting
+        states = client.get_cached_states()
         print(f"📊 Total Entities: {len(states)}")
         
         # Show entity domains
-        domains = set(s.get('entity_id', '').split('.')[0] for s in states if '.' in s.get('entity_id', ''))
-        print(f"🏷️  Domains: {', '.join(sorted(domains))}\n")
+        print(f"🏷️  Domains: {', '.join(sorted(client.domain_index))}\n")
         
         # Get config
         config_data = await client.get_config()
@@ -41,7 +40,7 @@ async def main():
         # List some entities by domain
         print("🔌 Sample Entities:")
         for domain in ['light', 'switch', 'sensor', 'automation'][:4]:
-            domain_entities = [s for s in states if s.get('entity_id', '').startswith(f"{domain}.")]
+            domain_entities = client.get_cached_states(domain)
             if domain_entities:
                 print(f"  {domain}: {len(domain_entities)} entities")
                 # Show first 3